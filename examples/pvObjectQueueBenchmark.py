@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+'''
+Micro-benchmark comparing push/pop throughput and latency of the
+standard (mutex based) and lock-free PvObjectQueue implementations.
+Single producer thread pushes time stamped objects into the queue, and
+single consumer thread retrieves them and records queue latency.
+'''
+
+import time
+import argparse
+import threading
+import pvaccess as pva
+
+def runProducer(pvq, nObjects, timeout):
+    # Objects are reused; pool must be larger than the number of objects
+    # that can be held by the queue and by the consumer at any given time
+    pvObjects = [pva.PvObject({'id' : pva.UINT, 't' : pva.DOUBLE}) for i in range(0,2*pvq.maxLength+1)]
+    nPvObjects = len(pvObjects)
+    for i in range(0,nObjects):
+        pv = pvObjects[i % nPvObjects]
+        pv['id'] = i
+        pv['t'] = time.perf_counter()
+        try:
+            pvq.put(pv, timeout)
+        except pva.QueueFull:
+            pass
+
+def runConsumer(pvq, nObjects, timeout, latencies):
+    nReceived = 0
+    while nReceived < nObjects:
+        pvList = pvq.getMany(0, timeout)
+        if not pvList:
+            # Producer is done
+            break
+        t = time.perf_counter()
+        for pv in pvList:
+            latencies.append(t-pv['t'])
+        nReceived += len(pvList)
+
+def runBenchmark(lockFree, nObjects, queueSize, timeout):
+    pvq = pva.PvObjectQueue(queueSize, lockFree)
+    latencies = []
+    consumerThread = threading.Thread(target=runConsumer, args=(pvq, nObjects, timeout, latencies))
+    producerThread = threading.Thread(target=runProducer, args=(pvq, nObjects, timeout))
+    startTime = time.perf_counter()
+    consumerThread.start()
+    producerThread.start()
+    producerThread.join()
+    consumerThread.join()
+    runtime = time.perf_counter()-startTime
+    counters = pvq.getCounters()
+    latencies.sort()
+    nLatencies = len(latencies)
+    print(f'Lock-free: {lockFree}')
+    print(f'  Objects delivered: {counters["nDelivered"]}/{nObjects} (rejected: {counters["nRejected"]})')
+    print(f'  Runtime: {runtime:.3f} seconds')
+    print(f'  Throughput: {counters["nDelivered"]/runtime:.1f} objects/second')
+    if nLatencies:
+        print(f'  Latency (median/p99/max): {latencies[nLatencies//2]*1e6:.1f}/{latencies[int(nLatencies*0.99)]*1e6:.1f}/{latencies[-1]*1e6:.1f} microseconds')
+
+def main():
+    parser = argparse.ArgumentParser(description='PvObjectQueue push/pop benchmark')
+    parser.add_argument('--n-objects', type=int, dest='nObjects', default=100000, help='Number of objects to push through the queue (default: 100000)')
+    parser.add_argument('--queue-size', type=int, dest='queueSize', default=1000, help='Queue size (default: 1000)')
+    parser.add_argument('--timeout', type=float, dest='timeout', default=1.0, help='Queue put/get timeout in seconds (default: 1.0)')
+    args = parser.parse_args()
+    for lockFree in [False, True]:
+        runBenchmark(lockFree, args.nObjects, args.queueSize, args.timeout)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+'''
+RPC server example using worker pool. Requests for the slow 'sleep'
+service and for the 'asyncSleep' coroutine service do not block other
+clients, while CPU-bound 'sum' service is executed in the process pool.
+Service counters are printed periodically.
+
+Invoke services using, e.g.:
+
+    $ pvcall sleep delay=2
+    $ pvcall asyncSleep delay=2
+    $ pvcall sum n=10000000
+'''
+
+import time
+import asyncio
+import pvaccess as pva
+
+def sleep(pvRequest):
+    delay = float(pvRequest.get().get('delay', 1))
+    time.sleep(delay)
+    return pva.PvObject({'delay' : pva.DOUBLE}, {'delay' : delay})
+
+async def asyncSleep(pvRequest):
+    delay = float(pvRequest.get().get('delay', 1))
+    await asyncio.sleep(delay)
+    return pva.PvObject({'delay' : pva.DOUBLE}, {'delay' : delay})
+
+# Process pool services must be defined at module level
+def computeSum(pvRequest):
+    n = int(pvRequest.get().get('n', 1000000))
+    result = 0
+    for i in range(0,n):
+        result += i
+    return pva.PvObject({'sum' : pva.ULONG}, {'sum' : result})
+
+if __name__ == '__main__':
+    srv = pva.RpcServer()
+    srv.setWorkerPoolSize(8)
+    srv.setProcessPoolSize(2)
+    srv.registerService('sleep', sleep, pva.RpcExecutorType.THREAD_POOL, 4, 100)
+    srv.registerService('asyncSleep', asyncSleep, pva.RpcExecutorType.THREAD_POOL, 4, 100)
+    srv.registerService('sum', computeSum, pva.RpcExecutorType.PROCESS_POOL, 2, 10)
+    srv.startListener()
+    try:
+        while True:
+            time.sleep(10)
+            for serviceName in ['sleep', 'asyncSleep', 'sum']:
+                print(f'Service {serviceName}: {srv.getServiceCounters(serviceName)}')
+    except KeyboardInterrupt:
+        pass
+    srv.stopListener()
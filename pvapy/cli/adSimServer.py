@@ -6,12 +6,16 @@ Area Detector Simulation Server
 
 import sys
 import time
+import queue
 import random
 import tempfile
 import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
 import argparse
 import os
 import os.path
+import signal
 import ctypes.util
 import numpy as np
 # HDF5 is optional
@@ -39,6 +43,7 @@ import pvaccess as pva
 from pvapy.utility.adImageUtility import AdImageUtility
 from pvapy.utility.floatWithUnits import FloatWithUnits
 from pvapy.utility.intWithUnits import IntWithUnits
+from pvapy.utility.latencyHistogram import LatencyHistogram
 __version__ = pva.__version__
 
 class FrameGenerator:
@@ -296,6 +301,46 @@ class NumpyRandomGenerator(FrameGenerator):
         print(f'Generated frame shape: {self.frames[0].shape}')
         print(f'Range of generated values: [{mn},{mx}]')
 
+class SharedFrameCache:
+    '''
+    Frame cache that can be shared between processes. Frames are serialized
+    into a single shared memory segment, so they do not have to be pickled
+    and sent to each worker process. Workers deserialize a frame directly
+    from shared memory each time it is published, and drop it once it is
+    copied into the server record, so memory usage does not grow with the
+    number of workers.
+    '''
+
+    def __init__(self, frameList):
+        frameBytesList = [frame.toBytes() for frame in frameList]
+        self.nFrames = len(frameBytesList)
+        self.offsetList = []
+        self.sizeList = []
+        offset = 0
+        for frameBytes in frameBytesList:
+            self.offsetList.append(offset)
+            self.sizeList.append(len(frameBytes))
+            offset += len(frameBytes)
+        self.size = offset
+        self.sharedMemory = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        for i,frameBytes in enumerate(frameBytesList):
+            offset = self.offsetList[i]
+            self.sharedMemory.buf[offset:offset+self.sizeList[i]] = frameBytes
+
+    def __len__(self):
+        return self.nFrames
+
+    def getFrame(self, frameId):
+        i = frameId % self.nFrames
+        offset = self.offsetList[i]
+        return pva.PvObject.fromBytes(self.sharedMemory.buf[offset:offset+self.sizeList[i]])
+
+    def close(self):
+        self.sharedMemory.close()
+
+    def unlink(self):
+        self.sharedMemory.unlink()
+
 class AdSimServer:
     ''' AD Sim Server class. '''
 
@@ -305,7 +350,8 @@ class AdSimServer:
 
     MIN_CACHE_SIZE = 1
     CACHE_TIMEOUT = 1.0
-    DELAY_CORRECTION = 0.0001
+    FARM_REPORT_PERIOD = 1.0
+    DEFAULT_SPIN_TIME = 0.0005
     NOTIFICATION_DELAY = 0.1
     BYTES_IN_MEGABYTE = 1000000
     METADATA_TYPE_DICT = {
@@ -313,7 +359,7 @@ class AdSimServer:
         'timeStamp' : pva.PvTimeStamp()
     }
 
-    def __init__(self, inputDirectory, inputFile, mmapMode, hdfDataset, hdfCompressionMode, cfgFile, frameRate, nFrames, cacheSize, nx, ny, colorMode, datatype, minimum, maximum, runtime, channelName, notifyPv, notifyPvValue, metadataPv, startDelay, shutdownDelay, reportPeriod, disableCurses):
+    def __init__(self, inputDirectory, inputFile, mmapMode, hdfDataset, hdfCompressionMode, cfgFile, frameRate, nFrames, cacheSize, nx, ny, colorMode, datatype, minimum, maximum, runtime, channelName, notifyPv, notifyPvValue, metadataPv, startDelay, shutdownDelay, reportPeriod, disableCurses, burstSize=1, spinTime=DEFAULT_SPIN_TIME, nChannels=1, nWorkers=1, splitFrames=False, idFormatSpec=None):
         self.lock = threading.Lock()
         self.deltaT = 0
         self.cacheTimeout = self.CACHE_TIMEOUT
@@ -322,6 +368,17 @@ class AdSimServer:
             self.cacheTimeout = max(self.CACHE_TIMEOUT, self.deltaT)
         self.runtime = runtime
         self.reportPeriod = reportPeriod
+        # Frames in a burst are published back to back, and bursts
+        # are scheduled so that the average rate matches frame rate
+        self.burstSize = max(burstSize, 1)
+        self.spinTime = max(spinTime, 0)
+        # Multiple channels and/or worker processes require farm mode
+        self.nChannels = max(nChannels, 1)
+        self.nWorkers = min(max(nWorkers, 1), self.nChannels)
+        self.splitFrames = splitFrames
+        self.isFarm = (self.nChannels > 1 or self.nWorkers > 1)
+        if self.isFarm and metadataPv:
+            raise pva.InvalidArgument('Metadata PVs are not supported with multiple channels or worker processes.')
         self.metadataIoc = None
         self.frameGeneratorList = []
         self.frameCacheSize = max(cacheSize, self.MIN_CACHE_SIZE)
@@ -372,15 +429,26 @@ class AdSimServer:
 
         fg = self.frameGeneratorList[0]
         self.frameRate = frameRate
+        # With split frames, frame rate is divided between channels;
+        # otherwise each channel publishes at the given frame rate
+        self.totalFrameRate = frameRate
+        if not splitFrames:
+            self.totalFrameRate = frameRate*self.nChannels
         self.uncompressedImageSize = IntWithUnits(fg.getUncompressedFrameSize(), 'B')
         self.compressedImageSize = IntWithUnits(fg.getCompressedFrameSize(), 'B')
-        self.compressedDataRate = FloatWithUnits(self.compressedImageSize*self.frameRate/self.BYTES_IN_MEGABYTE, 'MBps')
-        self.uncompressedDataRate = FloatWithUnits(self.uncompressedImageSize*self.frameRate/self.BYTES_IN_MEGABYTE, 'MBps')
-
-        self.channelName = channelName
-        self.pvaServer = pva.PvaServer()
+        self.compressedDataRate = FloatWithUnits(self.compressedImageSize*self.totalFrameRate/self.BYTES_IN_MEGABYTE, 'MBps')
+        self.uncompressedDataRate = FloatWithUnits(self.uncompressedImageSize*self.totalFrameRate/self.BYTES_IN_MEGABYTE, 'MBps')
+
+        self.channelNameList = self.getChannelNameList(channelName, self.nChannels, idFormatSpec)
+        self.channelName = self.channelNameList[0]
+        self.pvaServer = None
+        if not self.isFarm:
+            self.pvaServer = pva.PvaServer()
         self.setupMetadataPvs(metadataPv)
-        self.pvaServer.addRecord(self.channelName, pva.NtNdArray(), None)
+        if not self.isFarm:
+            self.pvaServer.addRecord(self.channelName, pva.NtNdArray(), None)
+        elif self.nInputFrames > self.frameCacheSize:
+            raise pva.InvalidArgument(f'Number of input frames ({self.nInputFrames}) must not exceed cache size ({self.frameCacheSize}) when using multiple channels or worker processes.')
 
         if notifyPv and notifyPvValue:
             try:
@@ -408,6 +476,8 @@ class AdSimServer:
         self.nPublishedFrames = 0
         self.startTime = 0
         self.lastPublishedTime = 0
+        # Difference between actual and scheduled burst publishing time
+        self.jitterHistogram = LatencyHistogram()
         self.startDelay = startDelay
         self.shutdownDelay = shutdownDelay
         self.isDone = False
@@ -416,6 +486,27 @@ class AdSimServer:
         self.screenInitialized = False
         self.disableCurses = disableCurses
 
+        # Farm mode: worker processes and their stats
+        self.sharedFrameCache = None
+        self.workerProcessList = []
+        self.stopEvent = None
+        self.statsQueue = None
+        self.workerStatsMap = {}
+
+    @classmethod
+    def getChannelNameList(cls, channelName, nChannels, idFormatSpec=None):
+        if '*' not in channelName:
+            if nChannels > 1:
+                raise pva.InvalidArgument(f'Channel name {channelName} must contain "*" when multiple channels are used.')
+            return [channelName]
+        channelNameList = []
+        for channelId in range(1,nChannels+1):
+            channelIdString = f'{channelId}'
+            if idFormatSpec:
+                channelIdString = f'{channelId:{idFormatSpec}}'
+            channelNameList.append(channelName.replace('*', channelIdString))
+        return channelNameList
+
     def setupCurses(self):
         screen = None
         if not self.disableCurses:
@@ -560,60 +651,84 @@ class AdSimServer:
             frame['dataTimeStamp'] = ts
         return frame
 
-    def framePublisher(self):
-        while True:
-            if self.isDone:
-                return
-
-            # Prepare metadata
-            metadataValueDict = self.getMetadataValueDict()
-
+    @staticmethod
+    def waitUntil(deadline, spinTime):
+        # Sleep until shortly before the deadline and spin for the rest
+        # of the time, as sleep alone is not accurate enough at high rates
+        delay = deadline - time.perf_counter() - spinTime
+        if delay > 0:
+            time.sleep(delay)
+        while time.perf_counter() < deadline:
+            # Yield to other threads while spinning
+            time.sleep(0)
+
+    @staticmethod
+    def getJitterReport(h):
+        return f'jitter p50/p99/max: {h.getPercentile(50)*1e6:.1f}/{h.getPercentile(99)*1e6:.1f}/{h.maxRecordedValue*1e6:.1f}us'
+
+    def publishFrame(self):
+        # Returns False when publishing should stop
+        if self.metadataPvs:
             # Update metadata and take timestamp
+            metadataValueDict = self.getMetadataValueDict()
             updateTime = self.updateMetadataPvs(metadataValueDict)
+        else:
+            updateTime = time.time()
 
-            # Prepare frame with a given timestamp
-            # so that metadata and image times are as close as possible
-            try:
-                frame = self.prepareFrame(updateTime)
-            except pva.QueueEmpty:
-                self.printReport('Server exiting after emptying queue')
-                self.isDone = True
-                return
-            except Exception:
-                if self.isDone:
-                    return
-                raise
-
-            # Publish frame
-            self.pvaServer.updateUnchecked(self.channelName, frame)
-            self.lastPublishedTime = time.time()
-            self.nPublishedFrames += 1
-            if self.usingQueue and self.nPublishedFrames >= self.nInputFrames:
-                self.printReport(f'Server exiting after publishing {self.nPublishedFrames}')
-                self.isDone = True
-                return
+        # Prepare frame with a given timestamp
+        # so that metadata and image times are as close as possible
+        try:
+            frame = self.prepareFrame(updateTime)
+        except pva.QueueEmpty:
+            self.printReport('Server exiting after emptying queue')
+            self.isDone = True
+            return False
+        except Exception:
+            if self.isDone:
+                return False
+            raise
 
-            runtime = 0
-            frameRate = 0
-            if self.nPublishedFrames > 1:
-                runtime = self.lastPublishedTime - self.startTime
-                deltaT = runtime/(self.nPublishedFrames - 1)
-                frameRate = 1.0/deltaT
-            else:
-                self.startTime = self.lastPublishedTime
-            if self.reportPeriod > 0 and (self.nPublishedFrames % self.reportPeriod) == 0:
-                report = f'Published frame id {self.currentFrameId:6d} @ {self.lastPublishedTime:.3f}s (frame rate: {frameRate:.4f}fps; runtime: {runtime:.3f}s)'
-                self.printReport(report)
+        # Publish frame
+        self.pvaServer.updateUnchecked(self.channelName, frame)
+        self.lastPublishedTime = time.time()
+        self.nPublishedFrames += 1
+        if self.usingQueue and self.nPublishedFrames >= self.nInputFrames:
+            self.printReport(f'Server exiting after publishing {self.nPublishedFrames}')
+            self.isDone = True
+            return False
 
-            if runtime > self.runtime:
-                self.printReport(f'Server exiting after reaching runtime of {runtime:.3f} seconds')
-                return
+        runtime = 0
+        frameRate = 0
+        if self.nPublishedFrames > 1:
+            runtime = self.lastPublishedTime - self.startTime
+            deltaT = runtime/(self.nPublishedFrames - 1)
+            frameRate = 1.0/deltaT
+        else:
+            self.startTime = self.lastPublishedTime
+        if self.reportPeriod > 0 and (self.nPublishedFrames % self.reportPeriod) == 0:
+            report = f'Published frame id {self.currentFrameId:6d} @ {self.lastPublishedTime:.3f}s (frame rate: {frameRate:.4f}fps; runtime: {runtime:.3f}s; {self.getJitterReport(self.jitterHistogram)})'
+            self.printReport(report)
+
+        if runtime > self.runtime:
+            self.printReport(f'Server exiting after reaching runtime of {runtime:.3f} seconds')
+            return False
+        return True
 
-            if self.deltaT > 0:
-                nextPublishTime = self.startTime + self.nPublishedFrames*self.deltaT
-                delay = nextPublishTime - time.time() - self.DELAY_CORRECTION
-                if delay > 0:
-                    threading.Timer(delay, self.framePublisher).start()
+    def framePublisher(self):
+        # Single publishing thread, which uses absolute deadlines
+        # so that scheduling errors do not accumulate
+        time.sleep(self.startDelay)
+        burstDeltaT = self.burstSize*self.deltaT
+        startTime = time.perf_counter()
+        nBursts = 0
+        while not self.isDone:
+            if burstDeltaT > 0:
+                deadline = startTime + nBursts*burstDeltaT
+                self.waitUntil(deadline, self.spinTime)
+                self.jitterHistogram.record(time.perf_counter()-deadline)
+            nBursts += 1
+            for _ in range(0, self.burstSize):
+                if self.isDone or not self.publishFrame():
                     return
 
     def printReport(self, report):
@@ -628,12 +743,137 @@ class AdSimServer:
             else:
                 print(report)
 
+    def updateWorkerStats(self, workerStats):
+        self.workerStatsMap[workerStats['workerId']] = workerStats
+
+    def drainWorkerStats(self, timeout=0):
+        try:
+            while True:
+                self.updateWorkerStats(self.statsQueue.get(block=True, timeout=timeout))
+        except queue.Empty:
+            pass
+
+    def getFarmStats(self):
+        nPublishedFrames = 0
+        startTime = 0
+        lastPublishedTime = 0
+        jitterHistogram = LatencyHistogram()
+        for workerStats in list(self.workerStatsMap.values()):
+            nPublishedFrames += workerStats['nPublishedFrames']
+            if workerStats['startTime'] > 0 and (startTime == 0 or workerStats['startTime'] < startTime):
+                startTime = workerStats['startTime']
+            lastPublishedTime = max(lastPublishedTime, workerStats['lastPublishedTime'])
+            jitterHistogram.merge(workerStats['jitterHistogram'])
+        runtime = 0
+        frameRate = 0
+        if lastPublishedTime > startTime > 0:
+            runtime = lastPublishedTime - startTime
+            frameRate = nPublishedFrames/runtime
+        return nPublishedFrames, runtime, frameRate, jitterHistogram
+
+    def getFarmReport(self):
+        nPublishedFrames, runtime, frameRate, jitterHistogram = self.getFarmStats()
+        return f'Published {nPublishedFrames} frames on {self.nChannels} channels from {self.nWorkers} workers (aggregate frame rate: {frameRate:.4f}fps; runtime: {runtime:.3f}s; {self.getJitterReport(jitterHistogram)})'
+
+    def farmMonitor(self):
+        lastReportTime = time.time()
+        while not self.isDone:
+            self.drainWorkerStats(self.FARM_REPORT_PERIOD)
+            if not [p for p in self.workerProcessList if p.is_alive()]:
+                self.printReport('Server exiting after all workers are done')
+                self.isDone = True
+                return
+            now = time.time()
+            if self.reportPeriod > 0 and now-lastReportTime >= self.FARM_REPORT_PERIOD:
+                lastReportTime = now
+                self.printReport(self.getFarmReport())
+
+    def startFarm(self):
+        # Frames are generated in this process, and shared with workers
+        self.frameProducer()
+        frameList = [self.frameCache[frameId] for frameId in sorted(self.frameCache.keys())]
+        self.frameCache = {}
+        self.sharedFrameCache = SharedFrameCache(frameList)
+        del frameList
+        print(f'Shared frame cache: {len(self.sharedFrameCache)} frames ({IntWithUnits(self.sharedFrameCache.size, "B")})')
+
+        channelFrameRate = self.frameRate
+        if self.splitFrames:
+            channelFrameRate = self.frameRate/self.nChannels
+        self.stopEvent = mp.Event()
+        self.statsQueue = mp.Queue()
+
+        # Workers ignore interrupts, so we can exit cleanly
+        originalSigintHandler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for workerId in range(1,self.nWorkers+1):
+            # Channels are assigned to workers in round-robin fashion;
+            # with split frames, channel i publishes ids i, i+N, i+2N, ...
+            channelList = []
+            for channelIndex in range(workerId-1,self.nChannels,self.nWorkers):
+                channelName = self.channelNameList[channelIndex]
+                if self.splitFrames:
+                    channelList.append((channelName, channelIndex+1, self.nChannels))
+                else:
+                    channelList.append((channelName, 1, 1))
+            mpProcess = mp.Process(target=runAdSimFarmWorker, args=(workerId, channelList, self.sharedFrameCache, channelFrameRate, self.burstSize, self.spinTime, self.runtime, self.startDelay, self.shutdownDelay, self.stopEvent, self.statsQueue))
+            self.workerProcessList.append(mpProcess)
+            print(f'Starting worker {workerId} for channels: {[c[0] for c in channelList]}')
+            mpProcess.start()
+        signal.signal(signal.SIGINT, originalSigintHandler)
+        threading.Thread(target=self.farmMonitor, daemon=True).start()
+
+    def stopFarm(self):
+        self.isDone = True
+        if self.stopEvent is None:
+            # Workers were not started
+            return
+        self.stopEvent.set()
+        # Keep receiving stats while waiting, so that workers are not
+        # blocked on flushing their queue
+        waitTime = self.shutdownDelay + self.CACHE_TIMEOUT
+        deadline = time.time() + waitTime
+        try:
+            while time.time() < deadline and [p for p in self.workerProcessList if p.is_alive()]:
+                self.drainWorkerStats(self.CACHE_TIMEOUT/10)
+        except KeyboardInterrupt:
+            pass
+        self.drainWorkerStats()
+        for mpProcess in self.workerProcessList:
+            if mpProcess.is_alive():
+                mpProcess.terminate()
+            mpProcess.join()
+        if self.screen:
+            self.curses.endwin()
+            self.screen = None
+        self.sharedFrameCache.close()
+        self.sharedFrameCache.unlink()
+
+        nPublishedFrames, runtime, frameRate, jitterHistogram = self.getFarmStats()
+        dataRate = FloatWithUnits(self.uncompressedImageSize*frameRate/self.BYTES_IN_MEGABYTE, 'MBps')
+        print(f'\nServer runtime: {runtime:.4f} seconds')
+        for workerId,workerStats in sorted(self.workerStatsMap.items()):
+            workerRuntime = workerStats['lastPublishedTime'] - workerStats['startTime']
+            workerFrameRate = 0
+            if workerRuntime > 0:
+                workerFrameRate = workerStats['nPublishedFrames']/workerRuntime
+            print(f'Worker {workerId} published frames: {workerStats["nPublishedFrames"]:6d} @ {workerFrameRate:.4f} fps ({workerStats["nChannels"]} channels)')
+        print(f'Published frames: {nPublishedFrames:6d} @ {frameRate:.4f} fps')
+        print(f'Data rate: {dataRate}')
+        if self.deltaT > 0:
+            print(f'Publishing {self.getJitterReport(jitterHistogram)} (burst size: {self.burstSize})')
+
     def start(self):
+        if self.isFarm:
+            self.startFarm()
+            return
         threading.Thread(target=self.frameProducer, daemon=True).start()
         self.pvaServer.start()
-        threading.Timer(self.startDelay, self.framePublisher).start()
+        threading.Thread(target=self.framePublisher).start()
 
     def stop(self):
+        if self.isFarm:
+            self.stopFarm()
+            return
         self.isDone = True
         try:
             time.sleep(self.shutdownDelay)
@@ -653,6 +893,93 @@ class AdSimServer:
         print(f'\nServer runtime: {runtime:.4f} seconds')
         print(f'Published frames: {self.nPublishedFrames:6d} @ {frameRate:.4f} fps')
         print(f'Data rate: {dataRate}')
+        if self.deltaT > 0:
+            print(f'Publishing {self.getJitterReport(self.jitterHistogram)} (burst size: {self.burstSize})')
+
+class AdSimFarmWorker:
+    ''' Publishes frames from shared frame cache on a subset of channels. '''
+
+    STATS_PERIOD = 1.0
+
+    def __init__(self, workerId, channelList, sharedFrameCache, channelFrameRate, burstSize, spinTime, runtime, startDelay, shutdownDelay, stopEvent, statsQueue):
+        self.workerId = workerId
+        # List of (channelName, firstFrameId, frameIdStep) tuples
+        self.channelList = channelList
+        self.sharedFrameCache = sharedFrameCache
+        self.burstDeltaT = 0
+        if channelFrameRate > 0:
+            self.burstDeltaT = burstSize/channelFrameRate
+        self.burstSize = burstSize
+        self.spinTime = spinTime
+        self.runtime = runtime
+        self.startDelay = startDelay
+        self.shutdownDelay = shutdownDelay
+        self.stopEvent = stopEvent
+        self.statsQueue = statsQueue
+        self.nPublishedFrames = 0
+        self.startTime = 0
+        self.lastPublishedTime = 0
+        self.jitterHistogram = LatencyHistogram()
+
+    def reportStats(self, isDone=False):
+        self.statsQueue.put({
+            'workerId' : self.workerId,
+            'nChannels' : len(self.channelList),
+            'nPublishedFrames' : self.nPublishedFrames,
+            'startTime' : self.startTime,
+            'lastPublishedTime' : self.lastPublishedTime,
+            'jitterHistogram' : self.jitterHistogram.copy(),
+            'isDone' : isDone
+        })
+
+    def publishFrames(self, pvaServer):
+        frameIdList = [firstFrameId for (_, firstFrameId, _) in self.channelList]
+        startTime = time.perf_counter()
+        self.startTime = time.time()
+        lastStatsTime = self.startTime
+        nBursts = 0
+        while not self.stopEvent.is_set():
+            if self.burstDeltaT > 0:
+                deadline = startTime + nBursts*self.burstDeltaT
+                AdSimServer.waitUntil(deadline, self.spinTime)
+                self.jitterHistogram.record(time.perf_counter()-deadline)
+            nBursts += 1
+            for i,(channelName, _, frameIdStep) in enumerate(self.channelList):
+                for _ in range(0, self.burstSize):
+                    frameId = frameIdList[i]
+                    frameIdList[i] += frameIdStep
+                    # Frame is not kept, so that workers do not hold
+                    # their own copies of the shared frame cache
+                    frame = self.sharedFrameCache.getFrame(frameId-1)
+                    frame['uniqueId'] = frameId
+                    ts = pva.PvTimeStamp(time.time())
+                    frame['timeStamp'] = ts
+                    frame['dataTimeStamp'] = ts
+                    pvaServer.updateUnchecked(channelName, frame)
+                    self.nPublishedFrames += 1
+            now = time.time()
+            self.lastPublishedTime = now
+            if now-lastStatsTime >= self.STATS_PERIOD:
+                lastStatsTime = now
+                self.reportStats()
+            if now-self.startTime > self.runtime:
+                break
+
+    def run(self):
+        pvaServer = pva.PvaServer()
+        for (channelName, _, _) in self.channelList:
+            pvaServer.addRecord(channelName, pva.NtNdArray(), None)
+        pvaServer.start()
+        if not self.stopEvent.wait(self.startDelay):
+            self.publishFrames(pvaServer)
+        self.reportStats(isDone=True)
+        # Allow clients to receive last updates
+        time.sleep(self.shutdownDelay)
+        pvaServer.stop()
+        self.sharedFrameCache.close()
+
+def runAdSimFarmWorker(*args):
+    AdSimFarmWorker(*args).run()
 
 def main():
     parser = argparse.ArgumentParser(description='PvaPy Area Detector Simulator')
@@ -680,6 +1007,12 @@ def main():
     parser.add_argument('-std', '--start-delay', type=float, dest='start_delay',  default=10.0, help='Server start delay in seconds (default: 10 seconds)')
     parser.add_argument('-shd', '--shutdown-delay', type=float, dest='shutdown_delay', default=10.0, help='Server shutdown delay in seconds (default: 10 seconds)')
     parser.add_argument('-rp', '--report-period', type=int, dest='report_period', default=1, help='Reporting period for publishing frames; if set to <=0 no frames will be reported as published (default: 1)')
+    parser.add_argument('-bs', '--burst-size', type=int, dest='burst_size', default=1, help='Number of frames published back to back at each scheduled publishing time; bursts are scheduled so that the average publishing rate matches the specified frame rate (default: 1)')
+    parser.add_argument('-spt', '--spin-time', type=float, dest='spin_time', default=AdSimServer.DEFAULT_SPIN_TIME, help=f'Time in seconds before each scheduled publishing time that the publisher spends spinning instead of sleeping; larger values improve timing accuracy at the expense of CPU usage (default: {AdSimServer.DEFAULT_SPIN_TIME} seconds)')
+    parser.add_argument('-nch', '--n-channels', type=int, dest='n_channels', default=1, help='Number of channels to publish (default: 1). If > 1, channel name must contain the "*" character, which will be replaced with channel id (1,2,...,N) formatted using id format specification.')
+    parser.add_argument('-nw', '--n-workers', type=int, dest='n_workers', default=1, help='Number of worker processes publishing channels (default: 1). Channels are distributed between workers in round-robin fashion. If number of channels or workers is greater than 1, all input frames must fit into cache, which is shared by all workers via shared memory, and metadata PVs cannot be used.')
+    parser.add_argument('-sf', '--split-frames', dest='split_frames', default=False, action='store_true', help='Split frames of a single simulated detector between channels. In this mode frame rate is the aggregate rate for all channels, and frame ids are interleaved (channel i publishes frames i, i+N, i+2N, ...), as expected by the data collector. By default, each channel acts as an independent detector publishing frames 1,2,3,... at the given frame rate.')
+    parser.add_argument('-ifs', '--id-format-spec', dest='id_format_spec', default=None, help='Specification to be used for channel id when forming channel names (default: None).')
     parser.add_argument('-dc', '--disable-curses', dest='disable_curses', default=False, action='store_true', help='Disable curses library screen handling. This is enabled by default, except when logging into standard output is turned on.')
 
     args, unparsed = parser.parse_known_args()
@@ -689,7 +1022,7 @@ def main():
 
     server = None
     try:
-        server = AdSimServer(inputDirectory=args.input_directory, inputFile=args.input_file, mmapMode=args.mmap_mode, hdfDataset=args.hdf_dataset, hdfCompressionMode=args.hdf_compression_mode, cfgFile=args.config_file, frameRate=args.frame_rate, nFrames=args.n_frames, cacheSize=args.cache_size, nx=args.n_x_pixels, ny=args.n_y_pixels, colorMode=args.color_mode, datatype=args.datatype, minimum=args.minimum, maximum=args.maximum, runtime=args.runtime, channelName=args.channel_name, notifyPv=args.notify_pv, notifyPvValue=args.notify_pv_value, metadataPv=args.metadata_pv, startDelay=args.start_delay, shutdownDelay=args.shutdown_delay, reportPeriod=args.report_period, disableCurses=args.disable_curses)
+        server = AdSimServer(inputDirectory=args.input_directory, inputFile=args.input_file, mmapMode=args.mmap_mode, hdfDataset=args.hdf_dataset, hdfCompressionMode=args.hdf_compression_mode, cfgFile=args.config_file, frameRate=args.frame_rate, nFrames=args.n_frames, cacheSize=args.cache_size, nx=args.n_x_pixels, ny=args.n_y_pixels, colorMode=args.color_mode, datatype=args.datatype, minimum=args.minimum, maximum=args.maximum, runtime=args.runtime, channelName=args.channel_name, notifyPv=args.notify_pv, notifyPvValue=args.notify_pv_value, metadataPv=args.metadata_pv, startDelay=args.start_delay, shutdownDelay=args.shutdown_delay, reportPeriod=args.report_period, disableCurses=args.disable_curses, burstSize=args.burst_size, spinTime=args.spin_time, nChannels=args.n_channels, nWorkers=args.n_workers, splitFrames=args.split_frames, idFormatSpec=args.id_format_spec)
 
         server.start()
         expectedRuntime = args.runtime+args.start_delay
@@ -39,6 +39,9 @@ def main():
     parser.add_argument('-ds', '--distributor-set', dest='distributor_set', default=None, help='Distributor client set that application belongs to within its group (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. Note that all clients belonging to the same set receive the same PV updates. If set id is not specified (i.e., if a group does not have multiple sets of clients), a PV update will be distributed to only one client.')
     parser.add_argument('-dt', '--distributor-trigger', dest='distributor_trigger', default=None, help='PV structure field that data distributor uses to distinguish different channel updates (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. In case of, for example, area detector applications, the "uniqueId" field would be a good choice for distinguishing between the different frames.')
     parser.add_argument('-du', '--distributor-updates', dest='distributor_updates', default=None, help='Number of sequential PV channel updates that a client (or a set of clients) will receive (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients.')
+    parser.add_argument('-dm', '--distributor-mode', dest='distributor_mode', default=None, help='Distributor update mode (default: None). Allowed values are "one" (update goes to one client per set), "all" (update goes to all clients in a set), "credit" (update goes to one client per set, selected according to the number of slots that clients advertise via credits), and "hash" (update goes to one client per set, selected by hashing the value of the distributor key field, so that all updates with the same key go to the same client). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. Note that in the credit and hash modes consumers do not receive updates in a predetermined sequence, and hence the number of missed PV updates reported by individual consumers is not accurate.')
+    parser.add_argument('-dcr', '--distributor-credits', type=int, dest='distributor_credits', default=None, help='Number of slots consumer advertises to the data distributor in the credit update mode (default: None). If not specified, monitor (client) queue size will be used if it is greater than zero, and server queue size otherwise. This parameter is ignored unless the credit update mode is used. Consumers return credit to the distributor as they process received updates, so at most this many updates are outstanding at any given time.')
+    parser.add_argument('-dk', '--distributor-key', dest='distributor_key', default=None, help='PV structure field whose value data distributor hashes in the hash update mode (default: None). If not specified, distributor trigger field will be used. All updates with the same key field value (e.g., all tiles of a frame) are delivered to the same consumer. This parameter is ignored unless the hash update mode is used.')
     parser.add_argument('-nds', '--n-distributor-sets', type=int, dest='n_distributor_sets', default=1, help='Number of distributor client sets (default: 1). This setting is used to determine appropriate value for the processor object id offset in case where multiple instances of this command are running separately for different client sets. If distributor client set is not specified, this setting is ignored.')
     parser.add_argument('-mc', '--metadata-channels', dest='metadata_channels', default=None, help='Comma-separated list of metadata channels specified in the form "protocol:\\<channelName>", where protocol can be either "ca" or "pva". If channel name is specified without a protocol, "ca" is assumed.')
     parser.add_argument('-rt', '--runtime', type=float, dest='runtime', default=0, help='Server runtime in seconds; values <=0 indicate infinite runtime (default: infinite).')
@@ -95,6 +98,9 @@ def main():
         distributorSet=args.distributor_set,
         distributorTrigger=args.distributor_trigger,
         distributorUpdates=args.distributor_updates,
+        distributorMode=args.distributor_mode,
+        distributorCredits=args.distributor_credits,
+        distributorKey=args.distributor_key,
         nDistributorSets=args.n_distributor_sets,
         metadataChannels=args.metadata_channels
     )
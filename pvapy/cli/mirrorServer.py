@@ -15,6 +15,10 @@ def main():
     parser = argparse.ArgumentParser(description='PvaPy Mirror Server')
     parser.add_argument('-v', '--version', action='version', version=f'%(prog)s {__version__}')
     parser.add_argument('-cm', '--channel-map', dest='channel_map', default=None, help='Channel map specification given as a comma-separated list of tuples of the form (<mirror_channel>,<source_channel>[,source_provider][,source_queue_size[,n_source_monitors,source_field_request_descriptor]]]); if specified, source provider must be either "pva" or "ca" (default: pva), and source queue size must be >= 0 (default: 0); specifying number of source monitors and source request descriptor is typically used with the data distributor plugin, which must be supported by the source PVA server (example request descriptor: "_[pydistributor=updates:1;group:mirror;trigger:uniqueId]").')
+    parser.add_argument('-vm', '--view-map', dest='view_map', default=None, help='Mirror view map specification given as a comma-separated list of tuples of the form (<view_channel>,<mirror_channel>,<field_1>[,<field_2>,...]); each view channel contains only the listed fields of a mirror channel specified in the channel map (example: "(image:meta,image,uniqueId,timeStamp,dimension)").')
+    parser.add_argument('-mr', '--max-rate', type=float, dest='max_rate', default=0, help='Maximum update rate in Hz for all mirror channels; values <= 0 indicate no rate limiting (default: 0)')
+    parser.add_argument('-dc', '--decimation', type=int, dest='decimation', default=1, help='Forward only every n-th source update for all mirror channels; values <= 1 indicate no decimation (default: 1)')
+    parser.add_argument('-fl', '--forward-latest', dest='forward_latest', default=False, action='store_true', help='When rate limiting is enabled, forward the latest source update received within the rate limiting window at the end of that window, instead of dropping it')
     parser.add_argument('-rt', '--runtime', type=float, dest='runtime', default=0, help='Server runtime in seconds; values <=0 indicate infinite runtime (default: infinite)')
     parser.add_argument('-rp', '--report-period', type=float, dest='report_period', default=0, help='Statistics report period for all channels in seconds; values <=0 indicate no reporting (default: 0)')
 
@@ -71,6 +75,26 @@ def main():
             sys.exit(1)
         mapEntries.append(me)
 
+    # View map entries are expected to be of the form
+    # (view_channel, mirror_channel, field_1, field_2, ...)
+    viewEntries = []
+    if args.view_map:
+        for t in args.view_map.split(')'):
+            e = t.replace(',(', '').replace('(', '')
+            if not e:
+                continue
+            ve = e.split(',')
+            if len(ve) < 3:
+                print(f'Invalid view map entry: {e}')
+                sys.exit(1)
+            if ve[1] not in channelList:
+                print(f'Mirror channel for view map entry is not in the channel map: {e}')
+                sys.exit(1)
+            viewEntries.append((ve[0], ve[1], ','.join(ve[2:])))
+
+    if args.max_rate > 0 or args.decimation > 1:
+        print(f'Mirror channel updates will be rate limited (maximum rate: {args.max_rate} Hz; decimation: {args.decimation}; forward latest: {args.forward_latest})')
+
     server = pva.PvaMirrorServer()
     server.start()
     startTime = time.time()
@@ -78,6 +102,11 @@ def main():
     for (cName,sName,sProviderType,sqSize,nsMonitors,sRequestDescriptor) in mapEntries:
         print(f'Adding mirror channel {cName} using source {sName} (provider type: {sProviderType}; queue size: {sqSize}; number of monitors: {nsMonitors}; request descriptor: {sRequestDescriptor})')
         server.addMirrorRecord(cName,sName,sProviderType,sqSize,nsMonitors,sRequestDescriptor)
+        if args.max_rate > 0 or args.decimation > 1:
+            server.setMirrorRecordRateLimit(cName,max(args.max_rate,0),max(args.decimation,1),args.forward_latest)
+    for (vName,cName,vRequestDescriptor) in viewEntries:
+        print(f'Adding mirror view {vName} using mirror channel {cName} (fields: {vRequestDescriptor})')
+        server.addMirrorView(vName,cName,vRequestDescriptor)
 
     print(f'Started mirror server @ {startTime:.3f}')
     sleepTime = 1
@@ -3,12 +3,14 @@
 import pvaccess as pva
 from .userDataProcessor import UserDataProcessor
 from ..utility.adImageUtility import AdImageUtility
+from ..utility.adImageDecompressor import AdImageDecompressor
 
 class AdImageProcessor(UserDataProcessor):
     ''' 
     Class that can be used as a base for user implementation of an
     Area Detector image processor class suitable for usage with the streaming
-    framework.
+    framework. Configuration dictionary may provide the following settings:\n
+    \t\\- decompressImages (bool) : if True, images compressed with one of the supported codecs (blosc, lz4, bslz4) will be decompressed by the reshapeNtNdArray() method (default: False)\n
     
     **AdImageProcessor(configDict={})**
 
@@ -16,6 +18,11 @@ class AdImageProcessor(UserDataProcessor):
     '''
     def __init__(self, configDict={}):
         UserDataProcessor.__init__(self, configDict)
+        self.imageDecompressor = None
+        if configDict.get('decompressImages', False):
+            self.imageDecompressor = AdImageDecompressor()
+            # Instance method takes precedence over the class method
+            self.reshapeNtNdArray = self._reshapeAndDecompressNtNdArray
 
     @classmethod
     def reshapeNtNdArray(cls, ntNdArray):
@@ -28,6 +35,9 @@ class AdImageProcessor(UserDataProcessor):
         '''
         return AdImageUtility.reshapeNtNdArray(ntNdArray)
 
+    def _reshapeAndDecompressNtNdArray(self, ntNdArray):
+        return AdImageUtility.reshapeNtNdArray(ntNdArray, self.imageDecompressor)
+
     @classmethod
     def getNtNdArrayDataFieldKey(cls, image):
         '''
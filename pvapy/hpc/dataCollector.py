@@ -8,7 +8,9 @@ import time
 import threading
 import pvaccess as pva
 from .sourceChannel import SourceChannel
+from .reorderBuffer import ReorderBuffer
 from .metadataChannelFactory import MetadataChannelFactory
+from .dataProcessingController import DataProcessingController
 from ..utility.loggingManager import LoggingManager
 from ..utility.floatWithUnits import FloatWithUnits
 
@@ -68,8 +70,14 @@ class ProcessingThread(threading.Thread):
         self.logger = LoggingManager.getLogger(f'{name}')
         self.isRunning = False
 
-    def processObjects(self):
-        objectTuples = self.dataCollector.getObjectsFromCache()
+    def getWaitTime(self):
+        latenessTimeout = self.dataCollector.collectorLatenessTimeout
+        if 0 < latenessTimeout < self.THREAD_EVENT_TIMEOUT_IN_SECONDS:
+            return latenessTimeout
+        return self.THREAD_EVENT_TIMEOUT_IN_SECONDS
+
+    def processObjects(self, skipGaps=False):
+        objectTuples = self.dataCollector.getObjectsFromCache(skipGaps)
         nObjects = len(objectTuples)
         if nObjects > 0:
             for objectId,pvObject in objectTuples:
@@ -88,14 +96,16 @@ class ProcessingThread(threading.Thread):
             while True:
                 try:
                     cacheSize = self.dataCollector.nObjectsCached
-                    timeSinceCacheUpdate = time.time()-self.dataCollector.cacheUpdateTime
                     if not cacheSize or self.isDone:
                         # Cache empty or we are done
                         break
-                    if cacheSize < self.dataCollector.collectorCacheSize and timeSinceCacheUpdate < self.THREAD_EVENT_TIMEOUT_IN_SECONDS:
+                    # Objects that are still out of order are released
+                    # only after the cache is full
+                    skipGaps = (cacheSize >= self.dataCollector.collectorCacheSize)
+                    nObjects = self.processObjects(skipGaps)
+                    if not nObjects:
                         # Cache is being filled
                         break
-                    nObjects = self.processObjects()
                 except Exception as ex:
                     self.logger.exception(ex)
 
@@ -112,12 +122,13 @@ class ProcessingThread(threading.Thread):
                     if cacheSize >= self.dataCollector.collectorCacheSize or self.isDone:
                         self.logger.debug('%s new objects cached, cache size: %s', nNewObjects, cacheSize)
                         break
-                    # If we did not get any new objects, wait on event
                     if not nNewObjects2:
-                        self.dataCollector.waitOnFirstProducerQueue(self.THREAD_EVENT_TIMEOUT_IN_SECONDS)
                         break
-            else:
-                self.dataCollector.waitOnEvent(self.THREAD_EVENT_TIMEOUT_IN_SECONDS)
+                if cacheSize >= self.dataCollector.collectorCacheSize:
+                    # Process cache without waiting
+                    continue
+            # Wait for new objects from any producer
+            self.dataCollector.waitForNewObjects(self.getWaitTime())
         # Finish up
         if self.dataCollector.monitorQueueSize >= 0:
             nNewObjects = 0
@@ -130,7 +141,7 @@ class ProcessingThread(threading.Thread):
         cacheSize = self.dataCollector.nObjectsCached
         self.logger.debug('Processing all remaining %s cached objects', cacheSize)
         while True:
-            nObjects = self.processObjects()
+            nObjects = self.processObjects(skipGaps=True)
             if not nObjects:
                 break
         # Wait after processing so that any clients can pick up
@@ -177,11 +188,12 @@ class DataCollector:
             'nErrors' : pva.UINT,
             'errorRate' : pva.DOUBLE,
             'nMissed' : pva.UINT,
-            'missedRate' : pva.DOUBLE
+            'missedRate' : pva.DOUBLE,
+            **DataProcessingController.getHistogramStatsPvaTypes()
         }
     }
 
-    def __init__(self, collectorId, inputChannel, producerIdList=[1], idFormatSpec=None, objectIdField='uniqueId', objectIdOffset=1, fieldRequest='', serverQueueSize=0, monitorQueueSize=-1, collectorCacheSize=-1, metadataChannels=None, processingController=None):
+    def __init__(self, collectorId, inputChannel, producerIdList=[1], idFormatSpec=None, objectIdField='uniqueId', objectIdOffset=1, fieldRequest='', serverQueueSize=0, monitorQueueSize=-1, collectorCacheSize=-1, collectorLatenessTimeout=5.0, metadataChannels=None, processingController=None):
         self.logger = LoggingManager.getLogger(f'collector-{collectorId}')
         self.eventLock = threading.Lock()
         self.event = threading.Event()
@@ -204,8 +216,11 @@ class DataCollector:
         self.logger.debug('Collector cache size is set to %s', self.collectorCacheSize)
         self.monitorQueueSize = self.getClientQueueSize(monitorQueueSize)
         self.logger.debug('Client queue size is set to %s', self.monitorQueueSize)
+        self.collectorLatenessTimeout = collectorLatenessTimeout
+        self.logger.debug('Collector lateness timeout is set to %s', self.collectorLatenessTimeout)
         self.cacheLock = threading.Lock()
-        self.collectorCacheMap = {}
+        self.reorderBuffer = ReorderBuffer(self.getReorderBufferCapacity(), objectIdOffset, collectorLatenessTimeout, producerIdList)
+        self.logger.debug('Reorder buffer capacity is set to %s', self.reorderBuffer.capacity)
         self.nObjectsCached = 0
 
         # Producer channels
@@ -227,15 +242,13 @@ class DataCollector:
             self.processingController.userDataProcessor.metadataQueueMap = self.metadataQueueMap
 
         self.processingThread = ProcessingThread(f'ProcessingThread-{self.collectorId}', self)
+        # Producer queues wake up processing thread directly on put
+        self.producerQueueList = []
+        if self.monitorQueueSize >= 0:
+            self.producerQueueList = [producerChannel.pvObjectQueue for producerChannel in self.producerChannelMap.values()]
         self.startTime = None
         self.endTime = None
-        self.minCachedObjectId = None
-        self.cacheUpdateTime = time.time()
-        self.lastObjectId = None
-
-        self.nRejected = 0
         self.nCollected = 0
-        self.nMissed = 0
 
         # If first object is ignored, stats will be adjusted
         self.nReceivedOffset = 0
@@ -254,6 +267,10 @@ class DataCollector:
             return collectorCacheSize
         return minCollectorCacheSize
 
+    def getReorderBufferCapacity(self):
+        # Allow for gaps in object ids between the cached objects
+        return self.collectorCacheSize*self.CACHE_SIZE_SCALING_FACTOR
+
     def getClientQueueSize(self, monitorQueueSize):
         if monitorQueueSize <= 0:
             # Either client queue is not used, or it is set to infinity
@@ -270,6 +287,17 @@ class DataCollector:
                 collectorCacheSize = int(configDict.get('collectorCacheSize'))
                 self.collectorCacheSize = self.getCollectorCacheSize(collectorCacheSize)
                 self.logger.debug('Collector cache size is set to %s', self.collectorCacheSize)
+                with self.cacheLock:
+                    self.reorderBuffer.setCapacity(self.getReorderBufferCapacity())
+            if 'collectorLatenessTimeout' in configDict:
+                self.collectorLatenessTimeout = float(configDict.get('collectorLatenessTimeout'))
+                self.reorderBuffer.latenessTimeout = self.collectorLatenessTimeout
+                self.logger.debug('Collector lateness timeout is set to %s', self.collectorLatenessTimeout)
+            if 'objectIdOffset' in configDict:
+                self.objectIdOffset = int(configDict.get('objectIdOffset'))
+                with self.cacheLock:
+                    self.reorderBuffer.objectIdOffset = self.objectIdOffset
+                self.logger.debug('Collector object id offset is set to %s', self.objectIdOffset)
             for producerChannel in self.producerChannelMap.values():
                 producerChannel.configure(configDict)
         if self.processingController:
@@ -279,11 +307,6 @@ class DataCollector:
         if self.processingController:
             self.processingController.process(pv)
 
-    def waitOnFirstProducerQueue(self, waitTime):
-        producerId = self.producerIdList[0]
-        producerChannel = self.producerChannelMap[producerId]
-        producerChannel.waitOnQueue(waitTime)
-
     def pushObjectsToCacheFromProducerQueues(self):
         nNewObjects = 0
         for producerChannel in self.producerChannelMap.values():
@@ -293,75 +316,36 @@ class DataCollector:
 
     def addObjectToCache(self, producerId, objectId, pvObject):
         with self.cacheLock:
-            if self.minCachedObjectId is None:
-                self.minCachedObjectId = objectId
-            if self.lastObjectId is not None and objectId <= self.lastObjectId:
-                if self.collectorCacheMap:
-                    self.nRejected += 1
-                    self.logger.debug('Rejecting object id %s from producer %s (last processed object id: %s; total number of rejected objects: %s)', objectId, producerId, self.lastObjectId, self.nRejected)
-                    return
-                self.logger.debug('Object id %s from producer %s is smaller than the last processed object id %s, resetting cache)', objectId, producerId, self.lastObjectId)
-                self.lastObjectId = None
-
-            # Keep lists of objects in the cache, in case
-            # producers generate objects with same IDs; the example is
-            # splitting image into tiles and processing tiles with multiple
-            # producers which retain original image ID
-            pvObjectList = self.collectorCacheMap.get(objectId, [])
-            pvObjectList.append(pvObject)
-            self.collectorCacheMap[objectId] = pvObjectList
-            self.nObjectsCached += 1
-            if objectId < self.minCachedObjectId:
-                self.minCachedObjectId = objectId
-            self.cacheUpdateTime = time.time()
+            if not self.reorderBuffer.add(producerId, objectId, pvObject):
+                self.logger.debug('Rejecting object id %s from producer %s (last processed object id: %s; total number of rejected objects: %s)', objectId, producerId, self.reorderBuffer.lastObjectId, self.reorderBuffer.nRejected)
+                return
+            self.nObjectsCached = len(self.reorderBuffer)
             self.setEvent()
 
-    def getObjectsFromCache(self):
+    def getObjectsFromCache(self, skipGaps=False):
         with self.cacheLock:
             # Get as many sequential objects as possible
-            objectTuples = []
-            if not self.collectorCacheMap:
-                return objectTuples
-            nMissed = 0
-            if self.lastObjectId is not None:
-                nMissed = self.minCachedObjectId-self.lastObjectId-self.objectIdOffset
-                if nMissed > 0:
-                    self.logger.debug('Missed %s objects since last retrieval from cache; total number of missed objects: %s', nMissed, self.nMissed)
-                    self.nMissed += nMissed
-            objectId = self.minCachedObjectId
-            objectTuples = []
-            while True:
-                if objectId in self.collectorCacheMap:
-                    newObjectTuples = list(map(lambda o: (objectId, o), self.collectorCacheMap.get(objectId, [])))
-                    objectTuples += newObjectTuples
-                    self.nObjectsCached -= len(newObjectTuples)
-                    del self.collectorCacheMap[objectId]
-                    self.lastObjectId = objectId
-                    objectId += 1
-                else:
-                    break
+            objectTuples = self.reorderBuffer.release(skipGaps)
+            self.nObjectsCached = len(self.reorderBuffer)
             nCollected = len(objectTuples)
-            self.minCachedObjectId = None
-            if len(self.collectorCacheMap):
-                self.minCachedObjectId = min(self.collectorCacheMap)
             self.nCollected += nCollected
             self.logger.debug('Found %s objects ready for processing, remaining cache size is %s', nCollected, self.nObjectsCached)
-            self.cacheUpdateTime = time.time()
             return objectTuples
 
     def resetStats(self):
         for producerChannel in self.producerChannelMap.values():
             producerChannel.resetStats()
-        self.nRejected = 0
+        with self.cacheLock:
+            self.reorderBuffer.resetStats()
         self.nCollected = 0
-        self.nMissed = 0
-        self.lastObjectId = None
 
     def getCollectorStats(self, receivingTime):
+        nRejected = self.reorderBuffer.nRejected
+        nMissed = self.reorderBuffer.nMissed
         collectorStats = {
             'nCollected' : self.nCollected, 
-            'nRejected' : self.nRejected,
-            'nMissed' : self.nMissed,
+            'nRejected' : nRejected,
+            'nMissed' : nMissed,
             'nCached' : self.nObjectsCached
         }
         collectedRate = 0
@@ -369,8 +353,8 @@ class DataCollector:
         missedRate = 0
         if receivingTime > 0:
             collectedRate = self.nCollected/receivingTime
-            rejectedRate = self.nRejected/receivingTime
-            missedRate = self.nMissed/receivingTime
+            rejectedRate = nRejected/receivingTime
+            missedRate = nMissed/receivingTime
         collectorStats['collectedRate'] = FloatWithUnits(collectedRate, 'Hz')
         collectorStats['rejectedRate'] = FloatWithUnits(rejectedRate, 'Hz')
         collectorStats['missedRate'] = FloatWithUnits(missedRate, 'Hz')
@@ -416,10 +400,12 @@ class DataCollector:
         for metadataChannel in self.metadataChannelMap.values():
             metadataChannel.stop()
         self.processingThread.stop()
+        for producerChannel in self.producerChannelMap.values():
+            producerChannel.cancelWaitOnQueue()
         self.processingThread.join(ProcessingThread.THREAD_EVENT_TIMEOUT_IN_SECONDS)
         if self.processingController:
             self.processingController.stop()
-        self.logger.debug('Collected objects %s; missed objects: %s; rejected objects: %s', self.nCollected, self.nMissed, self.nRejected)
+        self.logger.debug('Collected objects %s; missed objects: %s; rejected objects: %s', self.nCollected, self.reorderBuffer.nMissed, self.reorderBuffer.nRejected)
 
     def setEvent(self):
         with self.eventLock:
@@ -431,3 +417,9 @@ class DataCollector:
 
     def waitOnEvent(self, timeout=None):
         self.event.wait(timeout)
+
+    def waitForNewObjects(self, timeout):
+        if self.producerQueueList:
+            return pva.PvObjectQueue.waitForPutAny(self.producerQueueList, timeout)
+        # Monitor callbacks set the event
+        return self.event.wait(timeout)
@@ -4,9 +4,13 @@
 Data consumer module.
 '''
 
+import os
+import socket
+import threading
 import time
 import pvaccess as pva
 from .metadataChannelFactory import MetadataChannelFactory
+from .dataProcessingController import DataProcessingController
 from ..utility.loggingManager import LoggingManager
 from ..utility.floatWithUnits import FloatWithUnits
 
@@ -15,6 +19,10 @@ class DataConsumer:
 
     PROVIDER_TYPE_MAP = { 'pva' : pva.PVA, 'ca' : pva.CA }
 
+    # In the credit update mode, credit for processed updates is
+    # returned at least this often (in seconds)
+    CREDIT_RETURN_PERIOD = 0.1
+
     STATUS_TYPE_DICT = {
         'consumerId' : pva.UINT,
         'inputChannel' : pva.STRING,
@@ -31,7 +39,9 @@ class DataConsumer:
             'nReceived' : pva.UINT,
             'nRejected' : pva.UINT,
             'nDelivered' : pva.UINT,
-            'nQueued' : pva.UINT
+            'nQueued' : pva.UINT,
+            'nDropped' : pva.UINT,
+            'nConflated' : pva.UINT
         },
         'processorStats' : {
             'runtime' : pva.DOUBLE,
@@ -47,11 +57,12 @@ class DataConsumer:
             'nErrors' : pva.UINT,
             'errorRate' : pva.DOUBLE,
             'nMissed' : pva.UINT,
-            'missedRate' : pva.DOUBLE
+            'missedRate' : pva.DOUBLE,
+            **DataProcessingController.getHistogramStatsPvaTypes()
         }
     }
 
-    def __init__(self, consumerId, inputChannel, providerType=pva.PVA, objectIdField='uniqueId', fieldRequest='', serverQueueSize=-1, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=-1, distributorPluginName='pydistributor', distributorGroupId=None, distributorSetId=None, distributorTriggerFieldName=None, distributorUpdates=None, distributorUpdateMode=None, metadataChannels=None, processingController=None):
+    def __init__(self, consumerId, inputChannel, providerType=pva.PVA, objectIdField='uniqueId', fieldRequest='', serverQueueSize=-1, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=-1, distributorPluginName='pydistributor', distributorGroupId=None, distributorSetId=None, distributorTriggerFieldName=None, distributorUpdates=None, distributorUpdateMode=None, distributorCredits=None, distributorKeyFieldName=None, metadataChannels=None, processingController=None):
         self.logger = LoggingManager.getLogger(f'consumer-{consumerId}')
         self.consumerId = consumerId
         providerType = self.PROVIDER_TYPE_MAP.get(providerType.lower(), pva.PVA)
@@ -66,6 +77,26 @@ class DataConsumer:
         self.distributorTriggerFieldName = distributorTriggerFieldName
         self.distributorUpdates = distributorUpdates
         self.distributorUpdateMode = distributorUpdateMode
+        self.distributorCredits = distributorCredits
+        self.distributorKeyFieldName = distributorKeyFieldName
+        # Identifies this consumer to the distributor, which needs to
+        # be unique within distributor set
+        self.distributorConsumerId = f'{socket.gethostname()}-{os.getpid()}-{consumerId}'
+        self.returningCredits = (distributorUpdateMode == 'credit')
+        self.creditChannel = None
+        self.creditLock = threading.Lock()
+        self.creditEvent = threading.Event()
+        self.nPendingCredits = 0
+        self.nReturnedCredits = 0
+        self.nCreditReturnErrors = 0
+        self.nDroppedUpdates = 0
+        self.nDroppedUpdatesOffset = 0
+        self.isStopped = False
+        if self.returningCredits:
+            # Credit return requests differ in number of credits,
+            # so there is no point in caching them
+            self.creditChannel = pva.Channel(inputChannel, providerType)
+            self.creditChannel.setOperationCacheSize(0)
         self.objectIdField = objectIdField
         self.fieldRequest = fieldRequest
         self.pvObjectQueue = None
@@ -115,6 +146,11 @@ class DataConsumer:
             distributorStr += f'updates:{self.distributorUpdates};'
         if self.distributorUpdateMode:
             distributorStr += f'mode:{self.distributorUpdateMode};'
+            if self.distributorUpdateMode == 'credit':
+                distributorStr += f'credits:{self.getDistributorCredits()};'
+                distributorStr += f'consumer:{self.distributorConsumerId};'
+            elif self.distributorUpdateMode == 'hash' and self.distributorKeyFieldName:
+                distributorStr += f'key:{self.distributorKeyFieldName};'
 
         fieldRequest = ''
         if self.fieldRequest:
@@ -130,6 +166,29 @@ class DataConsumer:
             request = f'{recordStr}field({distributorStr})'
         return request
 
+    def getDistributorCreditRequest(self, nCredits):
+        # Returning credit does not create a new distributor client;
+        # request is attached to object id field only, so that reply does
+        # not contain record data, but the number of updates distributor
+        # dropped because no consumer in the set had credit
+        distributorStr = f'{self.distributorPluginName}='
+        if self.distributorGroupId:
+            distributorStr += f'group:{self.distributorGroupId};'
+        if self.distributorSetId:
+            distributorStr += f'set:{self.distributorSetId};'
+        distributorStr += f'consumer:{self.distributorConsumerId};ack:{nCredits}'
+        return f'field({self.objectIdField}[{distributorStr}])'
+
+    def getDistributorCredits(self):
+        # Advertise available slots to the distributor
+        if self.distributorCredits:
+            return int(self.distributorCredits)
+        if self.monitorQueueSize > 0:
+            return self.monitorQueueSize
+        if self.serverQueueSize > 0:
+            return self.serverQueueSize
+        return 1
+
     def configure(self, configDict):
         if isinstance(configDict, dict):
             if 'monitorQueueSize' in configDict:
@@ -144,6 +203,37 @@ class DataConsumer:
     def process(self, pv):
         if self.processingController:
             self.processingController.process(pv)
+        if self.returningCredits:
+            # Queue slot used by this update is free again
+            with self.creditLock:
+                self.nPendingCredits += 1
+                if self.nPendingCredits >= self.getCreditReturnBatchSize():
+                    self.creditEvent.set()
+
+    def getCreditReturnBatchSize(self):
+        return max(self.getDistributorCredits()//2, 1)
+
+    def returnCredits(self):
+        with self.creditLock:
+            nCredits = self.nPendingCredits
+            self.nPendingCredits = 0
+            self.creditEvent.clear()
+        if not nCredits:
+            return
+        try:
+            pv = self.creditChannel.get(self.getDistributorCreditRequest(nCredits))
+            self.nReturnedCredits += nCredits
+            self.nDroppedUpdates = pv[self.objectIdField]
+        except Exception as ex:
+            self.nCreditReturnErrors += 1
+            self.logger.warning('Could not return %s credits to distributor: %s', nCredits, ex)
+
+    def creditReturner(self):
+        self.logger.debug('Starting distributor credit thread')
+        while not self.isStopped:
+            self.creditEvent.wait(self.CREDIT_RETURN_PERIOD)
+            self.returnCredits()
+        self.logger.debug('Distributor credit thread is exiting')
 
     # Return true if object was processed, False otherwise
     def processFromQueue(self, waitTime):
@@ -157,6 +247,11 @@ class DataConsumer:
                 if self.accumulationTimeout > timeSinceLastPut:
                     self.logger.debug('Accumulation timeout did not occur yet (last put was %s seconds ago', timeSinceLastPut)
                     return False
+            # Drain accumulated objects in a single queue operation
+            pvObjectList = self.pvObjectQueue.getMany(self.accumulateObjects, waitTime)
+            for pvObject in pvObjectList:
+                self.process(pvObject)
+            return len(pvObjectList) > 0
         try:
             pvObject = self.pvObjectQueue.get(waitTime)
             self.process(pvObject)
@@ -167,6 +262,10 @@ class DataConsumer:
         return False
 
     def resetStats(self):
+        self.nReturnedCredits = 0
+        self.nCreditReturnErrors = 0
+        # Distributor counter cannot be reset remotely
+        self.nDroppedUpdatesOffset = self.nDroppedUpdates
         self.channel.resetMonitorCounters()
         if self.pvObjectQueue is not None:
             self.pvObjectQueue.resetCounters()
@@ -210,13 +309,30 @@ class DataConsumer:
         for metadataChannelId,metadataChannel in self.metadataChannelMap.items():
             metadataStats[f'metadata-{metadataChannelId}'] = metadataChannel.getStats(receivingTime)
 
-        return {'inputChannel' : self.inputChannel, 'monitorStats' : monitorStats, 'queueStats' : queueStats, 'metadataStats' : metadataStats, 'processorStats' : processorStats, 'userStats' : userStats}
+        statsDict = {'inputChannel' : self.inputChannel, 'monitorStats' : monitorStats, 'queueStats' : queueStats, 'metadataStats' : metadataStats, 'processorStats' : processorStats, 'userStats' : userStats}
+        if self.distributorUpdateMode:
+            statsDict['distributorStats'] = self.getDistributorStats()
+        return statsDict
+
+    def getDistributorStats(self):
+        distributorStats = {}
+        if self.returningCredits:
+            distributorStats['nReturnedCredits'] = self.nReturnedCredits
+            distributorStats['nPendingCredits'] = self.nPendingCredits
+            distributorStats['nCreditReturnErrors'] = self.nCreditReturnErrors
+            # Updates dropped by the distributor for the whole set, as
+            # reported with the last credit return
+            distributorStats['nDroppedUpdates'] = max(self.nDroppedUpdates-self.nDroppedUpdatesOffset, 0)
+        return distributorStats
 
     def getConsumerId(self):
         return self.consumerId
 
     def start(self):
         self.startTime = time.time()
+        self.isStopped = False
+        if self.returningCredits:
+            threading.Thread(target=self.creditReturner, daemon=True).start()
         request = self.getPvMonitorRequest()
         self.logger.debug('Using request string: %s', request)
         if self.pvObjectQueue is not None:
@@ -232,6 +348,8 @@ class DataConsumer:
 
     def stop(self):
         self.endTime = time.time()
+        self.isStopped = True
+        self.creditEvent.set()
         self.channel.stopMonitor()
         for metadataChannel in self.metadataChannelMap.values():
             metadataChannel.stop()
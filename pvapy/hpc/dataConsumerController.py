@@ -17,7 +17,7 @@ class DataConsumerController(SystemController):
     '''
     Controller class for a single data consumer.
 
-    **DataConsumerController(inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, nDistributorSets=1, metadataChannels=None)**
+    **DataConsumerController(inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, distributorMode=None, distributorCredits=None, distributorKey=None, nDistributorSets=1, metadataChannels=None)**
 
     :Parameter: *inputChannel* (str) - Input PV channel name. The "*" character will be replaced with <consumerId> formatted using <idFormatSpec> specification.
     :Parameter: *outputChannel* (str) - Output PVA channel name (default: None). If specified, this channel can be used for publishing processing results. The value of "_" indicates that the output channel name will be set to "pvapy:consumer:<consumerId>:output", while the "*" character will be replaced with <consumerId> formatted using <idFormatSpec> specification.
@@ -48,10 +48,13 @@ class DataConsumerController(SystemController):
     :Parameter: *distributorSet* (str) - Distributor client set that application belongs to within its group (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. Note that all clients belonging to the same set receive the same PV updates. If set id is not specified (i.e., if a group does not have multiple sets of clients), a PV update will be distributed to only one client.
     :Parameter: *distributorTrigger* (str) - PV structure field that data distributor uses to distinguish different channel updates (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. In case of, for example, area detector applications, the "uniqueId" field would be a good choice for distinguishing between the different frames.
     :Parameter: *distributorUpdates* (int) - Number of sequential PV channel updates that a client (or a set of clients) will receive (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients.
+    :Parameter: *distributorMode* (str) - Distributor update mode (default: None). Allowed values are "one" (update goes to one client per set), "all" (update goes to all clients in a set), "credit" (update goes to one client per set, selected according to the number of slots that clients advertise via credits), and "hash" (update goes to one client per set, selected by hashing the value of the distributor key field, so that all updates with the same key go to the same client). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. Note that in the credit and hash modes consumers do not receive updates in a predetermined sequence, and hence the number of missed PV updates reported by individual consumers is not accurate.
+    :Parameter: *distributorCredits* (int) - Number of slots consumer advertises to the data distributor in the credit update mode (default: None). If not specified, monitor (client) queue size will be used if it is greater than zero, and server queue size otherwise. This parameter is ignored unless the credit update mode is used. Consumers return credit to the distributor as they process received updates, so at most this many updates are outstanding at any given time.
+    :Parameter: *distributorKey* (str) - PV structure field whose value data distributor hashes in the hash update mode (default: None). If not specified, distributor trigger field will be used. All updates with the same key field value (e.g., all tiles of a frame) are delivered to the same consumer. This parameter is ignored unless the hash update mode is used.
     :Parameter: *nDistributorSets* (int) - Number of distributor client sets (default: 1). This setting is used to determine appropriate value for the processor object id offset in case where multiple instances of this command are running separately for different client sets. If distributor client set is not specified, this setting is ignored.
     :Parameter: *metadataChannels* (str) - Comma-separated list of metadata channels specified in the form "protocol:\\<channelName>", where protocol can be either "ca" or "pva". If channel name is specified without a protocol, "ca" is assumed.
     '''
-    def __init__(self, inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, consumerIdList=None, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, nDistributorSets=1, metadataChannels=None):
+    def __init__(self, inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, consumerIdList=None, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, distributorMode=None, distributorCredits=None, distributorKey=None, nDistributorSets=1, metadataChannels=None):
 
         SystemController.__init__(self, inputChannel, outputChannel=outputChannel, statusChannel=statusChannel, controlChannel=controlChannel, idFormatSpec=idFormatSpec, processorFile=processorFile, processorClass=processorClass, processorArgs=processorArgs, objectIdField=objectIdField, objectIdOffset=objectIdOffset, fieldRequest=fieldRequest, skipInitialUpdates=skipInitialUpdates, reportStatsList=reportStatsList, logLevel=logLevel, logFile=logFile, disableCurses=disableCurses)
         self.consumerId = consumerId
@@ -71,6 +74,9 @@ class DataConsumerController(SystemController):
         self.distributorSet = distributorSet
         self.distributorTrigger = distributorTrigger
         self.distributorUpdates = distributorUpdates
+        self.distributorMode = distributorMode
+        self.distributorCredits = distributorCredits
+        self.distributorKey = distributorKey
         self.nDistributorSets = nDistributorSets
         self.metadataChannels = metadataChannels
 
@@ -138,7 +144,7 @@ class DataConsumerController(SystemController):
         # Share PVA server
         self.processingController.pvaServer = self.pvaServer
 
-        self.dataConsumer = DataConsumer(consumerId, self.inputChannel, providerType=self.inputProviderType, objectIdField=self.objectIdField, fieldRequest=self.fieldRequest, serverQueueSize=self.serverQueueSize, monitorQueueSize=self.monitorQueueSize, accumulateObjects=self.accumulateObjects, accumulationTimeout=self.accumulationTimeout, distributorPluginName=self.distributorPluginName, distributorGroupId=self.distributorGroup, distributorSetId=self.distributorSet, distributorTriggerFieldName=self.distributorTrigger, distributorUpdates=self.distributorUpdates, distributorUpdateMode=None, metadataChannels=self.metadataChannels, processingController=self.processingController)
+        self.dataConsumer = DataConsumer(consumerId, self.inputChannel, providerType=self.inputProviderType, objectIdField=self.objectIdField, fieldRequest=self.fieldRequest, serverQueueSize=self.serverQueueSize, monitorQueueSize=self.monitorQueueSize, accumulateObjects=self.accumulateObjects, accumulationTimeout=self.accumulationTimeout, distributorPluginName=self.distributorPluginName, distributorGroupId=self.distributorGroup, distributorSetId=self.distributorSet, distributorTriggerFieldName=self.distributorTrigger, distributorUpdates=self.distributorUpdates, distributorUpdateMode=self.distributorMode, distributorCredits=self.distributorCredits, distributorKeyFieldName=self.distributorKey, metadataChannels=self.metadataChannels, processingController=self.processingController)
 
         # References used in the base class
         self.hpcObject = self.dataConsumer
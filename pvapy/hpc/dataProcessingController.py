@@ -7,10 +7,16 @@ import time
 import pvaccess as pva
 from ..utility.loggingManager import LoggingManager
 from ..utility.floatWithUnits import FloatWithUnits
+from ..utility.latencyHistogram import LatencyHistogram
 
 class DataProcessingController:
     ''' Data processor controller class. '''
 
+    # Latency is measured from the object time stamp to the processing start
+    TIMESTAMP_FIELD = 'timeStamp'
+    LATENCY_STATS_PREFIX = 'latency'
+    PROCESSING_TIME_STATS_PREFIX = 'processingTime'
+
     def __init__(self, configDict={}, userDataProcessor=None):
         self.configDict = configDict
 
@@ -38,6 +44,8 @@ class DataProcessingController:
         self.outputRecordAdded = False
         self.pvaServerStarted = False
         self.pvaServer = None
+        # Determined from the first object
+        self.hasTimeStamp = None
 
         # Defines all counters and sets them to zero
         self.resetStats()
@@ -101,6 +109,18 @@ class DataProcessingController:
         if self.userDataProcessor:
             self.userDataProcessor.configure(configDict)
 
+    def recordLatency(self, pvObject, now):
+        if self.hasTimeStamp is None:
+            self.hasTimeStamp = pvObject.hasField(self.TIMESTAMP_FIELD)
+        if not self.hasTimeStamp:
+            return
+        secondsPastEpoch = pvObject[f'{self.TIMESTAMP_FIELD}.secondsPastEpoch']
+        if secondsPastEpoch <= 0:
+            # Time stamp was not set
+            return
+        objectTime = secondsPastEpoch + pvObject[f'{self.TIMESTAMP_FIELD}.nanoseconds']*1e-9
+        self.latencyHistogram.record(now-objectTime)
+
     def process(self, pvObject):
         now = time.time()
         objectId = pvObject[self.objectIdField]
@@ -166,10 +186,13 @@ class DataProcessingController:
         self.lastObjectId = objectId
         self.lastObjectTime = now
         self.statsNeedsUpdate = True
+        self.recordLatency(pvObject, now)
         try:
             # Call user interface method for processing
             if self.userDataProcessor:
+                t0 = time.time()
                 pvObject2 = self.userDataProcessor.process(pvObject)
+                self.processingTimeHistogram.record(time.time()-t0)
             else:
                 pvObject2 = pvObject
             self.nProcessed += 1
@@ -190,6 +213,8 @@ class DataProcessingController:
         self.lastObjectTime = 0
         self.endTime = 0
         self.processorStats = {}
+        self.latencyHistogram = LatencyHistogram()
+        self.processingTimeHistogram = LatencyHistogram()
         self.statsNeedsUpdate = True
         # Call user interface method for resetting stats
         if self.userDataProcessor:
@@ -207,6 +232,24 @@ class DataProcessingController:
             return self.userDataProcessor.getStatsPvaTypes()
         return {}
 
+    def getHistograms(self):
+        # Histograms are copied, so they can be safely passed to other
+        # threads and processes
+        return {self.LATENCY_STATS_PREFIX : self.latencyHistogram.copy(), self.PROCESSING_TIME_STATS_PREFIX : self.processingTimeHistogram.copy()}
+
+    @classmethod
+    def getHistogramStatsPvaTypes(cls):
+        # Histogram stats keys are determined by the histogram class
+        return {key : pva.DOUBLE for prefix in [cls.LATENCY_STATS_PREFIX, cls.PROCESSING_TIME_STATS_PREFIX] for key in LatencyHistogram.getStatsKeys(prefix)}
+
+    @classmethod
+    def getHistogramStats(cls, histogramDict):
+        histogramStats = {}
+        for prefix,histogram in histogramDict.items():
+            for key,value in histogram.getStats(prefix).items():
+                histogramStats[key] = FloatWithUnits(value, 's', precision=6)
+        return histogramStats
+
     def getProcessorStats(self):
         if self.statsNeedsUpdate:
             self.processorStats = self.updateStats()
@@ -244,6 +287,7 @@ class DataProcessingController:
             'nErrors' : self.nErrors,
             'errorRate' : FloatWithUnits(errorRate, 'Hz')
         }
+        processorStats.update(self.getHistogramStats({self.LATENCY_STATS_PREFIX : self.latencyHistogram, self.PROCESSING_TIME_STATS_PREFIX : self.processingTimeHistogram}))
         return processorStats
 
     def updateOutputChannel(self, pvObject):
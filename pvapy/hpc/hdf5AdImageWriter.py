@@ -6,10 +6,18 @@ HDF5 AD Image Writer module.
 
 import os
 import stat
+import struct
 import time
 import h5py
+# HDF5 compression filters are optional
+try:
+    import hdf5plugin
+except ImportError:
+    pass
 import pvaccess as pva
 from .adImageProcessor import AdImageProcessor
+from ..utility.adImageUtility import AdImageUtility
+from ..utility.adImageDecompressor import AdImageDecompressor
 from ..utility.floatWithUnits import FloatWithUnits
 from ..utility.intWithUnits import IntWithUnits
 
@@ -22,6 +30,7 @@ class Hdf5AdImageWriter(AdImageProcessor):
     \t\\- outputFileNameFormat (str) : defines format to be used for naming output files, e.g. '{outputFileId:06}.{processorId}.hdf'\n
     \t\\- nImagesPerFile (int)       : number of images per output file'\n
     \t\\- datasetName (str)          : name of the dataset under which images will be saved'\n
+    \t\\- writeCompressedChunks (bool) : if True, compressed images (blosc, lz4 or bslz4 codec) will be written into the dataset created with the matching HDF5 filter without decompressing them; this works for mono and RGB1 images only, and requires HDF5 filter plugins (e.g., hdf5plugin package) for reading output files; changes of this setting take effect with the next output file'\n
 
     **Hdf5AdImageWriter(configDict)**
 
@@ -34,6 +43,18 @@ class Hdf5AdImageWriter(AdImageProcessor):
     DEFAULT_N_IMAGES_PER_FILE = 1000
     DEFAULT_DATASET_NAME = 'images'
 
+    # HDF5 filter ids and filter options for NDCodec compressors
+    HDF5_FILTER_MAP = {
+        'blosc' : (32001, None),
+        'lz4' : (32004, (0,)),
+        'bslz4' : (32008, (0, 2))
+    }
+
+    # Bitshuffle default block size parameters
+    BSHUF_TARGET_BLOCK_SIZE = 8192
+    BSHUF_BLOCKED_MULT = 8
+    BSHUF_MIN_RECOMMEND_BLOCK = 128
+
     def __init__(self, configDict={}):
         AdImageProcessor.__init__(self,configDict)
         self.outputDirectory = configDict.get('outputDirectory', self.DEFAULT_OUTPUT_DIRECTORY)
@@ -47,6 +68,9 @@ class Hdf5AdImageWriter(AdImageProcessor):
         self.logger.debug('Number of images per output file: %s', self.nImagesPerFile)
         self.datasetName = configDict.get('datasetName', self.DEFAULT_DATASET_NAME)
         self.logger.debug('Dataset name: %s', self.datasetName)
+        self.writeCompressedChunks = configDict.get('writeCompressedChunks', False)
+        self.logger.debug('Write compressed chunks: %s', self.writeCompressedChunks)
+        self.codecDecompressor = AdImageDecompressor()
 
         self.nDatasetImages = 0
         self.outputFileId = 0
@@ -55,6 +79,7 @@ class Hdf5AdImageWriter(AdImageProcessor):
         self.filePath = ''
         self.h5File = None
         self.h5Dataset = None
+        self.datasetCodecName = ''
         self.lastFileProcessedTime = 0
         self.lastFrameProcessedTime = 0
         self.fileProcessingTime = 0
@@ -71,7 +96,7 @@ class Hdf5AdImageWriter(AdImageProcessor):
         '''
         Method invoked at user initiated runtime configuration changes. It
         looks for 'outputDirectory', 'outputFileNameFormat',
-        'nImagesPerFile' and 'datasetName' keys in the configuration
+        'nImagesPerFile', 'datasetName' and 'writeCompressedChunks' keys in the configuration
         dictionary and reconfigures processor behavior according
         to the specified values.
 
@@ -93,6 +118,9 @@ class Hdf5AdImageWriter(AdImageProcessor):
         if 'datasetName' in configDict:
             self.datasetName = configDict.get('datasetName')
             self.logger.debug('Reconfigured dataset name: %s', self.datasetName)
+        if 'writeCompressedChunks' in configDict:
+            self.writeCompressedChunks = configDict.get('writeCompressedChunks')
+            self.logger.debug('Reconfigured write compressed chunks: %s', self.writeCompressedChunks)
 
     def process(self, pvObject):
         '''
@@ -103,7 +131,23 @@ class Hdf5AdImageWriter(AdImageProcessor):
         :Parameter: *pvObject* (NtNdArray) - channel monitor update object
         '''
         t0 = time.time()
-        (frameId,imageData,nx,ny,nz,_,_) = self.reshapeNtNdArray(pvObject)
+        # Writing compressed chunks is decided when the output file is
+        # opened, and cannot change until the file is closed
+        writeCompressedChunks = self.writeCompressedChunks
+        if self.nDatasetImages:
+            writeCompressedChunks = (self.datasetCodecName != '')
+        codecName = ''
+        if writeCompressedChunks:
+            codecName = self.codecDecompressor.getCodecName(pvObject)
+            if self.nDatasetImages and codecName != self.datasetCodecName:
+                # Frame is decompressed and written through the dataset filter
+                self.logger.debug('Frame codec "%s" does not match output dataset codec "%s", compressed chunk will not be written', codecName, self.datasetCodecName)
+                codecName = ''
+        if codecName:
+            (frameId,imageData,nx,ny,nz,dtype) = self.getCompressedFrame(pvObject, codecName)
+        else:
+            (frameId,imageData,nx,ny,nz,_,_) = self.reshapeNtNdArray(pvObject)
+            dtype = getattr(imageData, 'dtype', None)
         if not nx:
             self.logger.debug('Frame %s is empty', frameId)
             return pvObject
@@ -113,15 +157,25 @@ class Hdf5AdImageWriter(AdImageProcessor):
             self.filePath = self.filePath.format(frameId=frameId,uniqueId=frameId,objectId=frameId,processorId=self.processorId,outputFileId=self.outputFileId)
             self.logger.debug('Opening output file id %s (%s); it should contain %s images', self.outputFileId, self.filePath, self.nImagesPerFile)
             self.h5File = h5py.File(self.filePath,'w')
-            if not nz:
-                self.h5Dataset = self.h5File.create_dataset(self.datasetName, shape=(self.nImagesPerFile, ny, nx), dtype=imageData.dtype)
+            shape = (self.nImagesPerFile, ny, nx)
+            if nz:
+                shape = (self.nImagesPerFile, ny, nx, nz)
+            if not codecName:
+                self.h5Dataset = self.h5File.create_dataset(self.datasetName, shape=shape, dtype=dtype)
             else:
-                self.h5Dataset = self.h5File.create_dataset(self.datasetName, shape=(self.nImagesPerFile, ny, nx, nz), dtype=imageData.dtype)
+                # One chunk per frame, so that frames can be written
+                # directly into the file
+                (filterId, filterOpts) = self.HDF5_FILTER_MAP[codecName]
+                self.h5Dataset = self.h5File.create_dataset(self.datasetName, shape=shape, dtype=dtype, chunks=(1,)+shape[1:], compression=filterId, compression_opts=filterOpts)
+            self.datasetCodecName = codecName
         if not self.h5File:
             self.logger.warning('Output HDF5 file is closed')
             return pvObject
 
-        if not nz:
+        if codecName:
+            offset = (self.nDatasetImages,)+(0,)*(len(self.h5Dataset.shape)-1)
+            self.h5Dataset.id.write_direct_chunk(offset, imageData)
+        elif not nz:
             self.h5Dataset[self.nDatasetImages:self.nDatasetImages+1:,:] = imageData
         else:
             self.h5Dataset[self.nDatasetImages:self.nDatasetImages+1:,:,:] = imageData
@@ -146,6 +200,50 @@ class Hdf5AdImageWriter(AdImageProcessor):
         self.lastFrameProcessedTime = t1
         return pvObject
 
+    def getCompressedFrame(self, pvObject, codecName):
+        '''
+        Get compressed frame data in the form suitable for writing
+        directly into HDF5 dataset chunk.
+
+        :Parameter: *pvObject* (NtNdArray) - compressed image object
+        :Parameter: *codecName* (str) - codec name
+        :Returns: Tuple (frameId,chunkData,nx,ny,nz,dtype)
+        '''
+        if codecName not in self.HDF5_FILTER_MAP:
+            raise pva.InvalidArgument(f'Unsupported codec: {codecName}')
+        frameId = pvObject['uniqueId']
+        dims = pvObject['dimension']
+        colorMode = AdImageUtility.COLOR_MODE_MONO
+        for attribute in pvObject['attribute']:
+            if attribute['name'] == 'ColorMode':
+                colorMode = attribute['value'][0]['value']
+                break
+        if len(dims) == 0:
+            return (frameId,None,None,None,None,None)
+        if len(dims) == 2 and colorMode == AdImageUtility.COLOR_MODE_MONO:
+            # [NX, NY]
+            (nx,ny,nz) = (dims[0]['size'],dims[1]['size'],None)
+        elif len(dims) == 3 and colorMode == AdImageUtility.COLOR_MODE_RGB1:
+            # [3, NX, NY], stored in the same order as dataset (ny,nx,3)
+            (nx,ny,nz) = (dims[1]['size'],dims[2]['size'],dims[0]['size'])
+        else:
+            raise pva.InvalidArgument(f'Cannot write compressed frame {frameId} with dimensions {dims} and color mode {colorMode} directly into dataset.')
+        dtype = self.codecDecompressor.getDataType(pvObject)
+        data = pvObject['value'][0][pvObject.getSelectedUnionFieldName()]
+        nBytes = nx*ny*(nz or 1)*dtype.itemsize
+        if codecName == 'lz4':
+            # HDF5 LZ4 filter expects uncompressed size and block size,
+            # followed by compressed blocks prefixed with their sizes;
+            # NDCodec output is a single block
+            data = struct.pack('>QII', nBytes, nBytes, len(data)) + data.tobytes()
+        elif codecName == 'bslz4':
+            # HDF5 bitshuffle filter expects uncompressed size and block
+            # size in bytes; NDCodec uses default bitshuffle block size
+            blockSize = self.BSHUF_TARGET_BLOCK_SIZE//dtype.itemsize
+            blockSize = max((blockSize//self.BSHUF_BLOCKED_MULT)*self.BSHUF_BLOCKED_MULT, self.BSHUF_MIN_RECOMMEND_BLOCK)
+            data = struct.pack('>QI', nBytes, blockSize*dtype.itemsize) + data.tobytes()
+        return (frameId,data,nx,ny,nz,dtype)
+
     def stop(self):
         self._closeOutputFile()
 
@@ -7,16 +7,19 @@ import pvaccess as pva
 import multiprocessing as mp
 from ..utility.loggingManager import LoggingManager
 from ..utility.statsUtility import StatsUtility
+from ..utility.floatWithUnits import FloatWithUnits
 from .dataConsumer import DataConsumer
 from .systemController import SystemController
 from .dataConsumerController import DataConsumerController
+from .dataProcessingController import DataProcessingController
+from ..utility.latencyHistogram import LatencyHistogram
 
 class MpDataConsumerController(SystemController):
 
     ''' 
     Controller class for a multiple data consumers.
   
-    **MpDataConsumerController(inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, nDistributorSets=1, metadataChannels=None)**
+    **MpDataConsumerController(inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, distributorMode=None, distributorCredits=None, distributorKey=None, nDistributorSets=1, metadataChannels=None)**
 
     :Parameter: *inputChannel* (str) - Input PV channel name. The "*" character will be replaced with <consumerId> formatted using <idFormatSpec> specification.
     :Parameter: *outputChannel* (str) - Output PVA channel name (default: None). If specified, this channel can be used for publishing processing results. The value of "_" indicates that the output channel name will be set to "pvapy:consumer:<consumerId>:output", while the "*" character will be replaced with <consumerId> formatted using <idFormatSpec> specification.
@@ -47,10 +50,18 @@ class MpDataConsumerController(SystemController):
     :Parameter: *distributorSet* (str) - Distributor client set that application belongs to within its group (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. Note that all clients belonging to the same set receive the same PV updates. If set id is not specified (i.e., if a group does not have multiple sets of clients), a PV update will be distributed to only one client.
     :Parameter: *distributorTrigger* (str) - PV structure field that data distributor uses to distinguish different channel updates (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. In case of, for example, area detector applications, the "uniqueId" field would be a good choice for distinguishing between the different frames.
     :Parameter: *distributorUpdates* (int) - Number of sequential PV channel updates that a client (or a set of clients) will receive (default: None). This parameter should be used only if data distributor plugin will be distributing data between multiple clients.
+    :Parameter: *distributorMode* (str) - Distributor update mode (default: None). Allowed values are "one" (update goes to one client per set), "all" (update goes to all clients in a set), "credit" (update goes to one client per set, selected according to the number of slots that clients advertise via credits), and "hash" (update goes to one client per set, selected by hashing the value of the distributor key field, so that all updates with the same key go to the same client). This parameter should be used only if data distributor plugin will be distributing data between multiple clients. Note that in the credit and hash modes consumers do not receive updates in a predetermined sequence, and hence the number of missed PV updates reported by individual consumers is not accurate.
+    :Parameter: *distributorCredits* (int) - Number of slots consumer advertises to the data distributor in the credit update mode (default: None). If not specified, monitor (client) queue size will be used if it is greater than zero, and server queue size otherwise. This parameter is ignored unless the credit update mode is used. Consumers return credit to the distributor as they process received updates, so at most this many updates are outstanding at any given time.
+    :Parameter: *distributorKey* (str) - PV structure field whose value data distributor hashes in the hash update mode (default: None). If not specified, distributor trigger field will be used. All updates with the same key field value (e.g., all tiles of a frame) are delivered to the same consumer. This parameter is ignored unless the hash update mode is used.
     :Parameter: *nDistributorSets* (int) - Number of distributor client sets (default: 1). This setting is used to determine appropriate value for the processor object id offset in case where multiple instances of this command are running separately for different client sets. If distributor client set is not specified, this setting is ignored.
     :Parameter: *metadataChannels* (str) - Comma-separated list of metadata channels specified in the form "protocol:\\<channelName>", where protocol can be either "ca" or "pva". If channel name is specified without a protocol, "ca" is assumed.
     '''
-    def __init__(self, inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, consumerIdList=None, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, nDistributorSets=1, metadataChannels=None):
+
+    # Consumer processes report their latency histograms together with
+    # stats; histograms are removed from stats before reporting
+    HISTOGRAMS_KEY = 'histograms'
+
+    def __init__(self, inputChannel, outputChannel=None, statusChannel=None, controlChannel=None, idFormatSpec=None, processorFile=None, processorClass=None, processorArgs=None, objectIdField='uniqueId', objectIdOffset=0, fieldRequest='', skipInitialUpdates=1, reportStatsList='all', logLevel=None, logFile=None, disableCurses=False, consumerId=1, nConsumers=1, consumerIdList=None, inputProviderType='pva', serverQueueSize=0, monitorQueueSize=-1, accumulateObjects=-1, accumulationTimeout=1, distributorPluginName='pydistributor', distributorGroup=None, distributorSet=None, distributorTrigger=None, distributorUpdates=None, distributorMode=None, distributorCredits=None, distributorKey=None, nDistributorSets=1, metadataChannels=None):
 
         SystemController.__init__(self, inputChannel, outputChannel=outputChannel, statusChannel=statusChannel, controlChannel=controlChannel, idFormatSpec=idFormatSpec, processorFile=processorFile, processorClass=processorClass, processorArgs=processorArgs, objectIdField=objectIdField, objectIdOffset=objectIdOffset, fieldRequest=fieldRequest, skipInitialUpdates=skipInitialUpdates, reportStatsList=reportStatsList, logLevel=logLevel, logFile=logFile, disableCurses=disableCurses)
         self.consumerId = consumerId # used as a start of the consumer id range
@@ -74,6 +85,9 @@ class MpDataConsumerController(SystemController):
         self.distributorSet = distributorSet
         self.distributorTrigger = distributorTrigger
         self.distributorUpdates = distributorUpdates
+        self.distributorMode = distributorMode
+        self.distributorCredits = distributorCredits
+        self.distributorKey = distributorKey
         self.nDistributorSets = nDistributorSets
         self.metadataChannels = metadataChannels
 
@@ -81,6 +95,7 @@ class MpDataConsumerController(SystemController):
         self.requestQueueMap = {}
         self.responseQueueMap = {}
         self.lastStatsObjectIdMap = {}
+        self.histogramsMap = {}
 
     def start(self):
         # Replace interrupt handler for worker processes
@@ -92,7 +107,7 @@ class MpDataConsumerController(SystemController):
             self.requestQueueMap[consumerId] = requestQueue
             responseQueue = mp.Queue()
             self.responseQueueMap[consumerId] = responseQueue
-            mpProcess = mp.Process(target=mpdcController, args=(requestQueue, responseQueue, self.inputChannel, self.outputChannel, self.statusChannel, self.controlChannel, self.idFormatSpec, self.processorFile, self.processorClass, self.processorArgs, self.objectIdField, self.objectIdOffset, self.fieldRequest, self.skipInitialUpdates, self.reportStatsList, self.logLevel, self.logFile, self.disableCurses, consumerId, self.nConsumers, self.inputProviderType, self.serverQueueSize, self.monitorQueueSize, self.accumulateObjects, self.accumulationTimeout, self.distributorPluginName, self.distributorGroup, self.distributorSet, self.distributorTrigger, self.distributorUpdates, self.nDistributorSets, self.metadataChannels,))
+            mpProcess = mp.Process(target=mpdcController, args=(requestQueue, responseQueue, self.inputChannel, self.outputChannel, self.statusChannel, self.controlChannel, self.idFormatSpec, self.processorFile, self.processorClass, self.processorArgs, self.objectIdField, self.objectIdOffset, self.fieldRequest, self.skipInitialUpdates, self.reportStatsList, self.logLevel, self.logFile, self.disableCurses, consumerId, self.nConsumers, self.inputProviderType, self.serverQueueSize, self.monitorQueueSize, self.accumulateObjects, self.accumulationTimeout, self.distributorPluginName, self.distributorGroup, self.distributorSet, self.distributorTrigger, self.distributorUpdates, self.distributorMode, self.distributorCredits, self.distributorKey, self.nDistributorSets, self.metadataChannels,))
             self.mpProcessMap[consumerId] = mpProcess
             self.logger.debug(f'Starting consumer {consumerId}')
             mpProcess.start()
@@ -134,6 +149,7 @@ class MpDataConsumerController(SystemController):
                 while True:
                     responseQueue = self.responseQueueMap[consumerId]
                     statsDict[consumerId] = responseQueue.get(block=True, timeout=self.WAIT_TIME)
+                    self.extractHistograms(consumerId, statsDict[consumerId])
                     statsObjectId = statsDict[consumerId].get('objectId', 0)
                     if statsObjectId != lastStatsObjectId:
                         self.lastStatsObjectIdMap[consumerId] = statsObjectId 
@@ -143,12 +159,35 @@ class MpDataConsumerController(SystemController):
             except queue.Empty:
                 self.stopScreen()
                 self.logger.error(f'No stats received from consumer {consumerId}')
+        if self.distributorMode:
+            self.addDistributionStats(statsDict)
         return statsDict
 
+    def extractHistograms(self, consumerId, consumerStatsDict):
+        histograms = consumerStatsDict.pop(self.HISTOGRAMS_KEY, None)
+        if histograms:
+            self.histogramsMap[consumerId] = histograms
+
+    def addDistributionStats(self, statsDict):
+        # Show how distributor balances updates between consumers
+        nReceivedMap = {}
+        for consumerId in self.consumerIdList:
+            monitorStats = statsDict[consumerId].get('monitorStats', {})
+            nReceivedMap[consumerId] = monitorStats.get('nReceived', 0)
+        nReceivedTotal = sum(nReceivedMap.values())
+        for consumerId,nReceived in nReceivedMap.items():
+            receivedShare = 0
+            if nReceivedTotal > 0:
+                receivedShare = 100.0*nReceived/nReceivedTotal
+            distributorStats = statsDict[consumerId].get('distributorStats', {})
+            distributorStats['dispatchedShare'] = FloatWithUnits(receivedShare, '%')
+            statsDict[consumerId]['distributorStats'] = distributorStats
+
     def getCombinedSystemStats(self, statsDict):
         combinedQueueStats = {}
         combinedMonitorStats = {}
         combinedProcessorStats = {}
+        combinedHistograms = {}
         for consumerId in self.consumerIdList:
             consumerStats = statsDict[consumerId]
             queueStats = consumerStats.get('queueStats', {})
@@ -161,8 +200,12 @@ class MpDataConsumerController(SystemController):
             maxValues = StatsUtility.maxKeyValues(processorStats, combinedProcessorStats, keys=['endTime', 'lastObjectId', 'lastObjectTime'])
             combinedProcessorStats.update(minValues)
             combinedProcessorStats.update(maxValues)
+            # Percentiles cannot be combined, merge histograms instead
+            for prefix,histogram in self.histogramsMap.get(consumerId, {}).items():
+                combinedHistograms.setdefault(prefix, LatencyHistogram()).merge(histogram)
         combinedProcessorStats['receivingTime'] = combinedProcessorStats['lastObjectTime']- combinedProcessorStats['firstObjectTime']
         combinedProcessorStats['runtime'] = combinedProcessorStats['endTime']- combinedProcessorStats['startTime']
+        combinedProcessorStats.update(DataProcessingController.getHistogramStats(combinedHistograms))
 
         return {'monitorStats' : combinedMonitorStats, 'processorStats' : combinedProcessorStats, 'queueStats' : combinedQueueStats}
 
@@ -180,6 +223,7 @@ class MpDataConsumerController(SystemController):
             try:
                 responseQueue = self.responseQueueMap[consumerId]
                 statsDict[consumerId] = responseQueue.get(block=True, timeout=self.WAIT_TIME)
+                self.extractHistograms(consumerId, statsDict[consumerId])
                 self.logger.debug(f'Received final stats for consumer {consumerId}')
             except queue.Empty:
                 self.stopScreen()
@@ -221,6 +265,7 @@ class MpdcControllerRequestProcessingThread(threading.Thread):
                         break
                     elif request == self.controller.GET_STATS_COMMAND:
                         statsDict = self.controller.getStats()
+                        statsDict[MpDataConsumerController.HISTOGRAMS_KEY] = self.controller.processingController.getHistograms()
                         try:
                             self.responseQueue.put(statsDict, block=False)
                         except Exception as ex:
@@ -247,7 +292,7 @@ def mpdcControllerInit():
     sys.stderr = stderr
     sys.stdout = stdout
     
-def mpdcController(requestQueue, responseQueue, inputChannel, outputChannel, statusChannel, controlChannel, idFormatSpec, processorFile, processorClass, processorArgs, objectIdField, objectIdOffset, fieldRequest, skipInitialUpdates, reportStatsList, logLevel, logFile, disableCurses, consumerId, nConsumers, inputProviderType, serverQueueSize, monitorQueueSize, accumulateObjects, accumulationTimeout, distributorPluginName, distributorGroup, distributorSet, distributorTrigger, distributorUpdates, nDistributorSets, metadataChannels):
+def mpdcController(requestQueue, responseQueue, inputChannel, outputChannel, statusChannel, controlChannel, idFormatSpec, processorFile, processorClass, processorArgs, objectIdField, objectIdOffset, fieldRequest, skipInitialUpdates, reportStatsList, logLevel, logFile, disableCurses, consumerId, nConsumers, inputProviderType, serverQueueSize, monitorQueueSize, accumulateObjects, accumulationTimeout, distributorPluginName, distributorGroup, distributorSet, distributorTrigger, distributorUpdates, distributorMode, distributorCredits, distributorKey, nDistributorSets, metadataChannels):
     logger = LoggingManager.getLogger(f'mpdcController-{consumerId}')
     mpdcControllerInit()
     controller = DataConsumerController(
@@ -280,6 +325,9 @@ def mpdcController(requestQueue, responseQueue, inputChannel, outputChannel, sta
         distributorSet=distributorSet,
         distributorTrigger=distributorTrigger,
         distributorUpdates=distributorUpdates,
+        distributorMode=distributorMode,
+        distributorCredits=distributorCredits,
+        distributorKey=distributorKey,
         nDistributorSets=nDistributorSets,
         metadataChannels=metadataChannels
     )
@@ -319,6 +367,7 @@ def mpdcController(requestQueue, responseQueue, inputChannel, outputChannel, sta
     try:
         logger.debug(f'Requesting final stats for consumer {consumerId}')
         statsDict = controller.getStats()
+        statsDict[MpDataConsumerController.HISTOGRAMS_KEY] = controller.processingController.getHistograms()
         logger.debug(f'Reporting final stats for consumer {consumerId}')
         responseQueue.put(statsDict, block=True, timeout=controller.WAIT_TIME)
     except Exception as ex:
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+
+'''
+Reorder buffer module.
+'''
+
+import time
+from collections import deque
+
+class ReorderBuffer:
+    '''
+    Reorder buffer used by the data collector for releasing objects received
+    from multiple producers in the object id order. Objects are kept in a
+    circular array indexed by object id modulo buffer capacity, with the
+    sliding window starting at the next object id that should be released.
+    In-order objects are released without searching the buffer. Objects at
+    the start of the window are released, and missing object ids (gaps) are
+    skipped, once all producers have delivered objects with the same or
+    larger ids (per-producer watermarks), when the window start has been
+    blocked for longer than the lateness timeout, or when the caller
+    requests it (e.g., when the cache is full).
+    Objects that do not fit into the window force the window to advance,
+    releasing the oldest objects first.
+
+    **ReorderBuffer(capacity, objectIdOffset=1, latenessTimeout=5.0, producerIdList=None)**
+
+    :Parameter: *capacity* (int) - Minimum window size; actual capacity is rounded up to the next power of 2.
+    :Parameter: *objectIdOffset* (int) - Expected difference between two sequential object ids, used for counting missed objects.
+    :Parameter: *latenessTimeout* (float) - Time in seconds after which blocked window start is released; values <= 0 disable the timeout.
+    :Parameter: *producerIdList* (list) - List of producer ids used for watermark-based release. If not given, objects are released only on timeout or on caller's request.
+    '''
+
+    def __init__(self, capacity, objectIdOffset=1, latenessTimeout=5.0, producerIdList=None):
+        self.capacity = self._getCapacity(capacity)
+        self.mask = self.capacity-1
+        self.slots = [None]*self.capacity
+        self.objectIdOffset = objectIdOffset
+        self.latenessTimeout = latenessTimeout
+        self.producerIdList = producerIdList or []
+        self.producerWatermarkMap = {}
+        self.readyQueue = deque()
+        self.headId = None
+        self.maxId = None
+        self.lastObjectId = None
+        self.blockedTime = None
+        self.nObjects = 0
+        self.nRejected = 0
+        self.nMissed = 0
+
+    @classmethod
+    def _getCapacity(cls, capacity):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        return size
+
+    def __len__(self):
+        return self.nObjects
+
+    def setCapacity(self, capacity):
+        '''
+        Changes buffer capacity, keeping all objects currently in the buffer.
+        If the buffer shrinks, objects that no longer fit into the window are
+        released first.
+
+        :Parameter: *capacity* (int) - Minimum window size
+        '''
+        capacity = self._getCapacity(capacity)
+        if capacity == self.capacity:
+            return
+        if self.headId is not None and self.maxId-self.headId >= capacity:
+            self._advanceHead(self.maxId-capacity+1)
+        slots = [None]*capacity
+        if self.headId is not None:
+            for objectId in range(self.headId, self.maxId+1):
+                slots[objectId & (capacity-1)] = self.slots[objectId & self.mask]
+        self.slots = slots
+        self.capacity = capacity
+        self.mask = capacity-1
+
+    def add(self, producerId, objectId, obj):
+        '''
+        Adds object to the buffer.
+
+        :Parameter: *producerId* (int) - Producer id
+        :Parameter: *objectId* (int) - Object id
+        :Parameter: *obj* (object) - Object
+        :Returns: True if object was accepted, False if it was rejected as late
+        '''
+        if self.lastObjectId is not None and objectId <= self.lastObjectId:
+            if self.nObjects:
+                self.nRejected += 1
+                return False
+            # Producers were most likely restarted
+            self._reset()
+
+        if self.headId is None:
+            self.headId = objectId
+            self.maxId = objectId
+        elif objectId < self.headId:
+            # Nothing was released yet, window can move back only
+            # if all cached objects still fit into it
+            if self.maxId-objectId >= self.capacity:
+                self.nRejected += 1
+                return False
+            self.headId = objectId
+        elif objectId-self.headId >= self.capacity:
+            # Window must advance before the object can be stored
+            self._advanceHead(objectId-self.capacity+1)
+
+        index = objectId & self.mask
+        objectList = self.slots[index]
+        if objectList is None:
+            # Keep lists of objects, in case producers generate objects
+            # with same ids (e.g., image tiles retaining original image id)
+            objectList = []
+            self.slots[index] = objectList
+        objectList.append(obj)
+        self.nObjects += 1
+        if objectId > self.maxId:
+            self.maxId = objectId
+        watermark = self.producerWatermarkMap.get(producerId)
+        if watermark is None or objectId > watermark:
+            self.producerWatermarkMap[producerId] = objectId
+        return True
+
+    def _reset(self):
+        self.headId = None
+        self.maxId = None
+        self.lastObjectId = None
+        self.blockedTime = None
+        self.producerWatermarkMap = {}
+
+    def _releaseHead(self):
+        index = self.headId & self.mask
+        objectList = self.slots[index]
+        self.slots[index] = None
+        if objectList is not None:
+            objectId = self.headId
+            if self.lastObjectId is not None:
+                nMissed = objectId-self.lastObjectId-self.objectIdOffset
+                if nMissed > 0:
+                    self.nMissed += nMissed
+            for obj in objectList:
+                self.readyQueue.append((objectId, obj))
+            self.nObjects -= len(objectList)
+            self.lastObjectId = objectId
+        self.headId += 1
+
+    def _advanceHead(self, newHeadId):
+        # Release everything below the new window start; at most one
+        # full pass over the slots is needed
+        while self.headId < newHeadId and self.nObjects:
+            self._releaseHead()
+        if self.headId < newHeadId:
+            self.headId = newHeadId
+
+    def _isHeadFinal(self):
+        # Producers deliver objects in order, so nothing can be added at the
+        # start of the window once every producer is past it
+        if not self.producerIdList:
+            return False
+        headId = self.headId
+        if self.slots[headId & self.mask] is None:
+            # Gap cannot be filled any more
+            headId += 1
+        for producerId in self.producerIdList:
+            watermark = self.producerWatermarkMap.get(producerId)
+            if watermark is None or watermark < headId:
+                return False
+        return True
+
+    def _skipGap(self):
+        while self.slots[self.headId & self.mask] is None:
+            self.headId += 1
+
+    def hasReadyObjects(self):
+        '''
+        Checks whether there are objects that can be released without
+        waiting for cache to fill up or for lateness timeout.
+
+        :Returns: True if objects are ready for release, False otherwise
+        '''
+        if self.readyQueue:
+            return True
+        return self.nObjects > 0 and self._isHeadFinal()
+
+    def release(self, skipGaps=False, now=None):
+        '''
+        Releases as many sequential objects as possible. Objects are released
+        while all producers are past the start of the window, or after the
+        window start has been blocked for longer than the lateness timeout.
+
+        :Parameter: *skipGaps* (bool) - If True, objects starting with the smallest cached object id will be released regardless of watermarks and lateness timeout, until the next gap
+        :Parameter: *now* (float) - Current time; if not given, time.time() will be used
+        :Returns: List of (objectId, object) tuples
+        '''
+        if skipGaps and self.nObjects:
+            self._skipGap()
+            while self.slots[self.headId & self.mask] is not None:
+                self._releaseHead()
+            self.blockedTime = None
+        while self.nObjects:
+            if self._isHeadFinal():
+                self.blockedTime = None
+            else:
+                if self.latenessTimeout <= 0:
+                    break
+                if now is None:
+                    now = time.time()
+                if self.blockedTime is None:
+                    self.blockedTime = now
+                if now-self.blockedTime < self.latenessTimeout:
+                    break
+                # Window stays blocked until its start becomes final
+                # again, so that all late objects are flushed at once
+            self._skipGap()
+            self._releaseHead()
+        objectTuples = list(self.readyQueue)
+        self.readyQueue.clear()
+        return objectTuples
+
+    def resetStats(self):
+        '''
+        Resets buffer statistics, and forgets last released object id.
+        '''
+        self.nRejected = 0
+        self.nMissed = 0
+        self.lastObjectId = None
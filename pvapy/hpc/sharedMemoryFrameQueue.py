@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+
+import os
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import pvaccess as pva
+from ..utility.loggingManager import LoggingManager
+
+class SharedMemoryFrameQueue:
+
+    '''
+    Multiprocessing queue that transfers PV objects (e.g., NTNDArray frames)
+    between processes using a shared memory ring buffer. The shared memory
+    segment is divided into a fixed number of equally sized slots. The sending
+    process serializes object into a free slot, and only a small descriptor
+    (slot index and object size) goes through the underlying multiprocessing
+    queue. The slot is returned to the sender when the receiving process
+    releases it, which limits the number of frames in flight to the number of
+    slots. Objects that are not PV objects, or do not fit into a single slot,
+    are passed through the descriptor queue directly.
+
+    This class can be used instead of multiprocessing.Queue as input data
+    queue for the UserMpWorkerController class. Shared memory segment is
+    removed when the queue is closed by the process that created it, either
+    explicitly, by using the queue as a context manager, or after all worker
+    controllers using the queue have been stopped.
+
+    **SharedMemoryFrameQueue(nSlots=16, slotSize=16777216)**
+
+    :Parameter: *nSlots* (int) - Number of shared memory slots; this is the maximum number of frames that can be queued or processed at any given time.
+    :Parameter: *slotSize* (int) - Size of a single shared memory slot in bytes; it should be large enough to hold a serialized frame.
+    '''
+
+    DEFAULT_N_SLOTS = 16
+    DEFAULT_SLOT_SIZE = 16*1024*1024
+
+    def __init__(self, nSlots=DEFAULT_N_SLOTS, slotSize=DEFAULT_SLOT_SIZE):
+        if nSlots <= 0 or slotSize <= 0:
+            raise ValueError(f'Invalid shared memory queue configuration: nSlots={nSlots}, slotSize={slotSize}')
+        self.logger = LoggingManager.getLogger(self.__class__.__name__)
+        self.nSlots = nSlots
+        self.slotSize = slotSize
+        self.sharedMemory = shared_memory.SharedMemory(create=True, size=nSlots*slotSize)
+        self.ownerPid = os.getpid()
+        self.freeSlotQueue = mp.Queue()
+        for slotId in range(0,nSlots):
+            self.freeSlotQueue.put(slotId)
+        self.descriptorQueue = mp.Queue()
+        self.nSharedMemoryPuts = 0
+        self.nDirectPuts = 0
+        self.nUsers = 0
+        self.isClosed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # Logger is not transferred to other processes
+        state = self.__dict__.copy()
+        del state['logger']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.logger = LoggingManager.getLogger(self.__class__.__name__)
+
+    def _getSlotBuffer(self, slotId, size):
+        offset = slotId*self.slotSize
+        return self.sharedMemory.buf[offset:offset+size]
+
+    def put(self, mpqObject, block=True, timeout=None):
+        '''
+        Adds object to the queue. PV objects are copied into the first
+        available shared memory slot; if no slot is available, this method
+        will wait for the receiving process to release one.
+
+        :Parameter: *mpqObject* (object) - object to be sent
+        :Parameter: *block* (bool) - if True, wait for the free slot
+        :Parameter: *timeout* (float) - maximum wait time in seconds (default: None, wait indefinitely)
+        :Raises: *queue.Full* - when no slot becomes available within the given timeout
+        '''
+        if not isinstance(mpqObject, pva.PvObject):
+            self.descriptorQueue.put((None, 0, mpqObject), block, timeout)
+            self.nDirectPuts += 1
+            return
+        data = mpqObject.toBytes()
+        size = len(data)
+        if size > self.slotSize:
+            self.logger.warning(f'Object size {size} exceeds shared memory slot size {self.slotSize}, sending it directly')
+            self.descriptorQueue.put((None, 0, mpqObject), block, timeout)
+            self.nDirectPuts += 1
+            return
+        try:
+            slotId = self.freeSlotQueue.get(block, timeout)
+        except queue.Empty:
+            raise queue.Full('No shared memory slot available')
+        self._getSlotBuffer(slotId, size)[:] = data
+        self.descriptorQueue.put((slotId, size, None))
+        self.nSharedMemoryPuts += 1
+
+    def getSlot(self, block=True, timeout=None):
+        '''
+        Retrieves object from the queue without releasing its shared memory
+        slot. The slot must be released using the releaseSlot() method
+        once the object is no longer needed.
+
+        :Parameter: *block* (bool) - if True, wait for the object to become available
+        :Parameter: *timeout* (float) - maximum wait time in seconds (default: None, wait indefinitely)
+        :Returns: Tuple containing slot id (None for objects that were not sent via shared memory) and object
+        :Raises: *queue.Empty* - when no object is available within the given timeout
+        '''
+        slotId, size, mpqObject = self.descriptorQueue.get(block, timeout)
+        if slotId is None:
+            return (None, mpqObject)
+        slotBuffer = self._getSlotBuffer(slotId, size)
+        try:
+            mpqObject = pva.PvObject.fromBytes(slotBuffer)
+        except:
+            self.releaseSlot(slotId)
+            raise
+        finally:
+            slotBuffer.release()
+        return (slotId, mpqObject)
+
+    def releaseSlot(self, slotId):
+        '''
+        Returns shared memory slot to the sending process.
+
+        :Parameter: *slotId* (int) - slot id returned by the getSlot() method; None values are ignored
+        '''
+        if slotId is not None:
+            self.freeSlotQueue.put(slotId)
+
+    def get(self, block=True, timeout=None):
+        '''
+        Retrieves object from the queue and immediately releases its
+        shared memory slot.
+
+        :Parameter: *block* (bool) - if True, wait for the object to become available
+        :Parameter: *timeout* (float) - maximum wait time in seconds (default: None, wait indefinitely)
+        :Returns: Object received from the queue
+        :Raises: *queue.Empty* - when no object is available within the given timeout
+        '''
+        slotId, mpqObject = self.getSlot(block, timeout)
+        self.releaseSlot(slotId)
+        return mpqObject
+
+    def qsize(self):
+        '''
+        Retrieves approximate number of objects in the queue.
+
+        :Returns: Number of queued objects
+        '''
+        return self.descriptorQueue.qsize()
+
+    def empty(self):
+        '''
+        Checks whether the queue is empty.
+
+        :Returns: True if there are no queued objects, False otherwise
+        '''
+        return self.descriptorQueue.empty()
+
+    def getStats(self):
+        '''
+        Retrieves queue statistics for the sending process.
+
+        :Returns: Dictionary containing queue statistics parameters
+        '''
+        return {'nSlots' : self.nSlots, 'slotSize' : self.slotSize, 'nSharedMemoryPuts' : self.nSharedMemoryPuts, 'nDirectPuts' : self.nDirectPuts}
+
+    def acquire(self):
+        '''
+        Registers user of the queue (e.g., worker controller) in the sending
+        process.
+        '''
+        self.nUsers += 1
+
+    def release(self):
+        '''
+        Unregisters user of the queue in the sending process. Queue is
+        closed after the last user is unregistered.
+        '''
+        self.nUsers -= 1
+        if self.nUsers <= 0:
+            self.close()
+
+    def close(self):
+        '''
+        Closes shared memory segment. The segment is removed from the system
+        when it is closed by the process that created it.
+        '''
+        if self.isClosed:
+            return
+        self.isClosed = True
+        try:
+            self.sharedMemory.close()
+            if os.getpid() == self.ownerPid:
+                self.sharedMemory.unlink()
+        except Exception as ex:
+            self.logger.warning(f'Error closing shared memory queue: {ex}')
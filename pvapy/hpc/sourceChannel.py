@@ -20,7 +20,9 @@ class SourceChannel(pva.Channel):
             'nReceived' : pva.UINT,
             'nRejected' : pva.UINT,
             'nDelivered' : pva.UINT,
-            'nQueued' : pva.UINT
+            'nQueued' : pva.UINT,
+            'nDropped' : pva.UINT,
+            'nConflated' : pva.UINT
         },
     }
 
@@ -93,7 +95,12 @@ class SourceChannel(pva.Channel):
     def waitOnQueue(self, waitTime):
         if self.pvObjectQueue is not None:
             self.pvObjectQueue.waitForPut(waitTime)
-            self.parentObject.setEvent()
+            if len(self.pvObjectQueue):
+                self.parentObject.setEvent()
+
+    def cancelWaitOnQueue(self):
+        if self.pvObjectQueue is not None:
+            self.pvObjectQueue.cancelWaitForPut()
 
     def start(self):
         self.startTime = time.time()
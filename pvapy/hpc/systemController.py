@@ -15,6 +15,10 @@ class SystemController(HpcController):
 
     CONTROLLER_TYPE = 'system'
 
+    # Control channel callbacks take precedence over other
+    # PVA server callbacks
+    CONTROL_CALLBACK_PRIORITY = 10
+
     CONTROL_TYPE_DICT = {
         'objectTime' : pva.DOUBLE,
         'objectTimestamp' : pva.PvTimeStamp(),
@@ -192,6 +196,7 @@ class SystemController(HpcController):
             # update it
             self.controlPvObject = pva.PvObject(self.getControlTypeDict(), {f'{self.getControllerIdField()}' : hpcObjectId})
             self.pvaServer.addRecord(self.controlChannel, self.controlPvObject, self.controlCallback)
+            self.pvaServer.setCallbackPriority(self.controlChannel, self.CONTROL_CALLBACK_PRIORITY)
             self.logger.debug(f'Created {self.CONTROLLER_TYPE} control channel: {self.controlChannel}')
 
     def createDataProcessorConfig(self, processorId):
@@ -6,6 +6,7 @@ import os
 import multiprocessing as mp
 from ..utility.loggingManager import LoggingManager
 from .hpcController import HpcController
+from .sharedMemoryFrameQueue import SharedMemoryFrameQueue
 
 class UserMpWorker(mp.Process):
 
@@ -18,7 +19,7 @@ class UserMpWorker(mp.Process):
     :Parameter: *userMpDataProceessor* (UserMpDataProcessor) - Instance of the UserMpDataProcessor class that will be processing data.
     :Parameter: *commandRequestQueue* (multiprocessing.Queue) - Command request queue.
     :Parameter: *commandResponseQueue* (multiprocessing.Queue) - Command response queue.
-    :Parameter: *inputDataQueue* (multiprocessing.Queue) - Input data queue.
+    :Parameter: *inputDataQueue* (multiprocessing.Queue or SharedMemoryFrameQueue) - Input data queue. If shared memory frame queue is used, object's shared memory slot is released after the process() method returns.
     :Parameter: *logLevel* (str) - Log level; possible values: debug, info, warning, error, critical. If not provided, there will be no log output.
     :Parameter: *logFile* (str) - Log file.
     '''
@@ -99,16 +100,24 @@ class UserMpWorker(mp.Process):
         '''
         self.logger.debug(f'Data processing thread for worker {self.workerId} starting, PID: {os.getpid()}')
         self.rpThread.start()
+        useSharedMemory = isinstance(self.inputDataQueue, SharedMemoryFrameQueue)
         while True:
             if self.isStopped:
                 break
+            slotId = None
             try:
-                inputData = self.inputDataQueue.get(block=True, timeout=HpcController.WAIT_TIME)
+                if useSharedMemory:
+                    slotId, inputData = self.inputDataQueue.getSlot(block=True, timeout=HpcController.WAIT_TIME)
+                else:
+                    inputData = self.inputDataQueue.get(block=True, timeout=HpcController.WAIT_TIME)
                 self.process(inputData)
             except queue.Empty:
                 pass
             except Exception as ex:
                 self.logger.error(f'Data processing error: {ex}')
+            finally:
+                if slotId is not None:
+                    self.inputDataQueue.releaseSlot(slotId)
         self.logger.debug(f'Data processing thread for worker {self.workerId} is exiting')
 
 class RequestProcessingThread(threading.Thread):
@@ -6,6 +6,7 @@ import multiprocessing as mp
 from ..utility.loggingManager import LoggingManager
 from .userMpWorker import UserMpWorker
 from .hpcController import HpcController
+from .sharedMemoryFrameQueue import SharedMemoryFrameQueue
 
 class UserMpWorkerController(HpcController):
 
@@ -18,7 +19,7 @@ class UserMpWorkerController(HpcController):
 
     :Parameter: *workerId* (str) - Worker id.
     :Parameter: *userMpDataProcessor* (UserMpDataProcessor) - Instance of the UserMpDataProcessor class that will be processing data.
-    :Parameter: *inputDataQueue* (multiprocessing.Queue) - Input data queue.
+    :Parameter: *inputDataQueue* (multiprocessing.Queue or SharedMemoryFrameQueue) - Input data queue. Shared memory frame queue should be used for transferring large objects (e.g., area detector images), as it avoids pickling object data through a pipe; the queue is closed after all worker controllers using it have been stopped.
     :Parameter: *logLevel* (str) - Log level; possible values: debug, info, warning, error, critical. If not provided, there will be no log output.
     :Parameter: *logFile* (str) - Log file.
     '''
@@ -85,6 +86,8 @@ class UserMpWorkerController(HpcController):
         self.uwProcess.start()
         self.logger.debug(f'Started user worker process: {self.uwProcess}')
         signal.signal(signal.SIGINT, originalSigintHandler)
+        if isinstance(self.inputDataQueue, SharedMemoryFrameQueue):
+            self.inputDataQueue.acquire()
         self.isStopped = False
 
     def configure(configDict):
@@ -129,6 +132,9 @@ class UserMpWorkerController(HpcController):
             self.uwProcess.kill()
         except:
             pass
+        if isinstance(self.inputDataQueue, SharedMemoryFrameQueue):
+            # Shared memory is removed once the last worker is stopped
+            self.inputDataQueue.release()
         self.logger.debug(f'User worker process {self.workerId} is done')
         return self._renameDictKeys(statsDict, statsKeyPrefix)
 
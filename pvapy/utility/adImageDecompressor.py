@@ -0,0 +1,161 @@
+'''
+AD Image Decompressor class
+'''
+
+import numpy as np
+import pvaccess as pva
+
+# Compression libraries are optional
+try:
+    import blosc
+except ImportError:
+    blosc = None
+try:
+    import lz4.block
+except ImportError:
+    lz4 = None
+try:
+    import bitshuffle
+except ImportError:
+    bitshuffle = None
+
+class AdImageDecompressor:
+    '''
+    This class decompresses Area Detector images that were compressed with
+    one of the NDCodec compressors. Codec name and uncompressed data type
+    are taken from the NtNdArray 'codec' field. Supported codecs are
+    'blosc', 'lz4' and 'bslz4' (bitshuffle/LZ4); the corresponding python
+    packages (blosc, lz4 and bitshuffle) are optional, and are needed only
+    for images compressed with the given codec.
+
+    Blosc images are decompressed into an output buffer that is reused
+    for subsequent images of the same size and data type, so the returned
+    array remains valid only until the next image is decompressed. The
+    lz4 and bitshuffle packages do not support decompression into an
+    existing buffer, so LZ4 and bitshuffle/LZ4 images are returned in
+    arrays allocated for each image; their compressed data is passed to
+    the decompressor without copying.
+
+    **AdImageDecompressor(reuseOutputBuffer=True)**
+
+    :Parameter: *reuseOutputBuffer* (bool) - if True, output buffer will be reused between images
+    '''
+
+    NUMPY_DATA_TYPE_MAP = {
+        pva.UBYTE   : np.dtype('uint8'),
+        pva.BYTE    : np.dtype('int8'),
+        pva.USHORT  : np.dtype('uint16'),
+        pva.SHORT   : np.dtype('int16'),
+        pva.UINT    : np.dtype('uint32'),
+        pva.INT     : np.dtype('int32'),
+        pva.ULONG   : np.dtype('uint64'),
+        pva.LONG    : np.dtype('int64'),
+        pva.FLOAT   : np.dtype('float32'),
+        pva.DOUBLE  : np.dtype('float64')
+    }
+
+    def __init__(self, reuseOutputBuffer=True):
+        self.reuseOutputBuffer = reuseOutputBuffer
+        self.outputBuffer = None
+        self.decompressorMap = {
+            'blosc' : self.decompressBlosc,
+            'lz4' : self.decompressLz4,
+            'bslz4' : self.decompressBitshuffleLz4
+        }
+        self.dataTypeMap = {int(pvaType) : dtype for pvaType,dtype in self.NUMPY_DATA_TYPE_MAP.items()}
+
+    @classmethod
+    def getCodecName(cls, ntNdArray):
+        '''
+        Get name of the codec used for compressing NtNdArray data.
+
+        :Parameter: *ntNdArray* (NtNdArray) - NtNdArray object
+        :Returns: Codec name, or empty string for uncompressed data
+        '''
+        if not ntNdArray.hasField('codec'):
+            return ''
+        return ntNdArray['codec']['name']
+
+    def getDataType(self, ntNdArray):
+        '''
+        Get NumPy data type of the uncompressed image data. NDCodec stores
+        uncompressed PVA data type in the codec parameters field.
+
+        :Parameter: *ntNdArray* (NtNdArray) - NtNdArray object
+        :Returns: NumPy data type
+        '''
+        parameters = ntNdArray['codec']['parameters']
+        if isinstance(parameters, tuple):
+            parameters = parameters[0]
+        if isinstance(parameters, dict):
+            parameters = parameters.get('value')
+        dtype = self.dataTypeMap.get(parameters)
+        if dtype is None:
+            raise pva.InvalidArgument(f'Invalid codec data type: {parameters}')
+        return dtype
+
+    def getOutputBuffer(self, nElements, dtype):
+        '''
+        Get output buffer for the uncompressed image data.
+
+        :Parameter: *nElements* (int) - number of array elements
+        :Parameter: *dtype* (numpy.dtype) - array data type
+        :Returns: NumPy array
+        '''
+        if not self.reuseOutputBuffer:
+            return np.empty(nElements, dtype=dtype)
+        if self.outputBuffer is None or self.outputBuffer.size != nElements or self.outputBuffer.dtype != dtype:
+            self.outputBuffer = np.empty(nElements, dtype=dtype)
+        return self.outputBuffer
+
+    def decompressBlosc(self, data, nElements, dtype):
+        ''' Decompress blosc data. '''
+        if blosc is None:
+            raise pva.InvalidState('Missing blosc support.')
+        # Blosc decompresses directly into the output buffer, so make sure
+        # that uncompressed size stored in the blosc header fits before
+        # writing anything; compressed data is passed without copying
+        data = memoryview(np.ascontiguousarray(data))
+        nBytes = nElements*dtype.itemsize
+        try:
+            uncompressedSize = blosc.get_cbuffer_sizes(data)[0]
+        except Exception as ex:
+            raise pva.InvalidArgument(f'Invalid blosc data: {ex}')
+        if uncompressedSize != nBytes:
+            raise pva.InvalidArgument(f'Blosc uncompressed size {uncompressedSize} does not match expected image size {nBytes}')
+        image = self.getOutputBuffer(nElements, dtype)
+        blosc.decompress_ptr(data, image.__array_interface__['data'][0])
+        return image
+
+    def decompressLz4(self, data, nElements, dtype):
+        ''' Decompress LZ4 data. '''
+        if lz4 is None:
+            raise pva.InvalidState('Missing lz4 support.')
+        # NDCodec LZ4 blocks do not contain uncompressed size
+        data = memoryview(np.ascontiguousarray(data))
+        output = lz4.block.decompress(data, uncompressed_size=nElements*dtype.itemsize)
+        return np.frombuffer(output, dtype=dtype)
+
+    def decompressBitshuffleLz4(self, data, nElements, dtype):
+        ''' Decompress bitshuffle/LZ4 data. '''
+        if bitshuffle is None:
+            raise pva.InvalidState('Missing bitshuffle support.')
+        return bitshuffle.decompress_lz4(np.frombuffer(data, dtype=np.uint8), (nElements,), dtype)
+
+    def decompress(self, ntNdArray, data, nElements):
+        '''
+        Decompress NtNdArray image data.
+
+        :Parameter: *ntNdArray* (NtNdArray) - NtNdArray object
+        :Parameter: *data* (numpy.array) - compressed image data
+        :Parameter: *nElements* (int) - number of uncompressed image elements
+        :Returns: Flat NumPy array containing uncompressed image data, or original data if image was not compressed
+        '''
+        codecName = self.getCodecName(ntNdArray)
+        if not codecName:
+            return data
+        decompressor = self.decompressorMap.get(codecName)
+        if decompressor is None:
+            raise pva.InvalidArgument(f'Unsupported codec: {codecName}')
+        dtype = self.getDataType(ntNdArray)
+        return decompressor(data, nElements, dtype)
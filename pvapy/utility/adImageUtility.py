@@ -51,8 +51,12 @@ class AdImageUtility:
     }
 
     @classmethod
-    def reshapeNtNdArray(cls, ntNdArray):
-        ''' Reshape area detector numpy array. '''
+    def reshapeNtNdArray(cls, ntNdArray, decompressor=None):
+        '''
+        Reshape area detector numpy array. If decompressor (AdImageDecompressor
+        instance) is given, compressed image data will be decompressed before
+        reshaping; otherwise, compressed data is returned as is.
+        '''
         # Get color mode
         imageId = ntNdArray['uniqueId']
         colorMode = None
@@ -112,6 +116,9 @@ class AdImageUtility:
         ##image = ntNdArray.getUnion()[fieldKey]
         ###image = next(iter(ntNdArray['value'][0].values()))
         image = ntNdArray['value'][0][fieldKey]
+        if decompressor is not None:
+            image = decompressor.decompress(ntNdArray, image, nx*ny*(nz or 1))
+            fieldKey = cls.NTNDA_DATA_FIELD_KEY_MAP.get(image.dtype)
 
         if colorMode == cls.COLOR_MODE_MONO:
             # [NX, NY]
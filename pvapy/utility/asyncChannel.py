@@ -0,0 +1,158 @@
+'''
+Asyncio channel class
+'''
+
+import asyncio
+import pvaccess as pva
+
+class AsyncChannel(pva.Channel):
+    '''
+    Channel class that provides asyncio client API in addition to all
+    standard Channel methods. Get and put requests are served by the
+    channel's asynchronous request threads, and monitor updates by the
+    channel's monitor processing thread; results are delivered to the
+    event loop via loop.call_soon_threadsafe(), so that a single event
+    loop can handle a large number of channels without polling.
+
+    **AsyncChannel(name, providerType=pva.PVA)**
+
+    :Parameter: *name* (str) - channel name
+    :Parameter: *providerType* (PROVIDERTYPE) - provider type, either PVA (PV Access) or CA (Channel Access)
+
+    ::
+
+        async def main():
+            c = AsyncChannel('pvapy:image')
+            pv = await c.aget('field(uniqueId)')
+            async for pv in c.amonitor('field(uniqueId)', queueSize=100):
+                print(pv['uniqueId'])
+
+        asyncio.run(main())
+    '''
+
+    DEFAULT_MONITOR_QUEUE_SIZE = 100
+
+    def __init__(self, name, providerType=pva.PVA):
+        pva.Channel.__init__(self, name, providerType)
+        self.nMonitorOverruns = 0
+
+    @classmethod
+    def _createCallbacks(cls, loop, future):
+        def setResult(result):
+            if not future.done():
+                future.set_result(result)
+
+        def setException(error):
+            if not future.done():
+                future.set_exception(pva.PvaException(error))
+
+        def callback(pv):
+            try:
+                loop.call_soon_threadsafe(setResult, pv)
+            except RuntimeError:
+                # Event loop is closed
+                pass
+
+        def errorCallback(error):
+            try:
+                loop.call_soon_threadsafe(setException, error)
+            except RuntimeError:
+                pass
+
+        return (callback, errorCallback)
+
+    async def aget(self, requestDescriptor=None, timeout=None):
+        '''
+        Retrieves PV value from the channel without blocking the event loop.
+
+        :Parameter: *requestDescriptor* (str) - describes what PV data should be sent to the client; if not given, default request descriptor will be used
+        :Parameter: *timeout* (float) - maximum wait time in seconds (default: None, wait indefinitely)
+        :Returns: PvObject retrieved from the channel
+        :Raises: *PvaException* - in case of any errors
+        :Raises: *asyncio.TimeoutError* - when request does not complete within the given timeout
+        '''
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        callback, errorCallback = self._createCallbacks(loop, future)
+        if requestDescriptor is None:
+            self.asyncGet(callback, errorCallback)
+        else:
+            self.asyncGet(callback, errorCallback, requestDescriptor)
+        return await asyncio.wait_for(future, timeout)
+
+    async def aput(self, pvObject, requestDescriptor=None, timeout=None):
+        '''
+        Assigns PV data to the channel process variable without blocking
+        the event loop.
+
+        :Parameter: *pvObject* (PvObject) - PV object that will be assigned to channel PV according to the specified request descriptor
+        :Parameter: *requestDescriptor* (str) - PV request descriptor; if not given, default request descriptor will be used
+        :Parameter: *timeout* (float) - maximum wait time in seconds (default: None, wait indefinitely)
+        :Returns: PvObject containing data that was sent to the channel
+        :Raises: *PvaException* - in case of any errors
+        :Raises: *asyncio.TimeoutError* - when request does not complete within the given timeout
+        '''
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        callback, errorCallback = self._createCallbacks(loop, future)
+        if requestDescriptor is None:
+            self.asyncPut(pvObject, callback, errorCallback)
+        else:
+            self.asyncPut(pvObject, callback, errorCallback, requestDescriptor)
+        return await asyncio.wait_for(future, timeout)
+
+    async def amonitor(self, requestDescriptor=None, queueSize=DEFAULT_MONITOR_QUEUE_SIZE):
+        '''
+        Asynchronous iterator over channel monitor updates. Monitor is
+        started when iteration starts, and stopped when the iterator is
+        closed. If the consumer falls behind, the oldest queued updates are
+        discarded and counted as monitor overruns. Only one monitor can be
+        active on a channel at any given time, so multiple consumers of the
+        same channel require separate AsyncChannel objects. Breaking out of
+        the iteration leaves monitor stopping to the event loop's generator
+        finalization; use contextlib.aclosing() to stop it immediately.
+
+        :Parameter: *requestDescriptor* (str) - describes what PV data should be sent to the client; if not given, default request descriptor will be used
+        :Parameter: *queueSize* (int) - maximum number of updates waiting to be consumed
+        :Returns: Asynchronous iterator yielding PvObjects received from the channel
+        :Raises: *InvalidState* - when channel monitor is already active
+
+        ::
+
+            async for pv in channel.amonitor('field(value)', queueSize=10):
+                print(pv)
+        '''
+        if queueSize <= 0:
+            raise pva.InvalidArgument(f'Invalid monitor queue size: {queueSize}')
+        # Stopping monitor is channel-wide, so a second monitor would be
+        # stopped together with the first one
+        if self.isMonitorActive():
+            raise pva.InvalidState(f'Monitor is already active on channel {self.getName()}')
+        loop = asyncio.get_running_loop()
+        pvQueue = asyncio.Queue(maxsize=queueSize)
+
+        def enqueue(pv):
+            if pvQueue.full():
+                pvQueue.get_nowait()
+                self.nMonitorOverruns += 1
+            pvQueue.put_nowait(pv)
+
+        def subscriber(pv):
+            try:
+                loop.call_soon_threadsafe(enqueue, pv)
+            except RuntimeError:
+                # Event loop is closed
+                pass
+
+        # Queued monitor delivers copies of updates to the subscriber,
+        # so that received objects can be kept by the event loop
+        self.setMonitorMaxQueueLength(queueSize)
+        if requestDescriptor is None:
+            self.monitor(subscriber)
+        else:
+            self.monitor(subscriber, requestDescriptor)
+        try:
+            while True:
+                yield await pvQueue.get()
+        finally:
+            self.stopMonitor()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+'''
+Latency histogram module.
+'''
+
+import math
+
+class LatencyHistogram:
+    '''
+    Fixed-memory histogram of latency values, with log-linear bucketing
+    similar to the HDR histogram. Values are recorded as integer multiples
+    of the histogram resolution. Values smaller than 2^<significantBits>
+    resolution units are counted exactly, and each subsequent power of 2
+    range is split into 2^(<significantBits>-1) buckets of equal width,
+    which bounds the relative error of reported percentiles by
+    2^(1-<significantBits>). Values larger than the histogram range are
+    counted in the last bucket. Exact minimum, maximum and total are kept
+    separately. Histograms with the same configuration can be merged.
+
+    **LatencyHistogram(resolution=1e-6, maxValue=3600, significantBits=7)**
+
+    :Parameter: *resolution* (float) - Smallest distinguishable value, in seconds (default: 1 microsecond).
+    :Parameter: *maxValue* (float) - Largest value that can be recorded without saturation, in seconds (default: 1 hour).
+    :Parameter: *significantBits* (int) - Number of significant bits used for bucketing (default: 7, which corresponds to relative error of about 1.6%).
+    '''
+
+    PERCENTILES = [50, 90, 99, 99.9]
+
+    def __init__(self, resolution=1e-6, maxValue=3600, significantBits=7):
+        if resolution <= 0 or maxValue <= resolution:
+            raise ValueError(f'Invalid histogram range: resolution {resolution}, max value {maxValue}')
+        if significantBits < 2:
+            raise ValueError(f'Number of significant bits must be at least 2: {significantBits}')
+        self.resolution = resolution
+        self.maxValue = maxValue
+        self.significantBits = significantBits
+        self.subBucketCount = 1 << significantBits
+        self.subBucketHalfCount = self.subBucketCount >> 1
+        self.maxUnits = int(math.ceil(maxValue/resolution))
+        self.nBuckets = self.getBucketIndex(self.maxUnits)+1
+        self.reset()
+
+    def reset(self):
+        self.counts = [0]*self.nBuckets
+        self.count = 0
+        self.total = 0.0
+        self.minValue = 0.0
+        self.maxRecordedValue = 0.0
+
+    def copy(self):
+        histogram = LatencyHistogram(self.resolution, self.maxValue, self.significantBits)
+        return histogram.merge(self)
+
+    def getBucketIndex(self, units):
+        if units < self.subBucketCount:
+            return units
+        shift = units.bit_length()-self.significantBits
+        return shift*self.subBucketHalfCount + (units >> shift)
+
+    def getBucketValue(self, index):
+        # Returns highest value (in seconds) that maps into the given bucket
+        if index < self.subBucketCount:
+            return index*self.resolution
+        shift = index//self.subBucketHalfCount - 1
+        subBucket = index - shift*self.subBucketHalfCount
+        return (((subBucket+1) << shift)-1)*self.resolution
+
+    def record(self, value):
+        if value < 0:
+            value = 0.0
+        units = min(int(value/self.resolution), self.maxUnits)
+        self.counts[self.getBucketIndex(units)] += 1
+        if self.count == 0 or value < self.minValue:
+            self.minValue = value
+        if value > self.maxRecordedValue:
+            self.maxRecordedValue = value
+        self.count += 1
+        self.total += value
+
+    def isCompatible(self, histogram):
+        return self.resolution == histogram.resolution and self.nBuckets == histogram.nBuckets and self.significantBits == histogram.significantBits
+
+    def merge(self, histogram):
+        if not histogram.count:
+            return self
+        if not self.isCompatible(histogram):
+            raise ValueError('Cannot merge histograms with different configurations')
+        for i,c in enumerate(histogram.counts):
+            if c:
+                self.counts[i] += c
+        if self.count == 0 or histogram.minValue < self.minValue:
+            self.minValue = histogram.minValue
+        if histogram.maxRecordedValue > self.maxRecordedValue:
+            self.maxRecordedValue = histogram.maxRecordedValue
+        self.count += histogram.count
+        self.total += histogram.total
+        return self
+
+    def getPercentile(self, percentile):
+        if not self.count:
+            return 0.0
+        target = max(int(math.ceil(percentile/100.0*self.count)), 1)
+        nCounted = 0
+        for i,c in enumerate(self.counts):
+            nCounted += c
+            if nCounted >= target:
+                if i == self.nBuckets-1:
+                    # Last bucket also holds values beyond histogram range
+                    return self.maxRecordedValue
+                return min(max(self.getBucketValue(i), self.minValue), self.maxRecordedValue)
+        return self.maxRecordedValue
+
+    def getMean(self):
+        if not self.count:
+            return 0.0
+        return self.total/self.count
+
+    @classmethod
+    def getPercentileKey(cls, prefix, percentile):
+        # 50 => <prefix>P50, 99.9 => <prefix>P999
+        return f'{prefix}P{str(percentile).replace(".", "")}'
+
+    def getStats(self, prefix):
+        '''
+        Returns dictionary containing percentiles and maximum value,
+        with keys formed using the given prefix (e.g., latencyP50,
+        latencyP999 and latencyMax).
+        '''
+        stats = {}
+        for percentile in self.PERCENTILES:
+            stats[self.getPercentileKey(prefix, percentile)] = self.getPercentile(percentile)
+        stats[f'{prefix}Max'] = self.maxRecordedValue
+        return stats
+
+    @classmethod
+    def getStatsKeys(cls, prefix):
+        return [cls.getPercentileKey(prefix, percentile) for percentile in cls.PERCENTILES] + [f'{prefix}Max']
@@ -0,0 +1,496 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include <boost/python.hpp>
+
+#include "BulkChannelRequest.h"
+
+#if PVA_API_VERSION >= 482
+
+#include "pv/convert.h"
+#include "PvObject.h"
+#include "PvUtility.h"
+#include "PyUtility.h"
+#include "PyPvDataUtility.h"
+#include "PvaException.h"
+
+namespace bp = boost::python;
+namespace pvd = epics::pvData;
+namespace pvc = epics::pvaClient;
+
+//
+// Request tracker
+//
+BulkRequestTracker::BulkRequestTracker(unsigned int nRequests)
+    : mutex()
+    , event()
+    , pendingFlags(nRequests, false)
+    , completedFlags(nRequests, false)
+    , statuses(nRequests)
+    , nPending(0)
+{
+}
+
+BulkRequestTracker::~BulkRequestTracker()
+{
+}
+
+void BulkRequestTracker::startRequest(unsigned int index)
+{
+    pvd::Lock lock(mutex);
+    if (!pendingFlags[index]) {
+        pendingFlags[index] = true;
+        nPending++;
+    }
+    completedFlags[index] = false;
+}
+
+void BulkRequestTracker::completeRequest(unsigned int index, const pvd::Status& status)
+{
+    pvd::Lock lock(mutex);
+    if (!pendingFlags[index]) {
+        // Request was abandoned
+        return;
+    }
+    pendingFlags[index] = false;
+    completedFlags[index] = true;
+    statuses[index] = status;
+    nPending--;
+    if (nPending == 0) {
+        event.signal();
+    }
+}
+
+bool BulkRequestTracker::waitForRequests(double timeout)
+{
+    epicsTime deadline = epicsTime::getCurrent() + timeout;
+    while (true) {
+        {
+            pvd::Lock lock(mutex);
+            if (nPending == 0) {
+                return true;
+            }
+        }
+        double remainingTime = deadline - epicsTime::getCurrent();
+        if (remainingTime <= 0 || !event.wait(remainingTime)) {
+            break;
+        }
+    }
+
+    pvd::Lock lock(mutex);
+    if (nPending == 0) {
+        return true;
+    }
+    for (unsigned int i = 0; i < pendingFlags.size(); i++) {
+        pendingFlags[i] = false;
+    }
+    nPending = 0;
+    return false;
+}
+
+bool BulkRequestTracker::isCompleted(unsigned int index)
+{
+    pvd::Lock lock(mutex);
+    return completedFlags[index];
+}
+
+pvd::Status BulkRequestTracker::getStatus(unsigned int index)
+{
+    pvd::Lock lock(mutex);
+    return statuses[index];
+}
+
+//
+// Requester
+//
+BulkRequesterImpl::BulkRequesterImpl(unsigned int index_, const BulkRequestTracker::shared_pointer& trackerPtr_)
+    : index(index_)
+    , trackerPtr(trackerPtr_)
+{
+}
+
+BulkRequesterImpl::~BulkRequesterImpl()
+{
+}
+
+void BulkRequesterImpl::channelGetConnect(const pvd::Status& status, pvc::PvaClientGetPtr const& clientGet)
+{
+    trackerPtr->completeRequest(index, status);
+}
+
+void BulkRequesterImpl::getDone(const pvd::Status& status, pvc::PvaClientGetPtr const& clientGet)
+{
+    trackerPtr->completeRequest(index, status);
+}
+
+void BulkRequesterImpl::channelPutConnect(const pvd::Status& status, pvc::PvaClientPutPtr const& clientPut)
+{
+    trackerPtr->completeRequest(index, status);
+}
+
+void BulkRequesterImpl::getDone(const pvd::Status& status, pvc::PvaClientPutPtr const& clientPut)
+{
+    trackerPtr->completeRequest(index, status);
+}
+
+void BulkRequesterImpl::putDone(const pvd::Status& status, pvc::PvaClientPutPtr const& clientPut)
+{
+    trackerPtr->completeRequest(index, status);
+}
+
+//
+// Bulk channel request
+//
+const double BulkChannelRequest::DefaultTimeout(3.0);
+
+PvaPyLogger BulkChannelRequest::logger("BulkChannelRequest");
+PvaClient BulkChannelRequest::pvaClient;
+CaClient BulkChannelRequest::caClient;
+pvc::PvaClientPtr BulkChannelRequest::pvaClientPtr(pvc::PvaClient::get("pva ca"));
+std::map<std::string, pvc::PvaClientChannelPtr> BulkChannelRequest::channelMap;
+pvd::Mutex BulkChannelRequest::channelMapMutex;
+
+double BulkChannelRequest::getRemainingTime(const epicsTime& deadline)
+{
+    double remainingTime = deadline - epicsTime::getCurrent();
+    if (remainingTime < 0) {
+        return 0;
+    }
+    return remainingTime;
+}
+
+// Channel connections are all initiated before waiting on any of them,
+// so that the total wait time is determined by the slowest channel.
+std::vector<pvc::PvaClientChannelPtr> BulkChannelRequest::connectChannels(const std::vector<std::string>& channelNames, PvProvider::ProviderType providerType, const epicsTime& deadline, std::vector<std::string>& errors)
+{
+    unsigned int nChannels = channelNames.size();
+    std::string providerName = PvProvider::getProviderName(providerType);
+    std::vector<pvc::PvaClientChannelPtr> channels(nChannels);
+    {
+        pvd::Lock lock(channelMapMutex);
+        for (unsigned int i = 0; i < nChannels; i++) {
+            std::string key = providerName + ":" + channelNames[i];
+            std::map<std::string, pvc::PvaClientChannelPtr>::iterator it = channelMap.find(key);
+            if (it != channelMap.end()) {
+                channels[i] = it->second;
+                continue;
+            }
+            try {
+                pvc::PvaClientChannelPtr channel = pvaClientPtr->createChannel(channelNames[i], providerName);
+                channel->issueConnect();
+                channelMap[key] = channel;
+                channels[i] = channel;
+            }
+            catch (std::runtime_error& ex) {
+                errors[i] = ex.what();
+            }
+        }
+    }
+
+    for (unsigned int i = 0; i < nChannels; i++) {
+        if (!channels[i]) {
+            continue;
+        }
+        pvd::Status status = channels[i]->waitConnect(getRemainingTime(deadline));
+        if (!status.isOK() || !channels[i]->getChannel()->isConnected()) {
+            errors[i] = "Channel " + channelNames[i] + " connection timed out";
+            channels[i].reset();
+        }
+    }
+    return channels;
+}
+
+bp::tuple BulkChannelRequest::getMany(const bp::list& pyChannelNames, const std::string& requestDescriptor, double timeout, bool valuesOnly, PvProvider::ProviderType providerType)
+{
+    unsigned int nChannels = bp::len(pyChannelNames);
+    std::vector<std::string> channelNames(nChannels);
+    for (unsigned int i = 0; i < nChannels; i++) {
+        channelNames[i] = PyUtility::extractStringFromPyObject(pyChannelNames[i]);
+    }
+
+    std::vector<std::string> errors(nChannels);
+    std::vector<pvd::PVStructurePtr> results(nChannels);
+    PyThreadState* _pyThreadState = PyEval_SaveThread();
+    try {
+        epicsTime deadline = epicsTime::getCurrent() + timeout;
+        std::vector<pvc::PvaClientChannelPtr> channels = connectChannels(channelNames, providerType, deadline, errors);
+
+        // Create and connect get operations
+        BulkRequestTracker::shared_pointer trackerPtr(new BulkRequestTracker(nChannels));
+        std::vector<BulkRequesterImpl::shared_pointer> requesters(nChannels);
+        std::vector<pvc::PvaClientGetPtr> pvaGets(nChannels);
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!channels[i]) {
+                continue;
+            }
+            try {
+                requesters[i] = BulkRequesterImpl::shared_pointer(new BulkRequesterImpl(i, trackerPtr));
+                pvaGets[i] = channels[i]->createGet(requestDescriptor);
+                pvaGets[i]->setRequester(requesters[i]);
+                trackerPtr->startRequest(i);
+                pvaGets[i]->issueConnect();
+            }
+            catch (std::runtime_error& ex) {
+                trackerPtr->completeRequest(i, pvd::Status(pvd::Status::STATUSTYPE_ERROR, ex.what()));
+                errors[i] = ex.what();
+                pvaGets[i].reset();
+            }
+        }
+        trackerPtr->waitForRequests(getRemainingTime(deadline));
+
+        // Issue gets
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!pvaGets[i]) {
+                continue;
+            }
+            if (!trackerPtr->isCompleted(i)) {
+                errors[i] = "Channel " + channelNames[i] + " get connection timed out";
+                pvaGets[i].reset();
+                continue;
+            }
+            pvd::Status status = trackerPtr->getStatus(i);
+            if (!status.isSuccess()) {
+                errors[i] = status.getMessage();
+                pvaGets[i].reset();
+                continue;
+            }
+            try {
+                pvaGets[i]->waitConnect();
+                trackerPtr->startRequest(i);
+                pvaGets[i]->issueGet();
+            }
+            catch (std::runtime_error& ex) {
+                trackerPtr->completeRequest(i, pvd::Status(pvd::Status::STATUSTYPE_ERROR, ex.what()));
+                errors[i] = ex.what();
+                pvaGets[i].reset();
+            }
+        }
+        trackerPtr->waitForRequests(getRemainingTime(deadline));
+
+        // Collect results
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!pvaGets[i]) {
+                continue;
+            }
+            if (!trackerPtr->isCompleted(i)) {
+                errors[i] = "Channel " + channelNames[i] + " get timed out";
+                continue;
+            }
+            try {
+                pvd::Status status = pvaGets[i]->waitGet();
+                if (!status.isSuccess()) {
+                    errors[i] = status.getMessage();
+                    continue;
+                }
+                results[i] = pvaGets[i]->getData()->getPVStructure();
+            }
+            catch (std::runtime_error& ex) {
+                errors[i] = ex.what();
+            }
+        }
+    }
+    catch (std::exception& ex) {
+        PyEval_RestoreThread(_pyThreadState);
+        throw PvaException(ex.what());
+    }
+    PyEval_RestoreThread(_pyThreadState);
+
+    bp::dict pyResultDict;
+    bp::dict pyErrorDict;
+    for (unsigned int i = 0; i < nChannels; i++) {
+        if (results[i]) {
+            PvObject pvObject(results[i]);
+            if (valuesOnly && results[i]->getSubField(PvaConstants::ValueFieldKey)) {
+                pyResultDict[channelNames[i]] = pvObject.getPyObject(PvaConstants::ValueFieldKey);
+            }
+            else {
+                pyResultDict[channelNames[i]] = pvObject;
+            }
+        }
+        else {
+            pyErrorDict[channelNames[i]] = errors[i];
+        }
+    }
+    return bp::make_tuple(pyResultDict, pyErrorDict);
+}
+
+void BulkChannelRequest::preparePut(const PutValue& putValue, const pvc::PvaClientPutPtr& pvaPut)
+{
+    pvc::PvaClientPutDataPtr pvaData = pvaPut->getData();
+    if (putValue.pvStructurePtr) {
+        pvd::PVStructurePtr pvSend = pvaData->getPVStructure();
+        if (*(putValue.pvStructurePtr->getStructure()) == *(pvSend->getStructure())) {
+            pvSend->copyUnchecked(*putValue.pvStructurePtr);
+        }
+        else {
+            // Copy fields that are present both in source and destination
+            PyPvDataUtility::copyStructureToStructure2(putValue.pvStructurePtr, pvSend);
+        }
+    }
+    else if (putValue.isArray) {
+        pvaData->putStringArray(putValue.values);
+    }
+    else if (pvaData->isValueScalar()) {
+        pvd::getConvert()->fromString(pvaData->getScalarValue(), putValue.values[0]);
+    }
+    else {
+        pvd::PVStructurePtr pvStructure = pvaData->getPVStructure();
+        PvUtility::fromString(pvStructure, putValue.values);
+    }
+}
+
+bp::dict BulkChannelRequest::putMany(const bp::dict& channelValueDict, const std::string& requestDescriptor, double timeout, PvProvider::ProviderType providerType)
+{
+    bp::list pyChannelNames = channelValueDict.keys();
+    unsigned int nChannels = bp::len(pyChannelNames);
+    std::vector<std::string> channelNames(nChannels);
+    std::vector<PutValue> putValues(nChannels);
+    for (unsigned int i = 0; i < nChannels; i++) {
+        channelNames[i] = PyUtility::extractStringFromPyObject(pyChannelNames[i]);
+        bp::object pyObject = channelValueDict[pyChannelNames[i]];
+        bp::extract<PvObject> extractPvObject(pyObject);
+        putValues[i].isArray = false;
+        if (extractPvObject.check()) {
+            PvObject pvObject = extractPvObject();
+            putValues[i].pvStructurePtr = pvObject.getPvStructurePtr();
+        }
+        else if (PyUtility::isPyList(pyObject)) {
+            bp::list pyList = bp::extract<bp::list>(pyObject);
+            int listSize = bp::len(pyList);
+            for (int j = 0; j < listSize; j++) {
+                putValues[i].values.push_back(PyUtility::extractStringFromPyObject(pyList[j]));
+            }
+            putValues[i].isArray = true;
+        }
+        else {
+            putValues[i].values.push_back(PyUtility::extractStringFromPyObject(pyObject));
+        }
+    }
+
+    std::vector<std::string> errors(nChannels);
+    std::vector<bool> isDone(nChannels, false);
+    PyThreadState* _pyThreadState = PyEval_SaveThread();
+    try {
+        epicsTime deadline = epicsTime::getCurrent() + timeout;
+        std::vector<pvc::PvaClientChannelPtr> channels = connectChannels(channelNames, providerType, deadline, errors);
+
+        // Create and connect put operations
+        BulkRequestTracker::shared_pointer trackerPtr(new BulkRequestTracker(nChannels));
+        std::vector<BulkRequesterImpl::shared_pointer> requesters(nChannels);
+        std::vector<pvc::PvaClientPutPtr> pvaPuts(nChannels);
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!channels[i]) {
+                continue;
+            }
+            try {
+                requesters[i] = BulkRequesterImpl::shared_pointer(new BulkRequesterImpl(i, trackerPtr));
+                pvaPuts[i] = channels[i]->createPut(requestDescriptor);
+                pvaPuts[i]->setRequester(requesters[i]);
+                trackerPtr->startRequest(i);
+                pvaPuts[i]->issueConnect();
+            }
+            catch (std::runtime_error& ex) {
+                trackerPtr->completeRequest(i, pvd::Status(pvd::Status::STATUSTYPE_ERROR, ex.what()));
+                errors[i] = ex.what();
+                pvaPuts[i].reset();
+            }
+        }
+        trackerPtr->waitForRequests(getRemainingTime(deadline));
+
+        // Put data is retrieved before it is modified; all gets are
+        // issued at once, as PvaClientPut would otherwise do them
+        // one at a time
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!pvaPuts[i]) {
+                continue;
+            }
+            if (!trackerPtr->isCompleted(i)) {
+                errors[i] = "Channel " + channelNames[i] + " put connection timed out";
+                pvaPuts[i].reset();
+                continue;
+            }
+            pvd::Status status = trackerPtr->getStatus(i);
+            if (!status.isSuccess()) {
+                errors[i] = status.getMessage();
+                pvaPuts[i].reset();
+                continue;
+            }
+            try {
+                pvaPuts[i]->waitConnect();
+                trackerPtr->startRequest(i);
+                pvaPuts[i]->issueGet();
+            }
+            catch (std::runtime_error& ex) {
+                trackerPtr->completeRequest(i, pvd::Status(pvd::Status::STATUSTYPE_ERROR, ex.what()));
+                errors[i] = ex.what();
+                pvaPuts[i].reset();
+            }
+        }
+        trackerPtr->waitForRequests(getRemainingTime(deadline));
+
+        // Issue puts
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!pvaPuts[i]) {
+                continue;
+            }
+            if (!trackerPtr->isCompleted(i)) {
+                errors[i] = "Channel " + channelNames[i] + " put timed out";
+                pvaPuts[i].reset();
+                continue;
+            }
+            try {
+                pvd::Status status = pvaPuts[i]->waitGet();
+                if (!status.isSuccess()) {
+                    errors[i] = status.getMessage();
+                    pvaPuts[i].reset();
+                    continue;
+                }
+                preparePut(putValues[i], pvaPuts[i]);
+                trackerPtr->startRequest(i);
+                pvaPuts[i]->issuePut();
+            }
+            catch (std::runtime_error& ex) {
+                trackerPtr->completeRequest(i, pvd::Status(pvd::Status::STATUSTYPE_ERROR, ex.what()));
+                errors[i] = ex.what();
+                pvaPuts[i].reset();
+            }
+        }
+        trackerPtr->waitForRequests(getRemainingTime(deadline));
+
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!pvaPuts[i]) {
+                continue;
+            }
+            if (!trackerPtr->isCompleted(i)) {
+                errors[i] = "Channel " + channelNames[i] + " put timed out";
+                continue;
+            }
+            try {
+                pvd::Status status = pvaPuts[i]->waitPut();
+                if (!status.isSuccess()) {
+                    errors[i] = status.getMessage();
+                    continue;
+                }
+                isDone[i] = true;
+            }
+            catch (std::runtime_error& ex) {
+                errors[i] = ex.what();
+            }
+        }
+    }
+    catch (std::exception& ex) {
+        PyEval_RestoreThread(_pyThreadState);
+        throw PvaException(ex.what());
+    }
+    PyEval_RestoreThread(_pyThreadState);
+
+    bp::dict pyErrorDict;
+    for (unsigned int i = 0; i < nChannels; i++) {
+        if (!isDone[i]) {
+            pyErrorDict[channelNames[i]] = errors[i];
+        }
+    }
+    return pyErrorDict;
+}
+
+#endif // if PVA_API_VERSION >= 482
@@ -0,0 +1,107 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef BULK_CHANNEL_REQUEST_H
+#define BULK_CHANNEL_REQUEST_H
+
+#if PVA_API_VERSION >= 482
+
+#include <string>
+#include <vector>
+#include <map>
+
+#include "boost/python/list.hpp"
+#include "boost/python/dict.hpp"
+#include "boost/python/tuple.hpp"
+
+#include <epicsEvent.h>
+#include <epicsTime.h>
+#include "pv/pvData.h"
+#include "pv/pvaClient.h"
+
+#include "PvaClient.h"
+#include "CaClient.h"
+#include "PvProvider.h"
+#include "PvaPyLogger.h"
+#include "PvaConstants.h"
+
+// Keeps track of requests issued in parallel on multiple channels;
+// each request is identified by its channel index.
+class BulkRequestTracker
+{
+public:
+    POINTER_DEFINITIONS(BulkRequestTracker);
+    BulkRequestTracker(unsigned int nRequests);
+    virtual ~BulkRequestTracker();
+
+    void startRequest(unsigned int index);
+    void completeRequest(unsigned int index, const epics::pvData::Status& status);
+    // Returns false on timeout; requests that are still pending are abandoned
+    bool waitForRequests(double timeout);
+    bool isCompleted(unsigned int index);
+    epics::pvData::Status getStatus(unsigned int index);
+
+private:
+    epics::pvData::Mutex mutex;
+    epicsEvent event;
+    std::vector<bool> pendingFlags;
+    std::vector<bool> completedFlags;
+    std::vector<epics::pvData::Status> statuses;
+    unsigned int nPending;
+};
+
+// Requester for get and put operations on a single channel
+class BulkRequesterImpl
+    : public epics::pvaClient::PvaClientGetRequester
+    , public epics::pvaClient::PvaClientPutRequester
+{
+public:
+    POINTER_DEFINITIONS(BulkRequesterImpl);
+    BulkRequesterImpl(unsigned int index, const BulkRequestTracker::shared_pointer& trackerPtr);
+    virtual ~BulkRequesterImpl();
+
+    virtual void channelGetConnect(const epics::pvData::Status& status, epics::pvaClient::PvaClientGetPtr const& clientGet);
+    virtual void getDone(const epics::pvData::Status& status, epics::pvaClient::PvaClientGetPtr const& clientGet);
+    virtual void channelPutConnect(const epics::pvData::Status& status, epics::pvaClient::PvaClientPutPtr const& clientPut);
+    virtual void getDone(const epics::pvData::Status& status, epics::pvaClient::PvaClientPutPtr const& clientPut);
+    virtual void putDone(const epics::pvData::Status& status, epics::pvaClient::PvaClientPutPtr const& clientPut);
+
+private:
+    unsigned int index;
+    BulkRequestTracker::shared_pointer trackerPtr;
+};
+
+// Get and put requests issued concurrently on many channels. Channels
+// are created once and reused for subsequent requests. Failures of
+// individual channels do not abort the remaining requests.
+class BulkChannelRequest
+{
+public:
+    static const double DefaultTimeout;
+
+    static boost::python::tuple getMany(const boost::python::list& channelNames, const std::string& requestDescriptor=PvaConstants::FieldValueAlarmTimestampRequest, double timeout=DefaultTimeout, bool valuesOnly=false, PvProvider::ProviderType providerType=PvProvider::PvaProviderType);
+    static boost::python::dict putMany(const boost::python::dict& channelValueDict, const std::string& requestDescriptor=PvaConstants::FieldValueRequest, double timeout=DefaultTimeout, PvProvider::ProviderType providerType=PvProvider::PvaProviderType);
+
+private:
+    // Value to be put into a single channel
+    struct PutValue {
+        epics::pvData::PVStructurePtr pvStructurePtr;
+        std::vector<std::string> values;
+        bool isArray;
+    };
+
+    static PvaPyLogger logger;
+    static PvaClient pvaClient;
+    static CaClient caClient;
+    static epics::pvaClient::PvaClientPtr pvaClientPtr;
+    static std::map<std::string, epics::pvaClient::PvaClientChannelPtr> channelMap;
+    static epics::pvData::Mutex channelMapMutex;
+
+    static double getRemainingTime(const epicsTime& deadline);
+    static std::vector<epics::pvaClient::PvaClientChannelPtr> connectChannels(const std::vector<std::string>& channelNames, PvProvider::ProviderType providerType, const epicsTime& deadline, std::vector<std::string>& errors);
+    static void preparePut(const PutValue& putValue, const epics::pvaClient::PvaClientPutPtr& pvaPut);
+};
+
+#endif // if PVA_API_VERSION >= 482
+
+#endif // BULK_CHANNEL_REQUEST_H
@@ -0,0 +1,257 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include "CallbackScheduler.h"
+#include "PvaPyConstants.h"
+
+namespace bp = boost::python;
+namespace epvd = epics::pvData;
+
+const int CallbackScheduler::DefaultPriority(0);
+
+CallbackScheduler::RecordState::RecordState(int priority_)
+    : priority(priority_)
+    , isReady(false)
+    , isInProgress(false)
+    , pendingTimes()
+    , startTime()
+{
+    resetCounters();
+}
+
+void CallbackScheduler::RecordState::resetCounters()
+{
+    nCallbacks = 0;
+    lastLatency = 0;
+    minLatency = 0;
+    maxLatency = 0;
+    totalLatency = 0;
+    maxRuntime = 0;
+    totalRuntime = 0;
+}
+
+CallbackScheduler::CallbackScheduler()
+    : mutex()
+    , readyEvent()
+    , waitCancelled(false)
+    , recordStateMap()
+    , readyLaneMap()
+{
+}
+
+CallbackScheduler::~CallbackScheduler()
+{
+    cancelWait();
+}
+
+CallbackScheduler::RecordState& CallbackScheduler::getRecordState(const std::string& recordName)
+{
+    std::map<std::string, RecordState>::iterator it = recordStateMap.find(recordName);
+    if (it == recordStateMap.end()) {
+        it = recordStateMap.insert(std::pair<std::string, RecordState>(recordName, RecordState())).first;
+    }
+    return it->second;
+}
+
+void CallbackScheduler::makeReadyUnsynchronized(const std::string& recordName, RecordState& recordState)
+{
+    if (recordState.isReady || recordState.isInProgress || recordState.pendingTimes.empty()) {
+        return;
+    }
+    readyLaneMap[recordState.priority].push_back(recordName);
+    recordState.isReady = true;
+    readyEvent.signal();
+}
+
+void CallbackScheduler::addRecord(const std::string& recordName, int priority)
+{
+    epvd::Lock lock(mutex);
+    recordStateMap[recordName] = RecordState(priority);
+}
+
+void CallbackScheduler::removeRecord(const std::string& recordName)
+{
+    epvd::Lock lock(mutex);
+    std::map<std::string, RecordState>::iterator it = recordStateMap.find(recordName);
+    if (it == recordStateMap.end()) {
+        return;
+    }
+    if (it->second.isReady) {
+        std::deque<std::string>& readyLane = readyLaneMap[it->second.priority];
+        for (std::deque<std::string>::iterator it2 = readyLane.begin(); it2 != readyLane.end(); it2++) {
+            if (*it2 == recordName) {
+                readyLane.erase(it2);
+                break;
+            }
+        }
+        if (readyLane.empty()) {
+            readyLaneMap.erase(it->second.priority);
+        }
+    }
+    recordStateMap.erase(it);
+}
+
+void CallbackScheduler::setPriority(const std::string& recordName, int priority)
+{
+    epvd::Lock lock(mutex);
+    RecordState& recordState = getRecordState(recordName);
+    if (recordState.priority == priority) {
+        return;
+    }
+    if (recordState.isReady) {
+        // Move record into the new lane
+        std::deque<std::string>& readyLane = readyLaneMap[recordState.priority];
+        for (std::deque<std::string>::iterator it = readyLane.begin(); it != readyLane.end(); it++) {
+            if (*it == recordName) {
+                readyLane.erase(it);
+                break;
+            }
+        }
+        if (readyLane.empty()) {
+            readyLaneMap.erase(recordState.priority);
+        }
+        recordState.isReady = false;
+        recordState.priority = priority;
+        makeReadyUnsynchronized(recordName, recordState);
+    }
+    else {
+        recordState.priority = priority;
+    }
+}
+
+int CallbackScheduler::getPriority(const std::string& recordName)
+{
+    epvd::Lock lock(mutex);
+    return getRecordState(recordName).priority;
+}
+
+void CallbackScheduler::push(const std::string& recordName)
+{
+    epicsTimeStamp now;
+    epicsTimeGetCurrent(&now);
+    epvd::Lock lock(mutex);
+    RecordState& recordState = getRecordState(recordName);
+    recordState.pendingTimes.push_back(now);
+    makeReadyUnsynchronized(recordName, recordState);
+}
+
+bool CallbackScheduler::startCallback(std::string& recordName, double timeout)
+{
+    for (int i = 0; i < 2; i++) {
+        {
+            epvd::Lock lock(mutex);
+            if (waitCancelled) {
+                // Wake up remaining callback threads
+                readyEvent.signal();
+                return false;
+            }
+            if (!readyLaneMap.empty()) {
+                // Highest priority lane is the last one
+                std::map<int, std::deque<std::string> >::iterator lit = --readyLaneMap.end();
+                recordName = lit->second.front();
+                lit->second.pop_front();
+                if (lit->second.empty()) {
+                    readyLaneMap.erase(lit);
+                }
+                RecordState& recordState = getRecordState(recordName);
+                recordState.isReady = false;
+                recordState.isInProgress = true;
+                epicsTimeGetCurrent(&recordState.startTime);
+                double latency = epicsTimeDiffInSeconds(&recordState.startTime, &recordState.pendingTimes.front());
+                recordState.pendingTimes.pop_front();
+                recordState.lastLatency = latency;
+                if (recordState.nCallbacks == 0 || latency < recordState.minLatency) {
+                    recordState.minLatency = latency;
+                }
+                if (latency > recordState.maxLatency) {
+                    recordState.maxLatency = latency;
+                }
+                recordState.totalLatency += latency;
+                recordState.nCallbacks++;
+                if (!readyLaneMap.empty()) {
+                    // Other records are ready, make sure another thread
+                    // gets woken up
+                    readyEvent.signal();
+                }
+                return true;
+            }
+        }
+        if (i == 0) {
+            readyEvent.wait(timeout);
+        }
+    }
+    return false;
+}
+
+void CallbackScheduler::callbackDone(const std::string& recordName)
+{
+    epicsTimeStamp now;
+    epicsTimeGetCurrent(&now);
+    epvd::Lock lock(mutex);
+    std::map<std::string, RecordState>::iterator it = recordStateMap.find(recordName);
+    if (it == recordStateMap.end()) {
+        // Record was removed
+        return;
+    }
+    RecordState& recordState = it->second;
+    double runtime = epicsTimeDiffInSeconds(&now, &recordState.startTime);
+    if (runtime > recordState.maxRuntime) {
+        recordState.maxRuntime = runtime;
+    }
+    recordState.totalRuntime += runtime;
+    recordState.isInProgress = false;
+    // Pending callbacks go to the back of the lane
+    makeReadyUnsynchronized(recordName, recordState);
+}
+
+void CallbackScheduler::cancelWait()
+{
+    epvd::Lock lock(mutex);
+    waitCancelled = true;
+    readyEvent.signal();
+}
+
+void CallbackScheduler::resetCancelWait()
+{
+    epvd::Lock lock(mutex);
+    waitCancelled = false;
+}
+
+void CallbackScheduler::clear()
+{
+    epvd::Lock lock(mutex);
+    readyLaneMap.clear();
+    typedef std::map<std::string, RecordState>::iterator MI;
+    for (MI it = recordStateMap.begin(); it != recordStateMap.end(); it++) {
+        it->second.pendingTimes.clear();
+        it->second.isReady = false;
+    }
+}
+
+bp::dict CallbackScheduler::getCounters(const std::string& recordName)
+{
+    RecordState recordState;
+    unsigned int nPending = 0;
+    {
+        epvd::Lock lock(mutex);
+        recordState = getRecordState(recordName);
+        nPending = recordState.pendingTimes.size();
+    }
+    bp::dict counterDict;
+    unsigned int nCallbacks = recordState.nCallbacks;
+    counterDict[PvaPyConstants::NumCallbacksCounterKey] = nCallbacks;
+    counterDict[PvaPyConstants::NumPendingCallbacksCounterKey] = nPending;
+    counterDict[PvaPyConstants::LastCallbackLatencyCounterKey] = recordState.lastLatency;
+    counterDict[PvaPyConstants::MinCallbackLatencyCounterKey] = recordState.minLatency;
+    counterDict[PvaPyConstants::MaxCallbackLatencyCounterKey] = recordState.maxLatency;
+    counterDict[PvaPyConstants::AvgCallbackLatencyCounterKey] = nCallbacks > 0 ? recordState.totalLatency/nCallbacks : 0.0;
+    counterDict[PvaPyConstants::MaxCallbackRuntimeCounterKey] = recordState.maxRuntime;
+    counterDict[PvaPyConstants::AvgCallbackRuntimeCounterKey] = nCallbacks > 0 ? recordState.totalRuntime/nCallbacks : 0.0;
+    return counterDict;
+}
+
+void CallbackScheduler::resetCounters(const std::string& recordName)
+{
+    epvd::Lock lock(mutex);
+    getRecordState(recordName).resetCounters();
+}
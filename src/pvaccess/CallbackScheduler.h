@@ -0,0 +1,85 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef CALLBACK_SCHEDULER_H
+#define CALLBACK_SCHEDULER_H
+
+#include <string>
+#include <deque>
+#include <map>
+#include <epicsEvent.h>
+#include <epicsTime.h>
+#include <pv/pvData.h>
+
+#include "boost/python/dict.hpp"
+
+// Schedules record callbacks for a pool of callback threads. Each
+// record has its own queue of pending callbacks, and callbacks for
+// a given record are never executed concurrently. Records with pending
+// callbacks are served in order of their priority (higher value first),
+// and in round-robin fashion within the same priority, so that a busy
+// record cannot starve other records.
+class CallbackScheduler
+{
+public:
+    POINTER_DEFINITIONS(CallbackScheduler);
+
+    static const int DefaultPriority;
+
+    CallbackScheduler();
+    virtual ~CallbackScheduler();
+
+    void addRecord(const std::string& recordName, int priority=DefaultPriority);
+    void removeRecord(const std::string& recordName);
+    void setPriority(const std::string& recordName, int priority);
+    int getPriority(const std::string& recordName);
+
+    // Called on record write
+    void push(const std::string& recordName);
+
+    // Called by callback threads; returns false if no callback was
+    // ready within timeout, or if wait was cancelled. Each successful
+    // call must be followed by a call to callbackDone().
+    bool startCallback(std::string& recordName, double timeout);
+    void callbackDone(const std::string& recordName);
+    void cancelWait();
+    void resetCancelWait();
+    void clear();
+
+    // Statistics
+    boost::python::dict getCounters(const std::string& recordName);
+    void resetCounters(const std::string& recordName);
+
+private:
+    struct RecordState {
+        RecordState(int priority_=DefaultPriority);
+        void resetCounters();
+
+        int priority;
+        bool isReady;
+        bool isInProgress;
+        std::deque<epicsTimeStamp> pendingTimes;
+        epicsTimeStamp startTime;
+
+        // Statistics counters
+        unsigned int nCallbacks;
+        double lastLatency;
+        double minLatency;
+        double maxLatency;
+        double totalLatency;
+        double maxRuntime;
+        double totalRuntime;
+    };
+
+    RecordState& getRecordState(const std::string& recordName);
+    void makeReadyUnsynchronized(const std::string& recordName, RecordState& recordState);
+
+    epics::pvData::Mutex mutex;
+    epicsEvent readyEvent;
+    bool waitCancelled;
+    std::map<std::string, RecordState> recordStateMap;
+    // Records ready for callback execution, keyed by priority
+    std::map<int, std::deque<std::string> > readyLaneMap;
+};
+
+#endif
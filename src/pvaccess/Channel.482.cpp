@@ -53,6 +53,10 @@ Channel::Channel(const std::string& channelName, PvProvider::ProviderType provid
     , processingThreadRunning(false)
     , pvObjectQueue(DefaultMaxPvObjectQueueLength)
     , useInternalPvObjectQueue(true)
+    , pvStructurePoolPtr(new PvStructurePool())
+    , getOperationCache()
+    , putOperationCache()
+    , putGetOperationCache()
     , subscriberName()
     , subscriber()
     , subscriberMap()
@@ -90,6 +94,10 @@ Channel::Channel(const Channel& c)
     , processingThreadRunning(false)
     , pvObjectQueue(DefaultMaxPvObjectQueueLength)
     , useInternalPvObjectQueue(true)
+    , pvStructurePoolPtr(new PvStructurePool())
+    , getOperationCache()
+    , putOperationCache()
+    , putGetOperationCache()
     , subscriberName()
     , subscriber()
     , subscriberMap()
@@ -127,6 +135,7 @@ Channel::~Channel()
     waitForAsyncPutThreadExit(AsyncRequestThreadWaitTimeout);
     asyncGetRequestQueue.clear();
     asyncPutRequestQueue.clear();
+    clearOperationCache();
     pvaClientChannelPtr.reset();
     //epicsThreadSleep(ShutdownWaitTime);
 }
@@ -214,7 +223,8 @@ PvObject* Channel::get(const std::string& requestDescriptor)
     try {
         pvc::PvaClientGetPtr pvaGet = createGetPtr(requestDescriptor);
         pvaGet->get();
-        pvd::PVStructurePtr pvStructure = pvaGet->getData()->getPVStructure();
+        pvd::PVStructurePtr pvStructure = copyPvStructure(pvaGet->getData()->getPVStructure());
+        releaseGetPtr(requestDescriptor, pvaGet);
         PyEval_RestoreThread(_pyThreadState);
         return new PvObject(pvStructure);
     }
@@ -268,6 +278,7 @@ void Channel::put(const PvObject& pvObject, const std::string& requestDescriptor
         preparePut(pvObject, pvaPut);
         _pyThreadState = PyEval_SaveThread();
         pvaPut->put();
+        releasePutPtr(requestDescriptor, pvaPut);
     }
     catch (std::runtime_error& ex) {
         if (_pyThreadState) {
@@ -293,6 +304,7 @@ void Channel::put(const std::vector<std::string>& values, const std::string& req
         pvaData->putStringArray(values);
         _pyThreadState = PyEval_SaveThread();
         pvaPut->put();
+        releasePutPtr(requestDescriptor, pvaPut);
     }
     catch (std::runtime_error& ex) {
         if (_pyThreadState) {
@@ -329,6 +341,7 @@ void Channel::put(const std::string& value, const std::string& requestDescriptor
         }
         _pyThreadState = PyEval_SaveThread();
         pvaPut->put();
+        releasePutPtr(requestDescriptor, pvaPut);
     }
     catch (std::runtime_error& ex) {
         if (_pyThreadState) {
@@ -498,6 +511,7 @@ void Channel::parsePut(
         pvaData->parse(args);
         _pyThreadState = PyEval_SaveThread();
         pvaPut->put();
+        releasePutPtr(requestDescriptor, pvaPut);
     }
     catch (std::runtime_error& ex) {
         if (_pyThreadState) {
@@ -526,7 +540,8 @@ PvObject* Channel::parsePutGet(
         pvaData->parse(args);
         _pyThreadState = PyEval_SaveThread();
         pvaPutGet->putGet();
-        pvd::PVStructurePtr pvGet = pvaPutGet->getGetData()->getPVStructure();
+        pvd::PVStructurePtr pvGet = copyPvStructure(pvaPutGet->getGetData()->getPVStructure());
+        releasePutGetPtr(requestDescriptor, pvaPutGet);
         PyEval_RestoreThread(_pyThreadState);
         return new PvObject(pvGet);
     }
@@ -551,7 +566,8 @@ PvObject* Channel::putGet(const PvObject& pvObject, const std::string& requestDe
         pvPut << pvObject;
         _pyThreadState = PyEval_SaveThread();
         pvaPutGet->putGet();
-        pvd::PVStructurePtr pvGet = pvaPutGet->getGetData()->getPVStructure();
+        pvd::PVStructurePtr pvGet = copyPvStructure(pvaPutGet->getGetData()->getPVStructure());
+        releasePutGetPtr(requestDescriptor, pvaPutGet);
         PyEval_RestoreThread(_pyThreadState);
         return new PvObject(pvGet);
     }
@@ -578,8 +594,10 @@ PvObject* Channel::putGet(const std::vector<std::string>& values, const std::str
         pvaData->putStringArray(values);
         _pyThreadState = PyEval_SaveThread();
         pvaPutGet->putGet();
+        pvd::PVStructurePtr pvGet = copyPvStructure(pvaPutGet->getGetData()->getPVStructure());
+        releasePutGetPtr(requestDescriptor, pvaPutGet);
         PyEval_RestoreThread(_pyThreadState);
-        return new PvObject(pvaPutGet->getGetData()->getPVStructure());
+        return new PvObject(pvGet);
     }
     catch (std::runtime_error& ex) {
         if (_pyThreadState) {
@@ -615,8 +633,10 @@ PvObject* Channel::putGet(const std::string& value, const std::string& requestDe
         }
         _pyThreadState = PyEval_SaveThread();
         pvaPutGet->putGet();
+        pvd::PVStructurePtr pvGet = copyPvStructure(pvaPutGet->getGetData()->getPVStructure());
+        releasePutGetPtr(requestDescriptor, pvaPutGet);
         PyEval_RestoreThread(_pyThreadState);
-        return new PvObject(pvaPutGet->getGetData()->getPVStructure());
+        return new PvObject(pvGet);
     }
     catch (std::runtime_error& ex) {
         if (_pyThreadState) {
@@ -783,8 +803,10 @@ PvObject* Channel::getPut(const std::string& requestDescriptor)
         pvc::PvaClientPutGetPtr pvaPutGet = createPutGetPtr(requestDescriptor);
         _pyThreadState = PyEval_SaveThread();
         pvaPutGet->getPut();
+        pvd::PVStructurePtr pvPut = copyPvStructure(pvaPutGet->getPutData()->getPVStructure());
+        releasePutGetPtr(requestDescriptor, pvaPutGet);
         PyEval_RestoreThread(_pyThreadState);
-        return new PvObject(pvaPutGet->getPutData()->getPVStructure());
+        return new PvObject(pvPut);
     }
     catch (std::runtime_error& ex) {
         if (_pyThreadState) {
@@ -1010,6 +1032,7 @@ void Channel::invokePyCallback(bp::object& pyCallback, std::string errorMsg)
 void Channel::setMonitorMaxQueueLength(int maxLength)
 {
     pvObjectQueue.setMaxLength(maxLength);
+    pvStructurePoolPtr->setMaxSizeFromQueueLength(maxLength);
     if (useInternalPvObjectQueue && maxLength != 0 && !processingThreadRunning) {
         startProcessingThread();
     }
@@ -1040,6 +1063,9 @@ void Channel::startMonitor(const std::string& requestDescriptor)
     PyGilManager::evalInitThreads();
     this->monitorRequestDescriptor = requestDescriptor;
 
+    // Structure pool is sized according to the monitor queue length
+    pvStructurePoolPtr->setMaxSizeFromQueueLength(pvObjectQueue.getMaxLength());
+
     // Unless internal queue is used, and queue length is not zero, 
     // there is no need for processing thread.
     if (useInternalPvObjectQueue && pvObjectQueue.getMaxLength() != 0 && !processingThreadRunning) {
@@ -1102,6 +1128,7 @@ void Channel::resetMonitorCounters()
         ChannelMonitorRequesterImpl* requesterImpl = static_cast<ChannelMonitorRequesterImpl*>(pvaClientMonitorRequesterPtr.get());
         requesterImpl->resetCounters();
     }
+    pvStructurePoolPtr->resetCounters();
 }
 
 bp::dict Channel::getMonitorCounters()
@@ -1112,6 +1139,44 @@ bp::dict Channel::getMonitorCounters()
         pyDict[PvaPyConstants::NumReceivedCounterKey] = requesterImpl->getNumReceived();
         pyDict[PvaPyConstants::NumOverrunsCounterKey] = requesterImpl->getNumOverruns();
     }
+    pyDict[PvaPyConstants::NumPoolHitsCounterKey] = pvStructurePoolPtr->getNumHits();
+    pyDict[PvaPyConstants::NumPoolMissesCounterKey] = pvStructurePoolPtr->getNumMisses();
+    return pyDict;
+}
+
+void Channel::setOperationCacheSize(int size)
+{
+    getOperationCache.setMaxSize(size);
+    putOperationCache.setMaxSize(size);
+    putGetOperationCache.setMaxSize(size);
+}
+
+int Channel::getOperationCacheSize()
+{
+    return getOperationCache.getMaxSize();
+}
+
+void Channel::clearOperationCache()
+{
+    getOperationCache.clear();
+    putOperationCache.clear();
+    putGetOperationCache.clear();
+}
+
+void Channel::resetOperationCacheCounters()
+{
+    getOperationCache.resetCounters();
+    putOperationCache.resetCounters();
+    putGetOperationCache.resetCounters();
+}
+
+bp::dict Channel::getOperationCacheCounters()
+{
+    bp::dict pyDict;
+    pyDict[PvaPyConstants::NumCacheHitsCounterKey] = getOperationCache.getNumHits() + putOperationCache.getNumHits() + putGetOperationCache.getNumHits();
+    pyDict[PvaPyConstants::NumCacheMissesCounterKey] = getOperationCache.getNumMisses() + putOperationCache.getNumMisses() + putGetOperationCache.getNumMisses();
+    pyDict[PvaPyConstants::NumCacheEvictionsCounterKey] = getOperationCache.getNumEvictions() + putOperationCache.getNumEvictions() + putGetOperationCache.getNumEvictions();
+    pyDict[PvaPyConstants::NumCachedOperationsCounterKey] = getOperationCache.size() + putOperationCache.size() + putGetOperationCache.size();
     return pyDict;
 }
 
@@ -1232,10 +1297,13 @@ void Channel::processMonitorData(pvd::PVStructurePtr pvStructurePtr)
             // Cache structure on first update
             monitorStructurePtr = pvStructurePtr->getStructure();
         }
-        pvd::PVStructurePtr pvStructurePtr2(pvd::getPVDataCreate()->createPVStructure(monitorStructurePtr));
+        // Copy goes into pooled structure, which will be returned to the
+        // pool once the queued object is released
+        pvd::PVStructurePtr pvStructurePtr2(pvStructurePoolPtr->acquire(monitorStructurePtr));
         pvStructurePtr2->copyUnchecked(*pvStructurePtr); // copy
         PvObject pvObject(pvStructurePtr2);
-        bool isPushed = pvObjectQueue.pushIfNotFull(pvObject);
+        // Full queue is handled according to queue overflow policy
+        bool isPushed = pvObjectQueue.pushWithOverflowPolicy(pvObject);
         if (isPushed) {
             logger.trace("Pushed new monitor element into the queue: %d elements have not been processed.", pvObjectQueue.size());
         }
@@ -1283,6 +1351,9 @@ void Channel::onChannelDisconnect()
         callConnectionCallback(false);
     }
     monitorStructurePtr = pvd::StructureConstPtr();
+    pvStructurePoolPtr->clear();
+    // Cached operations must reconnect after channel comes back
+    clearOperationCache();
 }
 
 void Channel::onMonitorOverrun(epics::pvData::BitSetPtr bitSetPtr)
@@ -1349,32 +1420,62 @@ void Channel::determineDefaultRequestDescriptor()
 
 pvc::PvaClientGetPtr Channel::createGetPtr(const std::string& requestDescriptor)
 {
-    if (requestDescriptor == PvaConstants::DefaultKey) {
-        return pvaClientChannelPtr->createGet(defaultRequestDescriptor);
-    }
-    else {
-        return pvaClientChannelPtr->createGet(requestDescriptor);
+    const std::string& request = (requestDescriptor == PvaConstants::DefaultKey) ? defaultRequestDescriptor : requestDescriptor;
+    pvc::PvaClientGetPtr pvaGet = getOperationCache.acquire(request);
+    if (!pvaGet) {
+        pvaGet = pvaClientChannelPtr->createGet(request);
     }
+    return pvaGet;
 }
 
 pvc::PvaClientPutPtr Channel::createPutPtr(const std::string& requestDescriptor)
 {
-    if (requestDescriptor == PvaConstants::DefaultKey) {
-        return pvaClientChannelPtr->createPut(defaultRequestDescriptor);
-    }
-    else {
-        return pvaClientChannelPtr->createPut(requestDescriptor);
+    const std::string& request = (requestDescriptor == PvaConstants::DefaultKey) ? defaultRequestDescriptor : requestDescriptor;
+    pvc::PvaClientPutPtr pvaPut = putOperationCache.acquire(request);
+    if (!pvaPut) {
+        return pvaClientChannelPtr->createPut(request);
     }
+    // Fields modified by the previous put should not be sent again
+    pvaPut->getData()->getChangedBitSet()->clear();
+    return pvaPut;
 }
 
 pvc::PvaClientPutGetPtr Channel::createPutGetPtr(const std::string& requestDescriptor)
 {
-    if (requestDescriptor == PvaConstants::DefaultKey) {
-        return pvaClientChannelPtr->createPutGet(defaultPutGetRequestDescriptor);
-    }
-    else {
-        return pvaClientChannelPtr->createPutGet(requestDescriptor);
+    const std::string& request = (requestDescriptor == PvaConstants::DefaultKey) ? defaultPutGetRequestDescriptor : requestDescriptor;
+    pvc::PvaClientPutGetPtr pvaPutGet = putGetOperationCache.acquire(request);
+    if (!pvaPutGet) {
+        return pvaClientChannelPtr->createPutGet(request);
     }
+    pvaPutGet->getPutData()->getChangedBitSet()->clear();
+    return pvaPutGet;
+}
+
+void Channel::releaseGetPtr(const std::string& requestDescriptor, const pvc::PvaClientGetPtr& pvaGet)
+{
+    const std::string& request = (requestDescriptor == PvaConstants::DefaultKey) ? defaultRequestDescriptor : requestDescriptor;
+    getOperationCache.release(request, pvaGet);
+}
+
+void Channel::releasePutPtr(const std::string& requestDescriptor, const pvc::PvaClientPutPtr& pvaPut)
+{
+    const std::string& request = (requestDescriptor == PvaConstants::DefaultKey) ? defaultRequestDescriptor : requestDescriptor;
+    putOperationCache.release(request, pvaPut);
+}
+
+void Channel::releasePutGetPtr(const std::string& requestDescriptor, const pvc::PvaClientPutGetPtr& pvaPutGet)
+{
+    const std::string& request = (requestDescriptor == PvaConstants::DefaultKey) ? defaultPutGetRequestDescriptor : requestDescriptor;
+    putGetOperationCache.release(request, pvaPutGet);
+}
+
+// Structures owned by cached operations are overwritten by subsequent
+// requests, so objects returned to the caller must hold a copy
+pvd::PVStructurePtr Channel::copyPvStructure(const pvd::PVStructurePtr& pvStructurePtr)
+{
+    pvd::PVStructurePtr pvStructurePtr2(pvd::getPVDataCreate()->createPVStructure(pvStructurePtr->getStructure()));
+    pvStructurePtr2->copyUnchecked(*pvStructurePtr);
+    return pvStructurePtr2;
 }
 
 void Channel::setConnectionCallback(const bp::object& callback)
@@ -1423,7 +1524,8 @@ void Channel::asyncGetThread(Channel* channel)
                 channel->asyncConnect();
                 pvc::PvaClientGetPtr asyncPvaGet = channel->createGetPtr(asyncRequest->requestDescriptor);
                 asyncPvaGet->get();
-                PvObject pvObject(asyncPvaGet->getData()->getPVStructure());
+                PvObject pvObject(copyPvStructure(asyncPvaGet->getData()->getPVStructure()));
+                channel->releaseGetPtr(asyncRequest->requestDescriptor, asyncPvaGet);
                 if (!channel->shutdownInProgress) {
                     logger.trace("Invoking async get callback");
                     channel->invokePyCallback(asyncRequest->pyCallback, pvObject);
@@ -1521,7 +1623,8 @@ void Channel::asyncPutThread(Channel* channel)
                 pvc::PvaClientPutPtr asyncPvaPut = channel->createPutPtr(asyncRequest->requestDescriptor);
                 channel->preparePut(PvObject(asyncRequest->pvStructurePtr), asyncPvaPut);
                 asyncPvaPut->put();
-                PvObject pvObject(asyncPvaPut->getData()->getPVStructure());
+                PvObject pvObject(copyPvStructure(asyncPvaPut->getData()->getPVStructure()));
+                channel->releasePutPtr(asyncRequest->requestDescriptor, asyncPvaPut);
                 if (!channel->shutdownInProgress) {
                     logger.trace("Invoking async put callback");
                     channel->invokePyCallback(asyncRequest->pyCallback, pvObject);
@@ -20,6 +20,8 @@
 #include "ChannelRequesterImpl.h"
 #include "SynchronizedQueue.h"
 #include "PvObjectQueue.h"
+#include "PvStructurePool.h"
+#include "OperationCache.h"
 #include "PvaClient.h"
 #include "CaClient.h"
 #include "PvObject.h"
@@ -153,6 +155,13 @@ public:
     virtual void resetMonitorCounters();
     virtual boost::python::dict getMonitorCounters();
 
+    // Operation cache methods
+    virtual void setOperationCacheSize(int size);
+    virtual int getOperationCacheSize();
+    virtual void clearOperationCache();
+    virtual void resetOperationCacheCounters();
+    virtual boost::python::dict getOperationCacheCounters();
+
     virtual void setTimeout(double timeout);
     virtual double getTimeout() const;
     virtual void setDefaultRequestDescriptor(const std::string& requestDescriptor);
@@ -196,6 +205,10 @@ private:
     epics::pvaClient::PvaClientGetPtr createGetPtr(const std::string& requestDescriptor);
     epics::pvaClient::PvaClientPutPtr createPutPtr(const std::string& requestDescriptor);
     epics::pvaClient::PvaClientPutGetPtr createPutGetPtr(const std::string& requestDescriptor);
+    void releaseGetPtr(const std::string& requestDescriptor, const epics::pvaClient::PvaClientGetPtr& pvaGet);
+    void releasePutPtr(const std::string& requestDescriptor, const epics::pvaClient::PvaClientPutPtr& pvaPut);
+    void releasePutGetPtr(const std::string& requestDescriptor, const epics::pvaClient::PvaClientPutGetPtr& pvaPutGet);
+    static epics::pvData::PVStructurePtr copyPvStructure(const epics::pvData::PVStructurePtr& pvStructurePtr);
 
     void callSubscriber(const std::string& pySubscriberName, boost::python::object& pySubscriber, PvObject& pvObject);
     void invokePyCallback(boost::python::object& pyCallback, PvObject& pvObject);
@@ -215,6 +228,12 @@ private:
     bool processingThreadRunning;
     PvObjectQueue pvObjectQueue;
     bool useInternalPvObjectQueue;
+    PvStructurePool::shared_pointer pvStructurePoolPtr;
+
+    // Connected operation handles, keyed by request descriptor
+    OperationCache<epics::pvaClient::PvaClientGet> getOperationCache;
+    OperationCache<epics::pvaClient::PvaClientPut> putOperationCache;
+    OperationCache<epics::pvaClient::PvaClientPutGet> putGetOperationCache;
 
     // Use for single subscriber only
     std::string subscriberName;
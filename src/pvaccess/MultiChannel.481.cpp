@@ -6,21 +6,27 @@
 #include <iostream>
 
 #include <epicsThread.h>
+#include <pv/ntmultiChannel.h>
 
 #include "MultiChannel.h"
+#include "MultiChannelMonitorRequesterImpl.h"
 #include "PyUtility.h"
 #include "PyPvDataUtility.h"
 #include "PyGilManager.h"
+#include "InvalidState.h"
 
 namespace bp = boost::python;
 namespace epvd = epics::pvData;
 namespace epvac = epics::pvaClient;
+namespace nt = epics::nt;
 
 PvaPyLogger MultiChannel::logger("MultiChannel");
 PvaClient MultiChannel::pvaClient;
 CaClient MultiChannel::caClient;
 const double MultiChannel::DefaultMonitorPollPeriod(1.0);
+const double MultiChannel::DefaultCoalescingWindow(0.0);
 const double MultiChannel::ShutdownWaitTime(0.1);
+const double MultiChannel::EventWaitTime(1.0);
 epvac::PvaClientPtr MultiChannel::pvaClientPtr(epics::pvaClient::PvaClient::get("pva ca"));
 
 MultiChannel::MultiChannel(const bp::list& channelNames, PvProvider::ProviderType providerType_) 
@@ -33,6 +39,18 @@ MultiChannel::MultiChannel(const bp::list& channelNames, PvProvider::ProviderTyp
     , monitorPollPeriod()
     , monitorThreadRunning(false)
     , monitorActive(false)
+    , channelMonitorPtrs()
+    , channelMonitorRequesterPtrs()
+    , channelDataPtrs()
+    , channelDoubleData()
+    , channelChangedFlags()
+    , nChangedChannels(0)
+    , nMonitoredChannels(0)
+    , channelDataMutex()
+    , channelDataEvent()
+    , coalescingWindow(DefaultCoalescingWindow)
+    , waitForAllChannels(false)
+    , useDoubleArray(false)
 {
     nChannels = bp::len(channelNames);
     epvd::shared_vector<std::string> names(nChannels);
@@ -52,6 +70,18 @@ MultiChannel::MultiChannel(const MultiChannel& mc)
     , monitorPollPeriod()
     , monitorThreadRunning(false)
     , monitorActive(false)
+    , channelMonitorPtrs()
+    , channelMonitorRequesterPtrs()
+    , channelDataPtrs()
+    , channelDoubleData()
+    , channelChangedFlags()
+    , nChangedChannels(0)
+    , nMonitoredChannels(0)
+    , channelDataMutex()
+    , channelDataEvent()
+    , coalescingWindow(DefaultCoalescingWindow)
+    , waitForAllChannels(false)
+    , useDoubleArray(false)
 {
 }
 
@@ -219,6 +249,102 @@ void MultiChannel::monitorAsDoubleArray(const bp::object& pySubscriber, double p
     }
 }
 
+void MultiChannel::eventMonitor(const bp::object& pySubscriber)
+{
+    startEventMonitor(pySubscriber, DefaultCoalescingWindow, false, PvaConstants::FieldValueAlarmTimestampRequest, false);
+}
+
+void MultiChannel::eventMonitor(const bp::object& pySubscriber, double coalescingWindow)
+{
+    startEventMonitor(pySubscriber, coalescingWindow, false, PvaConstants::FieldValueAlarmTimestampRequest, false);
+}
+
+void MultiChannel::eventMonitor(const bp::object& pySubscriber, double coalescingWindow, bool waitForAllChannels)
+{
+    startEventMonitor(pySubscriber, coalescingWindow, waitForAllChannels, PvaConstants::FieldValueAlarmTimestampRequest, false);
+}
+
+void MultiChannel::eventMonitor(const bp::object& pySubscriber, double coalescingWindow, bool waitForAllChannels, const std::string& requestDescriptor)
+{
+    startEventMonitor(pySubscriber, coalescingWindow, waitForAllChannels, requestDescriptor, false);
+}
+
+void MultiChannel::eventMonitorAsDoubleArray(const bp::object& pySubscriber)
+{
+    startEventMonitor(pySubscriber, DefaultCoalescingWindow, false, "field(value)", true);
+}
+
+void MultiChannel::eventMonitorAsDoubleArray(const bp::object& pySubscriber, double coalescingWindow)
+{
+    startEventMonitor(pySubscriber, coalescingWindow, false, "field(value)", true);
+}
+
+void MultiChannel::eventMonitorAsDoubleArray(const bp::object& pySubscriber, double coalescingWindow, bool waitForAllChannels)
+{
+    startEventMonitor(pySubscriber, coalescingWindow, waitForAllChannels, "field(value)", true);
+}
+
+void MultiChannel::startEventMonitor(const bp::object& pySubscriber, double coalescingWindow, bool waitForAllChannels, const std::string& requestDescriptor, bool useDoubleArray)
+{
+    try {
+        epvd::Lock lock(monitorMutex);
+        if (monitorThreadRunning) {
+            logger.warn("Monitor is already running.");
+            return;
+        }
+        if (!multiChannelPtr->allConnected()) {
+            multiChannelPtr->connect();
+        }
+        epvac::PvaClientChannelArray channels = multiChannelPtr->getPvaClientChannelArray();
+        epvd::shared_vector<epvd::boolean> isConnected = multiChannelPtr->getIsConnected();
+        unsigned int nConnectedChannels = 0;
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (isConnected[i]) {
+                nConnectedChannels++;
+            }
+        }
+        if (nConnectedChannels == 0) {
+            throw InvalidState("None of the member channels are connected.");
+        }
+        {
+            epvd::Lock dataLock(channelDataMutex);
+            channelDataPtrs = std::vector<epvd::PVStructurePtr>(nChannels);
+            channelDoubleData = std::vector<double>(nChannels, 0);
+            channelChangedFlags = std::vector<bool>(nChannels, false);
+            nChangedChannels = 0;
+            // Channels that are not monitored would never change,
+            // so subscriber waits only for connected channels
+            nMonitoredChannels = nConnectedChannels;
+            this->coalescingWindow = coalescingWindow;
+            this->waitForAllChannels = waitForAllChannels;
+            this->useDoubleArray = useDoubleArray;
+        }
+        monitorActive = true;
+        this->pySubscriber = pySubscriber;
+
+        // Each member channel gets its own monitor, which will
+        // notify us about changes as they happen
+        for (unsigned int i = 0; i < nChannels; i++) {
+            if (!isConnected[i]) {
+                logger.warn("Channel %s is not connected and will not be monitored.", channels[i]->getChannelName().c_str());
+                continue;
+            }
+            epvac::PvaClientMonitorRequesterPtr requesterPtr(new MultiChannelMonitorRequesterImpl(i, this));
+            epvac::PvaClientMonitorPtr monitorPtr = channels[i]->createMonitor(requestDescriptor);
+            monitorPtr->setRequester(requesterPtr);
+            monitorPtr->issueConnect();
+            channelMonitorRequesterPtrs.push_back(requesterPtr);
+            channelMonitorPtrs.push_back(monitorPtr);
+        }
+        epicsThreadCreate("EventMultiChannelMonitorThread", epicsThreadPriorityHigh, epicsThreadGetStackSize(epicsThreadStackSmall), (EPICSTHREADFUNC)eventMonitorThread, this);
+    }
+    catch (std::runtime_error& ex) {
+        monitorActive = false;
+        stopChannelMonitors();
+        throw PvaException(ex.what());
+    }
+}
+
 void MultiChannel::stopMonitor()
 {
     epvd::Lock lock(monitorMutex);
@@ -228,6 +354,140 @@ void MultiChannel::stopMonitor()
     }
     // Monitor thread should exit after monitorActive is set to false
     monitorActive = false;
+    stopChannelMonitors();
+    channelDataEvent.signal();
+}
+
+void MultiChannel::stopChannelMonitors()
+{
+    for (unsigned int i = 0; i < channelMonitorRequesterPtrs.size(); i++) {
+        channelMonitorRequesterPtrs[i]->unlisten();
+    }
+    for (unsigned int i = 0; i < channelMonitorPtrs.size(); i++) {
+        try {
+            channelMonitorPtrs[i]->stop();
+        }
+        catch (std::runtime_error& ex) {
+            logger.warn("Could not stop channel monitor: %s", ex.what());
+        }
+    }
+    channelMonitorPtrs.clear();
+    channelMonitorRequesterPtrs.clear();
+}
+
+void MultiChannel::processChannelMonitorData(unsigned int channelIndex, const epvd::PVStructurePtr& pvStructurePtr)
+{
+    {
+        epvd::Lock lock(channelDataMutex);
+        if (channelIndex >= channelChangedFlags.size()) {
+            return;
+        }
+        if (useDoubleArray) {
+            epvd::PVScalarPtr pvScalarPtr = pvStructurePtr->getSubField<epvd::PVScalar>(PvaConstants::ValueFieldKey);
+            if (!pvScalarPtr) {
+                logger.warn("Channel %d does not have scalar value field.", channelIndex);
+                return;
+            }
+            channelDoubleData[channelIndex] = pvScalarPtr->getAs<double>();
+        }
+        else {
+            // Monitor data is reused, so we must keep a copy
+            channelDataPtrs[channelIndex] = epvd::getPVDataCreate()->createPVStructure(pvStructurePtr);
+        }
+        if (!channelChangedFlags[channelIndex]) {
+            channelChangedFlags[channelIndex] = true;
+            nChangedChannels++;
+        }
+    }
+    channelDataEvent.signal();
+}
+
+bool MultiChannel::getChangedChannelData(std::vector<epvd::PVStructurePtr>& dataPtrs, epvd::shared_vector<double>& doubleData)
+{
+    epvd::Lock lock(channelDataMutex);
+    if (nChangedChannels == 0 || (waitForAllChannels && nChangedChannels < nMonitoredChannels)) {
+        return false;
+    }
+    if (useDoubleArray) {
+        doubleData = epvd::shared_vector<double>(channelDoubleData.begin(), channelDoubleData.end());
+    }
+    else {
+        dataPtrs = channelDataPtrs;
+    }
+    channelChangedFlags.assign(nChannels, false);
+    nChangedChannels = 0;
+    return true;
+}
+
+epvd::PVStructurePtr MultiChannel::createNtMultiChannel(const std::vector<epvd::PVStructurePtr>& dataPtrs)
+{
+    nt::NTMultiChannelPtr ntMultiChannelPtr = nt::NTMultiChannel::createBuilder()->
+        value(epvd::getFieldCreate()->createVariantUnion())->
+        addIsConnected()->
+        addSeverity()->
+        addStatus()->
+        addMessage()->
+        addSecondsPastEpoch()->
+        addNanoseconds()->
+        addUserTag()->
+        create();
+
+    epvd::PVDataCreatePtr pvDataCreate = epvd::getPVDataCreate();
+    epvd::PVUnionArray::svector values(nChannels);
+    epvd::PVBooleanArray::svector isConnected(nChannels, false);
+    epvd::PVIntArray::svector severity(nChannels, 0);
+    epvd::PVIntArray::svector status(nChannels, 0);
+    epvd::PVStringArray::svector message(nChannels);
+    epvd::PVLongArray::svector secondsPastEpoch(nChannels, 0);
+    epvd::PVIntArray::svector nanoseconds(nChannels, 0);
+    epvd::PVIntArray::svector userTag(nChannels, 0);
+    for (unsigned int i = 0; i < nChannels; i++) {
+        values[i] = pvDataCreate->createPVVariantUnion();
+        epvd::PVStructurePtr pvStructurePtr = dataPtrs[i];
+        if (!pvStructurePtr) {
+            continue;
+        }
+        isConnected[i] = true;
+        epvd::PVFieldPtr valuePtr = pvStructurePtr->getSubField(PvaConstants::ValueFieldKey);
+        if (valuePtr) {
+            values[i]->set(pvDataCreate->createPVField(valuePtr));
+        }
+        epvd::PVIntPtr intPtr = pvStructurePtr->getSubField<epvd::PVInt>("alarm.severity");
+        if (intPtr) {
+            severity[i] = intPtr->get();
+        }
+        intPtr = pvStructurePtr->getSubField<epvd::PVInt>("alarm.status");
+        if (intPtr) {
+            status[i] = intPtr->get();
+        }
+        epvd::PVStringPtr stringPtr = pvStructurePtr->getSubField<epvd::PVString>("alarm.message");
+        if (stringPtr) {
+            message[i] = stringPtr->get();
+        }
+        epvd::PVLongPtr longPtr = pvStructurePtr->getSubField<epvd::PVLong>("timeStamp.secondsPastEpoch");
+        if (longPtr) {
+            secondsPastEpoch[i] = longPtr->get();
+        }
+        intPtr = pvStructurePtr->getSubField<epvd::PVInt>("timeStamp.nanoseconds");
+        if (intPtr) {
+            nanoseconds[i] = intPtr->get();
+        }
+        intPtr = pvStructurePtr->getSubField<epvd::PVInt>("timeStamp.userTag");
+        if (intPtr) {
+            userTag[i] = intPtr->get();
+        }
+    }
+    epvd::shared_vector<const std::string> channelNames = multiChannelPtr->getChannelNames();
+    ntMultiChannelPtr->getChannelName()->replace(channelNames);
+    ntMultiChannelPtr->getValue()->replace(freeze(values));
+    ntMultiChannelPtr->getIsConnected()->replace(freeze(isConnected));
+    ntMultiChannelPtr->getSeverity()->replace(freeze(severity));
+    ntMultiChannelPtr->getStatus()->replace(freeze(status));
+    ntMultiChannelPtr->getMessage()->replace(freeze(message));
+    ntMultiChannelPtr->getSecondsPastEpoch()->replace(freeze(secondsPastEpoch));
+    ntMultiChannelPtr->getNanoseconds()->replace(freeze(nanoseconds));
+    ntMultiChannelPtr->getUserTag()->replace(freeze(userTag));
+    return ntMultiChannelPtr->getPVStructure();
 }
 
 void MultiChannel::notifyMonitorThreadExit()
@@ -301,6 +561,51 @@ void MultiChannel::doubleMonitorThread(MultiChannel* multiChannel)
     multiChannel->monitorThreadRunning = false;
 }
 
+void MultiChannel::eventMonitorThread(MultiChannel* multiChannel)
+{
+    multiChannel->monitorThreadRunning = true;
+    logger.debug("Started monitor thread %s", epicsThreadGetNameSelf());
+    while (multiChannel->monitorActive) {
+        // Wait for any of the member channels to change
+        if (!multiChannel->channelDataEvent.wait(EventWaitTime)) {
+            continue;
+        }
+        if (!multiChannel->monitorActive) {
+            break;
+        }
+        if (multiChannel->coalescingWindow > 0) {
+            // Allow other channels to catch up, so that their
+            // changes are delivered in the same subscriber call
+            epicsThreadSleep(multiChannel->coalescingWindow);
+        }
+
+        try {
+            std::vector<epvd::PVStructurePtr> dataPtrs;
+            epvd::shared_vector<double> doubleData;
+            if (!multiChannel->getChangedChannelData(dataPtrs, doubleData)) {
+                continue;
+            }
+            if (multiChannel->useDoubleArray) {
+                epvd::shared_vector<const double> data(freeze(doubleData));
+                multiChannel->callSubscriber(data);
+            }
+            else {
+                PvObject pvObject(multiChannel->createNtMultiChannel(dataPtrs));
+                multiChannel->callSubscriber(pvObject);
+            }
+        }
+        catch (const std::exception& ex) {
+            // Not good.
+            logger.error("Monitor thread caught exception while processing monitor data: %s", ex.what());
+        }
+    }
+
+    // Monitor thread done.
+    logger.debug("Exiting monitor thread %s", epicsThreadGetNameSelf());
+    multiChannel->monitorThreadExitEvent.signal();
+    multiChannel->monitorThreadRunning = false;
+}
+
 void MultiChannel::callSubscriber(PvObject& pvObject)
 {
     // Acquire GIL. This is required because callSubscribers()
@@ -364,3 +669,39 @@ void MultiChannel::callSubscriber(bp::list& pyList)
     // logger.trace("Releasing python GIL after processing multi-channel monitor data");
     PyGilManager::gilStateRelease();
 }
+
+void MultiChannel::callSubscriber(const epvd::shared_vector<const double>& data)
+{
+    // Acquire GIL; python objects can only be created while
+    // holding it.
+    PyGilManager::gilStateEnsure();
+
+    // Call python code
+    try {
+#if defined HAVE_NUMPY_SUPPORT && HAVE_NUMPY_SUPPORT == 1
+        // Array memory is owned by the PV array, so values
+        // are not copied into the NumPy array
+        epvd::PVDoubleArrayPtr pvDoubleArrayPtr = epvd::getPVDataCreate()->createPVScalarArray<epvd::PVDoubleArray>();
+        pvDoubleArrayPtr->replace(data);
+        numpy_::ndarray ndArray = PyPvDataUtility::getScalarArrayAsNumPyArray<epvd::PVDoubleArray, double>(pvDoubleArrayPtr);
+        pySubscriber(ndArray);
+#else
+        bp::list pyList;
+        for(unsigned int i = 0; i < data.size(); i++) {
+            pyList.append(data[i]);
+        }
+        pySubscriber(pyList);
+#endif // if defined HAVE_NUMPY_SUPPORT && HAVE_NUMPY_SUPPORT == 1
+    }
+    catch(const bp::error_already_set&) {
+        logger.error("MultiChannel subscriber raised python exception.");
+        PyErr_Print();
+        PyErr_Clear();
+    }
+    catch (const std::exception& ex) {
+        logger.error(ex.what());
+    }
+
+    // Release GIL.
+    PyGilManager::gilStateRelease();
+}
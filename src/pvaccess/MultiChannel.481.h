@@ -8,6 +8,8 @@
 #include <vector>
 #include <map>
 
+#include <epicsEvent.h>
+
 #include "boost/python/object.hpp"
 #include "boost/python/list.hpp"
 #include "boost/python/dict.hpp"
@@ -28,6 +30,7 @@ class MultiChannel
 {
 public:
     static const double DefaultMonitorPollPeriod;
+    static const double DefaultCoalescingWindow;
 
     MultiChannel(const boost::python::list& channelNames, PvProvider::ProviderType providerType=PvProvider::PvaProviderType);
     MultiChannel(const MultiChannel& multiChannel);
@@ -47,12 +50,26 @@ public:
     virtual void monitorAsDoubleArray(const boost::python::object& pySubscriber);
     virtual void monitorAsDoubleArray(const boost::python::object& pySubscriber, double pollPeriod);
 
+    virtual void eventMonitor(const boost::python::object& pySubscriber);
+    virtual void eventMonitor(const boost::python::object& pySubscriber, double coalescingWindow);
+    virtual void eventMonitor(const boost::python::object& pySubscriber, double coalescingWindow, bool waitForAllChannels);
+    virtual void eventMonitor(const boost::python::object& pySubscriber, double coalescingWindow, bool waitForAllChannels, const std::string& requestDescriptor);
+
+    virtual void eventMonitorAsDoubleArray(const boost::python::object& pySubscriber);
+    virtual void eventMonitorAsDoubleArray(const boost::python::object& pySubscriber, double coalescingWindow);
+    virtual void eventMonitorAsDoubleArray(const boost::python::object& pySubscriber, double coalescingWindow, bool waitForAllChannels);
+
     virtual void stopMonitor();
 
+    // Called by member channel monitor requesters
+    void processChannelMonitorData(unsigned int channelIndex, const epics::pvData::PVStructurePtr& pvStructurePtr);
+
 private:
     static void ntMonitorThread(MultiChannel* multiChannel);
     static void doubleMonitorThread(MultiChannel* multiChannel);
+    static void eventMonitorThread(MultiChannel* multiChannel);
     static const double ShutdownWaitTime;
+    static const double EventWaitTime;
 
     static PvaPyLogger logger;
     static PvaClient pvaClient;
@@ -63,6 +80,12 @@ private:
     void waitForMonitorThreadExit(double timeout);
     void callSubscriber(PvObject& pvObject);
     void callSubscriber(boost::python::list& pyList);
+    void callSubscriber(const epics::pvData::shared_vector<const double>& data);
+
+    void startEventMonitor(const boost::python::object& pySubscriber, double coalescingWindow, bool waitForAllChannels, const std::string& requestDescriptor, bool useDoubleArray);
+    void stopChannelMonitors();
+    bool getChangedChannelData(std::vector<epics::pvData::PVStructurePtr>& dataPtrs, epics::pvData::shared_vector<double>& doubleData);
+    epics::pvData::PVStructurePtr createNtMultiChannel(const std::vector<epics::pvData::PVStructurePtr>& dataPtrs);
 
     unsigned int nChannels;
 
@@ -76,7 +99,23 @@ private:
     bool monitorThreadRunning;
     bool monitorActive;
     boost::python::object pySubscriber;
-    
+
+    // Event driven monitor: one monitor per member channel, latest
+    // data for each channel, and flags for channels changed since the
+    // last subscriber call; only channels connected when monitor was
+    // started are monitored
+    std::vector<epics::pvaClient::PvaClientMonitorPtr> channelMonitorPtrs;
+    std::vector<epics::pvaClient::PvaClientMonitorRequesterPtr> channelMonitorRequesterPtrs;
+    std::vector<epics::pvData::PVStructurePtr> channelDataPtrs;
+    std::vector<double> channelDoubleData;
+    std::vector<bool> channelChangedFlags;
+    unsigned int nChangedChannels;
+    unsigned int nMonitoredChannels;
+    epics::pvData::Mutex channelDataMutex;
+    epicsEvent channelDataEvent;
+    double coalescingWindow;
+    bool waitForAllChannels;
+    bool useDoubleArray;
 };
 
 #endif
@@ -0,0 +1,56 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#if PVA_API_VERSION >= 481
+
+#include <epicsAtomic.h>
+#include "boost/python.hpp"
+#include "MultiChannelMonitorRequesterImpl.h"
+#include "MultiChannel.h"
+
+using namespace epics::pvaClient;
+
+PvaPyLogger MultiChannelMonitorRequesterImpl::logger("MultiChannelMonitorRequesterImpl");
+
+MultiChannelMonitorRequesterImpl::MultiChannelMonitorRequesterImpl(unsigned int channelIndex_, MultiChannel* multiChannel_) : 
+    channelIndex(channelIndex_),
+    multiChannel(multiChannel_),
+    isActive(1),
+    mutex()
+{
+}
+
+MultiChannelMonitorRequesterImpl::~MultiChannelMonitorRequesterImpl()
+{
+}
+
+void MultiChannelMonitorRequesterImpl::event(PvaClientMonitorPtr monitor)
+{
+    try {
+        while (epics::atomic::get(isActive)) {
+            if (!monitor->poll()) {
+                break;
+            }
+            {
+                epics::pvData::Lock lock(mutex);
+                if (epics::atomic::get(isActive)) {
+                    PvaClientMonitorDataPtr pvaData = monitor->getData();
+                    multiChannel->processChannelMonitorData(channelIndex, pvaData->getPVStructure()); 
+                }
+            }
+            monitor->releaseEvent();
+        }
+    }
+    catch (std::runtime_error& ex) {
+        logger.warn(ex.what());
+    }
+}
+
+void MultiChannelMonitorRequesterImpl::unlisten()
+{
+    // Wait for data delivery in progress to complete
+    epics::pvData::Lock lock(mutex);
+    epics::atomic::set(isActive, 0);
+}
+
+#endif // if PVA_API_VERSION >= 481
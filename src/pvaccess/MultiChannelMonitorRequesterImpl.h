@@ -0,0 +1,38 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef MULTI_CHANNEL_MONITOR_REQUESTER_IMPL_H
+#define MULTI_CHANNEL_MONITOR_REQUESTER_IMPL_H
+
+#if PVA_API_VERSION >= 481
+
+#include "pv/pvData.h"
+#include "pv/pvaClient.h"
+#include "PvaPyLogger.h"
+
+class MultiChannel;
+
+// Monitor requester for a single member channel of the multi-channel.
+// Multi-channel object is not referenced after unlisten() returns, so
+// that it can be safely destroyed once its channel monitors are stopped.
+class MultiChannelMonitorRequesterImpl : public epics::pvaClient::PvaClientMonitorRequester
+{
+public:
+    POINTER_DEFINITIONS(MultiChannelMonitorRequesterImpl);
+    MultiChannelMonitorRequesterImpl(unsigned int channelIndex, MultiChannel* multiChannel);
+    virtual ~MultiChannelMonitorRequesterImpl();
+    virtual void event(epics::pvaClient::PvaClientMonitorPtr monitor);
+    virtual void unlisten();
+
+private:
+    static PvaPyLogger logger;
+    unsigned int channelIndex;
+    MultiChannel* multiChannel;
+    int isActive;
+    // Held while delivering data to the multi-channel
+    epics::pvData::Mutex mutex;
+};
+
+#endif // if PVA_API_VERSION >= 481
+
+#endif // MULTI_CHANNEL_MONITOR_REQUESTER_IMPL_H
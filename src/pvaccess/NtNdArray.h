@@ -16,6 +16,7 @@
 #include "PvCodec.h"
 #include "PvDimension.h"
 #include "NtType.h"
+#include "PvObjectPickleSuite.h"
 
 class NtNdArray : public NtType
 {
@@ -83,15 +84,11 @@ public:
     virtual PvDisplay getDisplay() const;
 };
 
-struct NtNdArrayPickleSuite : boost::python::pickle_suite
+struct NtNdArrayPickleSuite : PvObjectPickleSuite
 {
     static boost::python::tuple getinitargs(const NtNdArray& ntNdArray)
     {
-        return boost::python::make_tuple(
-            ntNdArray.getStructureDict(),
-            ntNdArray.get(),
-            NtNdArray::StructureId,
-            NtNdArray::createStructureFieldIdDict());
+        return boost::python::make_tuple();
     }
 };
 
@@ -5,7 +5,9 @@
 #include "NtTable.h"
 #include "StringUtility.h"
 #include "PyPvDataUtility.h"
+#include "PyUtility.h"
 #include "InvalidArgument.h"
+#include "InvalidState.h"
 
 namespace pvd = epics::pvData;
 namespace bp = boost::python;
@@ -71,6 +73,100 @@ bp::dict NtTable::createStructureFieldIdDict()
     return structureFieldIdDict;
 }
 
+// Maps NumPy dtype (kind and item size) into PV scalar type
+PvType::ScalarType NtTable::getScalarTypeFromNumPyDtype(const bp::object& pyDtype)
+{
+    std::string kind = PyUtility::extractValueFromPyObject<std::string>(pyDtype.attr("kind"));
+    int itemSize = PyUtility::extractValueFromPyObject<int>(pyDtype.attr("itemsize"));
+    switch (kind[0]) {
+        case 'b': {
+            return PvType::Boolean;
+        }
+        case 'i': {
+            switch (itemSize) {
+                case 1: return PvType::Byte;
+                case 2: return PvType::Short;
+                case 4: return PvType::Int;
+                case 8: return PvType::Long;
+            }
+            break;
+        }
+        case 'u': {
+            switch (itemSize) {
+                case 1: return PvType::UByte;
+                case 2: return PvType::UShort;
+                case 4: return PvType::UInt;
+                case 8: return PvType::ULong;
+            }
+            break;
+        }
+        case 'f': {
+            switch (itemSize) {
+                case 4: return PvType::Float;
+                case 8: return PvType::Double;
+            }
+            break;
+        }
+        case 'U':
+        case 'S':
+        case 'O': {
+            return PvType::String;
+        }
+    }
+    std::string dtypeName = PyUtility::extractStringFromPyObject(pyDtype);
+    throw InvalidArgument("Unsupported NumPy data type: %s.", dtypeName.c_str());
+}
+
+std::string NtTable::getNumPyDtypeName(PvType::ScalarType scalarType)
+{
+    switch (scalarType) {
+        case PvType::Boolean: return "bool";
+        case PvType::Byte: return "int8";
+        case PvType::UByte: return "uint8";
+        case PvType::Short: return "int16";
+        case PvType::UShort: return "uint16";
+        case PvType::Int: return "int32";
+        case PvType::UInt: return "uint32";
+        case PvType::Long: return "int64";
+        case PvType::ULong: return "uint64";
+        case PvType::Float: return "float32";
+        case PvType::Double: return "float64";
+        default: return "object";
+    }
+}
+
+NtTable NtTable::fromStructuredArray(const bp::object& pyArray)
+{
+    bp::object pyDtype = pyArray.attr("dtype");
+    bp::object pyNames = pyDtype.attr("names");
+    if (PyUtility::isPyNone(pyNames)) {
+        throw InvalidArgument("Input array must be NumPy structured array.");
+    }
+    bp::list labelList;
+    bp::list scalarTypeList;
+    int nFields = bp::len(pyNames);
+    for (int i = 0; i < nFields; i++) {
+        bp::object pyName = pyNames[i];
+        labelList.append(pyName);
+        scalarTypeList.append(getScalarTypeFromNumPyDtype(pyDtype.attr("fields")[pyName][0]));
+    }
+    NtTable ntTable(scalarTypeList);
+    ntTable.setLabels(labelList);
+    for (int i = 0; i < nFields; i++) {
+        ntTable.setColumnFromNumPy(i, pyArray[pyNames[i]]);
+    }
+    return ntTable;
+}
+
+NtTable NtTable::fromDataFrame(const bp::object& pyDataFrame)
+{
+    // Index is not part of the table
+    bp::dict kwargs;
+    kwargs["index"] = false;
+    bp::object pyRecords = pyDataFrame.attr("to_records")(*bp::tuple(), **kwargs);
+    return fromStructuredArray(pyRecords);
+}
+
 std::string NtTable::getColumnName(int column) 
 {
     std::string columnName = "column" + StringUtility::toString(column);
@@ -101,7 +197,8 @@ NtTable::NtTable(const PvObject& pvObject)
 }
 
 NtTable::NtTable(const NtTable& ntTable)
-    : NtType(ntTable.pvStructurePtr)
+    : NtType(ntTable.pvStructurePtr),
+    nColumns(ntTable.nColumns)
 {
 }
 
@@ -124,9 +221,7 @@ void NtTable::setLabels(const bp::list& pyList)
 
 void NtTable::setColumn(int column, const bp::list& pyList)
 {
-    if (column < 0 || column >= nColumns) {
-        throw InvalidArgument("Column index must be in range [0,%d].", nColumns-1);
-    }
+    checkColumnIndex(column);
     std::string columnName = getColumnName(column);
     pvd::PVStructurePtr pvStructurePtr2 = PyPvDataUtility::getStructureField(ValueFieldKey, pvStructurePtr);
     PyPvDataUtility::pyListToScalarArrayField(pyList, columnName, pvStructurePtr2);
@@ -141,15 +236,102 @@ bp::list NtTable::getLabels() const
 
 bp::list NtTable::getColumn(int column) const
 {
-    if (column < 0 || column >= nColumns) {
-        throw InvalidArgument("Column index must be in range [0,%d].", nColumns-1);
-    }
+    checkColumnIndex(column);
     std::string columnName = getColumnName(column);
     bp::list pyList;
     pvd::PVStructurePtr pvStructurePtr2 = PyPvDataUtility::getStructureField(ValueFieldKey, pvStructurePtr);
     PyPvDataUtility::scalarArrayFieldToPyList(columnName, pvStructurePtr2, pyList);
     return pyList;
 }
+
+void NtTable::checkColumnIndex(int column) const
+{
+    if (column < 0 || column >= nColumns) {
+        throw InvalidArgument("Column index must be in range [0,%d].", nColumns-1);
+    }
+}
+
+pvd::ScalarType NtTable::getColumnType(int column) const
+{
+    pvd::PVStructurePtr pvStructurePtr2 = PyPvDataUtility::getStructureField(ValueFieldKey, pvStructurePtr);
+    return PyPvDataUtility::getScalarArrayType(getColumnName(column), pvStructurePtr2);
+}
+
+void NtTable::setColumnFromNumPy(int column, const bp::object& pyObject)
+{
+    checkColumnIndex(column);
+    if (PyUtility::isPyList(pyObject)) {
+        setColumn(column, PyUtility::extractValueFromPyObject<bp::list>(pyObject));
+        return;
+    }
+    std::string columnName = getColumnName(column);
+    pvd::PVStructurePtr pvStructurePtr2 = PyPvDataUtility::getStructureField(ValueFieldKey, pvStructurePtr);
+    PvType::ScalarType scalarType = static_cast<PvType::ScalarType>(getColumnType(column));
+    if (scalarType == PvType::String) {
+        bp::list pyList = PyUtility::extractValueFromPyObject<bp::list>(pyObject.attr("tolist")());
+        PyPvDataUtility::pyListToScalarArrayField(pyList, columnName, pvStructurePtr2);
+        return;
+    }
+#if defined HAVE_NUMPY_SUPPORT && HAVE_NUMPY_SUPPORT == 1
+    // Conversion to contiguous array of the column type is a no-op if
+    // input already matches; column data is then copied in a single pass
+    bp::object pyArray = bp::import("numpy").attr("ascontiguousarray")(pyObject, getNumPyDtypeName(scalarType));
+    PyPvDataUtility::pyObjectToScalarArrayField(pyArray, columnName, pvStructurePtr2);
+#else
+    bp::list pyList = PyUtility::extractValueFromPyObject<bp::list>(pyObject.attr("tolist")());
+    PyPvDataUtility::pyListToScalarArrayField(pyList, columnName, pvStructurePtr2);
+#endif // if defined HAVE_NUMPY_SUPPORT && HAVE_NUMPY_SUPPORT == 1
+}
+
+bp::object NtTable::getColumnAsNumPy(int column) const
+{
+    checkColumnIndex(column);
+    std::string columnName = getColumnName(column);
+    pvd::PVStructurePtr pvStructurePtr2 = PyPvDataUtility::getStructureField(ValueFieldKey, pvStructurePtr);
+    // String columns, or builds without NumPy support, result in list
+    return PyPvDataUtility::getScalarArrayFieldAsPyObject(columnName, pvStructurePtr2, true);
+}
+
+bp::object NtTable::toStructuredArray() const
+{
+    bp::object np = bp::import("numpy");
+    bp::list labelList = getLabels();
+    bool useLabels = (bp::len(labelList) == nColumns);
+    bp::list dtypeList;
+    bp::list columnList;
+    int nRows = 0;
+    for (int column = 0; column < nColumns; column++) {
+        PvType::ScalarType scalarType = static_cast<PvType::ScalarType>(getColumnType(column));
+        bp::object pyColumn;
+        if (scalarType == PvType::String) {
+            pyColumn = np.attr("array")(getColumn(column), "U");
+        }
+        else {
+            pyColumn = np.attr("asarray")(getColumnAsNumPy(column), getNumPyDtypeName(scalarType));
+        }
+        int nValues = bp::len(pyColumn);
+        if (column == 0) {
+            nRows = nValues;
+        }
+        else if (nValues != nRows) {
+            throw InvalidState("Table column %d has %d values, expected %d.", column, nValues, nRows);
+        }
+        bp::object label = useLabels ? bp::object(labelList[column]) : bp::object(getColumnName(column));
+        dtypeList.append(bp::make_tuple(label, pyColumn.attr("dtype")));
+        columnList.append(pyColumn);
+    }
+    bp::object pyArray = np.attr("empty")(nRows, dtypeList);
+    for (int column = 0; column < nColumns; column++) {
+        pyArray[dtypeList[column][0]] = columnList[column];
+    }
+    return pyArray;
+}
+
+bp::object NtTable::toDataFrame() const
+{
+    bp::object pd = bp::import("pandas");
+    return pd.attr("DataFrame")(toStructuredArray());
+}
 void NtTable::setDescriptor(const std::string& descriptor)
 {
     pvStructurePtr->getSubField<pvd::PVString>(DescriptorFieldKey)->put(descriptor);
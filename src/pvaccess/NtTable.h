@@ -26,6 +26,8 @@ public:
     static boost::python::dict createStructureDict(int nColumns, PvType::ScalarType scalarType);
     static boost::python::dict createStructureDict(const boost::python::list& scalarTypePyList);
     static boost::python::dict createStructureFieldIdDict();
+    static NtTable fromStructuredArray(const boost::python::object& pyArray);
+    static NtTable fromDataFrame(const boost::python::object& pyDataFrame);
 
     // Instance methods
     NtTable(int nColumns, PvType::ScalarType scalarType);
@@ -39,6 +41,10 @@ public:
     virtual boost::python::list getLabels() const;
     virtual void setColumn(int column, const boost::python::list& pyList);
     virtual boost::python::list getColumn(int column) const;
+    virtual void setColumnFromNumPy(int column, const boost::python::object& pyObject);
+    virtual boost::python::object getColumnAsNumPy(int column) const;
+    virtual boost::python::object toStructuredArray() const;
+    virtual boost::python::object toDataFrame() const;
     virtual void setDescriptor(const std::string& descriptor);
     virtual std::string getDescriptor() const;
     virtual void setTimeStamp(const PvTimeStamp& pvTimeStamp);
@@ -46,6 +52,11 @@ public:
     virtual void setAlarm(const PvAlarm& pvAlarm);
     virtual PvAlarm getAlarm() const;
 private:
+    static PvType::ScalarType getScalarTypeFromNumPyDtype(const boost::python::object& pyDtype);
+    static std::string getNumPyDtypeName(PvType::ScalarType scalarType);
+    void checkColumnIndex(int column) const;
+    epics::pvData::ScalarType getColumnType(int column) const;
+
     int nColumns;
 };
 
@@ -0,0 +1,177 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef OPERATION_CACHE_H
+#define OPERATION_CACHE_H
+
+#include <list>
+#include <map>
+#include <string>
+#include <pv/pvData.h>
+
+// LRU cache of connected channel operation handles (get, put, putGet),
+// keyed by request descriptor. Handles are checked out of the cache
+// via acquire() and returned via release() once the operation completes,
+// so that a given handle is never used by more than one thread at a time.
+// Handles used by failed operations should not be returned to the cache.
+template <class T>
+class OperationCache
+{
+public:
+    typedef std::tr1::shared_ptr<T> TPtr;
+
+    static const int DefaultMaxSize = 8;
+
+    OperationCache(int maxSize=DefaultMaxSize);
+    virtual ~OperationCache();
+
+    void setMaxSize(int maxSize);
+    int getMaxSize();
+    unsigned int size();
+    void clear();
+
+    // Returns null pointer on cache miss
+    TPtr acquire(const std::string& key);
+    void release(const std::string& key, const TPtr& tPtr);
+
+    // Statistics
+    void resetCounters();
+    unsigned int getNumHits();
+    unsigned int getNumMisses();
+    unsigned int getNumEvictions();
+
+private:
+    typedef std::pair<std::string, TPtr> Entry;
+    typedef std::list<Entry> EntryList;
+    typedef std::map<std::string, typename EntryList::iterator> EntryMap;
+
+    void trim();
+
+    epics::pvData::Mutex mutex;
+    // Most recently used entries are at the front of the list
+    EntryList entryList;
+    EntryMap entryMap;
+    int maxSize;
+    unsigned int nHits;
+    unsigned int nMisses;
+    unsigned int nEvictions;
+};
+
+template <class T>
+OperationCache<T>::OperationCache(int maxSize_)
+    : mutex()
+    , entryList()
+    , entryMap()
+    , maxSize(maxSize_)
+    , nHits(0)
+    , nMisses(0)
+    , nEvictions(0)
+{
+}
+
+template <class T>
+OperationCache<T>::~OperationCache()
+{
+}
+
+template <class T>
+void OperationCache<T>::setMaxSize(int maxSize)
+{
+    epics::pvData::Lock lock(mutex);
+    this->maxSize = maxSize;
+    trim();
+}
+
+template <class T>
+int OperationCache<T>::getMaxSize()
+{
+    return maxSize;
+}
+
+template <class T>
+unsigned int OperationCache<T>::size()
+{
+    epics::pvData::Lock lock(mutex);
+    return entryList.size();
+}
+
+template <class T>
+void OperationCache<T>::clear()
+{
+    epics::pvData::Lock lock(mutex);
+    entryMap.clear();
+    entryList.clear();
+}
+
+template <class T>
+typename OperationCache<T>::TPtr OperationCache<T>::acquire(const std::string& key)
+{
+    epics::pvData::Lock lock(mutex);
+    typename EntryMap::iterator it = entryMap.find(key);
+    if (it == entryMap.end()) {
+        nMisses++;
+        return TPtr();
+    }
+    TPtr tPtr = it->second->second;
+    entryList.erase(it->second);
+    entryMap.erase(it);
+    nHits++;
+    return tPtr;
+}
+
+template <class T>
+void OperationCache<T>::release(const std::string& key, const TPtr& tPtr)
+{
+    epics::pvData::Lock lock(mutex);
+    if (maxSize <= 0 || !tPtr) {
+        return;
+    }
+    typename EntryMap::iterator it = entryMap.find(key);
+    if (it != entryMap.end()) {
+        // Another handle for the same request was returned first
+        entryList.erase(it->second);
+        entryMap.erase(it);
+    }
+    entryList.push_front(Entry(key, tPtr));
+    entryMap[key] = entryList.begin();
+    trim();
+}
+
+template <class T>
+void OperationCache<T>::trim()
+{
+    while (entryList.size() > 0 && entryList.size() > static_cast<unsigned int>(maxSize > 0 ? maxSize : 0)) {
+        entryMap.erase(entryList.back().first);
+        entryList.pop_back();
+        nEvictions++;
+    }
+}
+
+template <class T>
+void OperationCache<T>::resetCounters()
+{
+    epics::pvData::Lock lock(mutex);
+    nHits = 0;
+    nMisses = 0;
+    nEvictions = 0;
+}
+
+template <class T>
+unsigned int OperationCache<T>::getNumHits()
+{
+    return nHits;
+}
+
+template <class T>
+unsigned int OperationCache<T>::getNumMisses()
+{
+    return nMisses;
+}
+
+template <class T>
+unsigned int OperationCache<T>::getNumEvictions()
+{
+    return nEvictions;
+}
+
+#endif
@@ -18,6 +18,8 @@
 #include "PvaConstants.h"
 #include "PvaException.h"
 #include "PyPvDataUtility.h"
+#include "PyGilRelease.h"
+#include "PvSerializationUtility.h"
 #include "StringUtility.h"
 #include "InvalidArgument.h"
 #include "FieldNotFound.h"
@@ -829,6 +831,70 @@ PvObject PvObject::copy()
     return PvObject(pvStructurePtr2); 
 }
 
+void PvObject::release()
+{
+    // Replace underlying structure with an empty one; if the original
+    // structure came from a pool, it will be returned there
+    static pvd::StructureConstPtr emptyStructurePtr(pvd::getFieldCreate()->createFieldBuilder()->createStructure());
+    pvStructurePtr = pvd::getPVDataCreate()->createPVStructure(emptyStructurePtr);
+}
+
+// Binary serialization
+namespace {
+
+pvd::PVStructurePtr deserializeFromPyBuffer(const bp::object& pyObject)
+{
+    Py_buffer pyBuffer;
+    if (PyObject_GetBuffer(pyObject.ptr(), &pyBuffer, PyBUF_SIMPLE) != 0) {
+        PyErr_Clear();
+        throw InvalidArgument("Object does not support buffer protocol.");
+    }
+    pvd::PVStructurePtr pvStructurePtr;
+    try {
+        PyGilRelease gilRelease;
+        pvStructurePtr = PvSerializationUtility::deserialize(static_cast<const char*>(pyBuffer.buf), pyBuffer.len);
+    }
+    catch (...) {
+        PyBuffer_Release(&pyBuffer);
+        throw;
+    }
+    PyBuffer_Release(&pyBuffer);
+    return pvStructurePtr;
+}
+
+} // namespace
+
+PvObject PvObject::fromBytes(const bp::object& pyObject)
+{
+    return PvObject(deserializeFromPyBuffer(pyObject));
+}
+
+bp::object PvObject::toBytes() const
+{
+    std::size_t size;
+    {
+        PyGilRelease gilRelease;
+        size = PvSerializationUtility::getSerializedSize(pvStructurePtr);
+    }
+    PyObject* pyBytes = PyBytes_FromStringAndSize(NULL, size);
+    if (!pyBytes) {
+        bp::throw_error_already_set();
+    }
+    bp::object pyObject = bp::object(bp::handle<>(pyBytes));
+    char* output = PyBytes_AS_STRING(pyBytes);
+    {
+        // Python bytes object is not visible to other threads yet
+        PyGilRelease gilRelease;
+        PvSerializationUtility::serialize(pvStructurePtr, output, size);
+    }
+    return pyObject;
+}
+
+void PvObject::setFromBytes(const bp::object& pyObject)
+{
+    pvStructurePtr = deserializeFromPyBuffer(pyObject);
+}
+
 // Methods specific to Boost NumPy 
 bool PvObject::boostNumPyInitialized(false);
 bool PvObject::initializeBoostNumPy() 
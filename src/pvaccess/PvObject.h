@@ -54,6 +54,14 @@ public:
     // Copy
     PvObject copy();
 
+    // Release underlying structure
+    void release();
+
+    // Binary serialization
+    static PvObject fromBytes(const boost::python::object& pyObject);
+    boost::python::object toBytes() const;
+    void setFromBytes(const boost::python::object& pyObject);
+
     // Dictionary methods
     bool has_key(const std::string& fieldPath) const;
     boost::python::list items() const;
@@ -6,18 +6,49 @@
 
 #include "boost/python/module.hpp"
 #include "boost/python/tuple.hpp"
+#include "boost/python/dict.hpp"
+#include "boost/python/import.hpp"
+#include "boost/python/extract.hpp"
 
 #include "PvObject.h"
 
+// Objects are pickled using binary serialization of the underlying
+// structure; initialization arguments only need to create an instance
+// of the correct class.
 struct PvObjectPickleSuite : boost::python::pickle_suite
 {
+    // Out-of-band buffers are supported starting with protocol 5
+    static const int PickleBufferProtocol = 5;
+
     static boost::python::tuple getinitargs(const PvObject& pvObject)
     {
+        return boost::python::make_tuple(boost::python::dict());
+    }
+
+    static boost::python::tuple getstate(const PvObject& pvObject)
+    {
+        return boost::python::make_tuple(pvObject.toBytes());
+    }
+
+    static void setstate(PvObject& pvObject, boost::python::tuple state)
+    {
+        pvObject.setFromBytes(state[0]);
+    }
+
+    // For protocol 5 serialized object is passed as pickle.PickleBuffer,
+    // which allows pickler to transfer it out-of-band
+    static boost::python::tuple reduceEx(const boost::python::object& pySelf, int protocol)
+    {
+        const PvObject& pvObject = boost::python::extract<const PvObject&>(pySelf);
+        boost::python::object pyBytes = pvObject.toBytes();
+        if (protocol >= PickleBufferProtocol) {
+            pyBytes = boost::python::import("pickle").attr("PickleBuffer")(pyBytes);
+        }
         return boost::python::make_tuple(
-            pvObject.getStructureDict(),
-            pvObject.get());
+            pySelf.attr("__class__"),
+            pySelf.attr("__getinitargs__")(),
+            boost::python::make_tuple(pyBytes));
     }
 };
 
 #endif
-
@@ -2,22 +2,45 @@
 // found in the file LICENSE that is included with the distribution
 
 #include <map>
+#include <vector>
+#include <epicsAtomic.h>
+#include <epicsGuard.h>
 #include "PvObjectQueue.h"
 #include "PyGilManager.h"
 #include "PyUtility.h"
 #include "QueueEmpty.h"
 #include "QueueFull.h"
+#include "InvalidArgument.h"
+#include "InvalidRequest.h"
 
 namespace bp = boost::python;
 
 PvObjectQueue::PvObjectQueue(int maxLength)
     : sQueuePtr(new SynchronizedQueue<PvObject>(maxLength))
+    , rQueuePtr()
+    , putListenerSetPtr(new PutListenerSet())
 {
     PyGilManager::evalInitThreads();
 }
 
+PvObjectQueue::PvObjectQueue(int maxLength, bool lockFree)
+    : sQueuePtr()
+    , rQueuePtr()
+    , putListenerSetPtr(new PutListenerSet())
+{
+    if (lockFree) {
+        rQueuePtr = std::tr1::shared_ptr<SpscRingBuffer<PvObject> >(new SpscRingBuffer<PvObject>(maxLength));
+    }
+    else {
+        sQueuePtr = std::tr1::shared_ptr<SynchronizedQueue<PvObject> >(new SynchronizedQueue<PvObject>(maxLength));
+    }
+    PyGilManager::evalInitThreads();
+}
+
 PvObjectQueue::PvObjectQueue(const PvObjectQueue& q) 
     : sQueuePtr(q.sQueuePtr)
+    , rQueuePtr(q.rQueuePtr)
+    , putListenerSetPtr(q.putListenerSetPtr)
 {
     PyGilManager::evalInitThreads();
 }
@@ -26,9 +49,366 @@ PvObjectQueue::~PvObjectQueue()
 {
 }
 
+//
+// Queue interface, dispatched to either synchronized queue or
+// lock-free ring buffer
+//
+void PvObjectQueue::setMaxLength(int maxLength)
+{
+    if (rQueuePtr) {
+        // Ring buffer cannot be reallocated safely while producer
+        // and consumer threads may be accessing it
+        if (maxLength != rQueuePtr->getMaxLength()) {
+            throw InvalidRequest("Maximum length of lock-free queue cannot be changed.");
+        }
+        return;
+    }
+    else {
+        sQueuePtr->setMaxLength(maxLength);
+    }
+}
+
+int PvObjectQueue::getMaxLength()
+{
+    return rQueuePtr ? rQueuePtr->getMaxLength() : sQueuePtr->getMaxLength();
+}
+
+bool PvObjectQueue::isFull()
+{
+    return rQueuePtr ? rQueuePtr->isFull() : sQueuePtr->isFull();
+}
+
+bool PvObjectQueue::isEmpty()
+{
+    return rQueuePtr ? rQueuePtr->isEmpty() : sQueuePtr->isEmpty();
+}
+
+unsigned int PvObjectQueue::size()
+{
+    return rQueuePtr ? rQueuePtr->size() : sQueuePtr->size();
+}
+
+PvObject PvObjectQueue::back()
+{
+    return rQueuePtr ? rQueuePtr->back() : sQueuePtr->back();
+}
+
+PvObject PvObjectQueue::front()
+{
+    return rQueuePtr ? rQueuePtr->front() : sQueuePtr->front();
+}
+
+PvObject PvObjectQueue::frontAndPop()
+{
+    return rQueuePtr ? rQueuePtr->frontAndPop() : sQueuePtr->frontAndPop();
+}
+
+PvObject PvObjectQueue::frontAndPop(double timeout)
+{
+    return rQueuePtr ? rQueuePtr->frontAndPop(timeout) : sQueuePtr->frontAndPop(timeout);
+}
+
+void PvObjectQueue::pop()
+{
+    if (rQueuePtr) {
+        rQueuePtr->pop();
+    }
+    else {
+        sQueuePtr->pop();
+    }
+}
+
+void PvObjectQueue::push(const PvObject& pvObject)
+{
+    if (rQueuePtr) {
+        rQueuePtr->push(pvObject);
+    }
+    else {
+        sQueuePtr->push(pvObject);
+    }
+    notifyPutListeners();
+}
+
+void PvObjectQueue::push(const PvObject& pvObject, double timeout)
+{
+    if (rQueuePtr) {
+        rQueuePtr->push(pvObject, timeout);
+    }
+    else {
+        sQueuePtr->push(pvObject, timeout);
+    }
+    notifyPutListeners();
+}
+
+bool PvObjectQueue::popIfNotEmpty()
+{
+    return rQueuePtr ? rQueuePtr->popIfNotEmpty() : sQueuePtr->popIfNotEmpty();
+}
+
+bool PvObjectQueue::pushIfNotFull(const PvObject& pvObject)
+{
+    bool isPushed = rQueuePtr ? rQueuePtr->pushIfNotFull(pvObject) : sQueuePtr->pushIfNotFull(pvObject);
+    if (isPushed) {
+        notifyPutListeners();
+    }
+    return isPushed;
+}
+
+bool PvObjectQueue::pushWithOverflowPolicy(const PvObject& pvObject)
+{
+    bool isPushed = rQueuePtr ? rQueuePtr->pushIfNotFull(pvObject) : sQueuePtr->pushWithOverflowPolicy(pvObject);
+    if (isPushed) {
+        notifyPutListeners();
+    }
+    return isPushed;
+}
+
+unsigned int PvObjectQueue::frontAndPopMany(std::vector<PvObject>& pvObjects, int maxItems)
+{
+    return rQueuePtr ? rQueuePtr->frontAndPopMany(pvObjects, maxItems) : sQueuePtr->frontAndPopMany(pvObjects, maxItems);
+}
+
+unsigned int PvObjectQueue::frontAndPopMany(std::vector<PvObject>& pvObjects, int maxItems, double timeout)
+{
+    return rQueuePtr ? rQueuePtr->frontAndPopMany(pvObjects, maxItems, timeout) : sQueuePtr->frontAndPopMany(pvObjects, maxItems, timeout);
+}
+
+unsigned int PvObjectQueue::pushMany(const std::vector<PvObject>& pvObjects)
+{
+    unsigned int nPushed = rQueuePtr ? rQueuePtr->pushMany(pvObjects) : sQueuePtr->pushMany(pvObjects);
+    if (nPushed > 0) {
+        notifyPutListeners();
+    }
+    return nPushed;
+}
+
+void PvObjectQueue::waitForItemPushed(double timeout)
+{
+    if (rQueuePtr) {
+        rQueuePtr->waitForItemPushed(timeout);
+    }
+    else {
+        sQueuePtr->waitForItemPushed(timeout);
+    }
+}
+
+void PvObjectQueue::waitForItemPushedIfEmpty(double timeout)
+{
+    if (rQueuePtr) {
+        rQueuePtr->waitForItemPushedIfEmpty(timeout);
+    }
+    else {
+        sQueuePtr->waitForItemPushedIfEmpty(timeout);
+    }
+}
+
+void PvObjectQueue::waitForItemPopped(double timeout)
+{
+    if (rQueuePtr) {
+        rQueuePtr->waitForItemPopped(timeout);
+    }
+    else {
+        sQueuePtr->waitForItemPopped(timeout);
+    }
+}
+
+void PvObjectQueue::waitForItemPoppedIfFull(double timeout)
+{
+    if (rQueuePtr) {
+        rQueuePtr->waitForItemPoppedIfFull(timeout);
+    }
+    else {
+        sQueuePtr->waitForItemPoppedIfFull(timeout);
+    }
+}
+
+void PvObjectQueue::cancelWaitForItemPushed()
+{
+    if (rQueuePtr) {
+        rQueuePtr->cancelWaitForItemPushed();
+    }
+    else {
+        sQueuePtr->cancelWaitForItemPushed();
+    }
+    notifyPutListeners();
+}
+
+//
+// Waiting on multiple queues
+//
+void PvObjectQueue::addPutListener(epicsEvent* eventPtr)
+{
+    epicsGuard<epicsMutex> guard(putListenerSetPtr->mutex);
+    putListenerSetPtr->eventSet.insert(eventPtr);
+    epics::atomic::increment(putListenerSetPtr->nListeners);
+}
+
+void PvObjectQueue::removePutListener(epicsEvent* eventPtr)
+{
+    epicsGuard<epicsMutex> guard(putListenerSetPtr->mutex);
+    if (putListenerSetPtr->eventSet.erase(eventPtr) > 0) {
+        epics::atomic::decrement(putListenerSetPtr->nListeners);
+    }
+}
+
+void PvObjectQueue::notifyPutListeners()
+{
+    // Avoid locking on every push when nobody is waiting
+    if (!epics::atomic::get(putListenerSetPtr->nListeners)) {
+        return;
+    }
+    epicsGuard<epicsMutex> guard(putListenerSetPtr->mutex);
+    for (std::set<epicsEvent*>::iterator it = putListenerSetPtr->eventSet.begin(); it != putListenerSetPtr->eventSet.end(); ++it) {
+        (*it)->signal();
+    }
+}
+
+bool PvObjectQueue::waitForPutAny(std::vector<PvObjectQueue>& pvObjectQueues, double timeout)
+{
+    // Listener is registered before checking queues, so that
+    // an object pushed in the meantime cannot be missed
+    epicsEvent event;
+    for (std::vector<PvObjectQueue>::iterator it = pvObjectQueues.begin(); it != pvObjectQueues.end(); ++it) {
+        it->addPutListener(&event);
+    }
+    bool hasItems = false;
+    for (std::vector<PvObjectQueue>::iterator it = pvObjectQueues.begin(); it != pvObjectQueues.end() && !hasItems; ++it) {
+        hasItems = !it->isEmpty();
+    }
+    if (!hasItems && timeout > 0) {
+        event.wait(timeout);
+        for (std::vector<PvObjectQueue>::iterator it = pvObjectQueues.begin(); it != pvObjectQueues.end() && !hasItems; ++it) {
+            hasItems = !it->isEmpty();
+        }
+    }
+    for (std::vector<PvObjectQueue>::iterator it = pvObjectQueues.begin(); it != pvObjectQueues.end(); ++it) {
+        it->removePutListener(&event);
+    }
+    return hasItems;
+}
+
+void PvObjectQueue::cancelWaitForItemPopped()
+{
+    if (rQueuePtr) {
+        rQueuePtr->cancelWaitForItemPopped();
+    }
+    else {
+        sQueuePtr->cancelWaitForItemPopped();
+    }
+}
+
+void PvObjectQueue::clear()
+{
+    if (rQueuePtr) {
+        rQueuePtr->clear();
+    }
+    else {
+        sQueuePtr->clear();
+    }
+}
+
+void PvObjectQueue::resetCounters()
+{
+    if (rQueuePtr) {
+        rQueuePtr->resetCounters();
+    }
+    else {
+        sQueuePtr->resetCounters();
+    }
+}
+
+const std::map<std::string,unsigned int>& PvObjectQueue::getCounterMap()
+{
+    return rQueuePtr ? rQueuePtr->getCounterMap() : sQueuePtr->getCounterMap();
+}
+
+void PvObjectQueue::setCounter(const std::string& key, unsigned int value)
+{
+    if (rQueuePtr) {
+        rQueuePtr->setCounter(key, value);
+    }
+    else {
+        sQueuePtr->setCounter(key, value);
+    }
+}
+
+void PvObjectQueue::addToCounter(const std::string& key, unsigned int value)
+{
+    if (rQueuePtr) {
+        rQueuePtr->addToCounter(key, value);
+    }
+    else {
+        sQueuePtr->addToCounter(key, value);
+    }
+}
+
+double PvObjectQueue::getTimeSinceLastPush()
+{
+    return rQueuePtr ? rQueuePtr->getTimeSinceLastPush() : sQueuePtr->getTimeSinceLastPush();
+}
+
+double PvObjectQueue::getTimeSinceLastPop()
+{
+    return rQueuePtr ? rQueuePtr->getTimeSinceLastPop() : sQueuePtr->getTimeSinceLastPop();
+}
+
+//
+// Overflow policy
+//
+void PvObjectQueue::setOverflowPolicy(QueueOverflowPolicy::OverflowPolicy overflowPolicy)
+{
+    setOverflowPolicy(overflowPolicy, "");
+}
+
+void PvObjectQueue::setOverflowPolicy(QueueOverflowPolicy::OverflowPolicy overflowPolicy, const std::string& keyField)
+{
+    if (rQueuePtr) {
+        if (overflowPolicy != QueueOverflowPolicy::RejectNew) {
+            throw InvalidArgument("Lock-free queue supports only reject-new overflow policy.");
+        }
+        return;
+    }
+    if (overflowPolicy == QueueOverflowPolicy::Conflate) {
+        if (keyField.empty()) {
+            throw InvalidArgument("Conflation overflow policy requires key field name.");
+        }
+        sQueuePtr->setOverflowPolicy(overflowPolicy, keyField, &PvObjectQueue::hasSameKey);
+    }
+    else {
+        sQueuePtr->setOverflowPolicy(overflowPolicy);
+    }
+}
+
+QueueOverflowPolicy::OverflowPolicy PvObjectQueue::getOverflowPolicy()
+{
+    return rQueuePtr ? QueueOverflowPolicy::RejectNew : sQueuePtr->getOverflowPolicy();
+}
+
+std::string PvObjectQueue::getOverflowPolicyKey()
+{
+    return rQueuePtr ? "" : sQueuePtr->getOverflowPolicyKey();
+}
+
+bool PvObjectQueue::hasSameKey(const PvObject& queuedPvObject, const PvObject& pvObject, const std::string& keyField)
+{
+    epics::pvData::PVFieldPtr keyFieldPtr = pvObject.getPvStructurePtr()->getSubField(keyField);
+    if (!keyFieldPtr) {
+        return false;
+    }
+    epics::pvData::PVFieldPtr queuedKeyFieldPtr = queuedPvObject.getPvStructurePtr()->getSubField(keyField);
+    if (!queuedKeyFieldPtr) {
+        return false;
+    }
+    return *queuedKeyFieldPtr == *keyFieldPtr;
+}
+
+//
+// Python interface
+//
+
 PvObject PvObjectQueue::get() 
 {
-    return sQueuePtr->frontAndPop();
+    return frontAndPop();
 }
 
 PvObject PvObjectQueue::get(double timeout) 
@@ -36,7 +416,7 @@ PvObject PvObjectQueue::get(double timeout)
     PyThreadState *state;
     state = PyEval_SaveThread();
     try {
-        PvObject pvObject = sQueuePtr->frontAndPop(timeout);
+        PvObject pvObject = frontAndPop(timeout);
         PyEval_RestoreThread(state);
         return pvObject;
     }
@@ -52,15 +432,24 @@ PvObject PvObjectQueue::get(double timeout)
 
 void PvObjectQueue::put(const PvObject& pvObject) 
 {
-    sQueuePtr->push(pvObject);
+    if (getOverflowPolicy() != QueueOverflowPolicy::RejectNew) {
+        pushWithOverflowPolicy(pvObject);
+        return;
+    }
+    push(pvObject);
 }
 
 void PvObjectQueue::put(const PvObject& pvObject, double timeout) 
 {
+    if (getOverflowPolicy() != QueueOverflowPolicy::RejectNew) {
+        // New object is always accepted, no need to wait
+        pushWithOverflowPolicy(pvObject);
+        return;
+    }
     PyThreadState *state;
     state = PyEval_SaveThread();
     try {
-        sQueuePtr->push(pvObject, timeout);
+        push(pvObject, timeout);
         PyEval_RestoreThread(state);
         return;
     }
@@ -74,12 +463,69 @@ void PvObjectQueue::put(const PvObject& pvObject, double timeout)
     }
 }
 
+bp::list PvObjectQueue::getMany(int maxItems) 
+{
+    std::vector<PvObject> pvObjects;
+    frontAndPopMany(pvObjects, maxItems);
+    bp::list pyList;
+    for (std::vector<PvObject>::const_iterator it = pvObjects.begin(); it != pvObjects.end(); it++) {
+        pyList.append(*it);
+    }
+    return pyList;
+}
+
+bp::list PvObjectQueue::getMany(int maxItems, double timeout) 
+{
+    std::vector<PvObject> pvObjects;
+    PyThreadState *state;
+    state = PyEval_SaveThread();
+    try {
+        frontAndPopMany(pvObjects, maxItems, timeout);
+        PyEval_RestoreThread(state);
+    }
+    catch (...) {
+        PyEval_RestoreThread(state);
+        throw PvaException("Unexpected error caught in PvObjectQueue::getMany().");
+    }
+    bp::list pyList;
+    for (std::vector<PvObject>::const_iterator it = pvObjects.begin(); it != pvObjects.end(); it++) {
+        pyList.append(*it);
+    }
+    return pyList;
+}
+
+unsigned int PvObjectQueue::putMany(const bp::list& pvObjectList) 
+{
+    std::vector<PvObject> pvObjects;
+    int listSize = bp::len(pvObjectList);
+    pvObjects.reserve(listSize);
+    for (int i = 0; i < listSize; i++) {
+        bp::extract<PvObject> pvObjectExtract(pvObjectList[i]);
+        if (!pvObjectExtract.check()) {
+            throw InvalidArgument("List element %d is not a PvObject.", i);
+        }
+        pvObjects.push_back(pvObjectExtract());
+    }
+
+    PyThreadState *state;
+    state = PyEval_SaveThread();
+    try {
+        unsigned int nPushed = pushMany(pvObjects);
+        PyEval_RestoreThread(state);
+        return nPushed;
+    }
+    catch (...) {
+        PyEval_RestoreThread(state);
+        throw PvaException("Unexpected error caught in PvObjectQueue::putMany().");
+    }
+}
+
 void PvObjectQueue::waitForPut(double timeout) 
 {
     PyThreadState *state;
     state = PyEval_SaveThread();
     try {
-        sQueuePtr->waitForItemPushed(timeout);
+        waitForItemPushed(timeout);
         PyEval_RestoreThread(state);
     }
     catch (...) {
@@ -88,12 +534,36 @@ void PvObjectQueue::waitForPut(double timeout)
     }
 }
 
+bool PvObjectQueue::waitForPutAny(const bp::list& pvObjectQueueList, double timeout)
+{
+    std::vector<PvObjectQueue> pvObjectQueues;
+    for (int i = 0; i < bp::len(pvObjectQueueList); i++) {
+        bp::extract<PvObjectQueue> pvObjectQueueExtract(pvObjectQueueList[i]);
+        if (!pvObjectQueueExtract.check()) {
+            throw InvalidArgument("List element %d is not a PvObjectQueue.", i);
+        }
+        // Copies share queue storage and listeners with the original
+        pvObjectQueues.push_back(pvObjectQueueExtract());
+    }
+    PyThreadState *state;
+    state = PyEval_SaveThread();
+    try {
+        bool hasItems = waitForPutAny(pvObjectQueues, timeout);
+        PyEval_RestoreThread(state);
+        return hasItems;
+    }
+    catch (...) {
+        PyEval_RestoreThread(state);
+        throw PvaException("Unexpected error caught in PvObjectQueue::waitForPutAny().");
+    }
+}
+
 void PvObjectQueue::waitForGet(double timeout) 
 {
     PyThreadState *state;
     state = PyEval_SaveThread();
     try {
-        sQueuePtr->waitForItemPopped(timeout);
+        waitForItemPopped(timeout);
         PyEval_RestoreThread(state);
     }
     catch (...) {
@@ -104,7 +574,7 @@ void PvObjectQueue::waitForGet(double timeout)
 
 bp::dict PvObjectQueue::getCounters()
 {
-    const std::map<std::string,unsigned int> counterMap = sQueuePtr->getCounterMap();
+    const std::map<std::string,unsigned int> counterMap = getCounterMap();
     return PyUtility::mapToDict<std::string,unsigned int>(counterMap);
 }
 
@@ -4,13 +4,21 @@
 #ifndef PV_OBJECT_QUEUE_H
 #define PV_OBJECT_QUEUE_H
 
+#include <set>
 #include <string>
+#include <vector>
+#include <epicsEvent.h>
+#include <epicsMutex.h>
 
 #include "boost/python/dict.hpp"
+#include "boost/python/list.hpp"
 #include "PvObject.h"
 #include "SynchronizedQueue.h"
+#include "SpscRingBuffer.h"
+#include "QueueOverflowPolicy.h"
 
-// Wrapper around SynchronizedQueue<PvObject>
+// Wrapper around SynchronizedQueue<PvObject>, or around 
+// SpscRingBuffer<PvObject> for lock-free queues
 // We cannot use inheritance because this object
 // may be created in python and passed to the C++ layer, and the same
 // events/mutexes must work both in python and C++
@@ -20,51 +28,84 @@ public:
     POINTER_DEFINITIONS(PvObjectQueue);
 
     PvObjectQueue(int maxLength=SynchronizedQueue<PvObject>::Unlimited);
+    PvObjectQueue(int maxLength, bool lockFree);
     PvObjectQueue(const PvObjectQueue& pvObjectQueue);
     virtual ~PvObjectQueue();
 
-    void setMaxLength(int maxLength) { sQueuePtr->setMaxLength(maxLength); }
-    int getMaxLength() { return sQueuePtr->getMaxLength(); }
-    bool isFull() { return sQueuePtr->isFull(); }
-    bool isEmpty() { return sQueuePtr->isEmpty(); }
-    unsigned int size() { return sQueuePtr->size(); }
-    PvObject back() { return sQueuePtr->back(); } 
-    PvObject front() { return sQueuePtr->front(); } 
-    PvObject frontAndPop() { return sQueuePtr->frontAndPop(); } 
-    PvObject frontAndPop(double timeout) { return sQueuePtr->frontAndPop(timeout); } 
-    void pop() { sQueuePtr->pop(); } 
-    void push(const PvObject& pvObject) { sQueuePtr->push(pvObject); } 
-    void push(const PvObject& pvObject, double timeout) { sQueuePtr->push(pvObject, timeout); } 
-    bool popIfNotEmpty() { return sQueuePtr->popIfNotEmpty(); } 
-    bool pushIfNotFull(const PvObject& pvObject) { return sQueuePtr->pushIfNotFull(pvObject); } 
+    void setMaxLength(int maxLength);
+    int getMaxLength();
+    bool isFull();
+    bool isEmpty();
+    unsigned int size();
+    PvObject back();
+    PvObject front();
+    PvObject frontAndPop();
+    PvObject frontAndPop(double timeout);
+    void pop();
+    void push(const PvObject& pvObject);
+    void push(const PvObject& pvObject, double timeout);
+    bool popIfNotEmpty();
+    bool pushIfNotFull(const PvObject& pvObject);
+    bool pushWithOverflowPolicy(const PvObject& pvObject);
+    unsigned int frontAndPopMany(std::vector<PvObject>& pvObjects, int maxItems);
+    unsigned int frontAndPopMany(std::vector<PvObject>& pvObjects, int maxItems, double timeout);
+    unsigned int pushMany(const std::vector<PvObject>& pvObjects);
 
-    void waitForItemPushed(double timeout) { sQueuePtr->waitForItemPushed(timeout); }
-    void waitForItemPushedIfEmpty(double timeout) { sQueuePtr->waitForItemPushedIfEmpty(timeout); }
-    void waitForItemPopped(double timeout) { sQueuePtr->waitForItemPopped(timeout); }
-    void waitForItemPoppedIfFull(double timeout) { sQueuePtr->waitForItemPoppedIfFull(timeout); }
-    void cancelWaitForItemPushed() { sQueuePtr->cancelWaitForItemPushed(); }
-    void cancelWaitForItemPopped() { sQueuePtr->cancelWaitForItemPopped(); }
-    void clear() { sQueuePtr->clear(); }
+    void waitForItemPushed(double timeout);
+    void waitForItemPushedIfEmpty(double timeout);
+    void waitForItemPopped(double timeout);
+    void waitForItemPoppedIfFull(double timeout);
+    void cancelWaitForItemPushed();
+    void cancelWaitForItemPopped();
+    void clear();
 
-    void resetCounters() { sQueuePtr->resetCounters(); }
-    const std::map<std::string,unsigned int>& getCounterMap() { return sQueuePtr->getCounterMap(); }
-    void setCounter(const std::string& key, unsigned int value) { sQueuePtr->setCounter(key, value); }
-    void addToCounter(const std::string& key, unsigned int value) { sQueuePtr->addToCounter(key, value); }
-    double getTimeSinceLastPush() { return sQueuePtr->getTimeSinceLastPush(); }
-    double getTimeSinceLastPop() { return sQueuePtr->getTimeSinceLastPop(); }
+    void resetCounters();
+    const std::map<std::string,unsigned int>& getCounterMap();
+    void setCounter(const std::string& key, unsigned int value);
+    void addToCounter(const std::string& key, unsigned int value);
+    double getTimeSinceLastPush();
+    double getTimeSinceLastPop();
+    bool isLockFree() { return rQueuePtr.get() != 0; }
+
+    // Lock-free queues support only reject-new overflow policy
+    void setOverflowPolicy(QueueOverflowPolicy::OverflowPolicy overflowPolicy);
+    void setOverflowPolicy(QueueOverflowPolicy::OverflowPolicy overflowPolicy, const std::string& keyField);
+    QueueOverflowPolicy::OverflowPolicy getOverflowPolicy();
+    std::string getOverflowPolicyKey();
 
     // Python interface
     PvObject get();
     PvObject get(double timeout);
     void put(const PvObject& pvObject);
     void put(const PvObject& pvObject, double timeout);
+    boost::python::list getMany(int maxItems);
+    boost::python::list getMany(int maxItems, double timeout);
+    unsigned int putMany(const boost::python::list& pvObjectList);
     virtual void waitForPut(double timeout);
     virtual void waitForGet(double timeout);
-    void cancelWaitForPut() { sQueuePtr->cancelWaitForItemPushed(); }
-    void cancelWaitForGet() { sQueuePtr->cancelWaitForItemPopped(); }
+    static bool waitForPutAny(const boost::python::list& pvObjectQueueList, double timeout);
+    static bool waitForPutAny(std::vector<PvObjectQueue>& pvObjectQueues, double timeout);
+    void cancelWaitForPut() { cancelWaitForItemPushed(); }
+    void cancelWaitForGet() { cancelWaitForItemPopped(); }
     virtual boost::python::dict getCounters();
 private:
+    // Events of threads waiting for a put into any of multiple queues
+    // (see waitForPutAny()); shared between copies of the same queue
+    struct PutListenerSet {
+        PutListenerSet() : mutex(), eventSet(), nListeners(0) {}
+        epicsMutex mutex;
+        std::set<epicsEvent*> eventSet;
+        int nListeners;
+    };
+
+    static bool hasSameKey(const PvObject& queuedPvObject, const PvObject& pvObject, const std::string& keyField);
+    void addPutListener(epicsEvent* eventPtr);
+    void removePutListener(epicsEvent* eventPtr);
+    void notifyPutListeners();
+
     std::tr1::shared_ptr<SynchronizedQueue<PvObject> > sQueuePtr;
+    std::tr1::shared_ptr<SpscRingBuffer<PvObject> > rQueuePtr;
+    std::tr1::shared_ptr<PutListenerSet> putListenerSetPtr;
 };
 
 #endif
@@ -0,0 +1,174 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include <cstring>
+#include <epicsEndian.h>
+
+#include "PvSerializationUtility.h"
+#include "PvaException.h"
+#include "InvalidArgument.h"
+
+namespace pvd = epics::pvData;
+
+namespace PvSerializationUtility
+{
+
+//
+// Serialization control
+//
+SerializableControlImpl::SerializableControlImpl(char* output_, std::size_t outputSize_)
+    : buffer(StagingBufferSize)
+    , output(output_)
+    , outputSize(outputSize_)
+    , size(0)
+{
+}
+
+SerializableControlImpl::~SerializableControlImpl()
+{
+}
+
+void SerializableControlImpl::write(const char* data, std::size_t dataSize)
+{
+    if (output) {
+        if (size + dataSize > outputSize) {
+            throw PvaException("Serialization buffer overflow: cannot write %lu bytes at position %lu (buffer size: %lu).", (unsigned long)dataSize, (unsigned long)size, (unsigned long)outputSize);
+        }
+        std::memcpy(output + size, data, dataSize);
+    }
+    size += dataSize;
+}
+
+void SerializableControlImpl::flushSerializeBuffer()
+{
+    buffer.flip();
+    write(buffer.getBuffer(), buffer.getLimit());
+    buffer.clear();
+}
+
+void SerializableControlImpl::ensureBuffer(std::size_t size)
+{
+    if (buffer.getRemaining() < size) {
+        flushSerializeBuffer();
+    }
+}
+
+void SerializableControlImpl::alignBuffer(std::size_t alignment)
+{
+}
+
+bool SerializableControlImpl::directSerialize(pvd::ByteBuffer* existingBuffer, const char* toSerialize, std::size_t elementCount, std::size_t elementSize)
+{
+    // Array data goes straight into output memory
+    flushSerializeBuffer();
+    write(toSerialize, elementCount*elementSize);
+    return true;
+}
+
+void SerializableControlImpl::cachedSerialize(std::tr1::shared_ptr<const pvd::Field> const& field, pvd::ByteBuffer* buffer)
+{
+    field->serialize(buffer, this);
+}
+
+pvd::ByteBuffer* SerializableControlImpl::getBuffer()
+{
+    return &buffer;
+}
+
+std::size_t SerializableControlImpl::getSize()
+{
+    return size;
+}
+
+//
+// Deserialization control
+//
+DeserializableControlImpl::DeserializableControlImpl()
+    : buffer(NULL)
+{
+}
+
+DeserializableControlImpl::~DeserializableControlImpl()
+{
+}
+
+void DeserializableControlImpl::ensureData(std::size_t size)
+{
+    if (buffer->getRemaining() < size) {
+        throw InvalidArgument("Serialized object is truncated.");
+    }
+}
+
+void DeserializableControlImpl::alignData(std::size_t alignment)
+{
+}
+
+bool DeserializableControlImpl::directDeserialize(pvd::ByteBuffer* existingBuffer, char* deserializeTo, std::size_t elementCount, std::size_t elementSize)
+{
+    // Entire object is already in the buffer, data will be
+    // copied directly into the array
+    return false;
+}
+
+std::tr1::shared_ptr<const pvd::Field> DeserializableControlImpl::cachedDeserialize(pvd::ByteBuffer* buffer)
+{
+    return pvd::getFieldCreate()->deserialize(buffer, this);
+}
+
+void DeserializableControlImpl::setBuffer(pvd::ByteBuffer* buffer)
+{
+    this->buffer = buffer;
+}
+
+//
+// Serialization methods
+//
+std::size_t getSerializedSize(const pvd::PVStructurePtr& pvStructurePtr)
+{
+    return serialize(pvStructurePtr, NULL, 0);
+}
+
+std::size_t serialize(const pvd::PVStructurePtr& pvStructurePtr, char* output, std::size_t outputSize)
+{
+    SerializableControlImpl control(output, outputSize);
+    pvd::ByteBuffer* buffer = control.getBuffer();
+    control.ensureBuffer(HeaderSize);
+    for (std::size_t i = 0; i < sizeof(Magic); i++) {
+        buffer->putByte(Magic[i]);
+    }
+    buffer->putByte(FormatVersion);
+    buffer->putByte(buffer->getByteOrder() == EPICS_ENDIAN_BIG ? 1 : 0);
+    control.cachedSerialize(pvStructurePtr->getStructure(), buffer);
+    pvStructurePtr->serialize(buffer, &control);
+    control.flushSerializeBuffer();
+    return control.getSize();
+}
+
+pvd::PVStructurePtr deserialize(const char* input, std::size_t inputSize)
+{
+    if (inputSize < HeaderSize || std::memcmp(input, Magic, sizeof(Magic)) != 0) {
+        throw InvalidArgument("Input does not contain serialized PV object.");
+    }
+    epicsUInt8 formatVersion = input[sizeof(Magic)];
+    if (formatVersion != FormatVersion) {
+        throw InvalidArgument("Unsupported serialization format version: %d.", int(formatVersion));
+    }
+    int byteOrder = input[sizeof(Magic)+1] ? EPICS_ENDIAN_BIG : EPICS_ENDIAN_LITTLE;
+
+    // Buffer wraps input memory, without copying it
+    pvd::ByteBuffer buffer(const_cast<char*>(input), inputSize, byteOrder);
+    buffer.setPosition(HeaderSize);
+    DeserializableControlImpl control;
+    control.setBuffer(&buffer);
+    pvd::FieldConstPtr fieldPtr = control.cachedDeserialize(&buffer);
+    if (!fieldPtr || fieldPtr->getType() != pvd::structure) {
+        throw InvalidArgument("Serialized object does not contain PV structure.");
+    }
+    pvd::StructureConstPtr structurePtr = std::tr1::static_pointer_cast<const pvd::Structure>(fieldPtr);
+    pvd::PVStructurePtr pvStructurePtr = pvd::getPVDataCreate()->createPVStructure(structurePtr);
+    pvStructurePtr->deserialize(&buffer, &control);
+    return pvStructurePtr;
+}
+
+} // namespace PvSerializationUtility
+
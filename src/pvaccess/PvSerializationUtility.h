@@ -0,0 +1,77 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef PV_SERIALIZATION_UTILITY_H
+#define PV_SERIALIZATION_UTILITY_H
+
+#include <cstddef>
+#include "pv/pvData.h"
+#include "pv/byteBuffer.h"
+#include "pv/serialize.h"
+
+//
+// Binary serialization of PV structures. Serialized object consists of
+// a short header (magic string, format version and byte order),
+// followed by PV structure introspection data and PV structure field
+// values. Scalar arrays are copied directly between PV structure and
+// serialized buffer, without going through intermediate buffers.
+//
+namespace PvSerializationUtility
+{
+
+static const char Magic[] = { 'P', 'V', 'P', 'Y' };
+static const epicsUInt8 FormatVersion = 1;
+static const std::size_t HeaderSize = sizeof(Magic) + 2;
+static const std::size_t StagingBufferSize = 16384;
+
+// Serializes into external memory; if output memory is not provided,
+// control only counts number of serialized bytes
+class SerializableControlImpl : public epics::pvData::SerializableControl
+{
+public:
+    SerializableControlImpl(char* output=NULL, std::size_t outputSize=0);
+    virtual ~SerializableControlImpl();
+
+    virtual void flushSerializeBuffer();
+    virtual void ensureBuffer(std::size_t size);
+    virtual void alignBuffer(std::size_t alignment);
+    virtual bool directSerialize(epics::pvData::ByteBuffer* existingBuffer, const char* toSerialize, std::size_t elementCount, std::size_t elementSize);
+    virtual void cachedSerialize(std::tr1::shared_ptr<const epics::pvData::Field> const& field, epics::pvData::ByteBuffer* buffer);
+
+    epics::pvData::ByteBuffer* getBuffer();
+    std::size_t getSize();
+
+private:
+    void write(const char* data, std::size_t size);
+
+    epics::pvData::ByteBuffer buffer;
+    char* output;
+    std::size_t outputSize;
+    std::size_t size;
+};
+
+// Deserializes from external memory that contains entire serialized object
+class DeserializableControlImpl : public epics::pvData::DeserializableControl
+{
+public:
+    DeserializableControlImpl();
+    virtual ~DeserializableControlImpl();
+
+    virtual void ensureData(std::size_t size);
+    virtual void alignData(std::size_t alignment);
+    virtual bool directDeserialize(epics::pvData::ByteBuffer* existingBuffer, char* deserializeTo, std::size_t elementCount, std::size_t elementSize);
+    virtual std::tr1::shared_ptr<const epics::pvData::Field> cachedDeserialize(epics::pvData::ByteBuffer* buffer);
+
+    void setBuffer(epics::pvData::ByteBuffer* buffer);
+
+private:
+    epics::pvData::ByteBuffer* buffer;
+};
+
+std::size_t getSerializedSize(const epics::pvData::PVStructurePtr& pvStructurePtr);
+std::size_t serialize(const epics::pvData::PVStructurePtr& pvStructurePtr, char* output, std::size_t outputSize);
+epics::pvData::PVStructurePtr deserialize(const char* input, std::size_t inputSize);
+
+} // namespace PvSerializationUtility
+
+#endif
@@ -0,0 +1,138 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include "PvStructurePool.h"
+
+namespace pvd = epics::pvData;
+
+const int PvStructurePool::DefaultMaxSize(64);
+
+// Number of structures held on top of the queue length, to account
+// for objects that are being processed by the consumer
+const int PvStructurePool::ExtraSize(2);
+
+PvStructurePool::PooledPvStructure::PooledPvStructure(const pvd::PVStructurePtr& pvStructurePtr_, const PvStructurePool::weak_pointer& poolPtr_)
+    : pvStructurePtr(pvStructurePtr_)
+    , poolPtr(poolPtr_)
+{
+}
+
+PvStructurePool::PooledPvStructure::~PooledPvStructure()
+{
+    PvStructurePool::shared_pointer pool = poolPtr.lock();
+    if (pool) {
+        pool->release(pvStructurePtr);
+    }
+}
+
+PvStructurePool::PvStructurePool(int maxSize_)
+    : mutex()
+    , structurePtr()
+    , pvStructurePtrs()
+    , maxSize(maxSize_)
+    , nHits(0)
+    , nMisses(0)
+{
+}
+
+PvStructurePool::~PvStructurePool()
+{
+}
+
+void PvStructurePool::setMaxSize(int maxSize)
+{
+    pvd::Lock lock(mutex);
+    this->maxSize = maxSize;
+    if (maxSize >= 0 && pvStructurePtrs.size() > static_cast<unsigned int>(maxSize)) {
+        pvStructurePtrs.resize(maxSize);
+    }
+}
+
+int PvStructurePool::getMaxSize()
+{
+    return maxSize;
+}
+
+void PvStructurePool::setMaxSizeFromQueueLength(int queueLength)
+{
+    if (queueLength > 0) {
+        setMaxSize(queueLength + ExtraSize);
+    }
+    else {
+        setMaxSize(DefaultMaxSize);
+    }
+}
+
+unsigned int PvStructurePool::size()
+{
+    pvd::Lock lock(mutex);
+    return pvStructurePtrs.size();
+}
+
+void PvStructurePool::clear()
+{
+    pvd::Lock lock(mutex);
+    pvStructurePtrs.clear();
+    structurePtr = pvd::StructureConstPtr();
+}
+
+pvd::PVStructurePtr PvStructurePool::acquire(const pvd::StructureConstPtr& structurePtr)
+{
+    pvd::PVStructurePtr pvStructurePtr;
+    {
+        pvd::Lock lock(mutex);
+        if (structurePtr != this->structurePtr) {
+            // Introspection changed, pooled structures cannot be reused
+            pvStructurePtrs.clear();
+            this->structurePtr = structurePtr;
+        }
+        if (!pvStructurePtrs.empty()) {
+            pvStructurePtr = pvStructurePtrs.back();
+            pvStructurePtrs.pop_back();
+            nHits++;
+        }
+        else {
+            nMisses++;
+        }
+    }
+    if (!pvStructurePtr) {
+        pvStructurePtr = pvd::getPVDataCreate()->createPVStructure(structurePtr);
+    }
+
+    // Returned pointer shares ownership with the holder object, which
+    // gives the structure back to the pool once it is no longer used
+    std::tr1::shared_ptr<PooledPvStructure> holderPtr(new PooledPvStructure(pvStructurePtr, shared_from_this()));
+    return pvd::PVStructurePtr(holderPtr, pvStructurePtr.get());
+}
+
+void PvStructurePool::release(const pvd::PVStructurePtr& pvStructurePtr)
+{
+    pvd::Lock lock(mutex);
+    if (pvStructurePtr->getStructure() != structurePtr) {
+        return;
+    }
+    if (maxSize >= 0 && pvStructurePtrs.size() >= static_cast<unsigned int>(maxSize)) {
+        return;
+    }
+    pvStructurePtrs.push_back(pvStructurePtr);
+}
+
+void PvStructurePool::resetCounters()
+{
+    pvd::Lock lock(mutex);
+    nHits = 0;
+    nMisses = 0;
+}
+
+unsigned int PvStructurePool::getNumHits()
+{
+    pvd::Lock lock(mutex);
+    return nHits;
+}
+
+unsigned int PvStructurePool::getNumMisses()
+{
+    pvd::Lock lock(mutex);
+    return nMisses;
+}
+
@@ -0,0 +1,62 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef PV_STRUCTURE_POOL_H
+#define PV_STRUCTURE_POOL_H
+
+#include <vector>
+#include <pv/pvData.h>
+
+// Pool of PV structures used for copies of queued monitor updates.
+// Structures obtained via acquire() are returned to the pool when the
+// last reference to them is dropped (for example, when python releases the
+// corresponding PvObject), so that steady-state streaming does not
+// allocate new structures for every update.
+// Pool must always be created via shared pointer.
+class PvStructurePool : public std::tr1::enable_shared_from_this<PvStructurePool>
+{
+public:
+    POINTER_DEFINITIONS(PvStructurePool);
+
+    static const int DefaultMaxSize;
+    static const int ExtraSize;
+
+    PvStructurePool(int maxSize=DefaultMaxSize);
+    virtual ~PvStructurePool();
+
+    void setMaxSize(int maxSize);
+    int getMaxSize();
+    void setMaxSizeFromQueueLength(int queueLength);
+    unsigned int size();
+    void clear();
+
+    epics::pvData::PVStructurePtr acquire(const epics::pvData::StructureConstPtr& structurePtr);
+
+    // Statistics
+    void resetCounters();
+    unsigned int getNumHits();
+    unsigned int getNumMisses();
+
+private:
+    // Holds pooled structure while it is in use
+    class PooledPvStructure
+    {
+    public:
+        PooledPvStructure(const epics::pvData::PVStructurePtr& pvStructurePtr, const PvStructurePool::weak_pointer& poolPtr);
+        ~PooledPvStructure();
+        epics::pvData::PVStructurePtr pvStructurePtr;
+    private:
+        PvStructurePool::weak_pointer poolPtr;
+    };
+
+    void release(const epics::pvData::PVStructurePtr& pvStructurePtr);
+
+    epics::pvData::Mutex mutex;
+    epics::pvData::StructureConstPtr structurePtr;
+    std::vector<epics::pvData::PVStructurePtr> pvStructurePtrs;
+    int maxSize;
+    unsigned int nHits;
+    unsigned int nMisses;
+};
+
+#endif
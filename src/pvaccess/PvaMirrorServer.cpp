@@ -3,6 +3,7 @@
 
 
 #include <pv/clientFactory.h>
+#include <pv/createRequest.h>
 #include "StringUtility.h"
 #include "PyUtility.h"
 #include "PvaException.h"
@@ -22,6 +23,32 @@ namespace bp = boost::python;
 
 PvaPyLogger MirrorChannelDataProcessor::logger("MirrorChannelDataProcessor");
 
+MirrorChannelDataProcessor::MirrorView::MirrorView(const std::string& viewChannelName_, const std::string& fieldRequestDescriptor_)
+    : viewChannelName(viewChannelName_)
+    , fieldRequestDescriptor(fieldRequestDescriptor_)
+    , pvCopyPtr()
+    , bitSetPtr(new epvd::BitSet())
+{
+}
+
+MirrorChannelDataProcessor::WindowTimerCallback::WindowTimerCallback(const std::tr1::weak_ptr<MirrorChannelDataProcessor>& dataProcessorPtr_)
+    : epvd::TimerCallback()
+    , dataProcessorPtr(dataProcessorPtr_)
+{
+}
+
+void MirrorChannelDataProcessor::WindowTimerCallback::callback()
+{
+    MirrorChannelDataProcessorPtr ptr = dataProcessorPtr.lock();
+    if (ptr) {
+        ptr->flushPendingUpdate();
+    }
+}
+
+void MirrorChannelDataProcessor::WindowTimerCallback::timerStopped()
+{
+}
+
 MirrorChannelDataProcessor::MirrorChannelDataProcessor(PvaMirrorServer* pvaMirrorServer_, const std::string& mirrorChannelName_, unsigned int nSrcMonitors_)
     : pvaMirrorServer(pvaMirrorServer_)
     , mirrorChannelName(mirrorChannelName_)
@@ -29,6 +56,19 @@ MirrorChannelDataProcessor::MirrorChannelDataProcessor(PvaMirrorServer* pvaMirro
     , recordAdded(false)
     , nSrcMonitors(nSrcMonitors_)
     , nUpdatesToSkip(nSrcMonitors)
+    , mirrorViewMap()
+    , maxRate(0)
+    , decimation(1)
+    , forwardLatest(false)
+    , nUpdatesSinceDecimation(0)
+    , hasForwarded(false)
+    , lastForwardTime()
+    , pendingPvStructurePtr()
+    , hasPending(false)
+    , timerPtr()
+    , timerCallbackPtr()
+    , nForwarded(0)
+    , nDropped(0)
 {
 }
 
@@ -37,6 +77,126 @@ MirrorChannelDataProcessor::~MirrorChannelDataProcessor()
     onChannelDisconnect();
 }
 
+void MirrorChannelDataProcessor::setRateLimit(double maxRate_, unsigned int decimation_, bool forwardLatest_, const epvd::Timer::shared_pointer& timerPtr_)
+{
+    epvd::Lock lock(mutex);
+    cancelPendingUpdate();
+    maxRate = maxRate_;
+    decimation = decimation_;
+    forwardLatest = forwardLatest_;
+    nUpdatesSinceDecimation = 0;
+    timerPtr = timerPtr_;
+    if (!timerCallbackPtr) {
+        timerCallbackPtr = epvd::TimerCallback::shared_pointer(new WindowTimerCallback(shared_from_this()));
+    }
+}
+
+void MirrorChannelDataProcessor::forwardUpdate(const epvd::PVStructurePtr& pvStructurePtr)
+{
+    pvaMirrorServer->updateUnchecked(mirrorChannelName, pvStructurePtr);
+    // Views copy only their own fields from the mirror record
+    typedef std::map<std::string, MirrorView::shared_pointer>::iterator MI;
+    for (MI it = mirrorViewMap.begin(); it != mirrorViewMap.end(); it++) {
+        MirrorView::shared_pointer mirrorViewPtr = it->second;
+        if (mirrorViewPtr->pvCopyPtr) {
+            pvaMirrorServer->updateMirrorViewRecord(it->first, mirrorViewPtr->pvCopyPtr, mirrorViewPtr->bitSetPtr);
+        }
+    }
+    epicsTimeGetCurrent(&lastForwardTime);
+    hasForwarded = true;
+    nForwarded++;
+}
+
+void MirrorChannelDataProcessor::cancelPendingUpdate()
+{
+    if (timerPtr && timerCallbackPtr) {
+        timerPtr->cancel(timerCallbackPtr);
+    }
+    if (hasPending) {
+        hasPending = false;
+        nDropped++;
+    }
+}
+
+void MirrorChannelDataProcessor::flushPendingUpdate()
+{
+    epvd::Lock lock(mutex);
+    if (!hasPending || !recordAdded) {
+        return;
+    }
+    hasPending = false;
+    forwardUpdate(pendingPvStructurePtr);
+}
+
+void MirrorChannelDataProcessor::resetCounters()
+{
+    epvd::Lock lock(mutex);
+    nForwarded = 0;
+    nDropped = 0;
+}
+
+void MirrorChannelDataProcessor::getCounters(bp::dict& counterDict)
+{
+    epvd::Lock lock(mutex);
+    counterDict[PvaPyConstants::NumForwardedCounterKey] = nForwarded;
+    counterDict[PvaPyConstants::NumDroppedCounterKey] = nDropped;
+}
+
+void MirrorChannelDataProcessor::createViewRecord(MirrorView& mirrorView)
+{
+    mirrorView.pvCopyPtr = pvaMirrorServer->createMirrorViewRecord(mirrorView.viewChannelName, mirrorChannelName, mirrorView.fieldRequestDescriptor);
+}
+
+void MirrorChannelDataProcessor::removeViewRecord(MirrorView& mirrorView)
+{
+    if (!mirrorView.pvCopyPtr) {
+        return;
+    }
+    if (pvaMirrorServer->hasRecord(mirrorView.viewChannelName)) {
+        try {
+            pvaMirrorServer->removeRecord(mirrorView.viewChannelName);
+        }
+        catch (ObjectNotFound& ex) {
+            // channel is not there any more
+        }
+    }
+    // Mirror record structure may change after reconnect
+    mirrorView.pvCopyPtr.reset();
+}
+
+void MirrorChannelDataProcessor::addView(const std::string& viewChannelName, const std::string& fieldRequestDescriptor)
+{
+    epvd::Lock lock(mutex);
+    MirrorView::shared_pointer mirrorViewPtr(new MirrorView(viewChannelName, fieldRequestDescriptor));
+    if (recordAdded) {
+        // Mirror record structure is known, so invalid requests
+        // can be reported right away
+        createViewRecord(*mirrorViewPtr);
+    }
+    mirrorViewMap[viewChannelName] = mirrorViewPtr;
+}
+
+void MirrorChannelDataProcessor::removeView(const std::string& viewChannelName)
+{
+    epvd::Lock lock(mutex);
+    std::map<std::string, MirrorView::shared_pointer>::iterator it = mirrorViewMap.find(viewChannelName);
+    if (it == mirrorViewMap.end()) {
+        return;
+    }
+    removeViewRecord(*(it->second));
+    mirrorViewMap.erase(it);
+}
+
+void MirrorChannelDataProcessor::removeAllViews()
+{
+    epvd::Lock lock(mutex);
+    typedef std::map<std::string, MirrorView::shared_pointer>::iterator MI;
+    for (MI it = mirrorViewMap.begin(); it != mirrorViewMap.end(); it++) {
+        removeViewRecord(*(it->second));
+    }
+    mirrorViewMap.clear();
+}
+
 void MirrorChannelDataProcessor::processMonitorData(epvd::PVStructurePtr pvStructurePtr)
 {
     epvd::Lock lock(mutex);
@@ -47,6 +207,18 @@ void MirrorChannelDataProcessor::processMonitorData(epvd::PVStructurePtr pvStruc
         pvaMirrorServer->disableRecordProcessing(mirrorChannelName);
         recordAdded = true;
         nUpdatesToSkip--;
+        epicsTimeGetCurrent(&lastForwardTime);
+        hasForwarded = true;
+        nForwarded++;
+        typedef std::map<std::string, MirrorView::shared_pointer>::iterator MI;
+        for (MI it = mirrorViewMap.begin(); it != mirrorViewMap.end(); it++) {
+            try {
+                createViewRecord(*(it->second));
+            }
+            catch (std::exception& ex) {
+                logger.error("Cannot create mirror view record %s: %s", it->first.c_str(), ex.what());
+            }
+        }
     }
     else if (nUpdatesToSkip > 0) {
         // This makes sure we do not generate first update
@@ -54,7 +226,46 @@ void MirrorChannelDataProcessor::processMonitorData(epvd::PVStructurePtr pvStruc
         nUpdatesToSkip--;
     }
     else {
-        pvaMirrorServer->updateUnchecked(mirrorChannelName, pvStructurePtr);
+        if (decimation > 1) {
+            // Forward every n-th update
+            nUpdatesSinceDecimation++;
+            if (nUpdatesSinceDecimation < decimation) {
+                nDropped++;
+                return;
+            }
+            nUpdatesSinceDecimation = 0;
+        }
+        if (maxRate > 0 && hasForwarded) {
+            epicsTimeStamp now;
+            epicsTimeGetCurrent(&now);
+            double period = 1.0/maxRate;
+            double elapsed = epicsTimeDiffInSeconds(&now, &lastForwardTime);
+            if (elapsed < period) {
+                if (!forwardLatest) {
+                    nDropped++;
+                    return;
+                }
+                // Keep the latest update within the window; it will be
+                // forwarded when the window expires
+                if (hasPending) {
+                    nDropped++;
+                }
+                if (!pendingPvStructurePtr || pendingPvStructurePtr->getStructure() != pvStructurePtr->getStructure()) {
+                    pendingPvStructurePtr = epvd::getPVDataCreate()->createPVStructure(pvStructurePtr->getStructure());
+                }
+                pendingPvStructurePtr->copyUnchecked(*pvStructurePtr);
+                hasPending = true;
+                if (!timerPtr->isScheduled(timerCallbackPtr)) {
+                    timerPtr->scheduleAfterDelay(timerCallbackPtr, period-elapsed);
+                }
+                return;
+            }
+        }
+        if (hasPending) {
+            // Pending update is older than this one
+            cancelPendingUpdate();
+        }
+        forwardUpdate(pvStructurePtr);
     }
 }
 
@@ -65,7 +276,14 @@ void MirrorChannelDataProcessor::onChannelConnect()
 void MirrorChannelDataProcessor::onChannelDisconnect()
 {
     epvd::Lock lock(mutex);
+    cancelPendingUpdate();
+    hasForwarded = false;
+    nUpdatesSinceDecimation = 0;
     if (recordAdded) {
+        typedef std::map<std::string, MirrorView::shared_pointer>::iterator MI;
+        for (MI it = mirrorViewMap.begin(); it != mirrorViewMap.end(); it++) {
+            removeViewRecord(*(it->second));
+        }
         if (pvaMirrorServer->hasRecord(mirrorChannelName)) {
             try {
                 pvaMirrorServer->removeRecord(mirrorChannelName);
@@ -242,12 +460,18 @@ PvaPyLogger PvaMirrorServer::logger("PvaMirrorServer");
 PvaMirrorServer::PvaMirrorServer() 
     : PvaServer()
     , mirrorChannelMonitorMap()
+    , mirrorDataProcessorMap()
+    , mirrorViewMap()
+    , timerPtr()
 {
 }
 
 PvaMirrorServer::PvaMirrorServer(const PvaMirrorServer& pvaMirrorServer)
     : PvaServer()
     , mirrorChannelMonitorMap()
+    , mirrorDataProcessorMap()
+    , mirrorViewMap()
+    , timerPtr()
 {
 }
 
@@ -256,6 +480,9 @@ PvaMirrorServer::~PvaMirrorServer()
     removeAllMirrorRecords();
     removeAllRecords();
     stop();
+    if (timerPtr) {
+        timerPtr->close();
+    }
 }
 
 void PvaMirrorServer::addMirrorRecord(const std::string& mirrorChannelName, const std::string& srcChannelName, PvProvider::ProviderType srcProviderType)
@@ -283,10 +510,14 @@ void PvaMirrorServer::addMirrorRecord(const std::string& mirrorChannelName, cons
     if (it != mirrorChannelMonitorMap.end()) {
         throw ObjectAlreadyExists("Master database already has mirror record for channel: " + mirrorChannelName);
     }
+    if (hasMirrorView(mirrorChannelName)) {
+        throw ObjectAlreadyExists("Master database already has mirror view for channel: " + mirrorChannelName);
+    }
     if (nSrcMonitors < 1) {
         throw InvalidRequest("Number of source listeners for channel " + mirrorChannelName + " cannot be less than 1");
     }
     MirrorChannelDataProcessorPtr dataProcessorPtr = MirrorChannelDataProcessorPtr(new MirrorChannelDataProcessor(this, mirrorChannelName, nSrcMonitors));
+    mirrorDataProcessorMap[mirrorChannelName] = dataProcessorPtr;
     for (unsigned int i = 0; i < nSrcMonitors; i++) {
         MirrorChannelMonitorPtr mirrorChannelMonitorPtr = MirrorChannelMonitorPtr(new MirrorChannelMonitor(srcChannelName, srcProviderType, srcQueueSize, srcFieldRequestDescriptor, dataProcessorPtr));
         mirrorChannelMonitorMap.insert(std::make_pair(mirrorChannelName, mirrorChannelMonitorPtr));
@@ -301,6 +532,23 @@ void PvaMirrorServer::removeMirrorRecord(const std::string& mirrorChannelName)
     if (it == mirrorChannelMonitorMap.end()) {
         throw ObjectNotFound("Master database does not have mirror record for channel: " + mirrorChannelName);
     }
+
+    // Remove derived views first
+    std::map<std::string, MirrorChannelDataProcessorPtr>::iterator pit = mirrorDataProcessorMap.find(mirrorChannelName);
+    if (pit != mirrorDataProcessorMap.end()) {
+        pit->second->removeAllViews();
+        mirrorDataProcessorMap.erase(pit);
+    }
+    for (std::map<std::string, std::string>::iterator vit = mirrorViewMap.begin(); vit != mirrorViewMap.end(); ) {
+        if (vit->second == mirrorChannelName) {
+            logger.debug("Removing mirror view " + vit->first);
+            mirrorViewMap.erase(vit++);
+        }
+        else {
+            vit++;
+        }
+    }
+
     std::string srcChannelName;
     for (it = mirrorChannelMonitorMap.begin(); it != mirrorChannelMonitorMap.end(); ) {
         MirrorChannelMonitorPtr mirrorChannelMonitor = it->second;
@@ -349,10 +597,15 @@ void PvaMirrorServer::resetMirrorRecordCounters(const std::string& mirrorChannel
     if (it == mirrorChannelMonitorMap.end()) {
         throw ObjectNotFound("Master database does not have mirror record for channel: " + mirrorChannelName);
     }
-    for (it = mirrorChannelMonitorMap.begin(); it != mirrorChannelMonitorMap.end(); it++) {
+    MI end = mirrorChannelMonitorMap.upper_bound(mirrorChannelName);
+    for (; it != end; it++) {
         MirrorChannelMonitorPtr mirrorChannelMonitor = it->second;
         mirrorChannelMonitor->resetMonitorCounters();
     }
+    std::map<std::string, MirrorChannelDataProcessorPtr>::iterator pit = mirrorDataProcessorMap.find(mirrorChannelName);
+    if (pit != mirrorDataProcessorMap.end()) {
+        pit->second->resetCounters();
+    }
 }
 
 bp::dict PvaMirrorServer::getMirrorRecordCounters(const std::string& mirrorChannelName)
@@ -365,7 +618,8 @@ bp::dict PvaMirrorServer::getMirrorRecordCounters(const std::string& mirrorChann
     if (it == mirrorChannelMonitorMap.end()) {
         throw ObjectNotFound("Master database does not have mirror record for channel: " + mirrorChannelName);
     }
-    for (it = mirrorChannelMonitorMap.begin(); it != mirrorChannelMonitorMap.end(); it++) {
+    MI end = mirrorChannelMonitorMap.upper_bound(mirrorChannelName);
+    for (; it != end; it++) {
         MirrorChannelMonitorPtr mirrorChannelMonitor = it->second;
         bp::dict listenerDict = mirrorChannelMonitor->getMonitorCounters();
         nReceived += PyUtility::extractKeyValueFromPyDict<int>(PvaPyConstants::NumReceivedCounterKey, listenerDict, 0);
@@ -379,6 +633,10 @@ bp::dict PvaMirrorServer::getMirrorRecordCounters(const std::string& mirrorChann
     bp::dict recordDict;
     recordDict[PvaPyConstants::NumReceivedCounterKey] = nReceived;
     recordDict[PvaPyConstants::NumOverrunsCounterKey] = nOverruns;
+    std::map<std::string, MirrorChannelDataProcessorPtr>::iterator pit = mirrorDataProcessorMap.find(mirrorChannelName);
+    if (pit != mirrorDataProcessorMap.end()) {
+        pit->second->getCounters(recordDict);
+    }
     return recordDict;
 }
 
@@ -392,3 +650,97 @@ bp::list PvaMirrorServer::getMirrorRecordNames()
     return mirrorRecordNames;
 }
 
+
+void PvaMirrorServer::addMirrorView(const std::string& viewChannelName, const std::string& mirrorChannelName, const std::string& fieldRequestDescriptor)
+{
+    if (hasRecord(viewChannelName) || hasMirrorRecord(viewChannelName)) {
+        throw ObjectAlreadyExists("Master database already has record for channel: " + viewChannelName);
+    }
+    if (hasMirrorView(viewChannelName)) {
+        throw ObjectAlreadyExists("Master database already has mirror view for channel: " + viewChannelName);
+    }
+    std::map<std::string, MirrorChannelDataProcessorPtr>::iterator it = mirrorDataProcessorMap.find(mirrorChannelName);
+    if (it == mirrorDataProcessorMap.end()) {
+        throw ObjectNotFound("Master database does not have mirror record for channel: " + mirrorChannelName);
+    }
+    it->second->addView(viewChannelName, fieldRequestDescriptor);
+    mirrorViewMap[viewChannelName] = mirrorChannelName;
+    logger.debug("Added mirror view: " + viewChannelName + " (mirror channel: " + mirrorChannelName + "; field request descriptor: " + fieldRequestDescriptor + ")");
+}
+
+void PvaMirrorServer::removeMirrorView(const std::string& viewChannelName)
+{
+    std::map<std::string, std::string>::iterator it = mirrorViewMap.find(viewChannelName);
+    if (it == mirrorViewMap.end()) {
+        throw ObjectNotFound("Master database does not have mirror view for channel: " + viewChannelName);
+    }
+    std::map<std::string, MirrorChannelDataProcessorPtr>::iterator pit = mirrorDataProcessorMap.find(it->second);
+    if (pit != mirrorDataProcessorMap.end()) {
+        pit->second->removeView(viewChannelName);
+    }
+    mirrorViewMap.erase(it);
+    logger.debug("Removed mirror view: " + viewChannelName);
+}
+
+bool PvaMirrorServer::hasMirrorView(const std::string& viewChannelName)
+{
+    if (mirrorViewMap.find(viewChannelName) != mirrorViewMap.end()) {
+        return true;
+    }
+    return false;
+}
+
+bp::list PvaMirrorServer::getMirrorViewNames()
+{
+    bp::list mirrorViewNames;
+    typedef std::map<std::string, std::string>::iterator MI;
+    for (MI it = mirrorViewMap.begin(); it != mirrorViewMap.end(); it++) {
+        mirrorViewNames.append(it->first);
+    }
+    return mirrorViewNames;
+}
+
+void PvaMirrorServer::setMirrorRecordRateLimit(const std::string& mirrorChannelName, double maxRate, unsigned int decimation, bool forwardLatest)
+{
+    std::map<std::string, MirrorChannelDataProcessorPtr>::iterator it = mirrorDataProcessorMap.find(mirrorChannelName);
+    if (it == mirrorDataProcessorMap.end()) {
+        throw ObjectNotFound("Master database does not have mirror record for channel: " + mirrorChannelName);
+    }
+    if (maxRate < 0) {
+        throw InvalidRequest("Maximum update rate for channel " + mirrorChannelName + " cannot be negative");
+    }
+    if (decimation < 1) {
+        throw InvalidRequest("Decimation factor for channel " + mirrorChannelName + " cannot be less than 1");
+    }
+    if (maxRate > 0 && forwardLatest && !timerPtr) {
+        timerPtr = epvd::Timer::shared_pointer(new epvd::Timer("PvaMirrorServerTimer", epvd::lowPriority));
+    }
+    it->second->setRateLimit(maxRate, decimation, forwardLatest, timerPtr);
+    logger.debug("Set rate limit for mirror record: " + mirrorChannelName + " (maximum rate: " + StringUtility::toString<double>(maxRate) + "; decimation: " + StringUtility::toString<unsigned int>(decimation) + "; forward latest: " + StringUtility::toString<bool>(forwardLatest) + ")");
+}
+
+epics::pvCopy::PVCopyPtr PvaMirrorServer::createMirrorViewRecord(const std::string& viewChannelName, const std::string& mirrorChannelName, const std::string& fieldRequestDescriptor)
+{
+    std::string request = "field(" + fieldRequestDescriptor + ")";
+    epvd::PVStructurePtr pvRequest = epvd::CreateRequest::create()->createRequest(request);
+    if (!pvRequest) {
+        throw InvalidRequest("Invalid field request descriptor for mirror view " + viewChannelName + ": " + fieldRequestDescriptor);
+    }
+    // Field mapping between mirror and view record is built only once
+    epics::pvCopy::PVCopyPtr pvCopyPtr = epics::pvCopy::PVCopy::create(findRecord(mirrorChannelName)->getPVStructure(), pvRequest, "");
+    if (!pvCopyPtr) {
+        throw InvalidRequest("Mirror record " + mirrorChannelName + " does not contain fields requested for mirror view " + viewChannelName + ": " + fieldRequestDescriptor);
+    }
+    epvd::PVStructurePtr viewPvStructurePtr = pvCopyPtr->createPVStructure();
+    epvd::BitSetPtr bitSetPtr(new epvd::BitSet());
+    pvCopyPtr->initCopy(viewPvStructurePtr, bitSetPtr);
+    addRecord(viewChannelName, viewPvStructurePtr);
+    disableRecordProcessing(viewChannelName);
+    return pvCopyPtr;
+}
+
+void PvaMirrorServer::updateMirrorViewRecord(const std::string& viewChannelName, const epics::pvCopy::PVCopyPtr& pvCopyPtr, const epvd::BitSetPtr& bitSetPtr)
+{
+    bitSetPtr->clear();
+    findRecord(viewChannelName)->updateFromCopy(pvCopyPtr, bitSetPtr);
+}
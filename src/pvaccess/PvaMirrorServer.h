@@ -6,8 +6,14 @@
 
 #include <string>
 #include <map>
+#include <list>
 #include <boost/python/list.hpp>
+#include <boost/python/dict.hpp>
+#include <epicsTime.h>
 #include <pv/pvData.h>
+#include <pv/bitSet.h>
+#include <pv/timer.h>
+#include <pv/pvStructureCopy.h>
 #include <pv/pvAccess.h>
 #include <pv/serverContext.h>
 #include <pv/pvaClient.h>
@@ -28,9 +34,13 @@ class MirrorChannelMonitor;
 typedef std::tr1::shared_ptr<MirrorChannelMonitor> MirrorChannelMonitorPtr;
  
 // This class updates PVA server record and handles source channel connection
-// changes
+// changes. It also updates derived mirror views, i.e. records containing
+// a subset of the mirror record fields. Field mapping for each view is
+// built only once, after the mirror record structure becomes known.
+// Source updates can be decimated and rate limited before they are
+// copied into the mirror record.
 
-class MirrorChannelDataProcessor : public ChannelMonitorDataProcessor
+class MirrorChannelDataProcessor : public ChannelMonitorDataProcessor, public std::tr1::enable_shared_from_this<MirrorChannelDataProcessor>
 {
 public:
     MirrorChannelDataProcessor(PvaMirrorServer* pvaMirrorServer, const std::string& mirrorChannelName, unsigned int nSrcMonitors);
@@ -40,7 +50,42 @@ public:
     virtual void onChannelConnect();
     virtual void onChannelDisconnect();
 
+    virtual void addView(const std::string& viewChannelName, const std::string& fieldRequestDescriptor);
+    virtual void removeView(const std::string& viewChannelName);
+    virtual void removeAllViews();
+
+    virtual void setRateLimit(double maxRate, unsigned int decimation, bool forwardLatest, const epics::pvData::Timer::shared_pointer& timerPtr);
+    virtual void flushPendingUpdate();
+    virtual void resetCounters();
+    virtual void getCounters(boost::python::dict& counterDict);
+
 private:
+    // Forwards pending update at the end of the rate limiting window
+    class WindowTimerCallback : public epics::pvData::TimerCallback
+    {
+    public:
+        WindowTimerCallback(const std::tr1::weak_ptr<MirrorChannelDataProcessor>& dataProcessorPtr);
+        virtual void callback();
+        virtual void timerStopped();
+    private:
+        std::tr1::weak_ptr<MirrorChannelDataProcessor> dataProcessorPtr;
+    };
+
+    struct MirrorView {
+        POINTER_DEFINITIONS(MirrorView);
+        MirrorView(const std::string& viewChannelName, const std::string& fieldRequestDescriptor);
+
+        std::string viewChannelName;
+        std::string fieldRequestDescriptor;
+        epics::pvCopy::PVCopyPtr pvCopyPtr;
+        epics::pvData::BitSetPtr bitSetPtr;
+    };
+
+    void createViewRecord(MirrorView& mirrorView);
+    void removeViewRecord(MirrorView& mirrorView);
+    void forwardUpdate(const epics::pvData::PVStructurePtr& pvStructurePtr);
+    void cancelPendingUpdate();
+
     static PvaPyLogger logger;
     PvaMirrorServer *pvaMirrorServer;
     std::string mirrorChannelName;
@@ -48,6 +93,21 @@ private:
     bool recordAdded;
     unsigned int nSrcMonitors;
     int nUpdatesToSkip;
+    std::map<std::string, MirrorView::shared_pointer> mirrorViewMap;
+
+    // Rate limiting
+    double maxRate;
+    unsigned int decimation;
+    bool forwardLatest;
+    unsigned int nUpdatesSinceDecimation;
+    bool hasForwarded;
+    epicsTimeStamp lastForwardTime;
+    epics::pvData::PVStructurePtr pendingPvStructurePtr;
+    bool hasPending;
+    epics::pvData::Timer::shared_pointer timerPtr;
+    epics::pvData::TimerCallback::shared_pointer timerCallbackPtr;
+    unsigned int nForwarded;
+    unsigned int nDropped;
 };
 
  
@@ -118,10 +178,26 @@ public:
     virtual boost::python::dict getMirrorRecordCounters(const std::string& mirrorChannelName);
     virtual boost::python::list getMirrorRecordNames();
 
+    virtual void addMirrorView(const std::string& viewChannelName, const std::string& mirrorChannelName, const std::string& fieldRequestDescriptor);
+    virtual void removeMirrorView(const std::string& viewChannelName);
+    virtual bool hasMirrorView(const std::string& viewChannelName);
+    virtual boost::python::list getMirrorViewNames();
+
+    virtual void setMirrorRecordRateLimit(const std::string& mirrorChannelName, double maxRate, unsigned int decimation, bool forwardLatest);
+
+    // Used by mirror channel data processor
+    virtual epics::pvCopy::PVCopyPtr createMirrorViewRecord(const std::string& viewChannelName, const std::string& mirrorChannelName, const std::string& fieldRequestDescriptor);
+    virtual void updateMirrorViewRecord(const std::string& viewChannelName, const epics::pvCopy::PVCopyPtr& pvCopyPtr, const epics::pvData::BitSetPtr& bitSetPtr);
+
 private:
 
     static PvaPyLogger logger;
     std::multimap<std::string, MirrorChannelMonitorPtr> mirrorChannelMonitorMap;
+    std::map<std::string, MirrorChannelDataProcessorPtr> mirrorDataProcessorMap;
+    // Maps view channel name to mirror channel name
+    std::map<std::string, std::string> mirrorViewMap;
+    // Created on first use by rate limited mirror records
+    epics::pvData::Timer::shared_pointer timerPtr;
 };
 
 #endif
@@ -7,4 +7,25 @@ const char* PvaPyConstants::NumReceivedCounterKey("nReceived");
 const char* PvaPyConstants::NumRejectedCounterKey("nRejected");
 const char* PvaPyConstants::NumDeliveredCounterKey("nDelivered");
 const char* PvaPyConstants::NumQueuedCounterKey("nQueued");
+const char* PvaPyConstants::NumDroppedCounterKey("nDropped");
+const char* PvaPyConstants::NumConflatedCounterKey("nConflated");
+const char* PvaPyConstants::NumForwardedCounterKey("nForwarded");
 const char* PvaPyConstants::NumOverrunsCounterKey("nOverruns");
+const char* PvaPyConstants::NumPoolHitsCounterKey("nPoolHits");
+const char* PvaPyConstants::NumPoolMissesCounterKey("nPoolMisses");
+const char* PvaPyConstants::NumCacheHitsCounterKey("nCacheHits");
+const char* PvaPyConstants::NumCacheMissesCounterKey("nCacheMisses");
+const char* PvaPyConstants::NumCacheEvictionsCounterKey("nCacheEvictions");
+const char* PvaPyConstants::NumCachedOperationsCounterKey("nCachedOperations");
+const char* PvaPyConstants::NumCallbacksCounterKey("nCallbacks");
+const char* PvaPyConstants::NumPendingCallbacksCounterKey("nPending");
+const char* PvaPyConstants::LastCallbackLatencyCounterKey("lastLatency");
+const char* PvaPyConstants::MinCallbackLatencyCounterKey("minLatency");
+const char* PvaPyConstants::MaxCallbackLatencyCounterKey("maxLatency");
+const char* PvaPyConstants::AvgCallbackLatencyCounterKey("avgLatency");
+const char* PvaPyConstants::MaxCallbackRuntimeCounterKey("maxRuntime");
+const char* PvaPyConstants::AvgCallbackRuntimeCounterKey("avgRuntime");
+const char* PvaPyConstants::NumRequestsCounterKey("nRequests");
+const char* PvaPyConstants::NumErrorsCounterKey("nErrors");
+const char* PvaPyConstants::NumInFlightCounterKey("nInFlight");
+const char* PvaPyConstants::MaxQueuedCounterKey("maxQueued");
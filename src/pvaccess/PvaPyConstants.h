@@ -13,7 +13,28 @@ public:
     static const char* NumRejectedCounterKey;
     static const char* NumDeliveredCounterKey;
     static const char* NumQueuedCounterKey;
+    static const char* NumDroppedCounterKey;
+    static const char* NumConflatedCounterKey;
+    static const char* NumForwardedCounterKey;
     static const char* NumOverrunsCounterKey;
+    static const char* NumPoolHitsCounterKey;
+    static const char* NumPoolMissesCounterKey;
+    static const char* NumCacheHitsCounterKey;
+    static const char* NumCacheMissesCounterKey;
+    static const char* NumCacheEvictionsCounterKey;
+    static const char* NumCachedOperationsCounterKey;
+    static const char* NumCallbacksCounterKey;
+    static const char* NumPendingCallbacksCounterKey;
+    static const char* LastCallbackLatencyCounterKey;
+    static const char* MinCallbackLatencyCounterKey;
+    static const char* MaxCallbackLatencyCounterKey;
+    static const char* AvgCallbackLatencyCounterKey;
+    static const char* MaxCallbackRuntimeCounterKey;
+    static const char* AvgCallbackRuntimeCounterKey;
+    static const char* NumRequestsCounterKey;
+    static const char* NumErrorsCounterKey;
+    static const char* NumInFlightCounterKey;
+    static const char* MaxQueuedCounterKey;
 }; 
 
 #endif
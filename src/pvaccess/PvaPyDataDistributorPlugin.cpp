@@ -4,6 +4,7 @@
 #include <stdlib.h>
 
 #include <string>
+#include <sstream>
 #include <algorithm>
 #include <pv/lock.h>
 #include <pv/pvData.h>
@@ -31,6 +32,7 @@ static std::string name("pydistributor");
 bool PvaPyDataDistributorPlugin::initialized(PvaPyDataDistributorPlugin::initialize());
 
 PvaPyLogger PvaPyDataDistributor::logger("PvaPyDataDistributor");
+const int PvaPyDataDistributor::NumHashRingReplicas(64);
 std::map<std::string, PvaPyDataDistributorPtr> PvaPyDataDistributor::dataDistributorMap;
 epics::pvData::Mutex PvaPyDataDistributor::dataDistributorMapMutex;
 
@@ -83,19 +85,54 @@ PvaPyDataDistributor::~PvaPyDataDistributor()
     clientSetIdList.clear();
 }
 
-std::string PvaPyDataDistributor::addClient(int clientId, const std::string& setId, const std::string& triggerField, int nUpdatesPerClient, int updateMode)
+bool PvaPyDataDistributor::returnCredits(const std::string& groupId, const std::string& setId, const std::string& consumerId, int nCredits, unsigned int& nDroppedUpdates)
+{
+    PvaPyDataDistributorPtr ddPtr;
+    {
+        epvd::Lock lock(dataDistributorMapMutex);
+        std::map<std::string,PvaPyDataDistributorPtr>::iterator ddit = dataDistributorMap.find(groupId);
+        if (ddit == dataDistributorMap.end()) {
+            logger.warn("Cannot return credit for consumer %s: could not find group %s", consumerId.c_str(), groupId.c_str());
+            return false;
+        }
+        ddPtr = ddit->second;
+    }
+    return ddPtr->returnCredits(setId, consumerId, nCredits, nDroppedUpdates);
+}
+
+std::string PvaPyDataDistributor::addClient(int clientId, const std::string& setId, const std::string& triggerField, int nUpdatesPerClient, int updateMode, int nCredits, const std::string& keyField, const std::string& consumerId)
 {
     epvd::Lock lock(mutex);
     std::map<std::string,ClientSetPtr>::iterator git = clientSetMap.find(setId);
     if (git != clientSetMap.end()) {
         ClientSetPtr setPtr = git->second;
         setPtr->clientIdList.push_back(clientId);
-        logger.debug("Added client %d to existing set %s", clientId, setId.c_str());
+        setPtr->clientCreditsMap[clientId] = nCredits;
+        setPtr->clientBalanceMap[clientId] = nCredits;
+        setPtr->clientDispatchCountMap[clientId] = 0;
+        if (!consumerId.empty()) {
+            setPtr->consumerClientIdMap[consumerId] = clientId;
+            setPtr->clientConsumerIdMap[clientId] = consumerId;
+        }
+        if (setPtr->updateMode == DD_UPDATE_HASH) {
+            addToHashRing(setPtr, clientId);
+        }
+        logger.debug("Added client %d to existing set %s (nCredits: %d)", clientId, setId.c_str(), nCredits);
         return setPtr->triggerField;
     }
     else {
-        ClientSetPtr setPtr(new ClientSet(setId, triggerField, nUpdatesPerClient, updateMode));
+        ClientSetPtr setPtr(new ClientSet(setId, triggerField, nUpdatesPerClient, updateMode, keyField));
         setPtr->clientIdList.push_back(clientId);
+        setPtr->clientCreditsMap[clientId] = nCredits;
+        setPtr->clientBalanceMap[clientId] = nCredits;
+        setPtr->clientDispatchCountMap[clientId] = 0;
+        if (!consumerId.empty()) {
+            setPtr->consumerClientIdMap[consumerId] = clientId;
+            setPtr->clientConsumerIdMap[clientId] = consumerId;
+        }
+        if (updateMode == DD_UPDATE_HASH) {
+            addToHashRing(setPtr, clientId);
+        }
         clientSetMap[setId] = setPtr;
         clientSetIdList.push_back(setId);
         logger.debug("Added client %d to new set %s (triggerField: %s, nUpdatesPerClient: %d)", clientId, setId.c_str(), triggerField.c_str(), nUpdatesPerClient);
@@ -126,6 +163,27 @@ void PvaPyDataDistributor::removeClient(int clientId, const std::string& setId)
 
             // Remove client id from the list
             setPtr->clientIdList.erase(cit);
+            if (setPtr->updateMode == DD_UPDATE_CREDIT || setPtr->updateMode == DD_UPDATE_HASH) {
+                logger.debug("Client %d received %u updates", clientId, setPtr->clientDispatchCountMap[clientId]);
+            }
+            if (setPtr->updateMode == DD_UPDATE_HASH) {
+                removeFromHashRing(setPtr, clientId);
+            }
+            setPtr->clientCreditsMap.erase(clientId);
+            setPtr->clientBalanceMap.erase(clientId);
+            setPtr->clientDispatchCountMap.erase(clientId);
+            std::map<int,std::string>::iterator ccit = setPtr->clientConsumerIdMap.find(clientId);
+            if (ccit != setPtr->clientConsumerIdMap.end()) {
+                // Consumer may have reconnected with a new client id
+                std::map<std::string,int>::iterator cit3 = setPtr->consumerClientIdMap.find(ccit->second);
+                if (cit3 != setPtr->consumerClientIdMap.end() && cit3->second == clientId) {
+                    setPtr->consumerClientIdMap.erase(cit3);
+                }
+                setPtr->clientConsumerIdMap.erase(ccit);
+            }
+            if (setPtr->selectedClientId == clientId) {
+                setPtr->selectedClientId = -1;
+            }
             logger.debug("Removed client %d from set %s", clientId, setId.c_str());
 
              // Reset current client id iterator
@@ -167,7 +225,23 @@ void PvaPyDataDistributor::removeClient(int clientId, const std::string& setId)
     }
 }
 
-bool PvaPyDataDistributor::updateClient(int clientId, const std::string& setId, const std::string& triggerFieldValue)
+std::string PvaPyDataDistributor::getKeyField(const std::string& setId)
+{
+    epvd::Lock lock(mutex);
+    std::map<std::string,ClientSetPtr>::iterator git = clientSetMap.find(setId);
+    if (git != clientSetMap.end()) {
+        ClientSetPtr setPtr = git->second;
+        if (setPtr->updateMode == DD_UPDATE_HASH) {
+            if (setPtr->keyField.empty()) {
+                return setPtr->triggerField;
+            }
+            return setPtr->keyField;
+        }
+    }
+    return "";
+}
+
+bool PvaPyDataDistributor::updateClient(int clientId, const std::string& setId, const std::string& triggerFieldValue, const std::string& keyFieldValue)
 {
     epvd::Lock lock(mutex);
     logger.debug("Looking to update client %d for set %s", clientId, setId.c_str());
@@ -231,6 +305,61 @@ bool PvaPyDataDistributor::updateClient(int clientId, const std::string& setId,
             }
             break;
         }
+        case(DD_UPDATE_CREDIT): {
+            if (setPtr->lastUpdateValue != triggerFieldValue && (setPtr->updateCounter == 0 || setPtr->selectedClientId < 0)) {
+                // New sequence of updates (or selected client is gone):
+                // select client with most credit
+                setPtr->updateCounter = 0;
+                setPtr->selectedClientId = selectCreditClient(setPtr);
+                if (setPtr->selectedClientId < 0) {
+                    setPtr->nDroppedUpdates++;
+                    logger.debug("Update %s dropped in set %s (number of dropped updates: %u)", triggerFieldValue.c_str(), setId.c_str(), setPtr->nDroppedUpdates);
+                }
+            }
+            setPtr->lastUpdateValue = triggerFieldValue;
+            if (clientId != setPtr->selectedClientId) {
+                // Other client has more credit.
+                logger.debug("Client %d will not be updated, current client is %d", clientId, setPtr->selectedClientId);
+                return proceedWithUpdate;
+            }
+            proceedWithUpdate = true;
+            lastUpdateValue = triggerFieldValue;
+            setPtr->updateCounter++;
+            setPtr->clientBalanceMap[clientId]--;
+            setPtr->clientDispatchCountMap[clientId]++;
+            logger.debug("Client %d will be updated (remaining credit: %d, number of updates: %u)", clientId, setPtr->clientBalanceMap[clientId], setPtr->clientDispatchCountMap[clientId]);
+            if (setPtr->updateCounter >= setPtr->nUpdatesPerClient) {
+                // This client and set are done.
+                logger.debug("Set %s is done after %d updates", setId.c_str(), setPtr->updateCounter);
+                setPtr->updateCounter = 0;
+                currentSetIdIter++;
+            }
+            break;
+        }
+        case(DD_UPDATE_HASH): {
+            if (setPtr->lastUpdateValue != triggerFieldValue || setPtr->selectedClientId < 0) {
+                // New update: find client that owns the key
+                setPtr->lastUpdateValue = triggerFieldValue;
+                setPtr->selectedClientId = selectHashClient(setPtr, keyFieldValue);
+            }
+            if (clientId != setPtr->selectedClientId) {
+                // Key belongs to another client.
+                logger.debug("Client %d will not be updated, key %s belongs to client %d", clientId, keyFieldValue.c_str(), setPtr->selectedClientId);
+                return proceedWithUpdate;
+            }
+            proceedWithUpdate = true;
+            lastUpdateValue = triggerFieldValue;
+            setPtr->updateCounter++;
+            setPtr->clientDispatchCountMap[clientId]++;
+            logger.debug("Client %d will be updated for key %s (number of updates: %u)", clientId, keyFieldValue.c_str(), setPtr->clientDispatchCountMap[clientId]);
+            if (setPtr->updateCounter >= setPtr->nUpdatesPerClient) {
+                // This set is done.
+                logger.debug("Set %s is done after %d updates", setId.c_str(), setPtr->updateCounter);
+                setPtr->updateCounter = 0;
+                currentSetIdIter++;
+            }
+            break;
+        }
         default: {
             proceedWithUpdate = true;
         }
@@ -238,6 +367,139 @@ bool PvaPyDataDistributor::updateClient(int clientId, const std::string& setId,
     return proceedWithUpdate;
 }
 
+bool PvaPyDataDistributor::returnCredits(const std::string& setId, const std::string& consumerId, int nCredits, unsigned int& nDroppedUpdates)
+{
+    epvd::Lock lock(mutex);
+    std::map<std::string,ClientSetPtr>::iterator git = clientSetMap.find(setId);
+    if (git == clientSetMap.end()) {
+        logger.warn("Cannot return credit for consumer %s: could not find set %s", consumerId.c_str(), setId.c_str());
+        return false;
+    }
+    ClientSetPtr setPtr = git->second;
+    nDroppedUpdates = setPtr->nDroppedUpdates;
+    std::map<std::string,int>::iterator cit = setPtr->consumerClientIdMap.find(consumerId);
+    if (cit == setPtr->consumerClientIdMap.end()) {
+        logger.warn("Cannot return credit for consumer %s: could not find consumer in set %s", consumerId.c_str(), setId.c_str());
+        return false;
+    }
+    int clientId = cit->second;
+    // Balance cannot exceed number of advertised slots
+    int balance = std::min(setPtr->clientBalanceMap[clientId] + nCredits, setPtr->clientCreditsMap[clientId]);
+    setPtr->clientBalanceMap[clientId] = balance;
+    logger.debug("Consumer %s (client %d) returned %d credits, remaining credit: %d", consumerId.c_str(), clientId, nCredits, balance);
+    return true;
+}
+
+int PvaPyDataDistributor::selectCreditClient(const ClientSetPtr& setPtr)
+{
+    // Start search after the last selected client, so that clients
+    // with equal credit are updated in turn
+    std::list<int>& clientIdList = setPtr->clientIdList;
+    if (setPtr->currentClientIdIter == clientIdList.end()) {
+        setPtr->currentClientIdIter = clientIdList.begin();
+    }
+    std::list<int>::iterator selectedIter = clientIdList.end();
+    int maxBalance = 0;
+    for (int pass = 0; pass < 2 && selectedIter == clientIdList.end(); pass++) {
+        if (pass > 0) {
+            // All clients used up their credit, start new round for
+            // clients that do not return credit themselves
+            int nReplenished = 0;
+            for (std::list<int>::iterator cit = clientIdList.begin(); cit != clientIdList.end(); ++cit) {
+                if (setPtr->clientConsumerIdMap.find(*cit) == setPtr->clientConsumerIdMap.end()) {
+                    setPtr->clientBalanceMap[*cit] += setPtr->clientCreditsMap[*cit];
+                    nReplenished++;
+                }
+            }
+            logger.debug("Replenished credit for %d clients in set %s", nReplenished, setPtr->setId.c_str());
+        }
+        std::list<int>::iterator cit = setPtr->currentClientIdIter;
+        for (unsigned int i = 0; i < clientIdList.size(); i++) {
+            int balance = setPtr->clientBalanceMap[*cit];
+            if (balance > maxBalance) {
+                maxBalance = balance;
+                selectedIter = cit;
+            }
+            ++cit;
+            if (cit == clientIdList.end()) {
+                cit = clientIdList.begin();
+            }
+        }
+    }
+    if (selectedIter == clientIdList.end()) {
+        // None of the clients has free slots
+        logger.debug("No client with available credit in set %s", setPtr->setId.c_str());
+        return -1;
+    }
+    setPtr->currentClientIdIter = selectedIter;
+    setPtr->currentClientIdIter++;
+    logger.debug("Selected client %d with credit %d in set %s", *selectedIter, maxBalance, setPtr->setId.c_str());
+    return *selectedIter;
+}
+
+int PvaPyDataDistributor::selectHashClient(const ClientSetPtr& setPtr, const std::string& keyFieldValue)
+{
+    // Key is owned by the first client point on the ring that
+    // follows key hash value
+    if (setPtr->hashRing.empty()) {
+        return -1;
+    }
+    std::map<epicsUInt32, int>::iterator rit = setPtr->hashRing.lower_bound(hash(keyFieldValue));
+    if (rit == setPtr->hashRing.end()) {
+        rit = setPtr->hashRing.begin();
+    }
+    return rit->second;
+}
+
+epicsUInt32 PvaPyDataDistributor::hash(const std::string& value)
+{
+    // 32-bit FNV-1a hash, followed by avalanche mixing so that
+    // similar keys (e.g., sequential ids) spread evenly over the ring
+    epicsUInt32 h = 2166136261u;
+    for (std::string::const_iterator it = value.begin(); it != value.end(); ++it) {
+        h ^= static_cast<unsigned char>(*it);
+        h *= 16777619u;
+    }
+    h ^= h >> 16;
+    h *= 0x85ebca6bu;
+    h ^= h >> 13;
+    h *= 0xc2b2ae35u;
+    h ^= h >> 16;
+    return h;
+}
+
+void PvaPyDataDistributor::addToHashRing(const ClientSetPtr& setPtr, int clientId)
+{
+    // Each client owns a number of points on the ring, so that keys
+    // remain evenly spread; adding or removing a client remaps only
+    // keys owned by that client
+    for (int i = 0; i < NumHashRingReplicas; i++) {
+        std::stringstream ss;
+        ss << clientId << "#" << i;
+        epicsUInt32 h = hash(ss.str());
+        // Resolve (unlikely) collisions in favor of existing client
+        while (setPtr->hashRing.find(h) != setPtr->hashRing.end()) {
+            h++;
+        }
+        setPtr->hashRing[h] = clientId;
+    }
+    logger.debug("Added client %d to hash ring for set %s (ring size: %d)", clientId, setPtr->setId.c_str(), setPtr->hashRing.size());
+}
+
+void PvaPyDataDistributor::removeFromHashRing(const ClientSetPtr& setPtr, int clientId)
+{
+    std::map<epicsUInt32, int>::iterator rit = setPtr->hashRing.begin();
+    while (rit != setPtr->hashRing.end()) {
+        if (rit->second == clientId) {
+            setPtr->hashRing.erase(rit++);
+        }
+        else {
+            ++rit;
+        }
+    }
+    logger.debug("Removed client %d from hash ring for set %s (ring size: %d)", clientId, setPtr->setId.c_str(), setPtr->hashRing.size());
+}
+
 PvaPyDataDistributorPlugin::PvaPyDataDistributorPlugin()
 {
 }
@@ -272,7 +534,7 @@ PvaPyDataDistributorFilter::~PvaPyDataDistributorFilter()
     PvaPyDataDistributor::removeUnusedInstance(dataDistributorPtr);
 }
 
-PvaPyDataDistributorFilterPtr PvaPyDataDistributorFilter::create(
+PVFilterPtr PvaPyDataDistributorFilter::create(
      const std::string& requestValue,
      const PVCopyPtr& pvCopy,
      const PVFieldPtr& master)
@@ -287,9 +549,13 @@ PvaPyDataDistributorFilterPtr PvaPyDataDistributorFilter::create(
     std::vector<std::string> configItems2 = StringUtility::split(requestValue2, ';');
     int nUpdatesPerClient = 1;
     int updateMode = PvaPyDataDistributor::DD_UPDATE_ONE_PER_GROUP;
+    int nCredits = 1;
     std::string groupId = "default";
     std::string setId = "default";
     std::string triggerField = "timeStamp";
+    std::string keyField;
+    std::string consumerId;
+    int nReturnedCredits = 0;
     bool hasUpdateMode = false;
     bool hasSetId = false;
     for(unsigned int i = 0; i < configItems2.size(); i++) {
@@ -325,6 +591,14 @@ PvaPyDataDistributorFilterPtr PvaPyDataDistributorFilter::create(
                 updateMode = PvaPyDataDistributor::DD_UPDATE_ALL_IN_GROUP;
                 hasUpdateMode = true;
             }
+            else if (svalue == "credit") {
+                updateMode = PvaPyDataDistributor::DD_UPDATE_CREDIT;
+                hasUpdateMode = true;
+            }
+            else if (svalue == "hash") {
+                updateMode = PvaPyDataDistributor::DD_UPDATE_HASH;
+                hasUpdateMode = true;
+            }
             if (!hasUpdateMode) {
                 logger.debug("Invalid request spec for updateMode: %s", svalue.c_str());
             }
@@ -332,11 +606,41 @@ PvaPyDataDistributorFilterPtr PvaPyDataDistributorFilter::create(
                 logger.debug("Request spec for updateMode: %d", updateMode);
             }
         }
+        else if(configItem2.find("credits") == 0) {
+            std::string svalue = configItem2.substr(ind+1);
+            nCredits = atoi(svalue.c_str());
+            logger.debug("Request spec for nCredits: %d", nCredits);
+        }
         else if(configItem2.find("trigger") == 0) {
             std::string configItem = configItems[i];
             triggerField = configItem.substr(ind+1);
             logger.debug("Request spec for trigger field: %s", triggerField.c_str());
         }
+        else if(configItem2.find("key") == 0) {
+            std::string configItem = configItems[i];
+            keyField = configItem.substr(ind+1);
+            logger.debug("Request spec for key field: %s", keyField.c_str());
+        }
+        else if(configItem2.find("consumer") == 0) {
+            std::string configItem = configItems[i];
+            consumerId = configItem.substr(ind+1);
+            logger.debug("Request spec for consumer id: %s", consumerId.c_str());
+        }
+        else if(configItem2.find("ack") == 0) {
+            std::string svalue = configItem2.substr(ind+1);
+            nReturnedCredits = atoi(svalue.c_str());
+            logger.debug("Request spec for number of returned credits: %d", nReturnedCredits);
+        }
+    }
+
+    // Acknowledgement requests only return credit for an existing
+    // consumer, and do not create a new client
+    if(nReturnedCredits > 0) {
+        unsigned int nDroppedUpdates = 0;
+        if(consumerId.empty() || !PvaPyDataDistributor::returnCredits(groupId, setId, consumerId, nReturnedCredits, nDroppedUpdates)) {
+            return PVFilterPtr();
+        }
+        return PvaPyDataDistributorAckFilterPtr(new PvaPyDataDistributorAckFilter(nDroppedUpdates));
     }
     // If request does not have update mode specified, but has set id
     // then use a different update mode
@@ -346,34 +650,44 @@ PvaPyDataDistributorFilterPtr PvaPyDataDistributorFilter::create(
     }
 
     // Make sure request is valid
-    if(nUpdatesPerClient <= 0) {
-        return PvaPyDataDistributorFilterPtr();
+    if(nUpdatesPerClient <= 0 || nCredits <= 0) {
+        return PVFilterPtr();
     }
     PvaPyDataDistributorFilterPtr filter =
-         PvaPyDataDistributorFilterPtr(new PvaPyDataDistributorFilter(groupId, clientId, setId, triggerField, nUpdatesPerClient, updateMode, pvCopy, master));
+         PvaPyDataDistributorFilterPtr(new PvaPyDataDistributorFilter(groupId, clientId, setId, triggerField, nUpdatesPerClient, updateMode, nCredits, keyField, consumerId, pvCopy, master));
     return filter;
 }
 
-PvaPyDataDistributorFilter::PvaPyDataDistributorFilter(const std::string& groupId_, int clientId_, const std::string& setId_, const std::string& triggerField_, int nUpdatesPerClient, int updateMode, const PVCopyPtr& copyPtr_, const epvd::PVFieldPtr& masterFieldPtr_)
+PvaPyDataDistributorFilter::PvaPyDataDistributorFilter(const std::string& groupId_, int clientId_, const std::string& setId_, const std::string& triggerField_, int nUpdatesPerClient, int updateMode, int nCredits, const std::string& keyField, const std::string& consumerId, const PVCopyPtr& copyPtr_, const epvd::PVFieldPtr& masterFieldPtr_)
     : dataDistributorPtr(PvaPyDataDistributor::getInstance(groupId_))
     , clientId(clientId_)
     , setId(setId_)
     , triggerField(triggerField_)
     , masterFieldPtr(masterFieldPtr_)
     , triggerFieldPtr()
+    , keyFieldPtr()
     , firstUpdate(true)
 {
-    triggerField = dataDistributorPtr->addClient(clientId, setId, triggerField, nUpdatesPerClient, updateMode);
+    triggerField = dataDistributorPtr->addClient(clientId, setId, triggerField, nUpdatesPerClient, updateMode, nCredits, keyField, consumerId);
+    // Key field is used only in hash mode
+    std::string setKeyField = dataDistributorPtr->getKeyField(setId);
     if(masterFieldPtr->getField()->getType() == epvd::structure) {
         epvd::PVStructurePtr pvStructurePtr = static_pointer_cast<epvd::PVStructure>(masterFieldPtr);
         if(pvStructurePtr) {
             triggerFieldPtr = pvStructurePtr->getSubField(triggerField);
+            if(!setKeyField.empty()) {
+                keyFieldPtr = pvStructurePtr->getSubField(setKeyField);
+            }
         }
     }
     if(!triggerFieldPtr) {
         logger.debug("Using master field as trigger field");
         triggerFieldPtr = masterFieldPtr;
     }
+    if(!setKeyField.empty() && !keyFieldPtr) {
+        logger.debug("Using trigger field as key field");
+        keyFieldPtr = triggerFieldPtr;
+    }
 }
 
 
@@ -393,7 +707,13 @@ bool PvaPyDataDistributorFilter::filter(const PVFieldPtr& pvCopy, const BitSetPt
         std::stringstream ss;
         ss << triggerFieldPtr;
         std::string triggerFieldValue = ss.str();
-        proceedWithUpdate = dataDistributorPtr->updateClient(clientId, setId, triggerFieldValue);
+        std::string keyFieldValue;
+        if(keyFieldPtr) {
+            std::stringstream ss2;
+            ss2 << keyFieldPtr;
+            keyFieldValue = ss2.str();
+        }
+        proceedWithUpdate = dataDistributorPtr->updateClient(clientId, setId, triggerFieldValue, keyFieldValue);
     }
 
     if(proceedWithUpdate) {
@@ -414,4 +734,30 @@ string PvaPyDataDistributorFilter::getName()
     return name;
 }
 
+PvaPyDataDistributorAckFilter::PvaPyDataDistributorAckFilter(unsigned int nDroppedUpdates_)
+    : nDroppedUpdates(nDroppedUpdates_)
+{
+}
+
+PvaPyDataDistributorAckFilter::~PvaPyDataDistributorAckFilter()
+{
+}
+
+bool PvaPyDataDistributorAckFilter::filter(const PVFieldPtr& pvCopy, const BitSetPtr& bitSet, bool toCopy)
+{
+    if(!toCopy || pvCopy->getField()->getType() != epvd::scalar) {
+        return false;
+    }
+    // Reply carries distributor counter instead of record data
+    PVScalarPtr pvScalarPtr = static_pointer_cast<PVScalar>(pvCopy);
+    pvScalarPtr->putFrom<epicsUInt32>(nDroppedUpdates);
+    bitSet->set(pvCopy->getFieldOffset());
+    return true;
+}
+
+string PvaPyDataDistributorAckFilter::getName()
+{
+    return name;
+}
+
 }}
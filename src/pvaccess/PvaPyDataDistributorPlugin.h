@@ -20,10 +20,12 @@ namespace epics { namespace pvCopy {
 
 class PvaPyDataDistributorPlugin;
 class PvaPyDataDistributorFilter;
+class PvaPyDataDistributorAckFilter;
 class PvaPyDataDistributor;
 
 typedef std::tr1::shared_ptr<PvaPyDataDistributorPlugin> PvaPyDataDistributorPluginPtr;
 typedef std::tr1::shared_ptr<PvaPyDataDistributorFilter> PvaPyDataDistributorFilterPtr;
+typedef std::tr1::shared_ptr<PvaPyDataDistributorAckFilter> PvaPyDataDistributorAckFilterPtr;
 typedef std::tr1::shared_ptr<PvaPyDataDistributor> PvaPyDataDistributorPtr;
 
 struct ClientSet;
@@ -34,25 +36,58 @@ struct ClientSet
 {
     POINTER_DEFINITIONS(ClientSet);
 
-    ClientSet(const std::string& setId_, const std::string triggerField_, int nUpdatesPerClient_, int updateMode_) 
+    ClientSet(const std::string& setId_, const std::string triggerField_, int nUpdatesPerClient_, int updateMode_, const std::string& keyField_="") 
         : setId(setId_)
         , triggerField(triggerField_)
+        , keyField(keyField_)
         , nUpdatesPerClient(nUpdatesPerClient_)
         , updateMode(updateMode_)
         , clientIdList()
         , lastUpdateValue()
         , updateCounter(0)
         , currentClientIdIter(clientIdList.end())
+        , clientCreditsMap()
+        , clientBalanceMap()
+        , clientDispatchCountMap()
+        , consumerClientIdMap()
+        , clientConsumerIdMap()
+        , nDroppedUpdates(0)
+        , selectedClientId(-1)
+        , hashRing()
         {}
     ~ClientSet() {}
     std::string setId;
     std::string triggerField;
+    std::string keyField;
     int nUpdatesPerClient;
     int updateMode;
     std::list<int> clientIdList;
     std::string lastUpdateValue;
     int updateCounter;
     std::list<int>::iterator currentClientIdIter;
+
+    // Credit based distribution: number of slots advertised by each
+    // client, remaining credit, and number of dispatched updates
+    std::map<int, int> clientCreditsMap;
+    std::map<int, int> clientBalanceMap;
+    std::map<int, unsigned int> clientDispatchCountMap;
+
+    // Clients that identify themselves with consumer id return credit
+    // explicitly as their queue slots become free (see returnCredits()),
+    // instead of having it replenished when all clients use it up
+    std::map<std::string, int> consumerClientIdMap;
+    std::map<int, std::string> clientConsumerIdMap;
+
+    // Number of updates that were not sent to any client in the set
+    // because none of the clients had credit
+    unsigned int nDroppedUpdates;
+
+    // Client selected for current updates (credit and hash modes)
+    int selectedClientId;
+
+    // Hash based distribution: consistent hashing ring that maps
+    // hash values to client ids
+    std::map<epicsUInt32, int> hashRing;
 };
 
 class PvaPyDataDistributor 
@@ -61,22 +96,35 @@ public:
     enum ClientUpdateMode {
         DD_UPDATE_ONE_PER_GROUP = 0, // Update goes to one client per set
         DD_UPDATE_ALL_IN_GROUP = 1,  // Update goes to all clients in set
-        DD_N_UPDATE_MODES = 2        // Number of valid update modes
+        DD_UPDATE_CREDIT = 2,        // Update goes to one client per set, client with most credit is selected
+        DD_UPDATE_HASH = 3,          // Update goes to one client per set, client is selected by hashing key field value
+        DD_N_UPDATE_MODES = 4        // Number of valid update modes
     };
 
+    static const int NumHashRingReplicas;
+
     static PvaPyDataDistributorPtr getInstance(const std::string& groupId);
     static void removeUnusedInstance(PvaPyDataDistributorPtr dataDistributorPtr);
 
     virtual ~PvaPyDataDistributor();
     std::string getGroupId() const { return groupId; }
-    std::string addClient(int clientId, const std::string& setId, const std::string& triggerField, int nUpdatesPerClient, int updateMode);
+    static bool returnCredits(const std::string& groupId, const std::string& setId, const std::string& consumerId, int nCredits, unsigned int& nDroppedUpdates);
+
+    std::string addClient(int clientId, const std::string& setId, const std::string& triggerField, int nUpdatesPerClient, int updateMode, int nCredits=1, const std::string& keyField="", const std::string& consumerId="");
     void removeClient(int clientId, const std::string& setId);
-    bool updateClient(int clientId, const std::string& setId, const std::string& triggerFieldValue);
+    bool updateClient(int clientId, const std::string& setId, const std::string& triggerFieldValue, const std::string& keyFieldValue="");
+    std::string getKeyField(const std::string& setId);
 
 private:
     PvaPyDataDistributor(const std::string& id);
     PvaPyDataDistributor(const PvaPyDataDistributor& distributor);
     PvaPyDataDistributor& operator=(const PvaPyDataDistributor& distributor);
+    bool returnCredits(const std::string& setId, const std::string& consumerId, int nCredits, unsigned int& nDroppedUpdates);
+    int selectCreditClient(const ClientSetPtr& setPtr);
+    int selectHashClient(const ClientSetPtr& setPtr, const std::string& keyFieldValue);
+    static epicsUInt32 hash(const std::string& value);
+    static void addToHashRing(const ClientSetPtr& setPtr, int clientId);
+    static void removeFromHashRing(const ClientSetPtr& setPtr, int clientId);
 
     static PvaPyLogger logger;
     static std::map<std::string, PvaPyDataDistributorPtr> dataDistributorMap;
@@ -134,9 +182,10 @@ private:
     std::string triggerField;
     epics::pvData::PVFieldPtr masterFieldPtr;
     epics::pvData::PVFieldPtr triggerFieldPtr;
+    epics::pvData::PVFieldPtr keyFieldPtr;
     bool firstUpdate;
 
-    PvaPyDataDistributorFilter(const std::string& groupId, int clientId, const std::string& setId, const std::string& triggerField, int nUpdatesPerClient, int updateMode, const epics::pvCopy::PVCopyPtr& copyPtr, const epics::pvData::PVFieldPtr& masterFieldPtr);
+    PvaPyDataDistributorFilter(const std::string& groupId, int clientId, const std::string& setId, const std::string& triggerField, int nUpdatesPerClient, int updateMode, int nCredits, const std::string& keyField, const std::string& consumerId, const epics::pvCopy::PVCopyPtr& copyPtr, const epics::pvData::PVFieldPtr& masterFieldPtr);
 
 public:
     POINTER_DEFINITIONS(PvaPyDataDistributorFilter);
@@ -148,7 +197,7 @@ public:
      * @return The PVFilter.
      * A null is returned if master or requestValue is not appropriate for the plugin.
      */
-    static PvaPyDataDistributorFilterPtr create(
+    static PVFilterPtr create(
         const std::string& requestValue,
         const PVCopyPtr& pvCopy,
         const epics::pvData::PVFieldPtr & master);
@@ -168,5 +217,24 @@ public:
     std::string getName();
 };
 
+/**
+ * @brief  A filter for credit acknowledgement requests. Acknowledgement
+ * returns credit to the consumer when the request is created, and the
+ * requested (scalar) field is replaced with the number of updates that
+ * the consumer's set dropped because none of its clients had credit.
+ */
+class epicsShareClass PvaPyDataDistributorAckFilter : public PVFilter
+{
+private:
+    unsigned int nDroppedUpdates;
+
+public:
+    POINTER_DEFINITIONS(PvaPyDataDistributorAckFilter);
+    PvaPyDataDistributorAckFilter(unsigned int nDroppedUpdates);
+    virtual ~PvaPyDataDistributorAckFilter();
+    bool filter(const epics::pvData::PVFieldPtr & pvCopy,const epics::pvData::BitSetPtr & bitSet,bool toCopy);
+    std::string getName();
+};
+
 }}
 #endif  
@@ -10,9 +10,10 @@
 #include "ObjectAlreadyExists.h"
 #include "ObjectNotFound.h"
 #include "InvalidRequest.h"
-#include "QueueEmpty.h"
+#include "InvalidArgument.h"
 #include "PvaServer.h"
 #include "PyGilManager.h"
+#include "PyGilRelease.h"
 #include "PyUtility.h"
 
 namespace epvd = epics::pvData;
@@ -20,13 +21,15 @@ namespace epvdb = epics::pvDatabase;
 
 const double PvaServer::ShutdownWaitTime(0.1);
 const double PvaServer::RecordUpdateTimeout(10.0);
+const int PvaServer::DefaultCallbackThreadPoolSize(1);
 PvaPyLogger PvaServer::logger("PvaServer");
 
 PvaServer::PvaServer() :
     recordMap(),
     isRunning(false),
-    callbackQueuePtr(new SynchronizedQueue<std::string>()),
-    callbackThreadRunning(false),
+    callbackSchedulerPtr(new CallbackScheduler()),
+    callbackThreadPoolSize(DefaultCallbackThreadPoolSize),
+    nCallbackThreads(0),
     callbackThreadNeeded(false),
     callbackThreadMutex(),
     callbackThreadExitEvent()
@@ -38,8 +41,10 @@ PvaServer::PvaServer() :
 PvaServer::PvaServer(const std::string& channelName, const PvObject& pvObject) :
     recordMap(),
     isRunning(false),
-    callbackQueuePtr(new SynchronizedQueue<std::string>()),
-    callbackThreadRunning(false),
+    callbackSchedulerPtr(new CallbackScheduler()),
+    callbackThreadPoolSize(DefaultCallbackThreadPoolSize),
+    nCallbackThreads(0),
+    callbackThreadNeeded(false),
     callbackThreadMutex(),
     callbackThreadExitEvent()
 {
@@ -50,8 +55,10 @@ PvaServer::PvaServer(const std::string& channelName, const PvObject& pvObject) :
 PvaServer::PvaServer(const std::string& channelName, const PvObject& pvObject, const boost::python::object& onWriteCallback) :
     recordMap(),
     isRunning(false),
-    callbackQueuePtr(new SynchronizedQueue<std::string>()),
-    callbackThreadRunning(false),
+    callbackSchedulerPtr(new CallbackScheduler()),
+    callbackThreadPoolSize(DefaultCallbackThreadPoolSize),
+    nCallbackThreads(0),
+    callbackThreadNeeded(false),
     callbackThreadMutex(),
     callbackThreadExitEvent()
 {
@@ -62,8 +69,10 @@ PvaServer::PvaServer(const std::string& channelName, const PvObject& pvObject, c
 PvaServer::PvaServer(const PvaServer& pvaServer) :
     recordMap(),
     isRunning(false),
-    callbackQueuePtr(new SynchronizedQueue<std::string>()),
-    callbackThreadRunning(false),
+    callbackSchedulerPtr(new CallbackScheduler()),
+    callbackThreadPoolSize(DefaultCallbackThreadPoolSize),
+    nCallbackThreads(0),
+    callbackThreadNeeded(false),
     callbackThreadMutex(),
     callbackThreadExitEvent()
 {
@@ -108,7 +117,7 @@ void PvaServer::start()
     isRunning = true;
     PyGilManager::evalInitThreads();
     if (callbackThreadNeeded) {
-        startCallbackThread();
+        startCallbackThreads();
     }
     epics::pvDatabase::ChannelProviderLocalPtr channelProvider = epics::pvDatabase::getChannelProviderLocal();
     bool printInfo = logger.hasLogLevel(PvaPyLogger::PVAPY_LOG_LEVEL_INFO|PvaPyLogger::PVAPY_LOG_LEVEL_DEBUG);
@@ -122,7 +131,7 @@ void PvaServer::stop()
     }
     server->shutdown();
     isRunning = false;
-    callbackQueuePtr->cancelWaitForItemPushed();
+    callbackSchedulerPtr->cancelWait();
     waitForCallbackThreadExit(ShutdownWaitTime);
 }
 
@@ -137,6 +146,7 @@ void PvaServer::initRecord(const std::string& channelName, const epics::pvData::
     if(!master->addRecord(record)) {
         throw PvaException("Cannot add record to master database for channel: " + channelName);
     }
+    callbackSchedulerPtr->addRecord(channelName);
     recordMap[channelName] = record;
 }
 
@@ -151,10 +161,10 @@ void PvaServer::disableRecordProcessing(const std::string& channelName)
 
 void PvaServer::initRecord(const std::string& channelName, const PvObject& pvObject, const boost::python::object& onWriteCallback) 
 {
-    if (!callbackThreadRunning && !PyUtility::isPyNone(onWriteCallback)) {
-        startCallbackThread();
+    if (!PyUtility::isPyNone(onWriteCallback)) {
+        startCallbackThreads();
     }
-    PyPvRecordPtr record(PyPvRecord::create(channelName, pvObject, callbackQueuePtr, onWriteCallback));
+    PyPvRecordPtr record(PyPvRecord::create(channelName, pvObject, callbackSchedulerPtr, onWriteCallback));
     if(!record.get()) {
         throw PvaException("Failed to create PyPvRecord: " + channelName);
     }
@@ -163,6 +173,7 @@ void PvaServer::initRecord(const std::string& channelName, const PvObject& pvObj
     if(!master->addRecord(record)) {
         throw PvaException("Cannot add record to master database for channel: " + channelName);
     }
+    callbackSchedulerPtr->addRecord(channelName);
     recordMap[channelName] = record;
 }
 
@@ -170,10 +181,10 @@ void PvaServer::initRecord(const std::string& channelName, const PvObject& pvObj
 
 void PvaServer::initRecord(const std::string& channelName, const PvObject& pvObject, int asLevel, const std::string& asGroup, const boost::python::object& onWriteCallback) 
 {
-    if (!callbackThreadRunning && !PyUtility::isPyNone(onWriteCallback)) {
-        startCallbackThread();
+    if (!PyUtility::isPyNone(onWriteCallback)) {
+        startCallbackThreads();
     }
-    PyPvRecordPtr record(PyPvRecord::create(channelName, pvObject, asLevel, asGroup, callbackQueuePtr, onWriteCallback));
+    PyPvRecordPtr record(PyPvRecord::create(channelName, pvObject, asLevel, asGroup, callbackSchedulerPtr, onWriteCallback));
     if(!record.get()) {
         throw PvaException("Failed to create PyPvRecord: " + channelName);
     }
@@ -182,6 +193,7 @@ void PvaServer::initRecord(const std::string& channelName, const PvObject& pvObj
     if(!master->addRecord(record)) {
         throw PvaException("Cannot add record to master database for channel: " + channelName);
     }
+    callbackSchedulerPtr->addRecord(channelName);
     recordMap[channelName] = record;
 }
 
@@ -197,6 +209,7 @@ void PvaServer::update(const PvObject& pvObject)
     }
 
     std::map<std::string, PyPvRecordPtr>::iterator it = recordMap.begin();
+    PyGilRelease pyGilRelease;
     it->second->update(pvObject);
 }
 
@@ -210,6 +223,7 @@ void PvaServer::updateUnchecked(const PvObject& pvObject)
     }
 
     std::map<std::string, PyPvRecordPtr>::iterator it = recordMap.begin();
+    PyGilRelease pyGilRelease;
     it->second->updateUnchecked(pvObject);
 }
 
@@ -237,6 +251,7 @@ void PvaServer::update(const std::string& channelName, const PvObject& pvObject)
     if (it == recordMap.end()) {
         throw ObjectNotFound("Master database does not have record for channel: " + channelName);
     }
+    PyGilRelease pyGilRelease;
     it->second->update(pvObject);
 }
 
@@ -246,6 +261,7 @@ void PvaServer::updateUnchecked(const std::string& channelName, const PvObject&
     if (it == recordMap.end()) {
         throw ObjectNotFound("Master database does not have record for channel: " + channelName);
     }
+    PyGilRelease pyGilRelease;
     it->second->updateUnchecked(pvObject);
 }
 
@@ -289,6 +305,7 @@ void PvaServer::removeRecord(const std::string& channelName)
         throw ObjectNotFound("Master database does not have record for channel: " + channelName);
     }
     it->second->remove();
+    callbackSchedulerPtr->removeRecord(channelName);
     recordMap.erase(it);
 }
 
@@ -335,57 +352,76 @@ boost::python::list PvaServer::getRecordNames()
 
 void PvaServer::callbackThread(PvaServer* server)
 {
-    server->callbackThreadRunning = true;
     logger.debug("Started PVA Server callback thread %s", epicsThreadGetNameSelf());
     while (true) {
         if (!server->isRunning) {
             break;
         }
+        {
+            epics::pvData::Lock lock(server->callbackThreadMutex);
+            if (server->nCallbackThreads > server->callbackThreadPoolSize) {
+                // Thread pool size was reduced; thread count is decremented
+                // under the same lock, so that exactly the excess threads
+                // exit, and at least one thread keeps running
+                server->nCallbackThreads--;
+                logger.debug("Exiting excess PVA Server callback thread %s", epicsThreadGetNameSelf());
+                return;
+            }
+        }
 
-        // Handle possible exceptions while retrieving data from empty queue.
+        std::string recordName;
+        if (!server->callbackSchedulerPtr->startCallback(recordName, RecordUpdateTimeout)) {
+            // No PV updates received.
+            continue;
+        }
         try {
-            std::string recordName = server->callbackQueuePtr->frontAndPop(RecordUpdateTimeout);
             PyPvRecordPtr record = server->findRecord(recordName);
-            if (!server->isRunning) {
-                break;
+            if (server->isRunning) {
+                record->executeCallback();
             }
-            record->executeCallback();
         }
         catch (ObjectNotFound& ex) {
             // Record has been deleted before we could get to update
         }
-        catch (QueueEmpty& ex) {
-            // Queue empty, no PV updates received.
-        }
         catch (const std::exception& ex) {
             // Not good.
             logger.error("PVA Server callback thread caught exception: %s", ex.what());
         }
+        server->callbackSchedulerPtr->callbackDone(recordName);
     }
 
     // Callback thread done.
     logger.debug("Exiting PVA Server callback thread %s", epicsThreadGetNameSelf());
-    server->callbackQueuePtr->clear();
-    server->notifyCallbackThreadExit();
-    server->callbackThreadRunning = false;
+    epics::pvData::Lock lock(server->callbackThreadMutex);
+    server->nCallbackThreads--;
+    if (server->nCallbackThreads == 0) {
+        server->callbackSchedulerPtr->clear();
+        server->notifyCallbackThreadExit();
+    }
 }
 
-void PvaServer::startCallbackThread()
+void PvaServer::startCallbackThreads()
 {
     epics::pvData::Lock lock(callbackThreadMutex);
-    if (!callbackThreadRunning) {
+    callbackThreadNeeded = true;
+    callbackSchedulerPtr->resetCancelWait();
+    if (nCallbackThreads < callbackThreadPoolSize) {
         PyGilManager::evalInitThreads();
-        epicsThreadCreate("CallbackThread", epicsThreadPriorityHigh, epicsThreadGetStackSize(epicsThreadStackSmall), (EPICSTHREADFUNC)callbackThread, this);
-        callbackThreadNeeded = true;
     }
-    else {
-        logger.warn("Callback thread is already running.");
+    while (nCallbackThreads < callbackThreadPoolSize) {
+        epicsThreadCreate("CallbackThread", epicsThreadPriorityHigh, epicsThreadGetStackSize(epicsThreadStackSmall), (EPICSTHREADFUNC)callbackThread, this);
+        nCallbackThreads++;
     }
 }
 
 void PvaServer::waitForCallbackThreadExit(double timeout)
 {
-    if (callbackThreadRunning) {
+    bool callbackThreadsRunning = false;
+    {
+        epics::pvData::Lock lock(callbackThreadMutex);
+        callbackThreadsRunning = (nCallbackThreads > 0);
+    }
+    if (callbackThreadsRunning) {
         logger.debug("Waiting on callback thread exit, timeout in %f seconds", timeout);
         callbackThreadExitEvent.wait(timeout);
     }
@@ -396,3 +432,49 @@ void PvaServer::notifyCallbackThreadExit()
     callbackThreadExitEvent.signal();
 }
 
+void PvaServer::setCallbackPriority(const std::string& channelName, int priority)
+{
+    findRecord(channelName);
+    callbackSchedulerPtr->setPriority(channelName, priority);
+}
+
+int PvaServer::getCallbackPriority(const std::string& channelName)
+{
+    findRecord(channelName);
+    return callbackSchedulerPtr->getPriority(channelName);
+}
+
+void PvaServer::setCallbackThreadPoolSize(int poolSize)
+{
+    if (poolSize <= 0) {
+        throw InvalidArgument("Callback thread pool size must be positive, got %d.", poolSize);
+    }
+    bool startNeeded = false;
+    {
+        epics::pvData::Lock lock(callbackThreadMutex);
+        callbackThreadPoolSize = poolSize;
+        startNeeded = (nCallbackThreads > 0 && nCallbackThreads < poolSize);
+    }
+    // Excess threads exit after completing their current callback
+    if (startNeeded && isRunning) {
+        startCallbackThreads();
+    }
+}
+
+int PvaServer::getCallbackThreadPoolSize()
+{
+    epics::pvData::Lock lock(callbackThreadMutex);
+    return callbackThreadPoolSize;
+}
+
+boost::python::dict PvaServer::getCallbackCounters(const std::string& channelName)
+{
+    findRecord(channelName);
+    return callbackSchedulerPtr->getCounters(channelName);
+}
+
+void PvaServer::resetCallbackCounters(const std::string& channelName)
+{
+    findRecord(channelName);
+    callbackSchedulerPtr->resetCounters(channelName);
+}
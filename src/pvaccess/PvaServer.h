@@ -7,6 +7,7 @@
 #include <string>
 #include <map>
 #include <boost/python/list.hpp>
+#include <boost/python/dict.hpp>
 #include <pv/pvData.h>
 #include <pv/pvAccess.h>
 #include <pv/serverContext.h>
@@ -14,7 +15,7 @@
 #include "PvObject.h"
 #include "PyPvRecord.h"
 #include "PvaPyLogger.h"
-#include "SynchronizedQueue.h"
+#include "CallbackScheduler.h"
 
 class PvaServer 
 {
@@ -57,18 +58,29 @@ public:
     virtual boost::python::list getRecordNames();
     virtual void disableRecordProcessing(const std::string& channelName);
 
+    // Callbacks for records with higher priority are executed first;
+    // callbacks for a given record are never executed concurrently
+    virtual void setCallbackPriority(const std::string& channelName, int priority);
+    virtual int getCallbackPriority(const std::string& channelName);
+    virtual void setCallbackThreadPoolSize(int poolSize);
+    virtual int getCallbackThreadPoolSize();
+    virtual boost::python::dict getCallbackCounters(const std::string& channelName);
+    virtual void resetCallbackCounters(const std::string& channelName);
+
     virtual void start();
     virtual void stop();
 
 protected:
     void initRecord(const std::string& channelName, const epics::pvData::PVStructurePtr& pvStructurePtr);
+    PyPvRecordPtr findRecord(const std::string& channelName);
 
 private:
     static const double ShutdownWaitTime;
     static const double RecordUpdateTimeout;
+    static const int DefaultCallbackThreadPoolSize;
 
     static void callbackThread(PvaServer* server);
-    void startCallbackThread();
+    void startCallbackThreads();
     void waitForCallbackThreadExit(double timeout);
     void notifyCallbackThreadExit();
 
@@ -76,15 +88,15 @@ private:
 #if PVA_API_VERSION >= 483
     void initRecord(const std::string& channelName, const PvObject& pvObject, int asLevel, const std::string& asGroup, const boost::python::object& onWriteCallback = boost::python::object());
 #endif // if PVA_API_VERSION >= 483
-    PyPvRecordPtr findRecord(const std::string& channelName);
 
     static PvaPyLogger logger;
     epics::pvAccess::ServerContext::shared_pointer server;
     std::map<std::string, PyPvRecordPtr> recordMap;
     bool isRunning;
 
-    StringQueuePtr callbackQueuePtr;
-    bool callbackThreadRunning;
+    CallbackScheduler::shared_pointer callbackSchedulerPtr;
+    int callbackThreadPoolSize;
+    int nCallbackThreads;
     bool callbackThreadNeeded;
     epics::pvData::Mutex callbackThreadMutex;
     epicsEvent callbackThreadExitEvent;
@@ -0,0 +1,31 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef PY_GIL_ENSURE_H
+#define PY_GIL_ENSURE_H
+
+#include "boost/python.hpp"
+
+// Acquires GIL for the lifetime of the object; unlike PyGilManager,
+// GIL state is kept per object, so it can be used by multiple
+// threads concurrently
+class PyGilEnsure 
+{
+public:
+    PyGilEnsure();
+    ~PyGilEnsure();
+private:
+    PyGILState_STATE gilState;
+};
+
+inline PyGilEnsure::PyGilEnsure() :
+    gilState(PyGILState_Ensure())
+{
+}
+
+inline PyGilEnsure::~PyGilEnsure()
+{
+    PyGILState_Release(gilState); 
+}
+
+#endif // #ifndef PY_GIL_ENSURE_H
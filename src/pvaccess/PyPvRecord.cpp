@@ -6,6 +6,7 @@
 #include "PyPvRecord.h"
 #include "PyUtility.h"
 #include "PyGilManager.h"
+#include "InvalidArgument.h"
 
 namespace bp = boost::python;
 namespace epvd = epics::pvData;
@@ -22,9 +23,9 @@ PyPvRecordPtr PyPvRecord::create(const std::string& name, const epics::pvData::P
     return pvRecord;
 }
 
-PyPvRecordPtr PyPvRecord::create(const std::string& name, const PvObject& pvObject, const StringQueuePtr& callbackQueuePtr, const bp::object& onWriteCallback)
+PyPvRecordPtr PyPvRecord::create(const std::string& name, const PvObject& pvObject, const CallbackScheduler::shared_pointer& callbackSchedulerPtr, const bp::object& onWriteCallback)
 {
-    PyPvRecordPtr pvRecord(new PyPvRecord(name, pvObject, callbackQueuePtr, onWriteCallback));
+    PyPvRecordPtr pvRecord(new PyPvRecord(name, pvObject, callbackSchedulerPtr, onWriteCallback));
     if(!pvRecord->init()) {
         pvRecord.reset();
     }
@@ -33,9 +34,9 @@ PyPvRecordPtr PyPvRecord::create(const std::string& name, const PvObject& pvObje
 
 #if PVA_API_VERSION >= 483
 
-PyPvRecordPtr PyPvRecord::create(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const StringQueuePtr& callbackQueuePtr, const bp::object& onWriteCallback)
+PyPvRecordPtr PyPvRecord::create(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const CallbackScheduler::shared_pointer& callbackSchedulerPtr, const bp::object& onWriteCallback)
 {
-    PyPvRecordPtr pvRecord(new PyPvRecord(name, pvObject, asLevel, asGroup, callbackQueuePtr, onWriteCallback));
+    PyPvRecordPtr pvRecord(new PyPvRecord(name, pvObject, asLevel, asGroup, callbackSchedulerPtr, onWriteCallback));
     if(!pvRecord->init()) {
         pvRecord.reset();
     }
@@ -46,15 +47,15 @@ PyPvRecordPtr PyPvRecord::create(const std::string& name, const PvObject& pvObje
 
 PyPvRecord::PyPvRecord(const std::string& name, const epics::pvData::PVStructurePtr& pvStructurePtr)
     : epvdb::PVRecord(name, pvStructurePtr)
-    , callbackQueuePtr()
+    , callbackSchedulerPtr()
     , onWriteCallback()
     , processingEnabled(true)
 {
 }
 
-PyPvRecord::PyPvRecord(const std::string& name, const PvObject& pvObject, const StringQueuePtr& callbackQueuePtr_, const bp::object& onWriteCallback_)
+PyPvRecord::PyPvRecord(const std::string& name, const PvObject& pvObject, const CallbackScheduler::shared_pointer& callbackSchedulerPtr_, const bp::object& onWriteCallback_)
     : epvdb::PVRecord(name, pvObject.getPvStructurePtr())
-    , callbackQueuePtr(callbackQueuePtr_)
+    , callbackSchedulerPtr(callbackSchedulerPtr_)
     , onWriteCallback(onWriteCallback_)
     , processingEnabled(true)
 {
@@ -65,9 +66,9 @@ PyPvRecord::PyPvRecord(const std::string& name, const PvObject& pvObject, const
 
 #if PVA_API_VERSION >= 483
 
-PyPvRecord::PyPvRecord(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const StringQueuePtr& callbackQueuePtr_, const bp::object& onWriteCallback_)
+PyPvRecord::PyPvRecord(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const CallbackScheduler::shared_pointer& callbackSchedulerPtr_, const bp::object& onWriteCallback_)
     : epvdb::PVRecord(name, pvObject.getPvStructurePtr(), asLevel, asGroup)
-    , callbackQueuePtr(callbackQueuePtr_)
+    , callbackSchedulerPtr(callbackSchedulerPtr_)
     , onWriteCallback(onWriteCallback_)
     , processingEnabled(true)
 {
@@ -94,7 +95,7 @@ void PyPvRecord::process()
         return;
     }
     if(!PyUtility::isPyNone(onWriteCallback)) {
-        callbackQueuePtr->push(getRecordName());
+        callbackSchedulerPtr->push(getRecordName());
     }
     epvdb::PVRecord::process();
 }
@@ -163,6 +164,24 @@ void PyPvRecord::updateUnchecked(const epvd::PVStructurePtr& pvStructurePtr)
     unlock();
 }
 
+// Record structure must have been created by the given PVCopy object;
+// only fields selected by the copy are transferred from its master structure
+void PyPvRecord::updateFromCopy(const epics::pvCopy::PVCopyPtr& pvCopyPtr, const epvd::BitSetPtr& bitSetPtr)
+{
+    lock();
+    try {
+        beginGroupPut();
+        pvCopyPtr->updateCopySetBitSet(getPVStructure(), bitSetPtr);
+        endGroupPut();
+    }
+    catch(...) {
+        endGroupPut();
+        unlock();
+        throw;
+    }
+    unlock();
+}
+
 void PyPvRecord::disableProcessing() 
 {
     processingEnabled = false;
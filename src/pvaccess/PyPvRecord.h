@@ -10,9 +10,10 @@
 
 #include "pv/pvData.h"
 #include "pv/pvDatabase.h"
+#include "pv/pvStructureCopy.h"
 #include "PvObject.h"
 #include "PvaPyLogger.h"
-#include "SynchronizedQueue.h"
+#include "CallbackScheduler.h"
 
 class PyPvRecord;
 typedef std::tr1::shared_ptr<PyPvRecord> PyPvRecordPtr;
@@ -22,10 +23,10 @@ class PyPvRecord :
 {
 public:
     static PyPvRecordPtr create(const std::string& name, const epics::pvData::PVStructurePtr& pvStructurePtr);
-    static PyPvRecordPtr create(const std::string& name, const PvObject& pvObject, const StringQueuePtr& callbackQueuePtr, const boost::python::object& onWriteCallback = boost::python::object());
+    static PyPvRecordPtr create(const std::string& name, const PvObject& pvObject, const CallbackScheduler::shared_pointer& callbackSchedulerPtr, const boost::python::object& onWriteCallback = boost::python::object());
 
 #if PVA_API_VERSION >= 483
-    static PyPvRecordPtr create(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const StringQueuePtr& callbackQueuePtr, const boost::python::object& onWriteCallback = boost::python::object());
+    static PyPvRecordPtr create(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const CallbackScheduler::shared_pointer& callbackSchedulerPtr, const boost::python::object& onWriteCallback = boost::python::object());
 #endif // if PVA_API_VERSION >= 483
 
     POINTER_DEFINITIONS(PyPvRecord);
@@ -36,19 +37,20 @@ public:
     void updateUnchecked(const PvObject& pvObject);
     void update(const epics::pvData::PVStructurePtr& pvStructurePtr);
     void updateUnchecked(const epics::pvData::PVStructurePtr& pvStructurePtr);
+    void updateFromCopy(const epics::pvCopy::PVCopyPtr& pvCopyPtr, const epics::pvData::BitSetPtr& bitSetPtr);
     void executeCallback();
     void disableProcessing();
 
 private:
     static PvaPyLogger logger;
     PyPvRecord(const std::string& name, const epics::pvData::PVStructurePtr& pvStructurePtr);
-    PyPvRecord(const std::string& name, const PvObject& pvObject, const StringQueuePtr& callbackQueuePtr, const boost::python::object& onWriteCallback = boost::python::object());
+    PyPvRecord(const std::string& name, const PvObject& pvObject, const CallbackScheduler::shared_pointer& callbackSchedulerPtr, const boost::python::object& onWriteCallback = boost::python::object());
 
 #if PVA_API_VERSION >= 483
-    PyPvRecord(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const StringQueuePtr& callbackQueuePtr, const boost::python::object& onWriteCallback = boost::python::object());
+    PyPvRecord(const std::string& name, const PvObject& pvObject, int asLevel, const std::string& asGroup, const CallbackScheduler::shared_pointer& callbackSchedulerPtr, const boost::python::object& onWriteCallback = boost::python::object());
 #endif // if PVA_API_VERSION >= 483
 
-    StringQueuePtr callbackQueuePtr; 
+    CallbackScheduler::shared_pointer callbackSchedulerPtr; 
     boost::python::object onWriteCallback;
     bool processingEnabled;
 
@@ -0,0 +1,23 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef QUEUE_OVERFLOW_POLICY_H
+#define QUEUE_OVERFLOW_POLICY_H
+
+namespace QueueOverflowPolicy
+{
+
+// Determines what happens with new items pushed into a full queue
+enum OverflowPolicy {
+    // New item is rejected
+    RejectNew = 0,
+    // Oldest queued item is discarded to make room for the new one
+    DropOldest = 1,
+    // New item replaces queued item with the same key; if there is
+    // no such item and the queue is full, oldest item is discarded
+    Conflate = 2,
+};
+
+}
+
+#endif
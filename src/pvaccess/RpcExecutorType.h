@@ -0,0 +1,24 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef RPC_EXECUTOR_TYPE_H
+#define RPC_EXECUTOR_TYPE_H
+
+namespace RpcExecutorType
+{
+
+// Determines how RPC service requests are executed
+enum ExecutorType {
+    // Service is invoked directly by the PVA server thread that
+    // received the request
+    Synchronous = 0,
+    // Requests are queued and executed by the RPC server worker pool
+    ThreadPool = 1,
+    // Requests are queued, and worker pool threads execute them
+    // in the RPC server process pool
+    ProcessPool = 2,
+};
+
+}
+
+#endif
@@ -5,14 +5,27 @@
 #include "epicsThread.h"
 #include "RpcServer.h"
 #include "PyGilManager.h"
+#include "PyGilRelease.h"
+#include "InvalidArgument.h"
 #include "InvalidState.h"
+#include "ObjectNotFound.h"
+
+namespace bp = boost::python;
 
 PvaPyLogger RpcServer::logger("RpcServer");
 const double RpcServer::ShutdownWaitTime(0.1);
 
 RpcServer::RpcServer() :
     epics::pvAccess::RPCServer(),
-    destroyed(false)
+    destroyed(false),
+    serviceMap(),
+#if PVA_API_VERSION >= 470
+    asyncServiceMap(),
+    workerPoolPtr(new RpcWorkerPool()),
+#endif // if PVA_API_VERSION >= 470
+    processPoolSize(0),
+    pyProcessPool(),
+    pyEventLoop()
 {
 }
 
@@ -24,13 +37,171 @@ RpcServer::~RpcServer()
 
 void RpcServer::registerService(const std::string& serviceName, const boost::python::object& pyService)
 {
-    epics::pvAccess::RPCService::shared_pointer rpcServiceImplPtr(new RpcServiceImpl(pyService));
+    RpcServiceImpl::shared_pointer rpcServiceImplPtr(new RpcServiceImpl(pyService, bp::object(), getEventLoop(pyService)));
     epics::pvAccess::RPCServer::registerService(serviceName, rpcServiceImplPtr);
+    serviceMap[serviceName] = rpcServiceImplPtr;
+}
+
+void RpcServer::registerService(const std::string& serviceName, const boost::python::object& pyService, RpcExecutorType::ExecutorType executorType, int maxInFlight, int maxQueueSize)
+{
+    if (executorType == RpcExecutorType::Synchronous) {
+        registerService(serviceName, pyService);
+        return;
+    }
+#if PVA_API_VERSION >= 470
+    if (maxInFlight <= 0) {
+        throw InvalidArgument("Maximum number of requests in flight must be positive, got %d.", maxInFlight);
+    }
+    if (maxQueueSize < 0) {
+        throw InvalidArgument("Maximum request queue size cannot be negative, got %d.", maxQueueSize);
+    }
+    bp::object pyExecutor;
+    bp::object pyServiceEventLoop = getEventLoop(pyService);
+    if (executorType == RpcExecutorType::ProcessPool) {
+        if (!pyServiceEventLoop.is_none()) {
+            throw InvalidArgument("Coroutine service %s cannot be executed in the process pool.", serviceName.c_str());
+        }
+        pyExecutor = getProcessPool();
+    }
+    PyGilManager::evalInitThreads();
+    RpcServiceImpl::shared_pointer rpcServiceImplPtr(new RpcServiceImpl(pyService, pyExecutor, pyServiceEventLoop));
+    RpcServiceAsyncImpl::shared_pointer rpcServiceAsyncImplPtr(new RpcServiceAsyncImpl(rpcServiceImplPtr, workerPoolPtr, maxInFlight, maxQueueSize));
+    epics::pvAccess::RPCServer::registerService(serviceName, rpcServiceAsyncImplPtr);
+    serviceMap[serviceName] = rpcServiceImplPtr;
+    asyncServiceMap[serviceName] = rpcServiceAsyncImplPtr;
+#else
+    throw InvalidArgument("Service executor type %d is not supported by this version of PV Access.", executorType);
+#endif // if PVA_API_VERSION >= 470
 }
 
 void RpcServer::unregisterService(const std::string& serviceName)
 {
     epics::pvAccess::RPCServer::unregisterService(serviceName);
+    serviceMap.erase(serviceName);
+#if PVA_API_VERSION >= 470
+    asyncServiceMap.erase(serviceName);
+#endif // if PVA_API_VERSION >= 470
+}
+
+// Coroutine services are executed in event loop running in its own
+// thread; loop is created when the first such service is registered
+bp::object RpcServer::getEventLoop(const bp::object& pyService)
+{
+    if (!bp::import("inspect").attr("iscoroutinefunction")(pyService)) {
+        return bp::object();
+    }
+    if (pyEventLoop.is_none()) {
+        PyGilManager::evalInitThreads();
+        pyEventLoop = bp::import("asyncio").attr("new_event_loop")();
+        bp::dict kwargs;
+        kwargs["target"] = pyEventLoop.attr("run_forever");
+        kwargs["name"] = "RpcServerEventLoop";
+        kwargs["daemon"] = true;
+        bp::object pyThread = bp::import("threading").attr("Thread")(*bp::make_tuple(), **kwargs);
+        pyThread.attr("start")();
+    }
+    return pyEventLoop;
+}
+
+bp::object RpcServer::getProcessPool()
+{
+    if (pyProcessPool.is_none()) {
+        bp::dict kwargs;
+        if (processPoolSize > 0) {
+            kwargs["max_workers"] = processPoolSize;
+        }
+        // Forking a process with running PVA threads is not safe
+        kwargs["mp_context"] = bp::import("multiprocessing").attr("get_context")("spawn");
+        pyProcessPool = bp::import("concurrent.futures").attr("ProcessPoolExecutor")(*bp::make_tuple(), **kwargs);
+    }
+    return pyProcessPool;
+}
+
+void RpcServer::stopExecutors()
+{
+#if PVA_API_VERSION >= 470
+    {
+        // Worker threads need GIL to complete their requests
+        PyGilRelease pyGilRelease;
+        workerPoolPtr->stop(ShutdownWaitTime);
+    }
+#endif // if PVA_API_VERSION >= 470
+    if (!pyProcessPool.is_none()) {
+        pyProcessPool.attr("shutdown")(false);
+        pyProcessPool = bp::object();
+    }
+    if (!pyEventLoop.is_none()) {
+        pyEventLoop.attr("call_soon_threadsafe")(pyEventLoop.attr("stop"));
+        pyEventLoop = bp::object();
+    }
+}
+
+void RpcServer::setWorkerPoolSize(int poolSize)
+{
+#if PVA_API_VERSION >= 470
+    workerPoolPtr->setPoolSize(poolSize);
+#else
+    throw InvalidState("Worker pool is not supported by this version of PV Access.");
+#endif // if PVA_API_VERSION >= 470
+}
+
+int RpcServer::getWorkerPoolSize()
+{
+#if PVA_API_VERSION >= 470
+    return workerPoolPtr->getPoolSize();
+#else
+    return 0;
+#endif // if PVA_API_VERSION >= 470
+}
+
+void RpcServer::setProcessPoolSize(int poolSize)
+{
+    if (poolSize < 0) {
+        throw InvalidArgument("Process pool size cannot be negative, got %d.", poolSize);
+    }
+    if (!pyProcessPool.is_none()) {
+        throw InvalidState("Process pool size cannot be changed after the pool has been created.");
+    }
+    processPoolSize = poolSize;
+}
+
+int RpcServer::getProcessPoolSize()
+{
+    return processPoolSize;
+}
+
+bp::dict RpcServer::getServiceCounters(const std::string& serviceName)
+{
+    std::map<std::string, RpcServiceImpl::shared_pointer>::iterator it = serviceMap.find(serviceName);
+    if (it == serviceMap.end()) {
+        throw ObjectNotFound("Service " + serviceName + " is not registered.");
+    }
+    bp::dict counterDict;
+#if PVA_API_VERSION >= 470
+    std::map<std::string, RpcServiceAsyncImpl::shared_pointer>::iterator it2 = asyncServiceMap.find(serviceName);
+    if (it2 != asyncServiceMap.end()) {
+        it2->second->getCounters(counterDict);
+        return counterDict;
+    }
+#endif // if PVA_API_VERSION >= 470
+    it->second->getCounters(counterDict);
+    return counterDict;
+}
+
+void RpcServer::resetServiceCounters(const std::string& serviceName)
+{
+    std::map<std::string, RpcServiceImpl::shared_pointer>::iterator it = serviceMap.find(serviceName);
+    if (it == serviceMap.end()) {
+        throw ObjectNotFound("Service " + serviceName + " is not registered.");
+    }
+#if PVA_API_VERSION >= 470
+    std::map<std::string, RpcServiceAsyncImpl::shared_pointer>::iterator it2 = asyncServiceMap.find(serviceName);
+    if (it2 != asyncServiceMap.end()) {
+        it2->second->resetCounters();
+        return;
+    }
+#endif // if PVA_API_VERSION >= 470
+    it->second->resetCounters();
 }
 
 void RpcServer::startListener()
@@ -96,5 +267,6 @@ void RpcServer::shutdown()
 {
     destroyed = true;
     epics::pvAccess::RPCServer::destroy();
+    stopExecutors();
 }
 
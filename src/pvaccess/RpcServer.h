@@ -5,11 +5,16 @@
 #define RPC_SERVER_H
 
 #include <string>
+#include <map>
 #include "pv/pvData.h"
 #include "pv/pvAccess.h"
 #include "pv/rpcServer.h"
 #include "boost/python/object.hpp"
+#include "boost/python/dict.hpp"
 #include "RpcServiceImpl.h"
+#include "RpcServiceAsyncImpl.h"
+#include "RpcWorkerPool.h"
+#include "RpcExecutorType.h"
 #include "PvaPyLogger.h"
 
 class RpcServer : public epics::pvAccess::RPCServer
@@ -18,8 +23,16 @@ public:
     RpcServer();
     virtual ~RpcServer();
     void registerService(const std::string& serviceName, const boost::python::object& pyService);
+    void registerService(const std::string& serviceName, const boost::python::object& pyService, RpcExecutorType::ExecutorType executorType, int maxInFlight, int maxQueueSize);
     void unregisterService(const std::string& serviceName);
 
+    void setWorkerPoolSize(int poolSize);
+    int getWorkerPoolSize();
+    void setProcessPoolSize(int poolSize);
+    int getProcessPoolSize();
+    boost::python::dict getServiceCounters(const std::string& serviceName);
+    void resetServiceCounters(const std::string& serviceName);
+
     void startListener();
     void stopListener();
 
@@ -35,7 +48,20 @@ private:
     static const double ShutdownWaitTime;
     static PvaPyLogger logger;
     static void listenerThread(RpcServer* rpcServer);
+
+    boost::python::object getEventLoop(const boost::python::object& pyService);
+    boost::python::object getProcessPool();
+    void stopExecutors();
+
     bool destroyed;
+    std::map<std::string, RpcServiceImpl::shared_pointer> serviceMap;
+#if PVA_API_VERSION >= 470
+    std::map<std::string, RpcServiceAsyncImpl::shared_pointer> asyncServiceMap;
+    RpcWorkerPool::shared_pointer workerPoolPtr;
+#endif // if PVA_API_VERSION >= 470
+    int processPoolSize;
+    boost::python::object pyProcessPool;
+    boost::python::object pyEventLoop;
 };
 
 #endif
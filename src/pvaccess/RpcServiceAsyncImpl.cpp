@@ -0,0 +1,149 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include "RpcServiceAsyncImpl.h"
+
+#if PVA_API_VERSION >= 470
+#include "PvaPyConstants.h"
+#include "StringUtility.h"
+
+namespace bp = boost::python;
+namespace epvd = epics::pvData;
+namespace epva = epics::pvAccess;
+
+PvaPyLogger RpcServiceAsyncImpl::logger("RpcServiceAsyncImpl");
+
+RpcServiceAsyncImpl::RpcServiceAsyncImpl(const RpcServiceImpl::shared_pointer& serviceImplPtr_, const RpcWorkerPool::shared_pointer& workerPoolPtr_, int maxInFlight_, int maxQueueSize_)
+    : serviceImplPtr(serviceImplPtr_)
+    , workerPoolPtr(workerPoolPtr_)
+    , maxInFlight(maxInFlight_)
+    , maxQueueSize(maxQueueSize_)
+    , mutex()
+    , pendingRequests()
+    , nInFlight(0)
+{
+    resetCounters();
+}
+
+RpcServiceAsyncImpl::~RpcServiceAsyncImpl()
+{
+}
+
+void RpcServiceAsyncImpl::request(const epvd::PVStructurePtr& args, const epva::RPCResponseCallback::shared_pointer& callback)
+{
+    PendingRequest pendingRequest;
+    pendingRequest.args = args;
+    pendingRequest.callback = callback;
+    epicsTimeGetCurrent(&pendingRequest.receiveTime);
+
+    bool submitNeeded = false;
+    bool rejected = false;
+    {
+        epvd::Lock lock(mutex);
+        if (maxQueueSize > 0 && nInFlight >= maxInFlight && pendingRequests.size() >= maxQueueSize) {
+            nRejected++;
+            rejected = true;
+        }
+        else {
+            pendingRequests.push_back(pendingRequest);
+            if (pendingRequests.size() > maxQueued) {
+                maxQueued = pendingRequests.size();
+            }
+            if (nInFlight < maxInFlight) {
+                nInFlight++;
+                submitNeeded = true;
+            }
+        }
+    }
+    if (rejected) {
+        callback->requestDone(epvd::Status(epvd::Status::STATUSTYPE_ERROR, "Service request queue is full (maximum queue size: " + StringUtility::toString<unsigned int>(maxQueueSize) + ")."), epvd::PVStructurePtr());
+        return;
+    }
+    if (submitNeeded) {
+        workerPoolPtr->submit(shared_from_this());
+    }
+}
+
+void RpcServiceAsyncImpl::processNextRequest()
+{
+    PendingRequest pendingRequest;
+    {
+        epvd::Lock lock(mutex);
+        if (pendingRequests.empty()) {
+            // Request was taken by another task
+            nInFlight--;
+            return;
+        }
+        pendingRequest = pendingRequests.front();
+        pendingRequests.pop_front();
+    }
+
+    epvd::Status status = epvd::Status::Ok;
+    epvd::PVStructurePtr result;
+    try {
+        result = serviceImplPtr->request(pendingRequest.args);
+    }
+    catch (const epva::RPCRequestException& ex) {
+        status = ex.asStatus();
+    }
+    catch (const std::exception& ex) {
+        status = epvd::Status(epvd::Status::STATUSTYPE_ERROR, ex.what());
+    }
+    pendingRequest.callback->requestDone(status, result);
+
+    epicsTimeStamp now;
+    epicsTimeGetCurrent(&now);
+    double latency = epicsTimeDiffInSeconds(&now, &pendingRequest.receiveTime);
+    bool submitNeeded = false;
+    {
+        epvd::Lock lock(mutex);
+        lastLatency = latency;
+        if (nCompleted == 0 || latency < minLatency) {
+            minLatency = latency;
+        }
+        if (latency > maxLatency) {
+            maxLatency = latency;
+        }
+        totalLatency += latency;
+        nCompleted++;
+        if (!pendingRequests.empty()) {
+            // Keep our slot in flight for the next queued request
+            submitNeeded = true;
+        }
+        else {
+            nInFlight--;
+        }
+    }
+    if (submitNeeded) {
+        workerPoolPtr->submit(shared_from_this());
+    }
+}
+
+void RpcServiceAsyncImpl::getCounters(bp::dict& counterDict)
+{
+    serviceImplPtr->getCounters(counterDict);
+    epvd::Lock lock(mutex);
+    counterDict[PvaPyConstants::NumRejectedCounterKey] = nRejected;
+    counterDict[PvaPyConstants::NumQueuedCounterKey] = (unsigned int)pendingRequests.size();
+    counterDict[PvaPyConstants::MaxQueuedCounterKey] = maxQueued;
+    counterDict[PvaPyConstants::NumInFlightCounterKey] = nInFlight;
+    counterDict[PvaPyConstants::LastCallbackLatencyCounterKey] = lastLatency;
+    counterDict[PvaPyConstants::MinCallbackLatencyCounterKey] = minLatency;
+    counterDict[PvaPyConstants::MaxCallbackLatencyCounterKey] = maxLatency;
+    counterDict[PvaPyConstants::AvgCallbackLatencyCounterKey] = nCompleted > 0 ? totalLatency/nCompleted : 0.0;
+}
+
+void RpcServiceAsyncImpl::resetCounters()
+{
+    serviceImplPtr->resetCounters();
+    epvd::Lock lock(mutex);
+    nRejected = 0;
+    maxQueued = 0;
+    nCompleted = 0;
+    lastLatency = 0;
+    minLatency = 0;
+    maxLatency = 0;
+    totalLatency = 0;
+}
+
+#endif // if PVA_API_VERSION >= 470
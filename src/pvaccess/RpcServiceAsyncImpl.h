@@ -0,0 +1,71 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef RPC_SERVICE_ASYNC_IMPL_H
+#define RPC_SERVICE_ASYNC_IMPL_H
+
+#if PVA_API_VERSION >= 470
+
+#include <deque>
+#include <epicsTime.h>
+#include <pv/pvData.h>
+#include <pv/pvAccess.h>
+#include <pv/rpcServer.h>
+#include <boost/python/dict.hpp>
+#include "PvaPyLogger.h"
+#include "RpcServiceImpl.h"
+#include "RpcWorkerPool.h"
+
+// Queues service requests and executes them using RPC server worker
+// pool, so that slow requests do not block the PVA server thread that
+// received them. Number of requests executed concurrently is limited
+// by the maximum number of requests in flight; excess requests wait
+// in the service queue, and are rejected if the queue is full.
+class RpcServiceAsyncImpl : 
+    public epics::pvAccess::RPCServiceAsync, 
+    public std::tr1::enable_shared_from_this<RpcServiceAsyncImpl>
+{
+public:
+    POINTER_DEFINITIONS(RpcServiceAsyncImpl);
+    RpcServiceAsyncImpl(const RpcServiceImpl::shared_pointer& serviceImplPtr, const RpcWorkerPool::shared_pointer& workerPoolPtr, int maxInFlight, int maxQueueSize);
+    virtual ~RpcServiceAsyncImpl();
+
+    virtual void request(const epics::pvData::PVStructurePtr& args, const epics::pvAccess::RPCResponseCallback::shared_pointer& callback);
+
+    // Called by worker pool threads
+    void processNextRequest();
+
+    // Statistics
+    virtual void getCounters(boost::python::dict& counterDict);
+    virtual void resetCounters();
+
+private:
+    struct PendingRequest {
+        epics::pvData::PVStructurePtr args;
+        epics::pvAccess::RPCResponseCallback::shared_pointer callback;
+        epicsTimeStamp receiveTime;
+    };
+
+    static PvaPyLogger logger;
+    RpcServiceImpl::shared_pointer serviceImplPtr;
+    RpcWorkerPool::shared_pointer workerPoolPtr;
+    unsigned int maxInFlight;
+    unsigned int maxQueueSize;
+
+    epics::pvData::Mutex mutex;
+    std::deque<PendingRequest> pendingRequests;
+    unsigned int nInFlight;
+
+    // Statistics counters
+    unsigned int nRejected;
+    unsigned int maxQueued;
+    unsigned int nCompleted;
+    double lastLatency;
+    double minLatency;
+    double maxLatency;
+    double totalLatency;
+};
+
+#endif // if PVA_API_VERSION >= 470
+
+#endif
@@ -2,10 +2,13 @@
 // found in the file LICENSE that is included with the distribution
 
 #include <boost/python/extract.hpp>
+#include <boost/python/import.hpp>
+#include <epicsTime.h>
 #include "RpcServiceImpl.h"
 #include "PvObject.h"
-#include "PyGilManager.h"
+#include "PyGilEnsure.h"
 #include "PyUtility.h"
+#include "PvaPyConstants.h"
 
 namespace bp = boost::python; 
 
@@ -13,7 +16,28 @@ PvaPyLogger RpcServiceImpl::logger("Channel");
 
 RpcServiceImpl::RpcServiceImpl(const boost::python::object& pyService_) : 
     pyService(pyService_),
-    pyObject()
+    pyExecutor(),
+    pyEventLoop(),
+    pyObject(),
+    mutex(),
+    nRequests(0),
+    nErrors(0),
+    maxRuntime(0),
+    totalRuntime(0)
+{
+    PvObject::initializeBoostNumPy();
+}
+
+RpcServiceImpl::RpcServiceImpl(const boost::python::object& pyService_, const boost::python::object& pyExecutor_, const boost::python::object& pyEventLoop_) : 
+    pyService(pyService_),
+    pyExecutor(pyExecutor_),
+    pyEventLoop(pyEventLoop_),
+    pyObject(),
+    mutex(),
+    nRequests(0),
+    nErrors(0),
+    maxRuntime(0),
+    totalRuntime(0)
 {
     PvObject::initializeBoostNumPy();
 }
@@ -25,33 +49,95 @@ RpcServiceImpl::~RpcServiceImpl()
     //bp::incref(pyObject.ptr());
 }
 
-epics::pvData::PVStructurePtr RpcServiceImpl::request(const epics::pvData::PVStructurePtr& args)
+// Must be called with GIL held
+bp::object RpcServiceImpl::callService(const PvObject& pyRequest)
 {
-    PvObject pyRequest(args);
-    // Acquire GIL
-    PyGilManager::gilStateEnsure();
-
-    // Call python code
-    try {
-        pyObject = pyService(pyRequest);
+    bp::object pyResult;
+    if (!pyExecutor.is_none()) {
+        // Service runs in a separate process; this call
+        // releases GIL while waiting for the result
+        pyResult = pyExecutor.attr("submit")(pyService, pyRequest).attr("result")();
     }
-    catch(bp::error_already_set& ex) {
-        std::string errorMessage = PyUtility::getErrorMessageFromTraceback(ex);
-        throw epics::pvAccess::RPCRequestException(epics::pvData::Status::STATUSTYPE_ERROR, errorMessage);
+    else {
+        pyResult = pyService(pyRequest);
     }
-    catch (const std::exception& ex) {
-        throw epics::pvAccess::RPCRequestException(epics::pvData::Status::STATUSTYPE_ERROR, ex.what());
-        logger.error(ex.what());
+    if (!pyEventLoop.is_none()) {
+        bp::object asyncioModule = bp::import("asyncio");
+        if (asyncioModule.attr("iscoroutine")(pyResult)) {
+            pyResult = asyncioModule.attr("run_coroutine_threadsafe")(pyResult, pyEventLoop).attr("result")();
+        }
     }
+    return pyResult;
+}
 
-    // Release GIL. 
-    PyGilManager::gilStateRelease();
+void RpcServiceImpl::updateCounters(double runtime, bool success)
+{
+    epics::pvData::Lock lock(mutex);
+    nRequests++;
+    if (!success) {
+        nErrors++;
+    }
+    if (runtime > maxRuntime) {
+        maxRuntime = runtime;
+    }
+    totalRuntime += runtime;
+}
+
+epics::pvData::PVStructurePtr RpcServiceImpl::request(const epics::pvData::PVStructurePtr& args)
+{
+    PvObject pyRequest(args);
+    epicsTimeStamp startTime;
+    epicsTimeGetCurrent(&startTime);
+    std::string errorMessage;
+    epics::pvData::PVStructurePtr response;
+    {
+        // Acquire GIL; response is extracted before GIL is released,
+        // as the service may be executed by several threads concurrently
+        PyGilEnsure pyGilEnsure;
+        try {
+            bp::object pyResult = callService(pyRequest);
+            pyObject = pyResult;
+            bp::extract<PvObject> pvObjectExtract(pyResult);
+            if (pvObjectExtract.check()) {
+                PvObject pyResponse = pvObjectExtract();
+                response = static_cast<epics::pvData::PVStructurePtr>(pyResponse);
+            }
+            else {
+                errorMessage = "Callable python service object must return instance of PvObject.";
+            }
+        }
+        catch(bp::error_already_set& ex) {
+            errorMessage = PyUtility::getErrorMessageFromTraceback(ex);
+        }
+        catch (const std::exception& ex) {
+            logger.error(ex.what());
+            errorMessage = ex.what();
+        }
+    }
 
-    boost::python::extract<PvObject> pvObjectExtract(pyObject);
-    if (!pvObjectExtract.check()) {
-        throw epics::pvAccess::RPCRequestException(epics::pvData::Status::STATUSTYPE_ERROR, "Callable python service object must return instance of PvObject.");
+    epicsTimeStamp endTime;
+    epicsTimeGetCurrent(&endTime);
+    updateCounters(epicsTimeDiffInSeconds(&endTime, &startTime), errorMessage.empty());
+    if (!errorMessage.empty()) {
+        throw epics::pvAccess::RPCRequestException(epics::pvData::Status::STATUSTYPE_ERROR, errorMessage);
     }
-    PvObject pyResponse = pvObjectExtract();
-    return static_cast<epics::pvData::PVStructurePtr>(pyResponse);
+    return response;
+}
+
+void RpcServiceImpl::getCounters(bp::dict& counterDict)
+{
+    epics::pvData::Lock lock(mutex);
+    counterDict[PvaPyConstants::NumRequestsCounterKey] = nRequests;
+    counterDict[PvaPyConstants::NumErrorsCounterKey] = nErrors;
+    counterDict[PvaPyConstants::MaxCallbackRuntimeCounterKey] = maxRuntime;
+    counterDict[PvaPyConstants::AvgCallbackRuntimeCounterKey] = nRequests > 0 ? totalRuntime/nRequests : 0.0;
 }
 
+void RpcServiceImpl::resetCounters()
+{
+    epics::pvData::Lock lock(mutex);
+    nRequests = 0;
+    nErrors = 0;
+    maxRuntime = 0;
+    totalRuntime = 0;
+}
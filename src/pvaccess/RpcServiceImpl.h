@@ -8,6 +8,7 @@
 #include <pv/pvAccess.h>
 #include <pv/rpcServer.h>
 #include <boost/python/object.hpp>
+#include <boost/python/dict.hpp>
 #include "PvaPyLogger.h"
 #include "PvObject.h"
 
@@ -16,15 +17,35 @@ class RpcServiceImpl : public epics::pvAccess::RPCService
 public:
     POINTER_DEFINITIONS(RpcServiceImpl);
     RpcServiceImpl(const boost::python::object& pyService);
+    // Process pool executor and asyncio event loop are optional (None);
+    // if event loop is given, coroutines returned by the service are
+    // executed in it
+    RpcServiceImpl(const boost::python::object& pyService, const boost::python::object& pyExecutor, const boost::python::object& pyEventLoop);
     virtual ~RpcServiceImpl();
     epics::pvData::PVStructurePtr request(const epics::pvData::PVStructurePtr& args);
+
+    // Statistics
+    virtual void getCounters(boost::python::dict& counterDict);
+    virtual void resetCounters();
+
 private:
     static PvaPyLogger logger;
+    boost::python::object callService(const PvObject& pyRequest);
+    void updateCounters(double runtime, bool success);
+
     boost::python::object pyService;
+    boost::python::object pyExecutor;
+    boost::python::object pyEventLoop;
     // Keeping python response object in scope prevents problem with
     // service segfaulting while returning RPC result; this issue seems to have
     // appeared in recent boost versions 
     boost::python::object pyObject;
+
+    epics::pvData::Mutex mutex;
+    unsigned int nRequests;
+    unsigned int nErrors;
+    double maxRuntime;
+    double totalRuntime;
 };
 
 #endif
@@ -0,0 +1,135 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include "epicsThread.h"
+#include "RpcWorkerPool.h"
+
+#if PVA_API_VERSION >= 470
+
+#include "RpcServiceAsyncImpl.h"
+#include "PyGilManager.h"
+#include "InvalidArgument.h"
+
+PvaPyLogger RpcWorkerPool::logger("RpcWorkerPool");
+const int RpcWorkerPool::DefaultPoolSize(4);
+const double RpcWorkerPool::TaskWaitTimeout(0.1);
+
+RpcWorkerPool::RpcWorkerPool()
+    : mutex()
+    , taskEvent()
+    , exitEvent()
+    , taskQueue()
+    , poolSize(DefaultPoolSize)
+    , nWorkerThreads(0)
+    , isRunning(true)
+{
+}
+
+RpcWorkerPool::~RpcWorkerPool()
+{
+    stop(TaskWaitTimeout);
+}
+
+void RpcWorkerPool::submit(const std::tr1::shared_ptr<RpcServiceAsyncImpl>& servicePtr)
+{
+    epics::pvData::Lock lock(mutex);
+    if (!isRunning) {
+        return;
+    }
+    startWorkerThreadsUnsynchronized();
+    taskQueue.push_back(servicePtr);
+    taskEvent.signal();
+}
+
+void RpcWorkerPool::setPoolSize(int poolSize_)
+{
+    if (poolSize_ <= 0) {
+        throw InvalidArgument("Worker pool size must be positive, got %d.", poolSize_);
+    }
+    epics::pvData::Lock lock(mutex);
+    poolSize = poolSize_;
+    // Excess threads exit after completing their current task
+    if (nWorkerThreads > 0) {
+        startWorkerThreadsUnsynchronized();
+        taskEvent.signal();
+    }
+}
+
+int RpcWorkerPool::getPoolSize()
+{
+    epics::pvData::Lock lock(mutex);
+    return poolSize;
+}
+
+void RpcWorkerPool::stop(double timeout)
+{
+    bool workerThreadsRunning = false;
+    {
+        epics::pvData::Lock lock(mutex);
+        isRunning = false;
+        taskQueue.clear();
+        workerThreadsRunning = (nWorkerThreads > 0);
+        taskEvent.signal();
+    }
+    if (workerThreadsRunning) {
+        logger.debug("Waiting on worker thread exit, timeout in %f seconds", timeout);
+        exitEvent.wait(timeout);
+    }
+}
+
+void RpcWorkerPool::startWorkerThreadsUnsynchronized()
+{
+    if (nWorkerThreads < poolSize) {
+        PyGilManager::evalInitThreads();
+    }
+    while (nWorkerThreads < poolSize) {
+        epicsThreadCreate("RpcWorkerThread", epicsThreadPriorityMedium, epicsThreadGetStackSize(epicsThreadStackMedium), (EPICSTHREADFUNC)workerThread, this);
+        nWorkerThreads++;
+    }
+}
+
+void RpcWorkerPool::workerThread(RpcWorkerPool* pool)
+{
+    logger.debug("Started RPC worker thread %s", epicsThreadGetNameSelf());
+    while (true) {
+        std::tr1::shared_ptr<RpcServiceAsyncImpl> servicePtr;
+        {
+            epics::pvData::Lock lock(pool->mutex);
+            if (!pool->isRunning || pool->nWorkerThreads > pool->poolSize) {
+                // Pool was stopped or its size was reduced; thread
+                // count is updated here so that only excess threads exit
+                pool->nWorkerThreads--;
+                if (pool->nWorkerThreads == 0) {
+                    pool->exitEvent.signal();
+                }
+                else if (!pool->isRunning) {
+                    // Wake up remaining threads
+                    pool->taskEvent.signal();
+                }
+                break;
+            }
+            if (!pool->taskQueue.empty()) {
+                servicePtr = pool->taskQueue.front();
+                pool->taskQueue.pop_front();
+                if (!pool->taskQueue.empty()) {
+                    // Make sure another thread gets woken up
+                    pool->taskEvent.signal();
+                }
+            }
+        }
+        if (!servicePtr) {
+            pool->taskEvent.wait(TaskWaitTimeout);
+            continue;
+        }
+        try {
+            servicePtr->processNextRequest();
+        }
+        catch (const std::exception& ex) {
+            // Not good.
+            logger.error("RPC worker thread caught exception: %s", ex.what());
+        }
+    }
+    logger.debug("Exiting RPC worker thread %s", epicsThreadGetNameSelf());
+}
+
+#endif // if PVA_API_VERSION >= 470
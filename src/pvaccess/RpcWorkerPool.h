@@ -0,0 +1,51 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef RPC_WORKER_POOL_H
+#define RPC_WORKER_POOL_H
+
+#if PVA_API_VERSION >= 470
+
+#include <deque>
+#include <epicsEvent.h>
+#include <pv/pvData.h>
+#include "PvaPyLogger.h"
+
+class RpcServiceAsyncImpl;
+
+// Pool of threads executing queued RPC service requests. Each submitted
+// task results in a single request being processed by the given service.
+class RpcWorkerPool
+{
+public:
+    POINTER_DEFINITIONS(RpcWorkerPool);
+
+    static const int DefaultPoolSize;
+
+    RpcWorkerPool();
+    virtual ~RpcWorkerPool();
+
+    void submit(const std::tr1::shared_ptr<RpcServiceAsyncImpl>& servicePtr);
+    void setPoolSize(int poolSize);
+    int getPoolSize();
+    void stop(double timeout);
+
+private:
+    static const double TaskWaitTimeout;
+    static PvaPyLogger logger;
+
+    static void workerThread(RpcWorkerPool* pool);
+    void startWorkerThreadsUnsynchronized();
+
+    epics::pvData::Mutex mutex;
+    epicsEvent taskEvent;
+    epicsEvent exitEvent;
+    std::deque<std::tr1::shared_ptr<RpcServiceAsyncImpl> > taskQueue;
+    int poolSize;
+    int nWorkerThreads;
+    bool isRunning;
+};
+
+#endif // if PVA_API_VERSION >= 470
+
+#endif
@@ -0,0 +1,508 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#ifndef SPSC_RING_BUFFER_H
+#define SPSC_RING_BUFFER_H
+
+#include <memory>
+#include <string>
+#include <vector>
+#include <map>
+#include <epicsAtomic.h>
+#include <epicsEvent.h>
+#include <epicsTime.h>
+#include <pv/pvData.h>
+#include "QueueEmpty.h"
+#include "QueueFull.h"
+#include "InvalidArgument.h"
+#include "InvalidState.h"
+#include "PvaPyConstants.h"
+
+// Bounded lock-free ring buffer for a single producer and a single
+// consumer thread. Push and pop operations only use atomic loads and
+// stores of the head and tail indices; events are signaled only if
+// the other side is waiting. The interface mirrors SynchronizedQueue.
+template <class T>
+class SpscRingBuffer
+{
+public:
+    POINTER_DEFINITIONS(SpscRingBuffer<T>);
+
+    SpscRingBuffer(int maxLength);
+    virtual ~SpscRingBuffer();
+    // Buffer can be resized only while it is empty
+    void setMaxLength(int maxLength);
+    int getMaxLength();
+    bool isFull();
+    bool isEmpty();
+    unsigned int size();
+    T back();
+    T front();
+    T frontAndPop();
+    T frontAndPop(double timeout);
+    void pop();
+    void push(const T& t);
+    void push(const T& t, double timeout);
+
+    bool popIfNotEmpty();
+    bool pushIfNotFull(const T& t);
+
+    unsigned int frontAndPopMany(std::vector<T>& items, int maxItems);
+    unsigned int frontAndPopMany(std::vector<T>& items, int maxItems, double timeout);
+    unsigned int pushMany(const std::vector<T>& items);
+
+    void waitForItemPushed(double timeout);
+    void waitForItemPushedIfEmpty(double timeout);
+    void waitForItemPopped(double timeout);
+    void waitForItemPoppedIfFull(double timeout);
+    void cancelWaitForItemPushed();
+    void cancelWaitForItemPopped();
+    void clear();
+
+    // Statistics
+    void resetCounters();
+    const std::map<std::string,unsigned int>& getCounterMap();
+    void setCounter(const std::string& key, unsigned int value);
+    void addToCounter(const std::string& key, unsigned int value);
+    double getTimeSinceLastPush();
+    double getTimeSinceLastPop();
+
+private:
+    // Padding that keeps producer and consumer indices in separate
+    // cache lines
+    static const int CacheLineSize = 64;
+
+    void allocate(int maxLength);
+    void deallocate();
+    T* getSlot(size_t index);
+    T frontAndPopUnchecked();
+    void pushUnchecked(const T& t);
+    void signalPushIfWaiting();
+    void signalPopIfWaiting();
+
+    std::allocator<T> allocator;
+    T* buffer;
+    size_t capacity;
+
+    // Consumer side
+    size_t head;
+    char headPadding[CacheLineSize];
+    // Producer side
+    size_t tail;
+    char tailPadding[CacheLineSize];
+
+    int consumerWaiting;
+    int producerWaiting;
+    epicsEvent itemPushedEvent;
+    epicsEvent itemPoppedEvent;
+    epicsTimeStamp lastPushedTime;
+    epicsTimeStamp lastPoppedTime;
+
+    // Statistics counters
+    size_t nReceived;
+    size_t nRejected;
+    size_t nDelivered;
+    epics::pvData::Mutex counterMutex;
+    std::map<std::string, unsigned int> counterMap;
+};
+
+template <class T>
+SpscRingBuffer<T>::SpscRingBuffer(int maxLength)
+    : allocator()
+    , buffer(0)
+    , capacity(0)
+    , head(0)
+    , tail(0)
+    , consumerWaiting(0)
+    , producerWaiting(0)
+    , itemPushedEvent()
+    , itemPoppedEvent()
+    , lastPushedTime()
+    , lastPoppedTime()
+    , nReceived(0)
+    , nRejected(0)
+    , nDelivered(0)
+    , counterMutex()
+    , counterMap()
+{
+    allocate(maxLength);
+}
+
+template <class T>
+SpscRingBuffer<T>::~SpscRingBuffer()
+{
+    deallocate();
+    itemPushedEvent.signal();
+    itemPoppedEvent.signal();
+}
+
+template <class T>
+void SpscRingBuffer<T>::allocate(int maxLength)
+{
+    if (maxLength <= 0) {
+        throw InvalidArgument("Lock-free queue length must be positive, got %d.", maxLength);
+    }
+    capacity = maxLength;
+    buffer = allocator.allocate(capacity);
+}
+
+template <class T>
+void SpscRingBuffer<T>::deallocate()
+{
+    for (size_t i = head; i != tail; i++) {
+        allocator.destroy(getSlot(i));
+    }
+    allocator.deallocate(buffer, capacity);
+    buffer = 0;
+    head = 0;
+    tail = 0;
+}
+
+template <class T>
+T* SpscRingBuffer<T>::getSlot(size_t index)
+{
+    return buffer + (index % capacity);
+}
+
+template <class T>
+int SpscRingBuffer<T>::getMaxLength()
+{
+    return capacity;
+}
+
+template <class T>
+void SpscRingBuffer<T>::setMaxLength(int maxLength)
+{
+    if (size_t(maxLength) == capacity) {
+        return;
+    }
+    if (!isEmpty()) {
+        throw InvalidState("Lock-free queue cannot be resized while it is not empty.");
+    }
+    if (maxLength <= 0) {
+        throw InvalidArgument("Lock-free queue length must be positive, got %d.", maxLength);
+    }
+    deallocate();
+    allocate(maxLength);
+}
+
+template <class T>
+unsigned int SpscRingBuffer<T>::size()
+{
+    size_t h = epics::atomic::get(head);
+    size_t t = epics::atomic::get(tail);
+    return t - h;
+}
+
+template <class T>
+bool SpscRingBuffer<T>::isFull()
+{
+    return size() >= capacity;
+}
+
+template <class T>
+bool SpscRingBuffer<T>::isEmpty()
+{
+    return size() == 0;
+}
+
+template <class T>
+T SpscRingBuffer<T>::back()
+{
+    size_t t = epics::atomic::get(tail);
+    if (t == epics::atomic::get(head)) {
+        throw QueueEmpty("Queue is empty.");
+    }
+    epicsAtomicReadMemoryBarrier();
+    return *getSlot(t-1);
+}
+
+template <class T>
+T SpscRingBuffer<T>::front()
+{
+    size_t h = epics::atomic::get(head);
+    if (h == epics::atomic::get(tail)) {
+        throw QueueEmpty("Queue is empty.");
+    }
+    epicsAtomicReadMemoryBarrier();
+    return *getSlot(h);
+}
+
+template <class T>
+void SpscRingBuffer<T>::signalPushIfWaiting()
+{
+    // Compare-and-swap also acts as a full memory barrier, so that
+    // the consumer cannot miss the item just published
+    if (epics::atomic::compareAndSwap(consumerWaiting, 1, 0) == 1) {
+        itemPushedEvent.signal();
+    }
+}
+
+template <class T>
+void SpscRingBuffer<T>::signalPopIfWaiting()
+{
+    if (epics::atomic::compareAndSwap(producerWaiting, 1, 0) == 1) {
+        itemPoppedEvent.signal();
+    }
+}
+
+// Must be called by consumer when buffer is not empty
+template <class T>
+T SpscRingBuffer<T>::frontAndPopUnchecked()
+{
+    size_t h = head;
+    epicsAtomicReadMemoryBarrier();
+    T* slot = getSlot(h);
+    T t(*slot);
+    allocator.destroy(slot);
+    epicsTimeGetCurrent(&lastPoppedTime);
+    epicsAtomicWriteMemoryBarrier();
+    epics::atomic::set(head, h+1);
+    epics::atomic::increment(nDelivered);
+    signalPopIfWaiting();
+    return t;
+}
+
+// Must be called by producer when buffer is not full
+template <class T>
+void SpscRingBuffer<T>::pushUnchecked(const T& t)
+{
+    size_t tl = tail;
+    allocator.construct(getSlot(tl), t);
+    epicsTimeGetCurrent(&lastPushedTime);
+    epicsAtomicWriteMemoryBarrier();
+    epics::atomic::set(tail, tl+1);
+    epics::atomic::increment(nReceived);
+    signalPushIfWaiting();
+}
+
+template <class T>
+T SpscRingBuffer<T>::frontAndPop()
+{
+    if (isEmpty()) {
+        throw QueueEmpty("Queue is empty.");
+    }
+    return frontAndPopUnchecked();
+}
+
+template <class T>
+T SpscRingBuffer<T>::frontAndPop(double timeout)
+{
+    waitForItemPushedIfEmpty(timeout);
+    return frontAndPop();
+}
+
+template <class T>
+void SpscRingBuffer<T>::pop()
+{
+    frontAndPop();
+}
+
+template <class T>
+bool SpscRingBuffer<T>::popIfNotEmpty()
+{
+    if (isEmpty()) {
+        return false;
+    }
+    frontAndPopUnchecked();
+    return true;
+}
+
+template <class T>
+void SpscRingBuffer<T>::push(const T& t)
+{
+    if (isFull()) {
+        epics::atomic::increment(nRejected);
+        throw QueueFull("Queue is full.");
+    }
+    pushUnchecked(t);
+}
+
+template <class T>
+void SpscRingBuffer<T>::push(const T& t, double timeout)
+{
+    waitForItemPoppedIfFull(timeout);
+    push(t);
+}
+
+template <class T>
+bool SpscRingBuffer<T>::pushIfNotFull(const T& t)
+{
+    if (isFull()) {
+        epics::atomic::increment(nRejected);
+        return false;
+    }
+    pushUnchecked(t);
+    return true;
+}
+
+template <class T>
+unsigned int SpscRingBuffer<T>::frontAndPopMany(std::vector<T>& items, int maxItems)
+{
+    unsigned int nItems = 0;
+    while (!isEmpty() && (maxItems <= 0 || nItems < (unsigned int)maxItems)) {
+        items.push_back(frontAndPopUnchecked());
+        nItems++;
+    }
+    return nItems;
+}
+
+template <class T>
+unsigned int SpscRingBuffer<T>::frontAndPopMany(std::vector<T>& items, int maxItems, double timeout)
+{
+    waitForItemPushedIfEmpty(timeout);
+    return frontAndPopMany(items, maxItems);
+}
+
+template <class T>
+unsigned int SpscRingBuffer<T>::pushMany(const std::vector<T>& items)
+{
+    unsigned int nPushed = 0;
+    typedef typename std::vector<T>::const_iterator VI;
+    for (VI it = items.begin(); it != items.end(); it++) {
+        if (isFull()) {
+            // We are full, reject remaining items
+            epics::atomic::add(nRejected, size_t(items.end() - it));
+            break;
+        }
+        pushUnchecked(*it);
+        nPushed++;
+    }
+    return nPushed;
+}
+
+template <class T>
+void SpscRingBuffer<T>::waitForItemPushed(double timeout)
+{
+    epics::atomic::compareAndSwap(consumerWaiting, 0, 1);
+    itemPushedEvent.wait(timeout);
+    epics::atomic::set(consumerWaiting, 0);
+}
+
+template <class T>
+void SpscRingBuffer<T>::waitForItemPushedIfEmpty(double timeout)
+{
+    if (!isEmpty()) {
+        return;
+    }
+    // Announce that we are waiting and clear push event before checking
+    // buffer again; producer signals after publishing new item
+    epics::atomic::compareAndSwap(consumerWaiting, 0, 1);
+    itemPushedEvent.tryWait();
+    if (isEmpty()) {
+        itemPushedEvent.wait(timeout);
+    }
+    epics::atomic::set(consumerWaiting, 0);
+}
+
+template <class T>
+void SpscRingBuffer<T>::waitForItemPopped(double timeout)
+{
+    epics::atomic::compareAndSwap(producerWaiting, 0, 1);
+    itemPoppedEvent.wait(timeout);
+    epics::atomic::set(producerWaiting, 0);
+}
+
+template <class T>
+void SpscRingBuffer<T>::waitForItemPoppedIfFull(double timeout)
+{
+    if (!isFull()) {
+        return;
+    }
+    epics::atomic::compareAndSwap(producerWaiting, 0, 1);
+    itemPoppedEvent.tryWait();
+    if (isFull()) {
+        itemPoppedEvent.wait(timeout);
+    }
+    epics::atomic::set(producerWaiting, 0);
+}
+
+template <class T>
+void SpscRingBuffer<T>::cancelWaitForItemPushed()
+{
+    itemPushedEvent.signal();
+}
+
+template <class T>
+void SpscRingBuffer<T>::cancelWaitForItemPopped()
+{
+    itemPoppedEvent.signal();
+}
+
+// Must be called by consumer
+template <class T>
+void SpscRingBuffer<T>::clear()
+{
+    while (!isEmpty()) {
+        size_t h = head;
+        allocator.destroy(getSlot(h));
+        epicsAtomicWriteMemoryBarrier();
+        epics::atomic::set(head, h+1);
+    }
+    itemPoppedEvent.signal();
+}
+
+template <class T>
+void SpscRingBuffer<T>::resetCounters()
+{
+    epics::pvData::Lock lock(counterMutex);
+    typedef std::map<std::string, unsigned int>::iterator MI;
+    for (MI it = counterMap.begin(); it != counterMap.end(); it++) {
+        it->second = 0;
+    }
+    epics::atomic::set(nReceived, size_t(0));
+    epics::atomic::set(nRejected, size_t(0));
+    epics::atomic::set(nDelivered, size_t(0));
+}
+
+template <class T>
+const std::map<std::string,unsigned int>& SpscRingBuffer<T>::getCounterMap()
+{
+    epics::pvData::Lock lock(counterMutex);
+    counterMap[PvaPyConstants::NumReceivedCounterKey] = epics::atomic::get(nReceived);
+    counterMap[PvaPyConstants::NumRejectedCounterKey] = epics::atomic::get(nRejected);
+    counterMap[PvaPyConstants::NumDeliveredCounterKey] = epics::atomic::get(nDelivered);
+    counterMap[PvaPyConstants::NumQueuedCounterKey] = size();
+    // Only reject-new overflow policy is supported
+    counterMap[PvaPyConstants::NumDroppedCounterKey] = 0;
+    counterMap[PvaPyConstants::NumConflatedCounterKey] = 0;
+    return counterMap;
+}
+
+template <class T>
+void SpscRingBuffer<T>::setCounter(const std::string& key, unsigned int value)
+{
+    epics::pvData::Lock lock(counterMutex);
+    counterMap[key] = value;
+}
+
+template <class T>
+void SpscRingBuffer<T>::addToCounter(const std::string& key, unsigned int value)
+{
+    epics::pvData::Lock lock(counterMutex);
+    std::map<std::string,unsigned int>::iterator it = counterMap.find(key);
+    if (it != counterMap.end()) {
+        it->second = it->second + value;
+    }
+    else {
+        counterMap[key] = value;
+    }
+}
+
+template <class T>
+double SpscRingBuffer<T>::getTimeSinceLastPush()
+{
+    epicsTimeStamp ts;
+    epicsTimeGetCurrent(&ts);
+    return epicsTimeDiffInSeconds(&ts, &lastPushedTime);
+}
+
+template <class T>
+double SpscRingBuffer<T>::getTimeSinceLastPop()
+{
+    epicsTimeStamp ts;
+    epicsTimeGetCurrent(&ts);
+    return epicsTimeDiffInSeconds(&ts, &lastPoppedTime);
+}
+
+#endif
@@ -5,6 +5,7 @@
 #define SYNCHRONIZED_QUEUE_H
 
 #include <queue>
+#include <vector>
 #include <string>
 #include <map>
 #include <epicsEvent.h>
@@ -13,6 +14,7 @@
 #include "QueueEmpty.h"
 #include "QueueFull.h"
 #include "PvaPyConstants.h"
+#include "QueueOverflowPolicy.h"
 
 template <class T>
 class SynchronizedQueue : public std::queue<T>
@@ -22,6 +24,9 @@ public:
 
     static const int Unlimited = -1;
 
+    // Returns true if queued item and new item have the same key
+    typedef bool (*KeyMatcher)(const T& queuedItem, const T& item, const std::string& key);
+
     SynchronizedQueue(int maxLength=Unlimited);
     SynchronizedQueue(const SynchronizedQueue& q);
     virtual ~SynchronizedQueue();
@@ -38,6 +43,19 @@ public:
     void push(const T& t);
     void push(const T& t, double timeout);
 
+    // Batch operations performed under a single lock; no exception,
+    // return number of items retrieved/pushed
+    unsigned int frontAndPopMany(std::vector<T>& items, int maxItems);
+    unsigned int frontAndPopMany(std::vector<T>& items, int maxItems, double timeout);
+    unsigned int pushMany(const std::vector<T>& items);
+
+    // Push according to overflow policy; no exception, return true
+    // if new item was accepted
+    void setOverflowPolicy(QueueOverflowPolicy::OverflowPolicy overflowPolicy, const std::string& key="", KeyMatcher keyMatcher=0);
+    QueueOverflowPolicy::OverflowPolicy getOverflowPolicy();
+    std::string getOverflowPolicyKey();
+    bool pushWithOverflowPolicy(const T& t);
+
     // No exception, return true if operation succeeded
     bool popIfNotEmpty();
     bool pushIfNotFull(const T& t);
@@ -62,6 +80,8 @@ private:
     void throwQueueEmptyIfEmpty() ;
     T frontAndPopUnsynchronized();
     void pushUnsynchronized(const T& t);
+    void dropOldestUnsynchronized();
+    bool pushWithOverflowPolicyUnsynchronized(const T& t);
 
     epics::pvData::Mutex mutex;
     epicsEvent itemPushedEvent;
@@ -69,12 +89,17 @@ private:
     epicsEvent itemPoppedEvent;
     epicsTimeStamp lastPoppedTime;
     int maxLength;
+    QueueOverflowPolicy::OverflowPolicy overflowPolicy;
+    std::string overflowPolicyKey;
+    KeyMatcher keyMatcher;
 
     // Statistics counters
     std::map<std::string, unsigned int> counterMap;
     unsigned int nReceived;
     unsigned int nRejected;
     unsigned int nDelivered;
+    unsigned int nDropped;
+    unsigned int nConflated;
 };
 
 template <class T>
@@ -86,10 +111,15 @@ SynchronizedQueue<T>::SynchronizedQueue(int maxLength_)
     , itemPoppedEvent()
     , lastPoppedTime()
     , maxLength(maxLength_)
+    , overflowPolicy(QueueOverflowPolicy::RejectNew)
+    , overflowPolicyKey()
+    , keyMatcher(0)
     , counterMap()
     , nReceived(0)
     , nRejected(0)
     , nDelivered(0)
+    , nDropped(0)
+    , nConflated(0)
 {
 }
 
@@ -100,10 +130,15 @@ SynchronizedQueue<T>::SynchronizedQueue(const SynchronizedQueue<T>& q)
     , itemPushedEvent()
     , itemPoppedEvent()
     , maxLength(q.maxLength)
+    , overflowPolicy(q.overflowPolicy)
+    , overflowPolicyKey(q.overflowPolicyKey)
+    , keyMatcher(q.keyMatcher)
     , counterMap(q.counterMap)
     , nReceived(q.nReceived)
     , nRejected(q.nRejected)
     , nDelivered(q.nDelivered)
+    , nDropped(q.nDropped)
+    , nConflated(q.nConflated)
 {
 }
 
@@ -227,6 +262,125 @@ T SynchronizedQueue<T>::frontAndPop(double timeout)
     return frontAndPop();
 }
 
+template <class T>
+unsigned int SynchronizedQueue<T>::frontAndPopMany(std::vector<T>& items, int maxItems) 
+{
+    epics::pvData::Lock lock(mutex);
+    unsigned int nItems = 0;
+    while (!std::queue<T>::empty() && (maxItems <= 0 || nItems < (unsigned int)maxItems)) {
+        items.push_back(frontAndPopUnsynchronized());
+        nItems++;
+    }
+    return nItems;
+}
+
+template <class T>
+unsigned int SynchronizedQueue<T>::frontAndPopMany(std::vector<T>& items, int maxItems, double timeout) 
+{
+    {
+        epics::pvData::Lock lock(mutex);
+        if (std::queue<T>::empty()) {
+            // Clear push event.
+            itemPushedEvent.tryWait();
+        }
+        else {
+            unsigned int nItems = 0;
+            while (!std::queue<T>::empty() && (maxItems <= 0 || nItems < (unsigned int)maxItems)) {
+                items.push_back(frontAndPopUnsynchronized());
+                nItems++;
+            }
+            return nItems;
+        }
+    }
+    waitForItemPushed(timeout);
+    return frontAndPopMany(items, maxItems);
+}
+
+template <class T>
+unsigned int SynchronizedQueue<T>::pushMany(const std::vector<T>& items) 
+{
+    epics::pvData::Lock lock(mutex);
+    unsigned int nPushed = 0;
+    typedef typename std::vector<T>::const_iterator VI;
+    for (VI it = items.begin(); it != items.end(); it++) {
+        // Each item is subject to the same overflow policy as single push
+        if (pushWithOverflowPolicyUnsynchronized(*it)) {
+            nPushed++;
+        }
+    }
+    return nPushed;
+}
+
+template <class T>
+void SynchronizedQueue<T>::setOverflowPolicy(QueueOverflowPolicy::OverflowPolicy overflowPolicy, const std::string& key, KeyMatcher keyMatcher)
+{
+    epics::pvData::Lock lock(mutex);
+    this->overflowPolicy = overflowPolicy;
+    this->overflowPolicyKey = key;
+    this->keyMatcher = keyMatcher;
+}
+
+template <class T>
+QueueOverflowPolicy::OverflowPolicy SynchronizedQueue<T>::getOverflowPolicy()
+{
+    epics::pvData::Lock lock(mutex);
+    return overflowPolicy;
+}
+
+template <class T>
+std::string SynchronizedQueue<T>::getOverflowPolicyKey()
+{
+    epics::pvData::Lock lock(mutex);
+    return overflowPolicyKey;
+}
+
+template <class T>
+void SynchronizedQueue<T>::dropOldestUnsynchronized()
+{
+    std::queue<T>::pop();
+    nDropped++;
+}
+
+template <class T>
+bool SynchronizedQueue<T>::pushWithOverflowPolicy(const T& t)
+{
+    epics::pvData::Lock lock(mutex);
+    return pushWithOverflowPolicyUnsynchronized(t);
+}
+
+template <class T>
+bool SynchronizedQueue<T>::pushWithOverflowPolicyUnsynchronized(const T& t)
+{
+    if (overflowPolicy == QueueOverflowPolicy::Conflate && keyMatcher) {
+        // Underlying container is accessible to derived classes
+        typedef typename std::queue<T>::container_type::iterator CI;
+        for (CI it = std::queue<T>::c.begin(); it != std::queue<T>::c.end(); it++) {
+            if (keyMatcher(*it, t, overflowPolicyKey)) {
+                // Replace queued item, but keep its position
+                *it = t;
+                epicsTimeGetCurrent(&lastPushedTime);
+                nReceived++;
+                nConflated++;
+                return true;
+            }
+        }
+    }
+    int size = std::queue<T>::size();
+    if (maxLength > 0 && size >= maxLength) {
+        if (overflowPolicy == QueueOverflowPolicy::RejectNew) {
+            nRejected++;
+            return false;
+        }
+        // Make room for the new item
+        while (size >= maxLength) {
+            dropOldestUnsynchronized();
+            size--;
+        }
+    }
+    pushUnsynchronized(t);
+    return true;
+}
+
 template <class T>
 void SynchronizedQueue<T>::pop()
 {
@@ -393,6 +547,8 @@ void SynchronizedQueue<T>::resetCounters()
     nReceived = 0;
     nRejected = 0;
     nDelivered = 0;
+    nDropped = 0;
+    nConflated = 0;
 }
 
 template <class T>
@@ -403,6 +559,8 @@ const std::map<std::string,unsigned int>& SynchronizedQueue<T>::getCounterMap()
     counterMap[PvaPyConstants::NumRejectedCounterKey] = nRejected;
     counterMap[PvaPyConstants::NumDeliveredCounterKey] = nDelivered;
     counterMap[PvaPyConstants::NumQueuedCounterKey] = std::queue<T>::size();
+    counterMap[PvaPyConstants::NumDroppedCounterKey] = nDropped;
+    counterMap[PvaPyConstants::NumConflatedCounterKey] = nConflated;
     return counterMap;
 }
 
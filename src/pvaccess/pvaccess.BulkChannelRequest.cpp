@@ -0,0 +1,50 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include <boost/python/def.hpp>
+#include <boost/python/overloads.hpp>
+#include "BulkChannelRequest.h"
+
+using namespace boost::python;
+
+#if PVA_API_VERSION >= 482
+BOOST_PYTHON_FUNCTION_OVERLOADS(BulkChannelRequestGetMany, BulkChannelRequest::getMany, 1, 5)
+BOOST_PYTHON_FUNCTION_OVERLOADS(BulkChannelRequestPutMany, BulkChannelRequest::putMany, 1, 4)
+#endif // if PVA_API_VERSION >= 482
+
+//
+// Bulk channel requests
+//
+void wrapBulkChannelRequest()
+{
+
+#if PVA_API_VERSION >= 482
+
+def("getMany",
+    &BulkChannelRequest::getMany,
+    BulkChannelRequestGetMany(args("channelNames", "requestDescriptor", "timeout", "valuesOnly", "providerType"),
+    "Retrieves PV data from many channels at once. Connections, get operations and get requests for all channels are issued concurrently, so that the total time is determined by the slowest channel rather than by the number of channels. Channels are created once and reused by subsequent calls. Errors on individual channels do not abort the remaining requests.\n\n"
+    ":Parameter: *channelNames* (list) - channel names\n\n"
+    ":Parameter: *requestDescriptor* (str) - PV request descriptor (default: 'field(value,alarm,timeStamp)')\n\n"
+    ":Parameter: *timeout* (float) - timeout in seconds for the entire request (default: 3.0)\n\n"
+    ":Parameter: *valuesOnly* (bool) - if True, only 'value' field of retrieved objects will be returned (scalar arrays are returned as NumPy arrays, if NumPy support is enabled)\n\n"
+    ":Parameter: *providerType* (PROVIDERTYPE) - provider type, either PVA (PV Access) or CA (Channel Access)\n\n"
+    ":Returns: tuple containing dictionary of retrieved PvObjects (or values) keyed by channel name, and dictionary of error messages keyed by channel name for channels that could not be read\n\n"
+    "::\n\n"
+    "    (pvDict, errorDict) = getMany(['pv1', 'pv2', 'pv3'], 'field(value)', 5.0)\n\n"));
+
+def("putMany",
+    &BulkChannelRequest::putMany,
+    BulkChannelRequestPutMany(args("channelValueDict", "requestDescriptor", "timeout", "providerType"),
+    "Assigns PV data to many channels at once. Connections and put requests for all channels are issued concurrently. Values can be PvObjects, lists (for array values), or any objects that can be converted to strings (for scalar values). Errors on individual channels do not abort the remaining requests.\n\n"
+    ":Parameter: *channelValueDict* (dict) - dictionary of channel values keyed by channel name\n\n"
+    ":Parameter: *requestDescriptor* (str) - PV request descriptor (default: 'field(value)')\n\n"
+    ":Parameter: *timeout* (float) - timeout in seconds for the entire request (default: 3.0)\n\n"
+    ":Parameter: *providerType* (PROVIDERTYPE) - provider type, either PVA (PV Access) or CA (Channel Access)\n\n"
+    ":Returns: dictionary of error messages keyed by channel name for channels that could not be updated (empty if all puts succeeded)\n\n"
+    "::\n\n"
+    "    errorDict = putMany({'pv1' : 1, 'pv2' : 2.5, 'pv3' : [1,2,3]})\n\n"));
+
+#endif // if PVA_API_VERSION >= 482
+
+}
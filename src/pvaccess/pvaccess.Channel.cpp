@@ -1277,11 +1277,45 @@ class_<Channel>("Channel",
 
     .def("getMonitorCounters",
         static_cast<dict(Channel::*)()>(&Channel::getMonitorCounters),
-        "Retrieve dictionary with monitor counters, which include number of updates received and number of monitor overruns.\n\n"
+        "Retrieve dictionary with monitor counters, which include number of updates received, number of monitor overruns, and number of structure pool hits and misses for queued monitor updates (in steady state, queued updates should not result in pool misses).\n\n"
         ":Returns: dictionary containing available statistics counters\n\n"
         "::\n\n"
         "    counterDict = channel.getMonitorCounters()\n\n")
 
+    .def("setOperationCacheSize",
+        &Channel::setOperationCacheSize,
+        args("size"),
+        "Sets maximum number of connected get, put and putGet operations (per operation type) that are kept for reuse. Operations are cached per request descriptor, and the least recently used ones are discarded first. Repeated requests with a cached request descriptor do not need to create and connect new operation, and hence require only a single network round trip. Setting size to zero disables operation caching.\n\n"
+        ":Parameter: *size* (int) - maximum number of cached operations per operation type\n\n"
+        "::\n\n"
+        "    channel.setOperationCacheSize(16)\n\n")
+
+    .def("getOperationCacheSize",
+        &Channel::getOperationCacheSize,
+        "Retrieves maximum number of cached operations per operation type.\n\n"
+        ":Returns: maximum number of cached operations\n\n"
+        "::\n\n"
+        "    cacheSize = channel.getOperationCacheSize()\n\n")
+
+    .def("clearOperationCache",
+        &Channel::clearOperationCache,
+        "Discards all cached get, put and putGet operations. Operation cache is also cleared automatically on channel disconnect.\n\n"
+        "::\n\n"
+        "    channel.clearOperationCache()\n\n")
+
+    .def("resetOperationCacheCounters",
+        &Channel::resetOperationCacheCounters,
+        "Reset operation cache counters to zero.\n\n"
+        "::\n\n"
+        "    channel.resetOperationCacheCounters()\n\n")
+
+    .def("getOperationCacheCounters",
+        &Channel::getOperationCacheCounters,
+        "Retrieve dictionary with operation cache counters, which include number of cache hits and misses for get, put and putGet requests, number of least recently used operations discarded because the cache was full, and number of currently cached operations.\n\n"
+        ":Returns: dictionary containing available statistics counters\n\n"
+        "::\n\n"
+        "    counterDict = channel.getOperationCacheCounters()\n\n")
+
 #endif // if PVA_API_VERSION >= 482
 
     .def("stopMonitor",
@@ -130,6 +130,85 @@ class_<MultiChannel>("MultiChannel",
         "        print('New PV values: %s' % x)\n\n"
         "    mChannel.monitorAsDoubleArray(echo, 1.0)\n\n")
 
+    .def("eventMonitor",
+        static_cast<void(MultiChannel::*)(const boost::python::object&)>(&MultiChannel::eventMonitor),
+        args("subscriber"),
+        "Starts event driven multi-channel monitor with request descriptor 'field(value,alarm,timeStamp)'. Unlike the polling monitor, each member channel is monitored separately, and subscriber is called as soon as any of the channels changes.\n\n"
+        ":Parameter: *subscriber* (object) - reference to python function that will be executed when PV values change; the function should take PvObject instance with NTMultiChannel structure as its argument\n\n"
+        "::\n\n"
+        "    def echo(pvObject):\n\n"
+        "        print('New PV values: %s' % pvObject)\n\n"
+        "    mChannel.eventMonitor(echo)\n\n")
+
+    .def("eventMonitor",
+        static_cast<void(MultiChannel::*)(const boost::python::object&, double)>(&MultiChannel::eventMonitor),
+        args("subscriber", "coalescingWindow"),
+        "Starts event driven multi-channel monitor with request descriptor 'field(value,alarm,timeStamp)'.\n\n"
+        ":Parameter: *subscriber* (object) - reference to python function that will be executed when PV values change; the function should take PvObject instance with NTMultiChannel structure as its argument\n\n"
+        ":Parameter: *coalescingWindow* (float) - time in seconds to wait after the first channel change before calling subscriber; all changes within this window are delivered in a single subscriber call\n\n"
+        "::\n\n"
+        "    def echo(pvObject):\n\n"
+        "        print('New PV values: %s' % pvObject)\n\n"
+        "    mChannel.eventMonitor(echo, 0.01)\n\n")
+
+    .def("eventMonitor",
+        static_cast<void(MultiChannel::*)(const boost::python::object&, double, bool)>(&MultiChannel::eventMonitor),
+        args("subscriber", "coalescingWindow", "waitForAllChannels"),
+        "Starts event driven multi-channel monitor with request descriptor 'field(value,alarm,timeStamp)'.\n\n"
+        ":Parameter: *subscriber* (object) - reference to python function that will be executed when PV values change; the function should take PvObject instance with NTMultiChannel structure as its argument\n\n"
+        ":Parameter: *coalescingWindow* (float) - time in seconds to wait after the first channel change before calling subscriber; all changes within this window are delivered in a single subscriber call\n\n"
+        ":Parameter: *waitForAllChannels* (bool) - if True, subscriber will be called only after all monitored member channels have changed since the previous call; channels that are not connected when monitor is started are not monitored\n\n"
+        "::\n\n"
+        "    def echo(pvObject):\n\n"
+        "        print('New PV values: %s' % pvObject)\n\n"
+        "    mChannel.eventMonitor(echo, 0.01, True)\n\n")
+
+    .def("eventMonitor",
+        static_cast<void(MultiChannel::*)(const boost::python::object&, double, bool, const std::string&)>(&MultiChannel::eventMonitor),
+        args("subscriber", "coalescingWindow", "waitForAllChannels", "requestDescriptor"),
+        "Starts event driven multi-channel monitor.\n\n"
+        ":Parameter: *subscriber* (object) - reference to python function that will be executed when PV values change; the function should take PvObject instance with NTMultiChannel structure as its argument\n\n"
+        ":Parameter: *coalescingWindow* (float) - time in seconds to wait after the first channel change before calling subscriber; all changes within this window are delivered in a single subscriber call\n\n"
+        ":Parameter: *waitForAllChannels* (bool) - if True, subscriber will be called only after all monitored member channels have changed since the previous call; channels that are not connected when monitor is started are not monitored\n\n"
+        ":Parameter: *requestDescriptor* (str) - describes what PV data should be sent to subscribed channel clients\n\n"
+        "::\n\n"
+        "    def echo(pvObject):\n\n"
+        "        print('New PV values: %s' % pvObject)\n\n"
+        "    mChannel.eventMonitor(echo, 0.01, False, 'field(value,alarm,timeStamp)')\n\n")
+
+    .def("eventMonitorAsDoubleArray",
+        static_cast<void(MultiChannel::*)(const boost::python::object&)>(&MultiChannel::eventMonitorAsDoubleArray),
+        args("subscriber"),
+        "Starts event driven multi-channel monitor for processing array of double values. Subscriber is called as soon as any of the member channels changes.\n\n"
+        ":Parameter: *subscriber* (object) - reference to python function that will be executed when PV values change; the function should take NumPy array of doubles (or list of python floats, if NumPy support is not available) as its argument\n\n"
+        "::\n\n"
+        "    def echo(valueArray):\n\n"
+        "        print('New PV values: %s' % valueArray)\n\n"
+        "    mChannel.eventMonitorAsDoubleArray(echo)\n\n")
+
+    .def("eventMonitorAsDoubleArray",
+        static_cast<void(MultiChannel::*)(const boost::python::object&, double)>(&MultiChannel::eventMonitorAsDoubleArray),
+        args("subscriber", "coalescingWindow"),
+        "Starts event driven multi-channel monitor for processing array of double values.\n\n"
+        ":Parameter: *subscriber* (object) - reference to python function that will be executed when PV values change; the function should take NumPy array of doubles (or list of python floats, if NumPy support is not available) as its argument\n\n"
+        ":Parameter: *coalescingWindow* (float) - time in seconds to wait after the first channel change before calling subscriber; all changes within this window are delivered in a single subscriber call\n\n"
+        "::\n\n"
+        "    def echo(valueArray):\n\n"
+        "        print('New PV values: %s' % valueArray)\n\n"
+        "    mChannel.eventMonitorAsDoubleArray(echo, 0.01)\n\n")
+
+    .def("eventMonitorAsDoubleArray",
+        static_cast<void(MultiChannel::*)(const boost::python::object&, double, bool)>(&MultiChannel::eventMonitorAsDoubleArray),
+        args("subscriber", "coalescingWindow", "waitForAllChannels"),
+        "Starts event driven multi-channel monitor for processing array of double values.\n\n"
+        ":Parameter: *subscriber* (object) - reference to python function that will be executed when PV values change; the function should take NumPy array of doubles (or list of python floats, if NumPy support is not available) as its argument\n\n"
+        ":Parameter: *coalescingWindow* (float) - time in seconds to wait after the first channel change before calling subscriber; all changes within this window are delivered in a single subscriber call\n\n"
+        ":Parameter: *waitForAllChannels* (bool) - if True, subscriber will be called only after all monitored member channels have changed since the previous call; channels that are not connected when monitor is started are not monitored\n\n"
+        "::\n\n"
+        "    def echo(valueArray):\n\n"
+        "        print('New PV values: %s' % valueArray)\n\n"
+        "    mChannel.eventMonitorAsDoubleArray(echo, 0.01, True)\n\n")
+
     .def("stopMonitor",
         &MultiChannel::stopMonitor,
         "Stops multi-channel monitor for PV value changes.\n\n"
@@ -84,6 +84,62 @@ class_<NtTable, bases<NtType> >("NtTable",
         "::\n\n"
         "    table.setColumn(0, ['x', 'y', 'z'])\n\n")
 
+    .def("getColumnAsNumPy", 
+        &NtTable::getColumnAsNumPy, 
+        args("index"), 
+        "Retrieves specified column as NumPy array. The returned array shares memory with the underlying PV scalar array, so no data is copied. String columns, or columns of tables in builds without NumPy support, are returned as lists.\n\n"
+        ":Parameter: *index* (int) - column index (must be in range [0,N-1], where N is the number of table columns)\n\n"
+        ":Returns: NumPy array of values stored in the specified table column\n\n"
+        "::\n\n"
+        "    valueArray = table.getColumnAsNumPy(0)\n\n")
+
+    .def("setColumnFromNumPy", 
+        &NtTable::setColumnFromNumPy, 
+        args("index", "valueArray"), 
+        "Sets column values from NumPy array (or any other array-like object). The input array is converted to the column data type if needed, and its contents are copied into the column in a single pass, without creating intermediate Python objects.\n\n"
+        ":Parameter: *index* (int) - column index\n\n"
+        ":Parameter: *valueArray* (numpy.ndarray) - array of column values\n\n"
+        "::\n\n"
+        "    table.setColumnFromNumPy(1, numpy.arange(100, dtype=numpy.int32))\n\n")
+
+    .def("fromStructuredArray", 
+        &NtTable::fromStructuredArray, 
+        args("structuredArray"), 
+        "Creates NT table from NumPy structured array. Array field names are used as column labels, and column types are determined from field data types.\n\n"
+        ":Parameter: *structuredArray* (numpy.ndarray) - NumPy structured array\n\n"
+        ":Returns: NT table object\n\n"
+        ":Raises: *InvalidArgument* - in case input is not a structured array, or if it contains fields of unsupported data type\n\n"
+        "::\n\n"
+        "    a = numpy.array([(1, 1.5), (2, 2.5)], dtype=[('id', 'i4'), ('x', 'f8')])\n\n"
+        "    table = NtTable.fromStructuredArray(a)\n\n")
+    .staticmethod("fromStructuredArray")
+
+    .def("toStructuredArray", 
+        &NtTable::toStructuredArray, 
+        "Converts NT table into NumPy structured array. Column labels are used as array field names.\n\n"
+        ":Returns: NumPy structured array\n\n"
+        ":Raises: *InvalidState* - in case table columns are not of equal length\n\n"
+        "::\n\n"
+        "    a = table.toStructuredArray()\n\n")
+
+    .def("fromDataFrame", 
+        &NtTable::fromDataFrame, 
+        args("dataFrame"), 
+        "Creates NT table from pandas data frame. Data frame index is not included in the table. This method requires pandas module.\n\n"
+        ":Parameter: *dataFrame* (pandas.DataFrame) - pandas data frame\n\n"
+        ":Returns: NT table object\n\n"
+        ":Raises: *InvalidArgument* - in case data frame contains columns of unsupported data type\n\n"
+        "::\n\n"
+        "    table = NtTable.fromDataFrame(df)\n\n")
+    .staticmethod("fromDataFrame")
+
+    .def("toDataFrame", 
+        &NtTable::toDataFrame, 
+        "Converts NT table into pandas data frame. This method requires pandas module.\n\n"
+        ":Returns: pandas data frame\n\n"
+        "::\n\n"
+        "    df = table.toDataFrame()\n\n")
+
     .def("getDescriptor", 
         &NtTable::getDescriptor, 
         "Retrieves table descriptor.\n\n"
@@ -119,6 +119,8 @@ class_<PvObject>("PvObject",
 
     .def_pickle(PvObjectPickleSuite())
 
+    .def("__reduce_ex__", &PvObjectPickleSuite::reduceEx)
+
     .def(str(self))
 
     .def("set", 
@@ -1301,6 +1303,32 @@ class_<PvObject>("PvObject",
         "    pv = PvObject({'anUnion' : ({'anInt' : INT, 'aFloat' : FLOAT},)})\n\n"
         "    pv2 = pv.copy()\n\n")
 
+    .def("toBytes",
+        static_cast<object(PvObject::*)()const>(&PvObject::toBytes),
+        "Serializes PV structure introspection and field values into compact binary form. Scalar arrays are copied directly into the resulting bytes object. This method is also used for pickling PvObject instances; with pickle protocol 5 serialized object is passed as PickleBuffer and can be transferred out-of-band.\n\n"
+        ":Returns: bytes object containing serialized PV object\n\n"
+        "::\n\n"
+        "    b = pv.toBytes()\n\n")
+
+    .def("fromBytes",
+        &PvObject::fromBytes,
+        args("data"),
+        "Creates PV object from binary data produced by the toBytes() method. Input can be any object supporting the buffer protocol (bytes, bytearray, memoryview, NumPy array, etc.).\n\n"
+        ":Parameter: *data* (bytes) - serialized PV object\n\n"
+        ":Returns: PV object\n\n"
+        ":Raises: *InvalidArgument* - in case input does not contain valid serialized PV object\n\n"
+        "::\n\n"
+        "    pv2 = PvObject.fromBytes(pv.toBytes())\n\n")
+    .staticmethod("fromBytes")
+
+    .def("release",
+        static_cast<void(PvObject::*)()>(&PvObject::release),
+        "Releases underlying PV structure and leaves the object empty. Structures of objects retrieved via channel monitor queues are recycled, and calling this method returns them to the channel structure pool without waiting for the python object to be garbage collected.\n\n"
+        "::\n\n"
+        "    pv = pvq.get()\n\n"
+        "    process(pv)\n\n"
+        "    pv.release()\n\n")
+
 #if defined HAVE_NUMPY_SUPPORT && HAVE_NUMPY_SUPPORT == 1
     .add_property("useNumPyArrays", &PvObject::getUseNumPyArraysFlag, &PvObject::setUseNumPyArraysFlag)
 #endif // if defined HAVE_NUMPY_SUPPORT && HAVE_NUMPY_SUPPORT == 1
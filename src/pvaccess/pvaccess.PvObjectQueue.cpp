@@ -18,16 +18,20 @@ void wrapPvObjectQueue()
 
 class_<PvObjectQueue>("PvObjectQueue", 
     "PvObjectQueue is a class that can be used for receiving channel updates.\n\n"
-    "**PvObjectQueue([maxLength])**\n\n"
+    "**PvObjectQueue([maxLength, lockFree])**\n\n"
     "\t:Parameter: *maxLength* (int) - (optional) maximum queue length; if not provided, queue length will be unlimited\n\n"
+    "\t:Parameter: *lockFree* (bool) - (optional) if True, queue will be implemented as a bounded lock-free ring buffer, which can be used only by a single producer thread (e.g., channel monitor) and a single consumer thread; in this case maximum queue length must be positive, and it cannot be changed after the queue is created (default: False)\n\n"
     "\tExample:\n\n"
     "\t::\n\n"
     "\t\tpvq = PvObjectQueue(10000)\n\n"
+    "\t\tpvq2 = PvObjectQueue(10000, True)\n\n"
     "\n\n", 
     init<>())
 
     .def(init<int>(args("maxLength")))
 
+    .def(init<int,bool>(args("maxLength", "lockFree")))
+
     .def("__len__",
         static_cast<unsigned int(PvObjectQueue::*)()>(&PvObjectQueue::size),
         "Retrieves queue size.\n\n"
@@ -54,22 +58,51 @@ class_<PvObjectQueue>("PvObjectQueue",
     .def("put",
         static_cast<void(PvObjectQueue::*)(const PvObject&)>(&PvObjectQueue::put),
         args("pvObject"),
-        "Puts PvObject into the queue.\n\n"
+        "Puts PvObject into the queue. If the queue is full, new object is handled according to the queue overflow policy.\n\n"
         ":Parameter: *pvObject* (PvObject) - PV object that will be pushed into the queue\n\n"
-        ":Raises: *QueueFull* - when the queue is full\n\n"
+        ":Raises: *QueueFull* - when the queue is full and overflow policy is REJECT_NEW\n\n"
         "::\n\n"
         "    pvq.put(PvInt(1))\n\n")
 
     .def("put",
         static_cast<void(PvObjectQueue::*)(const PvObject&,double)>(&PvObjectQueue::put),
         args("pvObject", "timeout"),
-        "Puts PvObject into the queue with wait if the queue is full.\n\n"
+        "Puts PvObject into the queue with wait if the queue is full. Wait is needed only for REJECT_NEW overflow policy.\n\n"
         ":Parameter: *pvObject* (PvObject) - PV object that will be pushed into the queue\n\n"
         ":Parameter: *timeout* (float) - amount of time to wait if the queue is full\n\n"
-        ":Raises: *QueueFull* - when the queue is full after the specified timeout\n\n"
+        ":Raises: *QueueFull* - when the queue is full after the specified timeout and overflow policy is REJECT_NEW\n\n"
         "::\n\n"
         "    pvq.put(PvInt(1), 10)\n\n")
 
+    .def("getMany",
+        static_cast<list(PvObjectQueue::*)(int)>(&PvObjectQueue::getMany),
+        args("maxItems"),
+        "Retrieves up to a given number of PvObjects from the queue in a single operation. Unlike get(), this method does not raise an exception if the queue is empty.\n\n"
+        ":Parameter: *maxItems* (int) - maximum number of PvObjects to retrieve; if <= 0, all queued PvObjects will be retrieved\n\n"
+        ":Returns: list of PvObjects from the queue (empty list if the queue is empty)\n\n"
+        "::\n\n"
+        "    pvList = pvq.getMany(100)\n\n")
+
+    .def("getMany",
+        static_cast<list(PvObjectQueue::*)(int,double)>(&PvObjectQueue::getMany),
+        args("maxItems", "timeout"),
+        "Retrieves up to a given number of PvObjects from the queue in a single operation, with wait if the queue is empty. Unlike get(), this method does not raise an exception on timeout.\n\n"
+        ":Parameter: *maxItems* (int) - maximum number of PvObjects to retrieve; if <= 0, all queued PvObjects will be retrieved\n\n"
+        ":Parameter: *timeout* (float) - amount of time to wait for a new PvObject if queue is empty\n\n"
+        ":Returns: list of PvObjects from the queue (empty list if the queue is still empty after the specified timeout)\n\n"
+        "::\n\n"
+        "    pvList = pvq.getMany(100, 1.0)\n\n")
+
+    .def("putMany",
+        static_cast<unsigned int(PvObjectQueue::*)(const list&)>(&PvObjectQueue::putMany),
+        args("pvObjectList"),
+        "Puts list of PvObjects into the queue in a single operation. Each object is handled according to the queue overflow policy: with REJECT_NEW policy objects that do not fit into the queue are rejected and counted as such, while DROP_OLDEST and CONFLATE policies make room for them. Unlike put(), this method does not raise an exception if the queue is full.\n\n"
+        ":Parameter: *pvObjectList* (list) - list of PV objects that will be pushed into the queue\n\n"
+        ":Returns: number of PvObjects pushed into the queue\n\n"
+        ":Raises: *InvalidArgument* - when list contains objects other than PvObjects\n\n"
+        "::\n\n"
+        "    nPushed = pvq.putMany([PvInt(1), PvInt(2)])\n\n")
+
     .def("waitForPut",
         static_cast<void(PvObjectQueue::*)(double)>(&PvObjectQueue::waitForPut),
         args("timeout"),
@@ -84,6 +117,18 @@ class_<PvObjectQueue>("PvObjectQueue",
         "::\n\n"
         "    pvq.waitForGet(1.0)\n\n")
 
+    .def("waitForPutAny",
+        static_cast<bool(*)(const list&,double)>(&PvObjectQueue::waitForPutAny),
+        args("pvObjectQueueList", "timeout"),
+        "Waits until any of the given queues contains PvObjects. Unlike waiting on each queue in a separate thread, a single thread is woken up directly by a put into any of the queues.\n\n"
+        ":Parameter: *pvObjectQueueList* (list) - list of PvObjectQueue objects\n\n"
+        ":Parameter: *timeout* (float) - maximum amount of time to wait for new PvObjects if all queues are empty\n\n"
+        ":Returns: True if any of the queues is not empty, False otherwise\n\n"
+        ":Raises: *InvalidArgument* - when list contains objects other than PvObjectQueues\n\n"
+        "::\n\n"
+        "    hasObjects = PvObjectQueue.waitForPutAny([pvq1, pvq2], 1.0)\n\n")
+    .staticmethod("waitForPutAny")
+
     .def("cancelWaitForPut",
         static_cast<void(PvObjectQueue::*)()>(&PvObjectQueue::cancelWaitForPut),
         "Cancels wait on queue put.\n\n"
@@ -110,7 +155,7 @@ class_<PvObjectQueue>("PvObjectQueue",
 
     .def("getCounters",
         static_cast<dict(PvObjectQueue::*)()>(&PvObjectQueue::getCounters),
-        "Retrieve dictionary with all statistics counters, which include number of PvObjects accepted (pushed into the queue), rejected (not pushed into the queue) and retrieved (popped from the queue). The dictionary might also contain user defined counters, or other system counters, such as the number of PVA chanel monitor overruns.\n\n"
+        "Retrieve dictionary with all statistics counters, which include number of PvObjects accepted (pushed into the queue), rejected (not pushed into the queue), retrieved (popped from the queue), dropped (discarded because of DROP_OLDEST or CONFLATE overflow policy) and conflated (replaced by newer objects because of CONFLATE overflow policy). The dictionary might also contain user defined counters, or other system counters, such as the number of PVA chanel monitor overruns.\n\n"
         ":Returns: dictionary containing available statistics counters\n\n"
         "::\n\n"
         "    counterDict = pvq.getCounters()\n\n")
@@ -118,7 +163,7 @@ class_<PvObjectQueue>("PvObjectQueue",
     .def("setCounter",
         static_cast<void(PvObjectQueue::*)(const std::string&, unsigned int)>(&PvObjectQueue::setCounter),
         args("key", "value"),
-        "Sets value for the statistics counter identified with a given key. Note that setting system managed counters (nReceived, nRejected, nDelivered, nQueued) will not work.\n\n"
+        "Sets value for the statistics counter identified with a given key. Note that setting system managed counters (nReceived, nRejected, nDelivered, nQueued, nDropped, nConflated) will not work.\n\n"
         ":Parameter: *key* (str) - counter key\n\n"
         ":Parameter: *value* (int) - counter value (should be >= 0)\n\n"
         "::\n\n"
@@ -127,7 +172,7 @@ class_<PvObjectQueue>("PvObjectQueue",
     .def("addToCounter",
         static_cast<void(PvObjectQueue::*)(const std::string&, unsigned int)>(&PvObjectQueue::addToCounter),
         args("key", "value"),
-        "Adds value to the statistics counter identified with a given key. Note that manipulating system managed counters (nReceived, nRejected, nDelivered, nQueued) will not work.\n\n"
+        "Adds value to the statistics counter identified with a given key. Note that manipulating system managed counters (nReceived, nRejected, nDelivered, nQueued, nDropped, nConflated) will not work.\n\n"
         ":Parameter: *key* (str) - counter key\n\n"
         ":Parameter: *value* (int) - counter value (should be >= 0)\n\n"
         "::\n\n"
@@ -147,6 +192,46 @@ class_<PvObjectQueue>("PvObjectQueue",
         "::\n\n"
         "    t = pvq.getTimeSinceLastGet()\n\n")
 
+    .def("setOverflowPolicy",
+        static_cast<void(PvObjectQueue::*)(QueueOverflowPolicy::OverflowPolicy)>(&PvObjectQueue::setOverflowPolicy),
+        args("overflowPolicy"),
+        "Sets policy that determines how new objects are handled when the queue is full. With REJECT_NEW policy (default), new objects are rejected; with DROP_OLDEST policy the oldest queued objects are discarded to make room for new ones. Channel monitors, put() and putMany() methods obey this policy. Lock-free queues support only REJECT_NEW policy.\n\n"
+        ":Parameter: *overflowPolicy* (QUEUEOVERFLOWPOLICY) - queue overflow policy, either REJECT_NEW or DROP_OLDEST\n\n"
+        ":Raises: *InvalidArgument* - for CONFLATE policy without key field, or for policy not supported by lock-free queue\n\n"
+        "::\n\n"
+        "    pvq.setOverflowPolicy(DROP_OLDEST)\n\n")
+
+    .def("setOverflowPolicy",
+        static_cast<void(PvObjectQueue::*)(QueueOverflowPolicy::OverflowPolicy,const std::string&)>(&PvObjectQueue::setOverflowPolicy),
+        args("overflowPolicy", "keyField"),
+        "Sets policy that determines how new objects are handled when the queue is full. With CONFLATE policy, a new object replaces queued object that has the same value of the given key field, regardless of whether the queue is full or not; replaced object keeps its position in the queue. If there is no such object and the queue is full, the oldest queued object is discarded. Lock-free queues support only REJECT_NEW policy.\n\n"
+        ":Parameter: *overflowPolicy* (QUEUEOVERFLOWPOLICY) - queue overflow policy, one of REJECT_NEW, DROP_OLDEST or CONFLATE\n\n"
+        ":Parameter: *keyField* (str) - name of the field used as conflation key (e.g., 'name' or 'attribute.name'); ignored for policies other than CONFLATE\n\n"
+        ":Raises: *InvalidArgument* - for CONFLATE policy without key field, or for policy not supported by lock-free queue\n\n"
+        "::\n\n"
+        "    pvq.setOverflowPolicy(CONFLATE, 'name')\n\n")
+
+    .def("getOverflowPolicy",
+        static_cast<QueueOverflowPolicy::OverflowPolicy(PvObjectQueue::*)()>(&PvObjectQueue::getOverflowPolicy),
+        "Retrieves queue overflow policy.\n\n"
+        ":Returns: queue overflow policy\n\n"
+        "::\n\n"
+        "    overflowPolicy = pvq.getOverflowPolicy()\n\n")
+
+    .def("getOverflowPolicyKey",
+        static_cast<std::string(PvObjectQueue::*)()>(&PvObjectQueue::getOverflowPolicyKey),
+        "Retrieves name of the field used as conflation key.\n\n"
+        ":Returns: conflation key field name (empty string if not set)\n\n"
+        "::\n\n"
+        "    keyField = pvq.getOverflowPolicyKey()\n\n")
+
+    .def("isLockFree",
+        static_cast<bool(PvObjectQueue::*)()>(&PvObjectQueue::isLockFree),
+        "Checks whether queue is implemented as a lock-free ring buffer.\n\n"
+        ":Returns: True for lock-free queues, False otherwise\n\n"
+        "::\n\n"
+        "    lockFree = pvq.isLockFree()\n\n")
+
     .add_property("maxLength", &PvObjectQueue::getMaxLength, &PvObjectQueue::setMaxLength)
 
 ;
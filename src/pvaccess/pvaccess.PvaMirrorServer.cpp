@@ -97,7 +97,7 @@ class_<PvaMirrorServer, bases<PvaServer> >("PvaMirrorServer",
 
     .def("getMirrorRecordCounters",
         static_cast<dict(PvaMirrorServer::*)(const std::string&)>(&PvaMirrorServer::getMirrorRecordCounters),
-        "Retrieve dictionary with record counters, which include number of updates received and number of monitor overruns.\n\n"
+        "Retrieve dictionary with record counters, which include number of updates received, number of monitor overruns, and number of updates forwarded to or dropped by the mirror record (see setMirrorRecordRateLimit()).\n\n"
         ":Parameter: *mirrorChannelName* (str) - mirror channel name\n\n"
         ":Returns: dictionary containing available statistics counters\n\n"
         "::\n\n"
@@ -110,6 +110,59 @@ class_<PvaMirrorServer, bases<PvaServer> >("PvaMirrorServer",
         "::\n\n"
         "    mirrorRecordNames = pvaMirrorServer.getMirrorRecordNames()\n\n")
 
+    .def("setMirrorRecordRateLimit",
+        static_cast<void(PvaMirrorServer::*)(const std::string&,double,unsigned int,bool)>(&PvaMirrorServer::setMirrorRecordRateLimit),
+        args("mirrorChannelName", "maxRate", "decimation", "forwardLatest"),
+        "Limits the rate of mirror record updates. Source updates are first decimated, i.e. only every n-th update is considered for forwarding. Updates that arrive sooner than 1/maxRate seconds after the previously forwarded update are either dropped, or, if the forwardLatest flag is set, the latest of them is forwarded when the rate limiting window expires. Rate limiting is applied before source updates are copied into the mirror record and its views, and numbers of forwarded and dropped updates are reported via getMirrorRecordCounters().\n\n"
+        ":Parameter: *mirrorChannelName* (str) - mirror channel name\n\n"
+        ":Parameter: *maxRate* (float) - maximum update rate in Hz; value of 0 disables rate limiting\n\n"
+        ":Parameter: *decimation* (int) - decimation factor (should be >= 1); value of 1 disables decimation\n\n"
+        ":Parameter: *forwardLatest* (bool) - if True, the latest update received within the rate limiting window is forwarded at the end of the window; otherwise, updates received within the window are dropped\n\n"
+        ":Raises: *ObjectNotFound* - when database does not contain mirror record associated with a given channel name\n\n"
+        ":Raises: *InvalidRequest* - in case of invalid parameter values\n\n"
+        "::\n\n"
+        "    pvaMirrorServer.setMirrorRecordRateLimit('mirrorImage', 5, 1, True)\n\n")
+
+    .def("addMirrorView",
+        static_cast<void(PvaMirrorServer::*)(const std::string&,const std::string&,const std::string&)>(&PvaMirrorServer::addMirrorView),
+        args("viewChannelName", "mirrorChannelName", "fieldRequestDescriptor"),
+        "Adds mirror view record to the server database. Mirror view is derived from an existing mirror record and contains only a subset of its fields (e.g., image data or metadata only). View record is updated from the same source monitor as the mirror record, and the field mapping between the two records is built only once, when the mirror record structure becomes known, so that each update copies only fields requested by the view. If the mirror record has already received data, invalid field requests are reported immediately; otherwise, they are logged once the source channel connects.\n\n"
+        ":Parameter: *viewChannelName* (str) - mirror view channel name\n\n"
+        ":Parameter: *mirrorChannelName* (str) - existing mirror channel name\n\n"
+        ":Parameter: *fieldRequestDescriptor* (str) - comma-separated list of mirror record fields that should be included in the view\n\n"
+        ":Raises: *ObjectAlreadyExists* - when database already contains record associated with a given view channel name\n\n"
+        ":Raises: *ObjectNotFound* - when database does not contain mirror record associated with a given mirror channel name\n\n"
+        ":Raises: *InvalidRequest* - when field request descriptor is invalid\n\n"
+        ":Raises: *PvaException* - in case of any other errors\n\n"
+        "::\n\n"
+        "    pvaMirrorServer.addMirrorView('mirrorImageMetadata', 'mirrorImage', 'uniqueId,timeStamp,dimension,attribute')\n\n")
+
+    .def("removeMirrorView",
+        static_cast<void(PvaMirrorServer::*)(const std::string&)>(&PvaMirrorServer::removeMirrorView),
+        args("viewChannelName"),
+        "Removes mirror view record from the server database.\n\n"
+        ":Parameter: *viewChannelName* (str) - mirror view channel name\n\n"
+        ":Raises: *ObjectNotFound* - when database does not contain mirror view associated with a given channel name\n\n"
+        ":Raises: *PvaException* - in case of any other errors\n\n"
+        "::\n\n"
+        "    pvaMirrorServer.removeMirrorView('mirrorImageMetadata')\n\n")
+
+    .def("hasMirrorView",
+        static_cast<bool(PvaMirrorServer::*)(const std::string&)>(&PvaMirrorServer::hasMirrorView),
+        args("viewChannelName"),
+        "Determines if server database contains mirror view associated with a given channel name.\n\n"
+        ":Parameter: *viewChannelName* (str) - mirror view channel name\n\n"
+        ":Returns: True if view exists, false otherwise\n\n"
+        "::\n\n"
+        "    if pvaMirrorServer.hasMirrorView('mirrorImageMetadata'): print('Server contains mirror image metadata view.')\n\n")
+
+    .def("getMirrorViewNames",
+        static_cast<boost::python::list(PvaMirrorServer::*)()>(&PvaMirrorServer::getMirrorViewNames),
+        "Retrieves existing mirror view channel names from the server's database.\n\n"
+        ":Returns: list of known mirror view channel names\n\n"
+        "::\n\n"
+        "    mirrorViewNames = pvaMirrorServer.getMirrorViewNames()\n\n")
+
 ;
 } // wrapPvaMirrorServer()
 
@@ -231,6 +231,61 @@ class_<PvaServer>("PvaServer",
         ":Returns: list of known channel names\n\n"
         "::\n\n"
         "    recordNames = pvaServer.getRecordNames()\n\n")
+
+    .def("setCallbackPriority",
+        static_cast<void(PvaServer::*)(const std::string&,int)>(&PvaServer::setCallbackPriority),
+        args("channelName", "priority"),
+        "Sets priority for executing channel write callbacks. When there are pending callbacks for multiple channels, callbacks for channels with higher priority are executed first; channels with the same priority are served in round-robin fashion. Callbacks for a given channel are always executed in order, and never concurrently. Default priority is 0.\n\n"
+        ":Parameter: *channelName* (str) - channel name\n\n"
+        ":Parameter: *priority* (int) - callback priority\n\n"
+        ":Raises: *ObjectNotFound* - when database does not contain record associated with a given channel name\n\n"
+        "::\n\n"
+        "    pvaServer.setCallbackPriority('control', 10)\n\n")
+
+    .def("getCallbackPriority",
+        static_cast<int(PvaServer::*)(const std::string&)>(&PvaServer::getCallbackPriority),
+        args("channelName"),
+        "Retrieves priority for executing channel write callbacks.\n\n"
+        ":Parameter: *channelName* (str) - channel name\n\n"
+        ":Returns: callback priority\n\n"
+        ":Raises: *ObjectNotFound* - when database does not contain record associated with a given channel name\n\n"
+        "::\n\n"
+        "    priority = pvaServer.getCallbackPriority('control')\n\n")
+
+    .def("setCallbackThreadPoolSize",
+        static_cast<void(PvaServer::*)(int)>(&PvaServer::setCallbackThreadPoolSize),
+        args("poolSize"),
+        "Sets number of threads used for executing channel write callbacks. With more than one thread, a slow callback for one channel does not delay callbacks for other channels. Default pool size is 1.\n\n"
+        ":Parameter: *poolSize* (int) - number of callback threads (must be positive)\n\n"
+        ":Raises: *InvalidArgument* - for invalid pool size\n\n"
+        "::\n\n"
+        "    pvaServer.setCallbackThreadPoolSize(4)\n\n")
+
+    .def("getCallbackThreadPoolSize",
+        static_cast<int(PvaServer::*)()>(&PvaServer::getCallbackThreadPoolSize),
+        "Retrieves number of threads used for executing channel write callbacks.\n\n"
+        ":Returns: callback thread pool size\n\n"
+        "::\n\n"
+        "    poolSize = pvaServer.getCallbackThreadPoolSize()\n\n")
+
+    .def("getCallbackCounters",
+        static_cast<boost::python::dict(PvaServer::*)(const std::string&)>(&PvaServer::getCallbackCounters),
+        args("channelName"),
+        "Retrieves channel write callback statistics: number of executed callbacks (nCallbacks), number of pending callbacks (nPending), last, minimum, maximum and average time in seconds between channel write and start of callback execution (lastLatency, minLatency, maxLatency, avgLatency), and maximum and average callback runtime in seconds (maxRuntime, avgRuntime).\n\n"
+        ":Parameter: *channelName* (str) - channel name\n\n"
+        ":Returns: dictionary containing callback statistics counters\n\n"
+        ":Raises: *ObjectNotFound* - when database does not contain record associated with a given channel name\n\n"
+        "::\n\n"
+        "    counterDict = pvaServer.getCallbackCounters('control')\n\n")
+
+    .def("resetCallbackCounters",
+        static_cast<void(PvaServer::*)(const std::string&)>(&PvaServer::resetCallbackCounters),
+        args("channelName"),
+        "Resets channel write callback statistics.\n\n"
+        ":Parameter: *channelName* (str) - channel name\n\n"
+        ":Raises: *ObjectNotFound* - when database does not contain record associated with a given channel name\n\n"
+        "::\n\n"
+        "    pvaServer.resetCallbackCounters('control')\n\n")
 ;
 } // wrapPvaServer()
 
@@ -0,0 +1,23 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include "boost/python/enum.hpp"
+#include "QueueOverflowPolicy.h"
+
+using namespace boost::python;
+
+//
+// QueueOverflowPolicy enum 
+// 
+void wrapQueueOverflowPolicy()
+{
+
+enum_<QueueOverflowPolicy::OverflowPolicy>("QueueOverflowPolicy")
+    .value("REJECT_NEW", QueueOverflowPolicy::RejectNew)
+    .value("DROP_OLDEST", QueueOverflowPolicy::DropOldest)
+    .value("CONFLATE", QueueOverflowPolicy::Conflate)
+    .export_values()
+;
+                                        
+} // wrapQueueOverflowPolicy()
+
@@ -0,0 +1,22 @@
+// Copyright information and license terms for this software can be
+// found in the file LICENSE that is included with the distribution
+
+#include "boost/python/enum.hpp"
+#include "RpcExecutorType.h"
+
+using namespace boost::python;
+
+//
+// RpcExecutorType enum 
+// 
+void wrapRpcExecutorType()
+{
+
+enum_<RpcExecutorType::ExecutorType>("RpcExecutorType")
+    .value("SYNCHRONOUS", RpcExecutorType::Synchronous)
+    .value("THREAD_POOL", RpcExecutorType::ThreadPool)
+    .value("PROCESS_POOL", RpcExecutorType::ProcessPool)
+    .export_values()
+;
+                                        
+} // wrapRpcExecutorType()
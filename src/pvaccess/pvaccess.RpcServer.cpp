@@ -25,9 +25,9 @@ class_<RpcServer>("RpcServer",
     init<>())
 
     .def("registerService", 
-        &RpcServer::registerService, 
+        static_cast<void(RpcServer::*)(const std::string&,const object&)>(&RpcServer::registerService), 
         args("serviceName", "serviceImpl"), 
-        "Registers service implementation with RPC server. Typically, all services are registered before RPC server starts listening for client requests.\n\n"
+        "Registers service implementation with RPC server. Typically, all services are registered before RPC server starts listening for client requests. Service is invoked directly by the PVA server thread that received the request (see the *RpcExecutorType.SYNCHRONOUS* executor type). Service implementation may also be a coroutine function (*async def*), in which case it is executed in the RPC server's asyncio event loop.\n\n"
         ":Parameter: *serviceName* (str) - service name (name of the PV channel used for RPC client/server communication)\n\n"
         ":Parameter: *serviceImpl* (object) - reference to service implementation object (e.g., python function) that returns PV Object upon invocation\n\n"
         "The following is an example of RPC service that creates NT Table according to client specifications:\n\n"
@@ -54,6 +54,75 @@ class_<RpcServer>("RpcServer",
         "    rpcServer.registerService('createNtTable', createNtTable)\n\n"
         "    rpcServer.listen()\n\n")
 
+    .def("registerService", 
+        static_cast<void(RpcServer::*)(const std::string&,const object&,RpcExecutorType::ExecutorType,int,int)>(&RpcServer::registerService), 
+        args("serviceName", "serviceImpl", "executorType", "maxInFlight", "maxQueueSize"), 
+        "Registers service implementation with RPC server using a given executor type. With the *THREAD_POOL* executor type, service requests are queued and executed by the RPC server worker pool (see *setWorkerPoolSize()*), so that slow requests do not block other clients; this is most useful for services that release GIL (e.g., services performing I/O, or calling *time.sleep()*), and for coroutine services. With the *PROCESS_POOL* executor type, worker pool threads execute requests in the RPC server process pool (see *setProcessPoolSize()*), which is suitable for CPU-bound services; in this case service implementation must be picklable (e.g., module-level function in a module that can be imported by the spawned pool processes), and coroutine services are not supported. At most *maxInFlight* requests are executed concurrently for a given service; additional requests wait in the service queue, and are rejected once the queue holds *maxQueueSize* requests.\n\n"
+        ":Parameter: *serviceName* (str) - service name (name of the PV channel used for RPC client/server communication)\n\n"
+        ":Parameter: *serviceImpl* (object) - reference to service implementation object (e.g., python function or coroutine function) that returns PV Object upon invocation\n\n"
+        ":Parameter: *executorType* (RpcExecutorType) - service executor type (SYNCHRONOUS, THREAD_POOL or PROCESS_POOL)\n\n"
+        ":Parameter: *maxInFlight* (int) - maximum number of requests for this service executed concurrently (must be positive; ignored for the SYNCHRONOUS executor type)\n\n"
+        ":Parameter: *maxQueueSize* (int) - maximum number of requests waiting in the service queue; value of 0 indicates unlimited queue (ignored for the SYNCHRONOUS executor type)\n\n"
+        ":Raises: *InvalidArgument* - in case of invalid parameter values\n\n"
+        "::\n\n"
+        "    async def analyze(pvRequest):\n\n"
+        "        await asyncio.sleep(2)\n\n"
+        "        return pvaccess.PvObject({'result' : pvaccess.DOUBLE}, {'result' : 1.0})\n\n"
+        "    \n\n"
+        "    rpcServer.registerService('analyze', analyze, pvaccess.RpcExecutorType.THREAD_POOL, 4, 100)\n\n")
+
+    .def("setWorkerPoolSize", 
+        &RpcServer::setWorkerPoolSize, 
+        args("poolSize"), 
+        "Sets number of worker threads used for executing requests of services registered with *THREAD_POOL* or *PROCESS_POOL* executor types. Worker pool is shared by all such services, and its size can be changed at any time.\n\n"
+        ":Parameter: *poolSize* (int) - number of worker threads (must be positive; default: 4)\n\n"
+        ":Raises: *InvalidArgument* - in case of invalid pool size\n\n"
+        "::\n\n"
+        "    rpcServer.setWorkerPoolSize(8)\n\n")
+
+    .def("getWorkerPoolSize", 
+        &RpcServer::getWorkerPoolSize, 
+        "Retrieves number of worker threads.\n\n"
+        ":Returns: worker pool size\n\n"
+        "::\n\n"
+        "    poolSize = rpcServer.getWorkerPoolSize()\n\n")
+
+    .def("setProcessPoolSize", 
+        &RpcServer::setProcessPoolSize, 
+        args("poolSize"), 
+        "Sets number of processes used for executing requests of services registered with *PROCESS_POOL* executor type. Process pool is created when the first such service is registered, and its size cannot be changed afterwards. Pool processes are started using the *spawn* method, so that they do not inherit PVA threads from the server process.\n\n"
+        ":Parameter: *poolSize* (int) - number of processes; value of 0 indicates that the number of processes is determined by the number of available CPUs (default: 0)\n\n"
+        ":Raises: *InvalidArgument* - in case of invalid pool size\n\n"
+        ":Raises: *InvalidState* - if process pool has already been created\n\n"
+        "::\n\n"
+        "    rpcServer.setProcessPoolSize(4)\n\n")
+
+    .def("getProcessPoolSize", 
+        &RpcServer::getProcessPoolSize, 
+        "Retrieves configured number of processes in the process pool.\n\n"
+        ":Returns: process pool size\n\n"
+        "::\n\n"
+        "    poolSize = rpcServer.getProcessPoolSize()\n\n")
+
+    .def("getServiceCounters", 
+        &RpcServer::getServiceCounters, 
+        args("serviceName"), 
+        "Retrieves dictionary with service counters, which include number of requests executed, number of errors, and average and maximum request runtime. For services using worker pool, counters also include number of requests rejected, in flight and waiting in the service queue, maximum queue depth, and request latency statistics (time from receiving request until sending response).\n\n"
+        ":Parameter: *serviceName* (str) - service name\n\n"
+        ":Returns: dictionary containing available statistics counters\n\n"
+        ":Raises: *ObjectNotFound* - when service is not registered\n\n"
+        "::\n\n"
+        "    counterDict = rpcServer.getServiceCounters('analyze')\n\n")
+
+    .def("resetServiceCounters", 
+        &RpcServer::resetServiceCounters, 
+        args("serviceName"), 
+        "Resets service counters.\n\n"
+        ":Parameter: *serviceName* (str) - service name\n\n"
+        ":Raises: *ObjectNotFound* - when service is not registered\n\n"
+        "::\n\n"
+        "    rpcServer.resetServiceCounters('analyze')\n\n")
+
     .def("unregisterService", 
         &RpcServer::unregisterService, 
         args("serviceName"), 
@@ -29,6 +29,8 @@
 void wrapConstants();
 void wrapPvProvider();
 void wrapPvType();
+void wrapQueueOverflowPolicy();
+void wrapRpcExecutorType();
 
 void wrapPvObject();
 void wrapPvObjectQueue();
@@ -65,6 +67,7 @@ void wrapNtScalar();
 void wrapNtTable();
 
 void wrapChannel();
+void wrapBulkChannelRequest();
 void wrapRpcServer();
 void wrapRpcClient();
 
@@ -123,6 +126,8 @@ BOOST_PYTHON_MODULE(pvaccess)
     // Enum wrappers
     wrapPvType();
     wrapPvProvider();
+    wrapQueueOverflowPolicy();
+    wrapRpcExecutorType();
 
     // Class wrappers
     wrapPvObject();
@@ -159,6 +164,7 @@ BOOST_PYTHON_MODULE(pvaccess)
     wrapNtTable();
 
     wrapChannel();
+    wrapBulkChannelRequest();
     wrapPvObjectQueue();
     wrapRpcClient();
     wrapRpcServer(); 
@@ -0,0 +1,33 @@
+'''
+Test AD Image Decompressor.
+'''
+from unittest.mock import Mock
+import sys
+import pylint.lint
+import pytest
+import numpy as np
+import pvaccess as pva
+
+from pvapy.utility import adImageDecompressor
+from pvapy.utility.adImageDecompressor import AdImageDecompressor
+
+def testLint(monkeypatch):
+    ''' Test for linting errors '''
+    monkeypatch.setattr(sys, 'exit', Mock())
+    pylint_opts = ['pvapy.utility.adImageDecompressor', '--disable=all', '--enable=E,F', '--generated-members="pva.*"']
+    pylint.lint.Run(pylint_opts)
+    sys.exit.assert_called_once_with(0)
+
+def testBloscSizeMismatch(monkeypatch):
+    ''' Test that blosc data with unexpected uncompressed size is rejected before decompressing '''
+    bloscMock = Mock()
+    bloscMock.get_cbuffer_sizes.return_value = (16, 8, 16)
+    monkeypatch.setattr(adImageDecompressor, 'blosc', bloscMock)
+    decompressor = AdImageDecompressor()
+    data = np.zeros(8, dtype=np.uint8)
+    with pytest.raises(pva.InvalidArgument):
+        decompressor.decompressBlosc(data, 16, np.dtype('uint16'))
+    bloscMock.decompress_ptr.assert_not_called()
+    image = decompressor.decompressBlosc(data, 8, np.dtype('uint16'))
+    assert image.size == 8
+    bloscMock.decompress_ptr.assert_called_once()
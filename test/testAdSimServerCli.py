@@ -3,7 +3,10 @@ Test AD Sim Server CLI.
 '''
 from unittest.mock import Mock
 import sys
+import time
+import random
 import pylint.lint
+import pvaccess as pva
 
 from pvapy.cli import adSimServer
 
@@ -13,3 +16,26 @@ def testLint(monkeypatch):
     pylint_opts = ['pvapy.cli.adSimServer', '--disable=all', '--enable=E,F', '--generated-members="pva.*"']
     pylint.lint.Run(pylint_opts)
     sys.exit.assert_called_once_with(0)
+
+def testFarmPublishing():
+    ''' Test that frames from all farm workers are published '''
+    channelName = f'sim{random.randint(0,1000000)}:*'
+    server = adSimServer.AdSimServer(inputDirectory=None, inputFile=None, mmapMode=False, hdfDataset=None, hdfCompressionMode=False, cfgFile=None, frameRate=10, nFrames=4, cacheSize=4, nx=16, ny=16, colorMode=0, datatype='uint8', minimum=None, maximum=None, runtime=3, channelName=channelName, notifyPv=None, notifyPvValue=None, metadataPv=None, startDelay=2, shutdownDelay=1, reportPeriod=0, disableCurses=True, nChannels=2, nWorkers=2)
+    server.start()
+    time.sleep(1)
+    receivedMap = {}
+    channelList = []
+    for cName in server.channelNameList:
+        receivedMap[cName] = []
+        c = pva.Channel(cName)
+        c.monitor(lambda pv, receivedList=receivedMap[cName]: receivedList.append(pv['uniqueId']), 'field(uniqueId)')
+        channelList.append(c)
+    time.sleep(4)
+    for c in channelList:
+        c.stopMonitor()
+    server.stop()
+    for cName,receivedList in receivedMap.items():
+        assert [uniqueId for uniqueId in receivedList if uniqueId > 0], f'No frames received on channel {cName}'
+    assert sorted(server.workerStatsMap.keys()) == [1, 2]
+    for workerStats in server.workerStatsMap.values():
+        assert workerStats['nPublishedFrames'] > 0
@@ -0,0 +1,106 @@
+'''
+Test Async Channel.
+'''
+from unittest.mock import Mock
+import sys
+import asyncio
+import pylint.lint
+import pytest
+from pvaccess import PvInt
+from pvaccess import InvalidState
+
+from pvapy.utility.asyncChannel import AsyncChannel
+from testUtility import TestUtility
+from testServer import TestServer
+
+def testLint(monkeypatch):
+    ''' Test for linting errors '''
+    monkeypatch.setattr(sys, 'exit', Mock())
+    pylint_opts = ['pvapy.utility.asyncChannel', '--disable=all', '--enable=E,F', '--generated-members="pva.*"']
+    pylint.lint.Run(pylint_opts)
+    sys.exit.assert_called_once_with(0)
+
+def testAgetAput():
+    ''' Test awaitable get and put '''
+    async def run():
+        c = AsyncChannel(TestServer.STRUCT_CHANNEL_NAME)
+        pv = await c.aget('', timeout=5)
+        i = TestUtility.getRandomInt()
+        pv['int'] = i
+        await c.aput(pv, '', timeout=5)
+        pv2 = await c.aget('', timeout=5)
+        return (i, pv2['int'])
+    i, i2 = asyncio.run(run())
+    assert i == i2
+
+def testAmonitor():
+    ''' Test monitor updates delivered by asynchronous iterator '''
+    async def run():
+        c = AsyncChannel(TestServer.INT_CHANNEL_NAME)
+        putChannel = AsyncChannel(TestServer.INT_CHANNEL_NAME)
+        valueList = [TestUtility.getRandomInt() for i in range(3)]
+        receivedList = []
+        monitor = c.amonitor('field(value)', queueSize=10)
+        try:
+            # Initial update is received when monitor connects
+            await asyncio.wait_for(monitor.__anext__(), 5)
+            for value in valueList:
+                await putChannel.aput(PvInt(value), timeout=5)
+                pv = await asyncio.wait_for(monitor.__anext__(), 5)
+                receivedList.append(pv['value'])
+        finally:
+            await monitor.aclose()
+        return (valueList, receivedList, c.nMonitorOverruns, c.isMonitorActive())
+    valueList, receivedList, nMonitorOverruns, isMonitorActive = asyncio.run(run())
+    assert receivedList == valueList
+    assert nMonitorOverruns == 0
+    assert not isMonitorActive
+
+def testAmonitorOverruns():
+    ''' Test that oldest updates are discarded when consumer falls behind '''
+    async def run():
+        c = AsyncChannel(TestServer.INT_CHANNEL_NAME)
+        putChannel = AsyncChannel(TestServer.INT_CHANNEL_NAME)
+        monitor = c.amonitor('field(value)', queueSize=1)
+        try:
+            await asyncio.wait_for(monitor.__anext__(), 5)
+            for i in range(5):
+                await putChannel.aput(PvInt(i), timeout=5)
+            # Allow all updates to reach the event loop
+            await asyncio.sleep(1)
+            pv = await asyncio.wait_for(monitor.__anext__(), 5)
+        finally:
+            await monitor.aclose()
+        return (pv['value'], c.nMonitorOverruns)
+    value, nMonitorOverruns = asyncio.run(run())
+    assert value == 4
+    assert nMonitorOverruns > 0
+
+def testAmonitorBreak():
+    ''' Test that monitor is stopped after consumer breaks out of iteration '''
+    async def run():
+        c = AsyncChannel(TestServer.INT_CHANNEL_NAME)
+        async for _ in c.amonitor('field(value)'):
+            break
+        # Abandoned generator is closed by the event loop
+        for _ in range(10):
+            await asyncio.sleep(0.1)
+            if not c.isMonitorActive():
+                break
+        return c.isMonitorActive()
+    assert not asyncio.run(run())
+
+def testAmonitorAlreadyActive():
+    ''' Test that second monitor on the same channel is rejected '''
+    async def run():
+        c = AsyncChannel(TestServer.INT_CHANNEL_NAME)
+        monitor = c.amonitor('field(value)')
+        try:
+            await asyncio.wait_for(monitor.__anext__(), 5)
+            with pytest.raises(InvalidState):
+                await c.amonitor('field(value)').__anext__()
+            isMonitorActive = c.isMonitorActive()
+        finally:
+            await monitor.aclose()
+        return isMonitorActive
+    assert asyncio.run(run())
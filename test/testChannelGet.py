@@ -2,6 +2,11 @@
 
 import time
 from pvaccess import Channel
+from pvaccess import PvaServer
+from pvaccess import PvObject
+from pvaccess import INT
+from pvaccess import DOUBLE
+from pvaccess import STRING
 from pvaccess import PvBoolean
 from pvaccess import PvByte
 from pvaccess import PvUByte
@@ -54,3 +59,54 @@ class TestChannelGet:
         print('Testing error message is not None: %s' % (self.retrievalError))
         assert(self.retrievalError != None)
 
+    #
+    # Operation Cache
+    #
+    def testOperationCache(self):
+        cName = 'c' + TestUtility.getRandomString(5)
+        s = PvaServer(cName, PvObject({'i' : INT, 'd' : DOUBLE, 's' : STRING}, {'i' : 1, 'd' : 2.0, 's' : 'a'}))
+        c = Channel(cName)
+        c.setOperationCacheSize(2)
+        assert(c.getOperationCacheSize() == 2)
+
+        # Repeated request reuses cached operation
+        assert(c.get('field(i)')['i'] == 1)
+        assert(c.get('field(i)')['i'] == 1)
+        counterDict = c.getOperationCacheCounters()
+        print('\nOperation cache counters: %s' % counterDict)
+        assert(counterDict['nCacheHits'] == 1)
+        assert(counterDict['nCacheMisses'] == 1)
+        assert(counterDict['nCacheEvictions'] == 0)
+        assert(counterDict['nCachedOperations'] == 1)
+
+        # Least recently used operation for field(i) is evicted
+        c.get('field(d)')
+        c.get('field(s)')
+        counterDict = c.getOperationCacheCounters()
+        print('Operation cache counters: %s' % counterDict)
+        assert(counterDict['nCacheMisses'] == 3)
+        assert(counterDict['nCacheEvictions'] == 1)
+        assert(counterDict['nCachedOperations'] == 2)
+
+        # Operation for field(d) is still cached, field(i) is not, and
+        # caching field(i) again evicts least recently used field(s)
+        c.get('field(d)')
+        c.get('field(i)')
+        c.get('field(d)')
+        counterDict = c.getOperationCacheCounters()
+        print('Operation cache counters: %s' % counterDict)
+        assert(counterDict['nCacheHits'] == 3)
+        assert(counterDict['nCacheMisses'] == 4)
+        assert(counterDict['nCacheEvictions'] == 2)
+        c.get('field(i)')
+        counterDict = c.getOperationCacheCounters()
+        assert(counterDict['nCacheHits'] == 4)
+
+        c.clearOperationCache()
+        assert(c.getOperationCacheCounters()['nCachedOperations'] == 0)
+        c.resetOperationCacheCounters()
+        counterDict = c.getOperationCacheCounters()
+        assert(counterDict['nCacheHits'] == 0)
+        assert(counterDict['nCacheMisses'] == 0)
+        assert(counterDict['nCacheEvictions'] == 0)
+        s.stop()
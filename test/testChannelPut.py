@@ -2,6 +2,8 @@
 
 import time
 from pvaccess import Channel
+from pvaccess import putMany
+from pvaccess import getMany
 from pvaccess import PvBoolean
 from pvaccess import PvByte
 from pvaccess import PvUByte
@@ -16,6 +18,7 @@ from pvaccess import PvDouble
 from pvaccess import PvString
 from pvaccess import PvTimeStamp
 from testUtility import TestUtility
+from testServer import TestServer
 
 class TestChannelPut:
 
@@ -398,4 +401,17 @@ class TestChannelPut:
         print('Testing equality: %s == %s' % (pv['int'], pv2['int']))
         assert(pv['int'] == pv2['int'])
 
-
+    #
+    # Bulk Put
+    #
+    def testPutMany(self):
+        i = TestUtility.getRandomInt()
+        d = TestUtility.getRandomDouble()
+        print('\nSetting int and double channels to: %s, %s' % (i, d))
+        errorDict = putMany({TestServer.INT_CHANNEL_NAME : i, TestServer.DOUBLE_CHANNEL_NAME : d, 'nonexistingChannel' : i}, 'field(value)', 1.0)
+        print('Testing that only nonexisting channel failed: %s' % (errorDict))
+        assert(list(errorDict.keys()) == ['nonexistingChannel'])
+        (valueDict, errorDict) = getMany([TestServer.INT_CHANNEL_NAME, TestServer.DOUBLE_CHANNEL_NAME], 'field(value)', 1.0, True)
+        print('Testing equality: %s == %s' % (i, valueDict[TestServer.INT_CHANNEL_NAME]))
+        assert(i == valueDict[TestServer.INT_CHANNEL_NAME])
+        TestUtility.assertDoubleEquality(d, valueDict[TestServer.DOUBLE_CHANNEL_NAME])
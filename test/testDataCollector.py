@@ -3,9 +3,11 @@
 '''
 from unittest.mock import Mock
 import tempfile
+import time
 import os
 import sys
 import pylint.lint
+import pvaccess as pva
 
 from pvapy.hpc.dataCollector import DataCollector
 
@@ -15,3 +17,26 @@ def testLint(monkeypatch):
     pylint_opts = ['pvapy.hpc.dataCollector', '--disable=all', '--enable=E,F', '--generated-members="pva.*"']
     pylint.lint.Run(pylint_opts)
     sys.exit.assert_called_once_with(0)
+
+def testIdleProducer():
+    ''' Test that objects from active producer are collected while the other producer is idle '''
+    collector = DataCollector(1, 'pvapy:test:collector:*', producerIdList=[1,2], monitorQueueSize=10, collectorLatenessTimeout=10, processingController=Mock())
+    collector.processingThread.start()
+    try:
+        # Processing thread is waiting on producer queues
+        time.sleep(0.5)
+        producerQueue = collector.producerChannelMap[2].pvObjectQueue
+        producerQueue.put(pva.PvObject({'uniqueId' : pva.UINT}, {'uniqueId' : 1}))
+        # Object must be picked up well before processing thread wait times out
+        startTime = time.time()
+        while time.time()-startTime < 1:
+            if collector.nObjectsCached or collector.nCollected:
+                break
+            time.sleep(0.01)
+        assert collector.nObjectsCached + collector.nCollected == 1
+        assert len(producerQueue) == 0
+    finally:
+        collector.processingThread.stop()
+        for producerChannel in collector.producerChannelMap.values():
+            producerChannel.cancelWaitOnQueue()
+        collector.processingThread.join(5)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+import time
+import pvaccess as pva
+from testUtility import TestUtility
+
+class TestDataDistributor:
+
+    def createServer(self):
+        cName = 'dd' + TestUtility.getRandomString(5)
+        s = pva.PvaServer(cName, pva.PvObject({'uniqueId' : pva.INT, 'key' : pva.STRING}, {'uniqueId' : 0, 'key' : ''}))
+        return (s, cName)
+
+    def startMonitor(self, cName, request, receivedList):
+        def monitor(pv):
+            uniqueId = pv['uniqueId']
+            # Ignore initial update
+            if uniqueId > 0:
+                receivedList.append((uniqueId, pv['key']))
+        c = pva.Channel(cName)
+        c.monitor(monitor, request)
+        return c
+
+    def publish(self, s, uniqueIdList, keyList=None):
+        for i,uniqueId in enumerate(uniqueIdList):
+            key = ''
+            if keyList:
+                key = keyList[i]
+            s.update(pva.PvObject({'uniqueId' : pva.INT, 'key' : pva.STRING}, {'uniqueId' : uniqueId, 'key' : key}))
+            time.sleep(0.05)
+        time.sleep(1)
+
+    def testCreditMode(self):
+        s, cName = self.createServer()
+        groupId = TestUtility.getRandomString(5)
+        request = 'field(_[pydistributor=group:%s;trigger:uniqueId;mode:credit;credits:%s;consumer:%s])'
+        receivedMap = {'a' : [], 'b' : []}
+        ca = self.startMonitor(cName, request % (groupId, 3, 'a'), receivedMap['a'])
+        cb = self.startMonitor(cName, request % (groupId, 1, 'b'), receivedMap['b'])
+        time.sleep(1)
+
+        # Updates are dropped once all credit is used up
+        self.publish(s, range(1,7))
+        print('Received updates: %s' % receivedMap)
+        assert(len(receivedMap['a']) == 3)
+        assert(len(receivedMap['b']) == 1)
+
+        # Returned credit allows further updates; acknowledgement reply
+        # holds number of updates dropped for lack of credit
+        ackChannel = pva.Channel(cName)
+        ackChannel.setOperationCacheSize(0)
+        pv = ackChannel.get('field(uniqueId[pydistributor=group:%s;consumer:a;ack:2])' % groupId)
+        print('Acknowledgement reply: %s' % pv)
+        assert(pv['uniqueId'] == 2)
+        assert('key' not in pv)
+        self.publish(s, range(7,10))
+        print('Received updates: %s' % receivedMap)
+        assert(len(receivedMap['a']) == 5)
+        assert(len(receivedMap['b']) == 1)
+        receivedIdList = [uniqueId for uniqueId,_ in receivedMap['a']+receivedMap['b']]
+        assert(len(set(receivedIdList)) == len(receivedIdList))
+        ca.stopMonitor()
+        cb.stopMonitor()
+        s.stop()
+
+    def testHashMode(self):
+        s, cName = self.createServer()
+        groupId = TestUtility.getRandomString(5)
+        request = 'field(_[pydistributor=group:%s;trigger:uniqueId;mode:hash;key:key])' % groupId
+        receivedMap = {'a' : [], 'b' : []}
+        ca = self.startMonitor(cName, request, receivedMap['a'])
+        cb = self.startMonitor(cName, request, receivedMap['b'])
+        time.sleep(1)
+
+        # All updates with the same key go to the same client
+        nUpdates = 20
+        keyList = ['k%s' % (i%5) for i in range(0,nUpdates)]
+        self.publish(s, range(1,nUpdates+1), keyList)
+        print('Received updates: %s' % receivedMap)
+        assert(len(receivedMap['a'])+len(receivedMap['b']) == nUpdates)
+        keysA = set([key for _,key in receivedMap['a']])
+        keysB = set([key for _,key in receivedMap['b']])
+        assert(not keysA.intersection(keysB))
+        ca.stopMonitor()
+        cb.stopMonitor()
+        s.stop()
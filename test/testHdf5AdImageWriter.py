@@ -6,8 +6,12 @@ import tempfile
 import os
 import sys
 import pylint.lint
+import pytest
+import numpy as np
+import h5py
 
 from pvapy.hpc.hdf5AdImageWriter import Hdf5AdImageWriter
+from pvapy.utility.adImageUtility import AdImageUtility
 
 def testLint(monkeypatch):
     ''' Test for linting errors '''
@@ -15,3 +19,79 @@ def testLint(monkeypatch):
     pylint_opts = ['pvapy.hpc.hdf5AdImageWriter', '--disable=all', '--enable=E,F', '--generated-members="pva.*,adImageUtility.*"']
     pylint.lint.Run(pylint_opts)
     sys.exit.assert_called_once_with(0)
+
+def compressImage(image, codecName):
+    ''' Compress image the same way as the NDCodec plugin '''
+    if codecName == 'lz4':
+        lz4Block = pytest.importorskip('lz4.block')
+        return np.frombuffer(lz4Block.compress(image.tobytes(), store_size=False), dtype=np.uint8)
+    if codecName == 'bslz4':
+        bitshuffle = pytest.importorskip('bitshuffle')
+        return bitshuffle.compress_lz4(image.flatten())
+    blosc = pytest.importorskip('blosc')
+    return np.frombuffer(blosc.compress(image.tobytes(), typesize=image.itemsize), dtype=np.uint8)
+
+def generateImages(nImages, nx=32, ny=16, dtype=np.uint16):
+    ''' Generate list of compressible test images '''
+    return [(np.arange(nx*ny, dtype=dtype).reshape(ny, nx)+i)%251 for i in range(nImages)]
+
+def writeImages(writer, images, codecName):
+    ''' Write compressed images and return list of output files '''
+    filePathList = []
+    for (i,image) in enumerate(images):
+        (ny,nx) = image.shape
+        data = compressImage(image, codecName)
+        ntNdArray = AdImageUtility.generateNtNdArray2D(i+1, data, nx, ny, image.dtype, codecName)
+        writer.process(ntNdArray)
+        if writer.filePath not in filePathList:
+            filePathList.append(writer.filePath)
+    return filePathList
+
+def readImages(filePath, datasetName=Hdf5AdImageWriter.DEFAULT_DATASET_NAME):
+    ''' Read all images and dataset filter ids from output file '''
+    with h5py.File(filePath, 'r') as h5File:
+        dataset = h5File[datasetName]
+        dcpl = dataset.id.get_create_plist()
+        return (dataset[:], [dcpl.get_filter(i)[0] for i in range(dcpl.get_nfilters())])
+
+@pytest.mark.parametrize('codecName', ['lz4', 'bslz4', 'blosc'])
+def testCompressedChunksRoundTrip(codecName):
+    ''' Test that compressed chunks written directly into dataset can be read back '''
+    pytest.importorskip('hdf5plugin')
+    with tempfile.TemporaryDirectory() as outputDirectory:
+        writer = Hdf5AdImageWriter({'outputDirectory' : outputDirectory, 'outputFileNameFormat' : '{outputFileId:06}.hdf', 'nImagesPerFile' : 3, 'writeCompressedChunks' : True})
+        images = generateImages(3)
+        filePathList = writeImages(writer, images, codecName)
+        assert len(filePathList) == 1
+        (data, filterIds) = readImages(filePathList[0])
+        assert filterIds == [Hdf5AdImageWriter.HDF5_FILTER_MAP[codecName][0]]
+        assert np.array_equal(data, np.array(images))
+
+def testCompressedChunksReconfiguration():
+    ''' Test that disabling compressed chunks takes effect with the next output file '''
+    pytest.importorskip('hdf5plugin')
+    with tempfile.TemporaryDirectory() as outputDirectory:
+        writer = Hdf5AdImageWriter({'outputDirectory' : outputDirectory, 'outputFileNameFormat' : '{outputFileId:06}.hdf', 'nImagesPerFile' : 2, 'writeCompressedChunks' : True})
+        images = generateImages(4)
+        filePathList = writeImages(writer, images[0:1], 'lz4')
+        writer.configure({'writeCompressedChunks' : False})
+        filePathList += writeImages(writer, images[1:4], 'lz4')
+        assert len(set(filePathList)) == 2
+        (data, filterIds) = readImages(filePathList[0])
+        assert filterIds == [Hdf5AdImageWriter.HDF5_FILTER_MAP['lz4'][0]]
+        assert np.array_equal(data, np.array(images[0:2]))
+        (data, filterIds) = readImages(filePathList[-1])
+        assert filterIds == []
+        assert np.array_equal(data, np.array(images[2:4]))
+
+def testCompressedChunksCodecChange():
+    ''' Test that frames with codec different from the dataset codec are written through the dataset filter '''
+    pytest.importorskip('hdf5plugin')
+    with tempfile.TemporaryDirectory() as outputDirectory:
+        writer = Hdf5AdImageWriter({'outputDirectory' : outputDirectory, 'outputFileNameFormat' : '{outputFileId:06}.hdf', 'nImagesPerFile' : 2, 'writeCompressedChunks' : True})
+        images = generateImages(2)
+        filePathList = writeImages(writer, images[0:1], 'lz4')
+        filePathList += writeImages(writer, images[1:2], 'bslz4')
+        assert len(set(filePathList)) == 1
+        (data, _) = readImages(filePathList[0])
+        assert np.array_equal(data, np.array(images))
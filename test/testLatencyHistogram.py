@@ -0,0 +1,57 @@
+'''
+Test Latency Histogram.
+'''
+from unittest.mock import Mock
+import sys
+import random
+import pylint.lint
+
+from pvapy.utility.latencyHistogram import LatencyHistogram
+
+def testLint(monkeypatch):
+    ''' Test for linting errors '''
+    monkeypatch.setattr(sys, 'exit', Mock())
+    pylint_opts = ['pvapy.utility.latencyHistogram', '--disable=all', '--enable=E,F', '--generated-members="pva.*"']
+    pylint.lint.Run(pylint_opts)
+    sys.exit.assert_called_once_with(0)
+
+def testPercentiles():
+    ''' Test percentile accuracy '''
+    h = LatencyHistogram()
+    values = [random.uniform(0, 0.1) for i in range(0, 10000)]
+    for v in values:
+        h.record(v)
+    values.sort()
+    assert h.count == len(values)
+    for percentile in LatencyHistogram.PERCENTILES:
+        expected = values[int(percentile/100.0*len(values))-1]
+        assert abs(h.getPercentile(percentile)-expected) <= expected*0.02+h.resolution
+    stats = h.getStats('latency')
+    assert sorted(stats.keys()) == sorted(LatencyHistogram.getStatsKeys('latency'))
+    assert stats['latencyMax'] == values[-1]
+
+def testMerge():
+    ''' Test merging histograms '''
+    h1 = LatencyHistogram()
+    h2 = LatencyHistogram()
+    for i in range(0, 100):
+        h1.record(0.001)
+        h2.record(0.010)
+    h1.record(0.001)
+    h2.record(5.0)
+    h = h1.copy().merge(h2)
+    assert h.count == 202
+    assert h1.count == 101
+    assert abs(h.getPercentile(50)-0.001) < 0.001*0.02
+    assert abs(h.getPercentile(99)-0.010) < 0.010*0.02
+    assert h.getStats('latency')['latencyMax'] == 5.0
+    assert h.minValue == 0.001
+
+def testSaturation():
+    ''' Test recording values outside of histogram range '''
+    h = LatencyHistogram(maxValue=1.0)
+    h.record(-1.0)
+    h.record(10.0)
+    assert h.count == 2
+    assert h.getPercentile(50) == 0.0
+    assert h.getPercentile(100) == 10.0
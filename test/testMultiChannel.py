@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+import time
 from pvaccess import MultiChannel
 from pvaccess import PvInt
 from pvaccess import PvDouble
@@ -46,3 +47,27 @@ class TestMultiChannel:
         dv2 = pv['value'][1][0]['value']
         TestUtility.assertDoubleEquality(dv,dv2)
 
+    #
+    # MultiChannel Event Monitor
+    #
+
+    def testEventMonitorAsDoubleArray_IntDouble(self):
+        ic = TestUtility.getIntChannel()
+        dc = TestUtility.getDoubleChannel()
+        ic.put(TestUtility.getRandomInt())
+        dc.put(TestUtility.getRandomDouble())
+
+        valueList = []
+        mc = MultiChannel([ic.getName(),dc.getName()])
+        mc.eventMonitorAsDoubleArray(lambda x: valueList.append(list(x)), 0.1, True)
+        time.sleep(1)
+        iv = TestUtility.getRandomInt()
+        dv = TestUtility.getRandomDouble()
+        ic.put(iv)
+        dc.put(dv)
+        time.sleep(1)
+        mc.stopMonitor()
+        assert(len(valueList) >= 2)
+        assert(int(valueList[-1][0]) == iv)
+        TestUtility.assertDoubleEquality(dv,valueList[-1][1])
+
@@ -13,6 +13,7 @@ from pvaccess import PvDimension
 from pvaccess import PvCodec
 from pvaccess import PvInt
 from pvaccess import INT
+from pvaccess import DOUBLE
 from pvaccess import UBYTE
 from testUtility import TestUtility
 
@@ -44,6 +45,35 @@ class TestNtTypes:
             a2 = columns[i]
             TestUtility.assertListEquality(a1,a2)
         
+    def test_NtTableNumPy(self):
+        print()
+        dim = random.randint(10,100)
+        print('Using columns of size: {}'.format(dim))
+        ids = np.arange(dim, dtype=np.int32)
+        values = np.random.uniform(-1000, 1000, size=dim)
+        ntTable = NtTable([INT, DOUBLE])
+        ntTable.setLabels(['id', 'value'])
+        ntTable.setColumnFromNumPy(0, ids)
+        ntTable.setColumnFromNumPy(1, values)
+        assert(np.array_equiv(ntTable.getColumnAsNumPy(0), ids))
+        assert(np.array_equiv(ntTable.getColumnAsNumPy(1), values))
+
+        # Round trip through structured array
+        a = np.zeros(dim, dtype=[('id', 'i4'), ('value', 'f8'), ('name', 'U8')])
+        a['id'] = ids
+        a['value'] = values
+        a['name'] = ['n%d' % i for i in range(0, dim)]
+        ntTable2 = NtTable.fromStructuredArray(a)
+        assert(ntTable2.getNColumns() == 3)
+        TestUtility.assertListEquality(ntTable2.getLabels(), ['id', 'value', 'name'])
+        TestUtility.assertListEquality(ntTable2.getColumn(2), list(a['name']))
+        a2 = ntTable2.toStructuredArray()
+        print('Comparing structured arrays {} to {}'.format(a2[:3], a[:3]))
+        assert(a2.dtype.names == a.dtype.names)
+        assert(np.array_equiv(a2['id'], a['id']))
+        assert(np.array_equiv(a2['value'], a['value']))
+        assert(np.array_equiv(a2['name'], a['name']))
+
 
     #
     # NtNdArray
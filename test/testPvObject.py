@@ -1,6 +1,11 @@
 #!/usr/bin/env python
 
+import pickle
+import time
 from pvaccess import PvObject
+from pvaccess import PvObjectQueue
+from pvaccess import PvaServer
+from pvaccess import Channel
 from pvaccess import PvInt
 from pvaccess import PvString
 from pvaccess import PvFloat
@@ -526,3 +531,80 @@ class TestPvObject:
             assert(pv2['st']['d'] == structureList[i]['st.d'])
        
 
+
+    #
+    # Release
+    #
+
+    def test_Release(self):
+        print()
+        value = TestUtility.getRandomInt()
+        pv = PvObject({'v' : INT}, {'v' : value})
+        assert(pv['v'] == value)
+        pv.release()
+        assert(pv.getStructureDict() == {})
+        assert('v' not in pv)
+
+    def test_ReleaseToMonitorPool(self):
+        print()
+        cName = 'c' + TestUtility.getRandomString(5)
+        s = PvaServer(cName, PvObject({'v' : INT}, {'v' : 0}))
+        c = Channel(cName)
+        pvq = PvObjectQueue()
+        c.monitor(pvq)
+
+        # Initial update allocates new structure
+        pv = pvq.get(5)
+        assert(pv['v'] == 0)
+        counterDict = c.getMonitorCounters()
+        print('Monitor counters: %s' % counterDict)
+        assert(counterDict['nPoolHits'] == 0)
+        assert(counterDict['nPoolMisses'] == 1)
+
+        # Released structure is reused for the next update
+        pv.release()
+        s.update(PvObject({'v' : INT}, {'v' : 1}))
+        pv = pvq.get(5)
+        assert(pv['v'] == 1)
+        counterDict = c.getMonitorCounters()
+        print('Monitor counters: %s' % counterDict)
+        assert(counterDict['nPoolHits'] == 1)
+        assert(counterDict['nPoolMisses'] == 1)
+
+        # Pool is empty while the object is still in use
+        s.update(PvObject({'v' : INT}, {'v' : 2}))
+        pv2 = pvq.get(5)
+        assert(pv['v'] == 1)
+        assert(pv2['v'] == 2)
+        counterDict = c.getMonitorCounters()
+        print('Monitor counters: %s' % counterDict)
+        assert(counterDict['nPoolHits'] == 1)
+        assert(counterDict['nPoolMisses'] == 2)
+
+        c.stopMonitor()
+        time.sleep(0.1)
+        s.stop()
+
+    #
+    # Binary serialization
+    #
+
+    def test_Bytes(self):
+        print()
+        size = TestUtility.getRandomListSize()
+        valueList = [TestUtility.getRandomInt() for i in range(0,size)]
+        value = TestUtility.getRandomString()
+        pv = PvObject({'s' : STRING, 'a' : [INT], 'st' : {'d' : DOUBLE}}, {'s' : value, 'a' : valueList}, 'test_t:1.0')
+        pv2 = PvObject.fromBytes(pv.toBytes())
+        assert(pv2.getStructureDict() == pv.getStructureDict())
+        assert(pv2['s'] == value)
+        TestUtility.assertListEquality(pv2['a'], valueList)
+
+    def test_Pickle(self):
+        print()
+        size = TestUtility.getRandomListSize()
+        valueList = [TestUtility.getRandomDouble() for i in range(0,size)]
+        pv = PvObject({'a' : [DOUBLE]}, {'a' : valueList})
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL+1):
+            pv2 = pickle.loads(pickle.dumps(pv, protocol=protocol))
+            TestUtility.assertListEquality(pv2['a'], valueList)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+import time
+import threading
+from pvaccess import PvObjectQueue
+from pvaccess import PvObject
+from pvaccess import PvInt
+from pvaccess import INT
+from pvaccess import STRING
+from pvaccess import REJECT_NEW
+from pvaccess import DROP_OLDEST
+from pvaccess import CONFLATE
+from pvaccess import QueueEmpty
+from pvaccess import QueueFull
+from pvaccess import InvalidRequest
+
+class TestPvObjectQueue:
+
+    def test_GetManyPutMany(self):
+        print()
+        pvq = PvObjectQueue(5)
+        nPushed = pvq.putMany([PvInt(i) for i in range(8)])
+        assert(nPushed == 5)
+        assert(len(pvq) == 5)
+        counters = pvq.getCounters()
+        assert(counters['nReceived'] == 5)
+        assert(counters['nRejected'] == 3)
+        pvList = pvq.getMany(3)
+        assert([pv.get() for pv in pvList] == [0, 1, 2])
+        pvList = pvq.getMany(0, 0.1)
+        assert([pv.get() for pv in pvList] == [3, 4])
+        assert(pvq.getCounters()['nDelivered'] == 5)
+
+    def test_GetManyTimeout(self):
+        print()
+        pvq = PvObjectQueue()
+        pvList = pvq.getMany(10, 0.1)
+        assert(pvList == [])
+
+    def test_LockFreeQueue(self):
+        print()
+        pvq = PvObjectQueue(3, True)
+        assert(pvq.isLockFree())
+        for i in range(0,4):
+            try:
+                pvq.put(PvInt(i))
+            except QueueFull:
+                assert(i == 3)
+        assert(len(pvq) == 3)
+        assert(pvq.get().get() == 0)
+        assert(pvq.get(0.1).get() == 1)
+        assert(pvq.putMany([PvInt(4), PvInt(5), PvInt(6)]) == 2)
+        assert([pv.get() for pv in pvq.getMany(0, 0.1)] == [2, 4, 5])
+        counters = pvq.getCounters()
+        assert(counters['nReceived'] == 5)
+        assert(counters['nRejected'] == 2)
+        assert(counters['nDelivered'] == 5)
+        assert(counters['nQueued'] == 0)
+        try:
+            pvq.get(0.1)
+            assert(False)
+        except QueueEmpty:
+            pass
+
+    def test_LockFreeQueueResize(self):
+        print()
+        pvq = PvObjectQueue(3, True)
+        pvq.maxLength = 3
+        try:
+            pvq.maxLength = 5
+            assert(False)
+        except InvalidRequest:
+            pass
+        assert(pvq.maxLength == 3)
+
+    def test_WaitForPutAny(self):
+        print()
+        pvq1 = PvObjectQueue()
+        pvq2 = PvObjectQueue()
+        assert(not PvObjectQueue.waitForPutAny([pvq1, pvq2], 0.1))
+        # Idle first queue must not delay wakeup on the second one
+        def put():
+            time.sleep(0.2)
+            pvq2.put(PvInt(1))
+        threading.Thread(target=put).start()
+        t0 = time.time()
+        assert(PvObjectQueue.waitForPutAny([pvq1, pvq2], 5))
+        assert(time.time()-t0 < 2)
+        assert(len(pvq1) == 0)
+        assert(pvq2.get().get() == 1)
+
+    def test_DropOldestPolicy(self):
+        print()
+        pvq = PvObjectQueue(3)
+        pvq.setOverflowPolicy(DROP_OLDEST)
+        for i in range(0,5):
+            pvq.put(PvInt(i))
+        assert([pv.get() for pv in pvq.getMany(0)] == [2, 3, 4])
+        counters = pvq.getCounters()
+        assert(counters['nDropped'] == 2)
+        assert(counters['nRejected'] == 0)
+
+    def test_ConflatePolicy(self):
+        print()
+        pvq = PvObjectQueue(2)
+        pvq.setOverflowPolicy(CONFLATE, 'name')
+        assert(pvq.getOverflowPolicyKey() == 'name')
+        for (name, value) in [('a', 1), ('b', 2), ('a', 3), ('c', 4)]:
+            pvq.put(PvObject({'name' : STRING, 'value' : INT}, {'name' : name, 'value' : value}))
+        pvList = pvq.getMany(0)
+        assert([(pv['name'], pv['value']) for pv in pvList] == [('b', 2), ('c', 4)])
+        counters = pvq.getCounters()
+        assert(counters['nConflated'] == 1)
+        assert(counters['nDropped'] == 1)
+
+    def test_PutManyRejectNewPolicy(self):
+        print()
+        pvq = PvObjectQueue(3)
+        pvq.setOverflowPolicy(REJECT_NEW)
+        assert(pvq.putMany([PvInt(i) for i in range(5)]) == 3)
+        assert([pv.get() for pv in pvq.getMany(0)] == [0, 1, 2])
+        counters = pvq.getCounters()
+        assert(counters['nRejected'] == 2)
+        assert(counters['nDropped'] == 0)
+
+    def test_PutManyDropOldestPolicy(self):
+        print()
+        pvq = PvObjectQueue(3)
+        pvq.setOverflowPolicy(DROP_OLDEST)
+        pvq.put(PvInt(0))
+        assert(pvq.putMany([PvInt(i) for i in range(1,5)]) == 4)
+        assert([pv.get() for pv in pvq.getMany(0)] == [2, 3, 4])
+        counters = pvq.getCounters()
+        assert(counters['nDropped'] == 2)
+        assert(counters['nRejected'] == 0)
+
+    def test_PutManyConflatePolicy(self):
+        print()
+        pvq = PvObjectQueue(2)
+        pvq.setOverflowPolicy(CONFLATE, 'name')
+        pvList = [PvObject({'name' : STRING, 'value' : INT}, {'name' : name, 'value' : value}) for (name, value) in [('a', 1), ('b', 2), ('a', 3), ('c', 4)]]
+        assert(pvq.putMany(pvList) == 4)
+        pvList = pvq.getMany(0)
+        assert([(pv['name'], pv['value']) for pv in pvList] == [('b', 2), ('c', 4)])
+        counters = pvq.getCounters()
+        assert(counters['nConflated'] == 1)
+        assert(counters['nDropped'] == 1)
+        assert(counters['nRejected'] == 0)
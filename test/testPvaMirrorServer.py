@@ -30,3 +30,72 @@ class TestPvaMirrorServer:
         assert(len(s.getMirrorRecordNames()) == 0)
         assert(len(s.getRecordNames()) == 0)
         s.stop()
+
+    def testAddAndRemoveMirrorView(self):
+        s = pva.PvaMirrorServer()
+
+        c = TestUtility.getShortChannel()
+        value = TestUtility.getRandomShort()
+        c.put(pva.PvShort(value))
+
+        mirrorChannelName = 'mirror_' + TestUtility.getRandomString(5)
+        viewChannelName = 'view_' + TestUtility.getRandomString(5)
+        s.addMirrorRecord(mirrorChannelName , c.getName(), pva.PVA)
+        s.addMirrorView(viewChannelName, mirrorChannelName, 'value')
+        time.sleep(1.0)
+        assert(s.hasMirrorView(viewChannelName))
+        assert(len(s.getMirrorViewNames()) == 1)
+        assert(len(s.getRecordNames()) == 2)
+
+        c2 = pva.Channel(viewChannelName)
+        pv = c2.get('field()')
+        print('Retrieved value from mirror view %s: %s' % (viewChannelName, pv))
+        assert(list(pv.getStructureDict().keys()) == ['value'])
+        assert(pv['value'] == value)
+
+        value = TestUtility.getRandomShort()
+        c.put(pva.PvShort(value))
+        time.sleep(1.0)
+        value2 = c2.get('field()')['value']
+        print('Retrieved updated value from mirror view %s: %s' % (viewChannelName, value2))
+        assert(value == value2)
+
+        s.removeMirrorView(viewChannelName)
+        assert(not s.hasMirrorView(viewChannelName))
+        assert(len(s.getRecordNames()) == 1)
+        s.addMirrorView(viewChannelName, mirrorChannelName, 'value')
+        s.removeMirrorRecord(mirrorChannelName)
+        assert(len(s.getMirrorViewNames()) == 0)
+        assert(len(s.getRecordNames()) == 0)
+        s.stop()
+
+    def testMirrorRecordRateLimit(self):
+        s = pva.PvaMirrorServer()
+
+        c = TestUtility.getShortChannel()
+        mirrorChannelName = 'mirror_' + TestUtility.getRandomString(5)
+        s.addMirrorRecord(mirrorChannelName , c.getName(), pva.PVA)
+        s.setMirrorRecordRateLimit(mirrorChannelName, 0, 2, False)
+        time.sleep(1.0)
+        s.resetMirrorRecordCounters(mirrorChannelName)
+
+        nUpdates = 10
+        for i in range(0,nUpdates):
+            c.put(pva.PvShort(i+1))
+            time.sleep(0.1)
+        time.sleep(1.0)
+        counters = s.getMirrorRecordCounters(mirrorChannelName)
+        print('Mirror record counters: %s' % counters)
+        assert(counters['nForwarded'] == nUpdates//2)
+        assert(counters['nDropped'] == nUpdates//2)
+
+        # Latest update within the window must be forwarded
+        s.setMirrorRecordRateLimit(mirrorChannelName, 0.5, 1, True)
+        value = TestUtility.getRandomShort()
+        c.put(pva.PvShort(value))
+        time.sleep(3.0)
+        value2 = pva.Channel(mirrorChannelName).get().getPyObject()
+        print('Retrieved value from mirror channel %s: %s' % (mirrorChannelName, value2))
+        assert(value == value2)
+        s.removeMirrorRecord(mirrorChannelName)
+        s.stop()
@@ -1,4 +1,6 @@
 #!/usr/bin/env python
+import time
+import threading
 import pvaccess as pva
 from testUtility import TestUtility
 
@@ -21,3 +23,60 @@ class TestPvaServer:
         s.removeRecord(cName)
         assert(len(s.getRecordNames()) == 0)
         s.stop()
+
+    def testCallbackPriority(self):
+        s = pva.PvaServer()
+        # Single callback thread, so that low priority callbacks queue up
+        s.setCallbackThreadPoolSize(1)
+        assert(s.getCallbackThreadPoolSize() == 1)
+        dataName = 'd' + TestUtility.getRandomString(5)
+        controlName = 'c' + TestUtility.getRandomString(5)
+        controlEvent = threading.Event()
+        callbackOrder = []
+        def dataCallback(pv):
+            callbackOrder.append(dataName)
+            time.sleep(0.2)
+        def controlCallback(pv):
+            callbackOrder.append(controlName)
+            controlEvent.set()
+        s.addRecord(dataName, pva.PvInt(), dataCallback)
+        s.addRecord(controlName, pva.PvInt(), controlCallback)
+        s.setCallbackPriority(controlName, 10)
+        assert(s.getCallbackPriority(controlName) == 10)
+
+        # Control callback must go ahead of the queued data callbacks
+        dc = pva.Channel(dataName)
+        for i in range(0,5):
+            dc.put(pva.PvInt(i))
+        cc = pva.Channel(controlName)
+        cc.put(pva.PvInt(1))
+        assert(controlEvent.wait(2))
+        print('Callback order: %s' % callbackOrder)
+        assert(callbackOrder.index(controlName) <= 1)
+        counters = s.getCallbackCounters(controlName)
+        print('Control channel callback counters: %s' % counters)
+        assert(counters['nCallbacks'] == 1)
+        assert(counters['maxLatency'] < 0.5)
+        s.stop()
+
+    def testCallbackThreadPoolShrink(self):
+        s = pva.PvaServer()
+        s.setCallbackThreadPoolSize(4)
+        cName = 'c' + TestUtility.getRandomString(5)
+        callbackEvent = threading.Event()
+        def callback(pv):
+            callbackEvent.set()
+        s.addRecord(cName, pva.PvInt(), callback)
+        c = pva.Channel(cName)
+        c.put(pva.PvInt(1))
+        assert(callbackEvent.wait(2))
+
+        # Excess threads exit, but callbacks must still be executed
+        s.setCallbackThreadPoolSize(1)
+        time.sleep(2)
+        for i in range(0,3):
+            callbackEvent.clear()
+            c.put(pva.PvInt(i))
+            assert(callbackEvent.wait(2))
+        assert(s.getCallbackCounters(cName)['nCallbacks'] == 4)
+        s.stop()
@@ -0,0 +1,72 @@
+'''
+Test Reorder Buffer.
+'''
+from unittest.mock import Mock
+import sys
+import pylint.lint
+
+from pvapy.hpc.reorderBuffer import ReorderBuffer
+
+def testLint(monkeypatch):
+    ''' Test for linting errors '''
+    monkeypatch.setattr(sys, 'exit', Mock())
+    pylint_opts = ['pvapy.hpc.reorderBuffer', '--disable=all', '--enable=E,F', '--generated-members="pva.*"']
+    pylint.lint.Run(pylint_opts)
+    sys.exit.assert_called_once_with(0)
+
+def testInOrderRelease():
+    ''' Test releasing objects once all producers are past them '''
+    rb = ReorderBuffer(8, producerIdList=[1,2])
+    rb.add(1, 1, 'a')
+    assert not rb.hasReadyObjects()
+    rb.add(2, 2, 'b')
+    assert rb.release() == [(1, 'a')]
+    rb.add(1, 3, 'c')
+    rb.add(1, 5, 'e')
+    rb.add(2, 4, 'd')
+    assert rb.release() == [(2, 'b'), (3, 'c'), (4, 'd')]
+    rb.add(2, 7, 'g')
+    assert rb.release() == [(5, 'e')]
+    assert rb.nMissed == 0
+    assert len(rb) == 1
+
+def testGapSkipping():
+    ''' Test skipping missing objects '''
+    rb = ReorderBuffer(16, latenessTimeout=0, producerIdList=[1,2])
+    rb.add(1, 1, 'a')
+    rb.add(1, 3, 'c')
+    assert rb.release() == []
+    assert rb.release(skipGaps=True) == [(1, 'a')]
+    assert rb.release(skipGaps=True) == [(3, 'c')]
+    assert rb.nMissed == 1
+    rb.add(2, 10, 'j')
+    assert not rb.add(2, 2, 'b')
+    assert rb.nRejected == 1
+
+def testWindowOverflow():
+    ''' Test releasing objects that no longer fit into the window '''
+    rb = ReorderBuffer(4, producerIdList=[1,2])
+    rb.add(1, 1, 'a')
+    rb.add(1, 2, 'b')
+    rb.add(1, 10, 'j')
+    assert rb.release() == [(1, 'a'), (2, 'b')]
+    assert rb.nMissed == 0
+    assert len(rb) == 1
+
+def testLatenessTimeout():
+    ''' Test releasing backlog after a single timeout when one producer stalls '''
+    rb = ReorderBuffer(16, latenessTimeout=1.0, producerIdList=[1,2])
+    rb.add(1, 1, 'a')
+    rb.add(2, 2, 'b')
+    assert rb.release(now=0) == [(1, 'a')]
+    # Producer 1 stalls, producer 2 keeps going
+    for objectId in range(4, 12, 2):
+        rb.add(2, objectId, objectId)
+    assert rb.release(now=0.5) == []
+    assert rb.release(now=1.5) == [(2, 'b'), (4, 4), (6, 6), (8, 8), (10, 10)]
+    assert rb.nMissed == 4
+    assert len(rb) == 0
+    # Once producer 1 catches up, objects are released without waiting
+    rb.add(2, 12, 12)
+    rb.add(1, 13, 13)
+    assert rb.release(now=1.6) == [(12, 12)]
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+import os
+import time
+import asyncio
+import threading
+import pvaccess as pva
+from testUtility import TestUtility
+
+def sleep(pvRequest):
+    delay = pvRequest['delay']
+    time.sleep(delay)
+    return pva.PvObject({'delay' : pva.DOUBLE}, {'delay' : delay})
+
+async def asyncSleep(pvRequest):
+    delay = pvRequest['delay']
+    await asyncio.sleep(delay)
+    return pva.PvObject({'delay' : pva.DOUBLE}, {'delay' : delay})
+
+# Process pool services must be picklable, so that spawned pool processes
+# can import them
+def getPid(pvRequest):
+    return pva.PvObject({'pid' : pva.INT}, {'pid' : os.getpid()})
+
+class TestRpcServer:
+
+    def invokeConcurrently(self, serviceName, delayList, startInterval=0):
+        resultList = []
+        def invoke(delay):
+            client = pva.RpcClient(serviceName)
+            try:
+                client.invoke(pva.PvObject({'delay' : pva.DOUBLE}, {'delay' : delay}), 10)
+                resultList.append(True)
+            except Exception as ex:
+                print('Request failed: %s' % ex)
+                resultList.append(False)
+        threadList = []
+        for delay in delayList:
+            t = threading.Thread(target=invoke, args=(delay,))
+            t.start()
+            threadList.append(t)
+            time.sleep(startInterval)
+        for t in threadList:
+            t.join(20)
+        return resultList
+
+    def testThreadPoolConcurrency(self):
+        serviceName = 'rpc' + TestUtility.getRandomString(5)
+        srv = pva.RpcServer()
+        srv.setWorkerPoolSize(4)
+        srv.registerService(serviceName, sleep, pva.RpcExecutorType.THREAD_POOL, 4, 0)
+        srv.startListener()
+        time.sleep(1)
+
+        # Requests do not wait for each other
+        nRequests = 4
+        delay = 1
+        startTime = time.time()
+        resultList = self.invokeConcurrently(serviceName, [delay]*nRequests)
+        runtime = time.time()-startTime
+        print('Executed %s requests in %s seconds' % (nRequests, runtime))
+        assert(resultList == [True]*nRequests)
+        assert(runtime < nRequests*delay)
+
+        counterDict = srv.getServiceCounters(serviceName)
+        print('Service counters: %s' % counterDict)
+        assert(counterDict['nRequests'] == nRequests)
+        assert(counterDict['nErrors'] == 0)
+        assert(counterDict['nRejected'] == 0)
+        assert(counterDict['nInFlight'] == 0)
+        assert(counterDict['nQueued'] == 0)
+        assert(counterDict['maxLatency'] >= delay)
+        srv.resetServiceCounters(serviceName)
+        assert(srv.getServiceCounters(serviceName)['nRequests'] == 0)
+        srv.stopListener()
+
+    def testInFlightLimit(self):
+        serviceName = 'rpc' + TestUtility.getRandomString(5)
+        srv = pva.RpcServer()
+        srv.setWorkerPoolSize(4)
+        srv.registerService(serviceName, sleep, pva.RpcExecutorType.THREAD_POOL, 1, 1)
+        srv.startListener()
+        time.sleep(1)
+
+        # First request is executed, second waits in the queue, and the
+        # third one is rejected
+        resultList = self.invokeConcurrently(serviceName, [1, 1, 1], 0.2)
+        print('Request results: %s' % resultList)
+        assert(resultList.count(True) == 2)
+        assert(resultList.count(False) == 1)
+
+        counterDict = srv.getServiceCounters(serviceName)
+        print('Service counters: %s' % counterDict)
+        assert(counterDict['nRequests'] == 2)
+        assert(counterDict['nRejected'] == 1)
+        assert(counterDict['maxQueued'] == 1)
+        assert(counterDict['nInFlight'] == 0)
+        srv.stopListener()
+
+    def testProcessPool(self):
+        serviceName = 'rpc' + TestUtility.getRandomString(5)
+        srv = pva.RpcServer()
+        srv.setProcessPoolSize(2)
+        srv.registerService(serviceName, getPid, pva.RpcExecutorType.PROCESS_POOL, 2, 0)
+        srv.startListener()
+        time.sleep(1)
+
+        # Service is executed in one of the spawned pool processes
+        client = pva.RpcClient(serviceName)
+        nRequests = 3
+        for i in range(nRequests):
+            result = client.invoke(pva.PvObject({'delay' : pva.DOUBLE}, {'delay' : 0}), 30)
+            print('Request executed by process %s' % result['pid'])
+            assert(result['pid'] != os.getpid())
+
+        counterDict = srv.getServiceCounters(serviceName)
+        print('Service counters: %s' % counterDict)
+        assert(counterDict['nRequests'] == nRequests)
+        assert(counterDict['nErrors'] == 0)
+        srv.stopListener()
+
+    def testCoroutineService(self):
+        serviceName = 'rpc' + TestUtility.getRandomString(5)
+        srv = pva.RpcServer()
+        srv.setWorkerPoolSize(4)
+        srv.registerService(serviceName, asyncSleep, pva.RpcExecutorType.THREAD_POOL, 4, 0)
+        srv.startListener()
+        time.sleep(1)
+
+        # Coroutines are executed concurrently in the server event loop
+        nRequests = 4
+        delay = 1
+        startTime = time.time()
+        resultList = self.invokeConcurrently(serviceName, [delay]*nRequests)
+        runtime = time.time()-startTime
+        print('Executed %s requests in %s seconds' % (nRequests, runtime))
+        assert(resultList == [True]*nRequests)
+        assert(runtime < nRequests*delay)
+
+        counterDict = srv.getServiceCounters(serviceName)
+        print('Service counters: %s' % counterDict)
+        assert(counterDict['nRequests'] == nRequests)
+        assert(counterDict['nErrors'] == 0)
+        srv.stopListener()
+
+    def testCoroutineServiceInProcessPool(self):
+        serviceName = 'rpc' + TestUtility.getRandomString(5)
+        srv = pva.RpcServer()
+        try:
+            srv.registerService(serviceName, asyncSleep, pva.RpcExecutorType.PROCESS_POOL, 1, 0)
+            assert(False)
+        except pva.InvalidArgument:
+            pass
@@ -0,0 +1,36 @@
+'''
+Test Shared Memory Frame Queue
+'''
+from unittest.mock import Mock
+import sys
+import multiprocessing as mp
+import pylint.lint
+import pvaccess as pva
+
+from pvapy.hpc.sharedMemoryFrameQueue import SharedMemoryFrameQueue
+
+def testLint(monkeypatch):
+    ''' Test for linting errors '''
+    monkeypatch.setattr(sys, 'exit', Mock())
+    pylint_opts = ['pvapy.hpc.sharedMemoryFrameQueue', '--disable=all', '--enable=E,F', '--generated-members="pva.*"']
+    pylint.lint.Run(pylint_opts)
+    sys.exit.assert_called_once_with(0)
+
+def getFrame(frameQueue, resultQueue):
+    ''' Receive frame in a child process '''
+    pvObject = frameQueue.get(timeout=5)
+    resultQueue.put(pvObject['uniqueId'])
+
+def testRoundTrip():
+    ''' Test frame transfer to child process and slot release '''
+    with SharedMemoryFrameQueue(nSlots=1, slotSize=1024) as frameQueue:
+        resultQueue = mp.Queue()
+        for uniqueId in range(1,4):
+            # Put succeeds only if the child released the only slot
+            frameQueue.put(pva.PvObject({'uniqueId' : pva.UINT}, {'uniqueId' : uniqueId}), timeout=5)
+            process = mp.Process(target=getFrame, args=(frameQueue, resultQueue))
+            process.start()
+            assert resultQueue.get(timeout=10) == uniqueId
+            process.join(10)
+        assert frameQueue.getStats()['nSharedMemoryPuts'] == 3
+    assert frameQueue.isClosed